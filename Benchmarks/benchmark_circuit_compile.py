@@ -0,0 +1,161 @@
+#              benchmark_circuit_compile.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import time
+
+## \file benchmark_circuit_compile.py
+#
+#  \brief Times building a reversible circuit gate by gate against
+#  building it from a compiled Circuit.
+#
+# The circuit is the CCNOT/CNOT circuit of Gate_play/practiceGates.py, with
+# a layer of NOT gates on the control wires before and after it. The old
+# way builds every gate at max_level and multiplies it into the circuit
+# matrix; the compiled Circuit cancels self-inverse pairs, fuses runs of
+# gates into blocks on at most three wires and builds one operator per
+# block. The second case appends the inverse circuit (the gates in reverse
+# order), which compiles down to the identity. The matrix store is cleaned
+# between runs, and the two packedIDs are checked to be equal.
+#
+
+## \brief Returns the gate list of the practiceGates.py circuit
+def practice_gates(half_level):
+    CntrlNot_offset = 2
+    CCnotA_offset = 3
+    CCnotB_offset = 4
+    gates = [('not', i) for i in range(half_level)]
+    for i in range(half_level):
+        gates.append(('ccnot', (i+CCnotB_offset)%half_level,
+                      (i+CCnotA_offset)%half_level, i+half_level))
+        gates.append(('cnot', (i+CntrlNot_offset)%half_level, i+half_level))
+    gates += [('not', i) for i in range(half_level)]
+    return gates
+
+
+## \brief Builds the circuit one gate at a time, as practiceGates.py does
+def gate_by_gate(gates, max_level):
+    builds = 0
+    circuit_mID = mypy.get_identity_pID(max_level)
+    targets = mypy.intArray(1)
+    for g in gates:
+        if g[0] == 'not':
+            targets[0] = g[1]
+            gate_mID = mypy.build_not_gates(targets, 1)
+        elif g[0] == 'cnot':
+            gate_mID = mypy.build_cnot_gate(g[1], g[2], 0)
+        else:
+            gate_mID = mypy.build_ccnot_gate(g[1], g[2], g[3])
+        builds += 1
+        circuit_mID = mypy.matrix_mult(circuit_mID, gate_mID)
+    return circuit_mID, builds
+
+
+## \brief Builds the circuit from a compiled Circuit
+def compiled(gates, max_level):
+    circuit = mypy.Circuit(max_level)
+    for g in gates:
+        if g[0] == 'not':
+            circuit.not_gate(g[1])
+        elif g[0] == 'cnot':
+            circuit.cnot(g[1], g[2])
+        else:
+            circuit.ccnot(g[1], g[2], g[3])
+    circuit.compile()
+    circuit_mID, report = circuit.product()
+    return circuit_mID, circuit.stats
+
+
+if __name__ == '__main__':
+
+    max_level = 10
+    if len(sys.argv) == 2:
+        max_level = int(sys.argv[1])
+    half_level = max_level//2
+
+    matrix_exponent = 26
+    op_exponent = 24
+    regionbitparam = -1
+    zeroregionbitparam = -1
+    verbose = 0
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+
+    forward = practice_gates(half_level)
+    cases = [("circuit", forward), ("circuit+inverse", forward + forward[::-1])]
+
+    print("%16s %6s %14s %14s %14s %14s %s" %("case","gates","old builds",
+          "new builds","old (s)","new (s)","same pID"))
+    for name, gates in cases:
+        start = time.perf_counter()
+        old_mID, old_builds = gate_by_gate(gates, max_level)
+        old_time = time.perf_counter() - start
+        mypy.set_hold_matrix(old_mID)
+        mypy.clean_matrix_storage()
+
+        start = time.perf_counter()
+        new_mID, stats = compiled(gates, max_level)
+        new_time = time.perf_counter() - start
+
+        print("%16s %6d %14d %14d %14.4f %14.4f %s" %(name, len(gates),
+              old_builds, stats['blocks'], old_time, new_time,
+              old_mID == new_mID))
+        mypy.release_hold_matrix(old_mID)
+        mypy.clean_matrix_storage()
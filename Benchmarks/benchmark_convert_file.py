@@ -0,0 +1,142 @@
+#              benchmark_convert_file.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../Count_triangles"))
+import convert_file
+import glob
+import numpy as np
+import tempfile
+import time
+
+## \file benchmark_convert_file.py
+#
+#  \brief Measures the throughput of Count_triangles/convert_file.py.
+#
+# The weighted edge lists (row, column, weight) in Count_triangles/data are
+# copied without their weight column into a temporary directory, to give
+# SNAP style edge lists, and converted to Matrix Market format. A synthetic
+# edge list of num_edges random edges (100 million by default) is then
+# written to the temporary directory and converted. The program does not need LARC. For each file the input
+# size, number of edges, time, and throughput in MB/s and edges/s are
+# printed.
+#
+
+## \brief Writes num_edges random tab separated edges to filename
+def write_synthetic_edges(filename, num_edges, num_vertices):
+    rng = np.random.default_rng(2024)
+    block = 1 << 22
+    with open(filename, "wb") as fp:
+        for start in range(0, num_edges, block):
+            n = min(block, num_edges - start)
+            lines = convert_file.format_edge_lines(
+                rng.integers(1, num_vertices, size=n),
+                rng.integers(1, num_vertices, size=n))
+            # "row col 1\n" -> "row\tcol\n"
+            fp.write(lines.replace(b" 1\n", b"\n").replace(b" ", b"\t"))
+
+
+## \brief Copies the first two columns of a tab separated file
+def write_two_columns(infilename, outfilename):
+    with open(infilename, "rb") as infp, open(outfilename, "wb") as outfp:
+        for line in infp:
+            outfp.write(b"\t".join(line.split()[:2]) + b"\n")
+
+
+## \brief Converts infilename and returns (seconds, number of edges)
+def time_conversion(infilename, outfilename, profile):
+    start = time.perf_counter()
+    with convert_file.open_input_file(infilename, "rb") as infp:
+        with open(outfilename, "wb") as outfp:
+            convert_file.do_one_file(infp, outfp, infilename, outfilename, profile)
+    seconds = time.perf_counter() - start
+    with open(outfilename, "rb") as fp:
+        for line in fp:
+            if not line.startswith(b"%"):
+                num_edges = int(line.split()[2])
+                break
+    return seconds, num_edges
+
+
+if __name__ == '__main__':
+
+    num_edges = 100000000
+    if len(sys.argv) == 2:
+        num_edges = int(sys.argv[1])
+
+    profile = {"mmio_type": "general", "vertex_shift": 0, "up_edges": "Output",
+               "down_edges": "Output", "self_edges": "Output"}
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "../Count_triangles/data")
+
+    print("%32s %10s %12s %10s %10s %12s" %("file","MB","edges","time (s)","MB/s","edges/s"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        infilenames = []
+        for data_file in sorted(glob.glob(os.path.join(data_dir, "*.tsv"))):
+            infilenames.append(os.path.join(tmp_dir, os.path.basename(data_file)))
+            write_two_columns(data_file, infilenames[-1])
+        infilenames.append(os.path.join(tmp_dir, "synthetic_%d.tsv" % num_edges))
+        write_synthetic_edges(infilenames[-1], num_edges, 1 << 24)
+        for infilename in infilenames:
+            outfilename = os.path.join(tmp_dir, "out.mmio")
+            seconds, edges = time_conversion(infilename, outfilename, profile)
+            megabytes = os.path.getsize(infilename) / 1e6
+            print("%32s %10.1f %12d %10.3f %10.1f %12.3g" %(os.path.basename(infilename),
+                  megabytes, edges, seconds, megabytes/seconds, edges/seconds))
+            os.remove(outfilename)
@@ -0,0 +1,114 @@
+#              benchmark_edge_loading.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import glob
+import tempfile
+import time
+
+## \file benchmark_edge_loading.py
+#
+#  \brief Times loading the Count_triangles/data graphs from Matrix Market
+#  text against loading them from binary edge files.
+#
+# Each Matrix Market file in Count_triangles/data is read with
+# read_matrixMarketExchange_file, converted to a binary edge file with
+# edge_files.py (timed separately, since this is done once per graph), and
+# loaded again with read_edge_file. The matrix store is cleaned between
+# loads. Edge files only hold 0/1 adjacency matrices, so the two packedIDs
+# agree for the graphs but not for the small test matrices with other values.
+#
+if __name__ == '__main__':
+
+    max_level = 16
+    matrix_exponent = 26
+    op_exponent = 24
+    regionbitparam = -1
+    zeroregionbitparam = -1
+    verbose = 0
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "../Count_triangles/data")
+    print("%36s %10s %12s %12s %12s %s" %("file","edges","text (s)",
+          "convert (s)","binary (s)","same pID"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mm_name in sorted(glob.glob(os.path.join(data_dir, "*.mm"))):
+            start = time.perf_counter()
+            text_pID = mypy.read_matrixMarketExchange_file(mm_name)
+            text_time = time.perf_counter() - start
+            mypy.set_hold_matrix(text_pID)
+            mypy.clean_matrix_storage()
+
+            edge_name = os.path.join(tmp_dir, "graph.edges")
+            start = time.perf_counter()
+            rows, cols, num_vertices = mypy.edges_from_text(mm_name)
+            num_edges = mypy.write_edge_file(edge_name, rows, cols, num_vertices)
+            convert_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            edge_pID = mypy.read_edge_file(edge_name, mypy.matrix_row_level(text_pID))
+            edge_time = time.perf_counter() - start
+
+            print("%36s %10d %12.4f %12.4f %12.4f %s" %(os.path.basename(mm_name),
+                  num_edges, text_time, convert_time, edge_time, text_pID == edge_pID))
+            mypy.release_hold_matrix(text_pID)
+            mypy.clean_matrix_storage()
@@ -0,0 +1,148 @@
+#              benchmark_incremental_triangles.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+sys.path.append(os.path.join(os.path.dirname(__file__),"../Count_triangles"))
+import MyPyLARC as mypy
+from incremental_triangles import IncrementalTriangleCounter
+import numpy as np
+import time
+
+## \file benchmark_incremental_triangles.py
+#
+#  \brief Compares the incremental triangle count of a growing graph with
+#  recounting from scratch, on the Theory-16-25-81 graphs.
+#
+# The edges of each graph are shuffled, half of them form the initial
+# graph, and the rest are added in batches with
+# IncrementalTriangleCounter.add_edges (the matrix store is cleaned after
+# each batch, keeping the held A and A^2). For each batch size this prints
+# the mean time per batch and the insert throughput, and the time of a
+# full recount (loading A, computing A^2 and trace(A A^2)) of the final
+# graph, whose count must agree with the incremental one. "speedup" is the
+# full recount time over the mean batch time, i.e. how much cheaper it is
+# to update each snapshot than to recount it.
+#
+# Usage: python benchmark_incremental_triangles.py [max_batches]
+# (at most max_batches batches, default 20, are timed for each size)
+#
+BATCH_SIZES = [10, 100, 1000, 10000]
+
+
+##
+# \brief Counts the triangles of a graph from scratch
+#
+# \return The pair (triangles, seconds)
+def full_recount(rows, cols, level):
+    start = time.perf_counter()
+    counter = IncrementalTriangleCounter(level, rows, cols)
+    seconds = time.perf_counter() - start
+    mypy.release_hold_matrix(counter.A_ID)
+    mypy.release_hold_matrix(counter.B_ID)
+    return counter.triangles, seconds
+
+
+if __name__ == '__main__':
+
+    max_batches = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    max_level = 16
+    matrix_exponent = 26
+    op_exponent = 24
+    regionbitparam = -1
+    zeroregionbitparam = -1
+    verbose = 0
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "../Count_triangles/data")
+    print("%28s %8s %8s %12s %12s %12s %8s %s" %("graph","batch","batches",
+          "batch (s)","edges/s","recount (s)","speedup","same count"))
+    for name in ["Theory-16-25-81-B1k.tsv", "Theory-16-25-81-B2k.tsv"]:
+        rows, cols, num_vertices = mypy.edges_from_text(os.path.join(data_dir, name))
+        order = np.random.default_rng(0).permutation(len(rows))
+        rows, cols = rows[order], cols[order]
+        initial = len(rows) // 2
+
+        for batch_size in BATCH_SIZES:
+            counter = IncrementalTriangleCounter(max_level, rows[:initial],
+                                                 cols[:initial])
+            mypy.clean_matrix_storage()
+            end = min(len(rows), initial + max_batches * batch_size)
+            batch_time = 0.0
+            num_batches = 0
+            for first in range(initial, end, batch_size):
+                start = time.perf_counter()
+                counter.add_edges(rows[first:first+batch_size],
+                                  cols[first:first+batch_size])
+                counter.clean()
+                batch_time += time.perf_counter() - start
+                num_batches += 1
+            mypy.release_hold_matrix(counter.A_ID)
+            mypy.release_hold_matrix(counter.B_ID)
+            mypy.clean_matrix_storage()
+
+            triangles, recount_time = full_recount(rows[:end], cols[:end],
+                                                   max_level)
+            mypy.clean_matrix_storage()
+            mean_time = batch_time / num_batches
+            print("%28s %8d %8d %12.4f %12.0f %12.4f %8.1f %s" %(name,
+                  batch_size, num_batches, mean_time,
+                  (end - initial) / batch_time, recount_time,
+                  recount_time / mean_time, triangles == counter.triangles))
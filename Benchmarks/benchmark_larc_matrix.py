@@ -0,0 +1,145 @@
+#              benchmark_larc_matrix.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import numpy as np
+import time
+
+## \file benchmark_larc_matrix.py
+#
+#  \brief Times an iteration written with raw packedIDs against the same
+#  iteration written with LarcMatrix handles.
+#
+# The iteration applies the cyclic shift permutation of a level to a basis
+# vector, v = P v, so every step makes a new vector and no product is found
+# in the op store. The raw loop roots the current vector with a RecentRoots
+# history of one; the handle loop just rebinds v = P @ v and lets the old
+# handle go. Both use a StoreGC policy collecting every 1000 new matrices,
+# and the final vectors are checked to be equal.
+#
+
+## \brief Returns the cyclic shift permutation matrix of a level
+def shift_matrix(level):
+    dim = 2**level
+    P = np.zeros((dim, dim), dtype=np.int64)
+    P[np.arange(dim), (np.arange(dim) - 1) % dim] = 1
+    return P
+
+
+## \brief The iteration with raw packedIDs
+def raw_loop(P_pID, v_pID, steps, store_gc):
+    current = mypy.RecentRoots(1)
+    current.push(v_pID)
+    for i in range(steps):
+        v_pID = mypy.matrix_mult(P_pID, v_pID)
+        current.push(v_pID)
+        store_gc.maybe_collect()
+    return v_pID, current
+
+
+## \brief The iteration with LarcMatrix handles
+def handle_loop(P, v, steps, store_gc):
+    for i in range(steps):
+        v = P @ v
+        store_gc.maybe_collect()
+    return v
+
+
+if __name__ == '__main__':
+
+    level = 10
+    steps = 1000
+    if len(sys.argv) == 3:
+        level = int(sys.argv[1])
+        steps = int(sys.argv[2])
+    steps = min(steps, 2**level - 1)
+
+    matrix_exponent = 22
+    op_exponent = 20
+    max_level = level
+    regionbitparam = -1
+    zeroregionbitparam = -1
+    verbose = 0
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+
+    P = mypy.LarcMatrix.from_numpy(shift_matrix(level))
+    basis = np.zeros(2**level, dtype=np.int64)
+    basis[0] = 1
+    v = mypy.LarcMatrix.from_numpy(basis)
+
+    print("%10s %8s %12s %14s %12s" %("loop","steps","time (s)",
+          "us per step","collections"))
+    store_gc = mypy.StoreGC(every_created=1000)
+    start = time.perf_counter()
+    raw_pID, raw_roots = raw_loop(P.pID, v.pID, steps, store_gc)
+    raw_time = time.perf_counter() - start
+    print("%10s %8d %12.4f %14.2f %12d" %("raw", steps, raw_time,
+          1e6*raw_time/steps, store_gc.stats['collections']))
+
+    # start the second loop from the same store contents
+    store_gc.collect()
+    store_gc = mypy.StoreGC(every_created=1000)
+    start = time.perf_counter()
+    w = handle_loop(P, v, steps, store_gc)
+    handle_time = time.perf_counter() - start
+    print("%10s %8d %12.4f %14.2f %12d" %("LarcMatrix", steps, handle_time,
+          1e6*handle_time/steps, store_gc.stats['collections']))
+    print("same final vector: %s" %(w.pID == raw_pID))
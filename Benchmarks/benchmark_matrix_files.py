@@ -0,0 +1,177 @@
+#              benchmark_matrix_files.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import glob
+import tempfile
+import time
+
+## \file benchmark_matrix_files.py
+#
+#  \brief Times loading and saving the matrices in MatricesDFT/Level* in
+#  the JSON larcMatrixFile format and in the binary format (matrix_binary.c).
+#
+# The matrices are the ones written by
+# FFT_play/StrategyExperiments/store_fft_matrices.py, so that script must be
+# run first (with a complex scalarType) for each level to be measured. Each
+# file is read with read_larcMatrixFile and written back to a temporary
+# directory in both formats. The store is then cleaned, the binary copy is
+# read into the empty store, and the JSON file is read again; the two
+# packedIDs must agree. Where store_fft_matrices.py also wrote an archive
+# (fft_matrices.lma), reading all of its matrices in one pass is compared
+# with reading each of their JSON files. Times are wall-clock seconds.
+#
+# Usage: python benchmark_matrix_files.py [levels...]
+# (default: every MatricesDFT/Level* directory found)
+#
+if __name__ == '__main__':
+
+    max_level = 16
+    matrix_exponent = 26
+    op_exponent = 24
+    regionbitparam = -1
+    zeroregionbitparam = -1
+    verbose = 0
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+
+    matrix_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "../FFT_play/StrategyExperiments/MatricesDFT")
+    if len(sys.argv) > 1:
+        level_dirs = [os.path.join(matrix_dir, "Level" + arg) for arg in sys.argv[1:]]
+    else:
+        level_dirs = sorted(glob.glob(os.path.join(matrix_dir, "Level*")),
+                            key=lambda d: int(d.split("Level")[-1]))
+    if not level_dirs:
+        print("No MatricesDFT/Level* directories; run store_fft_matrices.py first.")
+        sys.exit(1)
+
+    print("%32s %9s %9s %9s %10s %10s %10s %10s %s" %("file","LARCsize",
+          "JSON MB","bin MB","JSON load","JSON save","bin save","bin load",
+          "same pID"))
+    totals = [0.0, 0.0, 0.0, 0.0]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for level_dir in level_dirs:
+            for json_name in sorted(glob.glob(os.path.join(level_dir, "*"))):
+                if json_name.endswith((mypy.BINARY_SUFFIX, mypy.ARCHIVE_SUFFIX,
+                                       ".info")):
+                    continue
+                short_name = os.path.join(os.path.basename(level_dir),
+                                          os.path.basename(json_name))
+                start = time.perf_counter()
+                json_pID = mypy.read_larcMatrixFile(json_name)
+                json_load = time.perf_counter() - start
+
+                json_copy = os.path.join(tmp_dir, "matrix.json")
+                start = time.perf_counter()
+                larc_size = mypy.fprint_larcMatrixFile(json_pID, json_copy)
+                json_save = time.perf_counter() - start
+
+                binary_copy = os.path.join(tmp_dir, "matrix" + mypy.BINARY_SUFFIX)
+                start = time.perf_counter()
+                mypy.fprint_larcMatrixBinary(json_pID, binary_copy)
+                binary_save = time.perf_counter() - start
+
+                mypy.clean_matrix_storage()
+                start = time.perf_counter()
+                binary_pID = mypy.read_larcMatrixBinary(binary_copy)
+                binary_load = time.perf_counter() - start
+                same = (binary_pID == mypy.read_larcMatrixFile(json_copy))
+
+                print("%32s %9d %9.2f %9.2f %10.4f %10.4f %10.4f %10.4f %s"
+                      %(short_name, larc_size,
+                        os.path.getsize(json_copy) / 2**20,
+                        os.path.getsize(binary_copy) / 2**20,
+                        json_load, json_save, binary_save, binary_load, same))
+                for i, t in enumerate((json_load, json_save, binary_save, binary_load)):
+                    totals[i] += t
+                mypy.clean_matrix_storage()
+
+    print("%32s %9s %9s %9s %10.4f %10.4f %10.4f %10.4f" %("total","","","",
+          totals[0], totals[1], totals[2], totals[3]))
+    print("load speedup %.2f, save speedup %.2f" %(totals[0] / totals[3],
+          totals[1] / totals[2]))
+
+    print()
+    print("%12s %9s %9s %12s %12s %8s %s" %("archive","matrices","JSON MB",
+          "archive MB","JSON load","archive load","speedup","same pIDs"))
+    for level_dir in level_dirs:
+        archive_name = os.path.join(level_dir, "fft_matrices" + mypy.ARCHIVE_SUFFIX)
+        if not os.path.exists(archive_name):
+            continue
+        names = mypy.matrix_archive_names(archive_name)
+        json_names = [os.path.join(level_dir, name) for name in names]
+        mypy.clean_matrix_storage()
+        start = time.perf_counter()
+        for name in json_names:
+            mypy.read_larcMatrixFile(name)
+        json_load = time.perf_counter() - start
+        mypy.clean_matrix_storage()
+        start = time.perf_counter()
+        archive_pIDs = mypy.load_matrix_archive(archive_name)
+        archive_load = time.perf_counter() - start
+        same = all(archive_pIDs[name] == mypy.read_larcMatrixFile(json_name)
+                   for name, json_name in zip(names, json_names))
+        print("%12s %9d %9.2f %12.2f %12.4f %12.4f %8.2f %s"
+              %(os.path.basename(level_dir), len(names),
+                sum(os.path.getsize(name) for name in json_names) / 2**20,
+                os.path.getsize(archive_name) / 2**20,
+                json_load, archive_load, json_load / archive_load, same))
+        mypy.clean_matrix_storage()
@@ -0,0 +1,130 @@
+#              benchmark_mm_reader.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import glob
+import numpy as np
+import tempfile
+import time
+
+## \file benchmark_mm_reader.py
+#
+#  \brief Times read_matrixMarketExchange_file against the threaded
+#  read_matrixMarket_parallel (edge_io.c) for several thread counts.
+#
+# The Matrix Market files in Count_triangles/data are read, and so is a
+# synthetic random graph of num_edges edges written to a temporary file
+# (to show the scaling on a larger input). The matrix store is cleaned
+# between reads, and the packedID of each parallel read is compared with
+# that of the serial LARC reader. The parallel reader parses and builds the
+# bands of rows in several threads, but stores the scalars and nodes in
+# one thread, so that part does not get faster with more threads.
+#
+# Usage: python benchmark_mm_reader.py [num_edges [max_threads]]
+# (defaults: 2000000 edges, and up to the number of online CPUs)
+#
+if __name__ == '__main__':
+
+    num_edges = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    max_threads = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    max_level = 20
+    matrix_exponent = 26
+    op_exponent = 24
+    regionbitparam = -1
+    zeroregionbitparam = -1
+    verbose = 0
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "../Count_triangles/data")
+    thread_counts = [t for t in [1, 2, 4, 8, 16, 32] if t <= max_threads]
+    print("%36s %10s %12s %8s %12s %8s %s" %("file","MB","serial (s)",
+          "threads","parallel (s)","speedup","same pID"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # a random symmetric pattern matrix with 2**20 rows
+        rng = np.random.default_rng(0)
+        rows = rng.integers(1, 2**20 + 1, num_edges)
+        cols = rng.integers(1, 2**20 + 1, num_edges)
+        keys = np.unique(np.maximum(rows, cols) * 2**21 + np.minimum(rows, cols))
+        random_name = os.path.join(tmp_dir, "random_graph.mm")
+        with open(random_name, "w") as fp:
+            fp.write("%%%%MatrixMarket matrix coordinate pattern symmetric\n"
+                     "%d %d %d\n" %(2**20, 2**20, len(keys)))
+            np.savetxt(fp, np.column_stack((keys // 2**21, keys % 2**21)),
+                       fmt="%d")
+
+        for mm_name in sorted(glob.glob(os.path.join(data_dir, "*.mm"))) + [random_name]:
+            megabytes = os.path.getsize(mm_name) / 2**20
+            start = time.perf_counter()
+            serial_pID = mypy.read_matrixMarketExchange_file(mm_name)
+            serial_time = time.perf_counter() - start
+            mypy.set_hold_matrix(serial_pID)
+            mypy.clean_matrix_storage()
+            for num_threads in thread_counts:
+                start = time.perf_counter()
+                parallel_pID = mypy.read_matrixMarket_parallel(mm_name, -1, num_threads)
+                parallel_time = time.perf_counter() - start
+                print("%36s %10.1f %12.4f %8d %12.4f %8.2f %s" %(os.path.basename(mm_name),
+                      megabytes, serial_time, num_threads, parallel_time,
+                      serial_time / parallel_time, parallel_pID == serial_pID))
+                mypy.clean_matrix_storage()
+            mypy.release_hold_matrix(serial_pID)
+            mypy.clean_matrix_storage()
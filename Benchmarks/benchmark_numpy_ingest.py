@@ -0,0 +1,115 @@
+#              benchmark_numpy_ingest.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import numpy as np
+import time
+
+## \file benchmark_numpy_ingest.py
+#
+#  \brief Times numpy_to_pID against map_to_str + row_major_list_to_store.
+#
+# For each level the same matrix is loaded both ways. The matrix entries are
+# small integers in a random (but repeating) pattern, so that both paths
+# produce exactly the same LARC matrix and we can check that the packedIDs
+# agree. The matrix store is cleaned between levels.
+#
+if __name__ == '__main__':
+
+    min_level = 8
+    max_level = 14
+    if len(sys.argv) == 3:
+        min_level = int(sys.argv[1])
+        max_level = int(sys.argv[2])
+
+    matrix_exponent = 26
+    op_exponent = 24
+    regionbitparam = -1
+    zeroregionbitparam = -1
+    verbose = 0
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+    scalarTypeStr = mypy.cvar.scalarTypeStr
+
+    rng = np.random.default_rng(2024)
+    print("%6s %14s %14s %9s %s" %("level","string (s)","numpy (s)","speedup","same pID"))
+    for level in range(min_level, max_level+1):
+        dim = 2**level
+        # a 16x16 random tile repeated over the matrix, scaled by a random
+        # value per tile row, gives a matrix with moderate compression
+        tile = rng.integers(-4, 5, size=(16, 16))
+        scale = np.repeat(rng.integers(1, 4, size=dim//16), 16)
+        A = scale[:, np.newaxis] * np.tile(tile, (dim//16, dim//16))
+        if scalarTypeStr in ('Boolean',):
+            A = (A > 0).astype(np.int64)
+
+        start = time.perf_counter()
+        numpy_pID = mypy.numpy_to_pID(A)
+        numpy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        A_str = mypy.map_to_str(A.reshape(-1).tolist(), scalarTypeStr)
+        string_pID = mypy.row_major_list_to_store(A_str, level, level, dim)
+        string_time = time.perf_counter() - start
+        A_str = None
+
+        print("%6d %14.4f %14.4f %9.1f %s" %(level, string_time, numpy_time,
+              string_time/numpy_time, numpy_pID == string_pID))
+        mypy.clean_matrix_storage()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+ #*################################################################
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCcontributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*################################################################
+
+from __future__ import print_function, division
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import tempfile
+import time
+
+## \file compare_orderings.py
+#
+#  \brief Compares the LARC compression of a graph under vertex relabelings.
+#
+# The graph (a .mm, .tsv or .edges file) is relabeled with each ordering of
+# vertex_order.py and loaded with read_edge_file. For each ordering the
+# number of nonzero entries (matrix_count_entries, which should not change),
+# the LARCsize of the adjacency matrix A and of A^2, and the times to
+# relabel and to compute A^2 are printed. The matrix store is cleaned
+# between orderings.
+#
+if __name__ == '__main__':
+
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python compare_orderings.py data_path [max_level]")
+        print("  data_path:  a .mm or .tsv graph file, or a .edges file")
+        print("  max_level:  the LARC max_level (default 16)")
+        sys.exit(1)
+    data_path = sys.argv[1]
+    max_level = int(sys.argv[2]) if len(sys.argv) == 3 else 16
+
+    if data_path.endswith(".edges"):
+        rows, cols, num_vertices = mypy.edge_arrays_from_file(data_path)
+    else:
+        rows, cols, num_vertices = mypy.edges_from_text(data_path)
+
+    matrix_exponent = 26
+    op_exponent = 24
+    regionbitparam = -1
+    zeroregionbitparam = -1
+    verbose = 0
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+
+    print("%10s %12s %12s %12s %12s %12s" %("ordering","entries","LARCsize A",
+          "LARCsize A^2","order (s)","A^2 (s)"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        edge_name = os.path.join(tmp_dir, "graph.edges")
+        for method in mypy.VERTEX_ORDERINGS:
+            start = time.perf_counter()
+            new_label = mypy.vertex_ordering(rows, cols, num_vertices, method)
+            new_rows, new_cols = mypy.relabel_edges(rows, cols, new_label)
+            order_time = time.perf_counter() - start
+            mypy.write_edge_file(edge_name, new_rows, new_cols, num_vertices)
+
+            A_ID = mypy.read_edge_file(edge_name, -1)
+            if mypy.matrix_is_invalid(A_ID):
+                print("could not load the graph with ordering %s" %method)
+                sys.exit(1)
+            entries = mypy.matrix_count_entries(A_ID, "1")
+            size_A = mypy.count_unique_nodes(A_ID)
+
+            start = time.perf_counter()
+            B_ID = mypy.matrix_mult(A_ID, A_ID)
+            mult_time = time.perf_counter() - start
+            size_B = mypy.count_unique_nodes(B_ID)
+
+            print("%10s %12s %12d %12d %12.4f %12.4f" %(method, entries, size_A,
+                  size_B, order_time, mult_time))
+            mypy.clean_matrix_storage()
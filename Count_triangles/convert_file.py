@@ -62,10 +62,15 @@ Matrix Market mmio format.
 
 import argparse
 import configparser
+import gzip
 import sys
 import os
 import os.path
 import re
+import shutil
+import tempfile
+
+import numpy as np
 
 __author__ = "IDA/CCS LARC Team"
 __copyright__ = "Copyright (c) 2021 by Institute for Defense Analyses.  All rights reserved."
@@ -78,90 +83,240 @@ __date__ = "March 9, 2021"
 verbose = None
 
 
+# Size of the blocks read from the input file.  Each block is cut at its last
+# newline and parsed with numpy, so memory use is a small multiple of this.
+chunk_bytes = 1 << 22
+
+# Codes for the edge processing actions, used by the vectorized converter.
+edge_action_codes = {"Output": 0, "Reverse": 1, "Double": 2, "Skip": 3, "Fail": 4}
+
+pattern_two_nums = re.compile("([0-9]+)(?:[ \t]*,[ \t]*|[ \t]+)([0-9]+)")
+
+
+def open_input_file(infilename, mode):
+    """
+    Opens the input file, which may be gzip compressed (a name ending in
+    '.gz') or '-' for standard input.  The mode is 'rb' or 'rt'.
+    """
+    if infilename == "-":
+        return sys.stdin.buffer if mode == "rb" else sys.stdin
+    if infilename.endswith(".gz"):
+        return gzip.open(infilename, mode)
+    return open(infilename, mode)
+
+
+def read_line_blocks(infp):
+    """
+    Reads a binary file in blocks of about chunk_bytes, yielding each block
+    cut just after its last newline.  The final block always ends with a
+    newline, even if the file does not.
+    """
+    leftover = b""
+    while True:
+        data = infp.read(chunk_bytes)
+        if not data:
+            break
+        data = leftover + data
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            leftover = data
+            continue
+        leftover = data[cut:]
+        yield data[:cut]
+    if leftover:
+        yield leftover + b"\n"
+
+
+def parse_edge_block(block):
+    """
+    Finds the lines of a block which are two unsigned numbers separated by
+    whitespace or a comma (the lines pattern_two_nums matches) and parses
+    them, without a Python loop over the lines.
+
+    Returns (first, second, edge_lines, other_lines, line_start, line_end):
+    the two numbers of each edge line as int64 arrays, the indices (within
+    the block) of the edge lines, the indices of the remaining lines which
+    are not blank, and the byte offsets of the start and the newline of
+    every line.
+    """
+    buf = np.frombuffer(block, dtype=np.uint8)
+    newline = (buf == 10)
+    line_end = np.flatnonzero(newline)
+    line_start = np.empty_like(line_end)
+    line_start[0] = 0
+    line_start[1:] = line_end[:-1] + 1
+
+    is_digit = (buf >= 48) & (buf <= 57)
+    is_comma = (buf == 44)
+    is_other = ~(is_digit | is_comma | newline | (buf == 32) | (buf == 9) | (buf == 13))
+    tok_start = is_digit.copy()
+    tok_start[1:] &= ~is_digit[:-1]
+    tok_end = is_digit.copy()
+    tok_end[:-1] &= ~is_digit[1:]
+
+    # count the numbers, commas and other bytes of each line in one pass
+    weight = tok_start.astype(np.int64)
+    weight[is_comma] = 1 << 21
+    weight[is_other] = 1 << 42
+    counts = np.add.reduceat(weight, line_start)
+    num_tokens = counts & ((1 << 21) - 1)
+    num_commas = (counts >> 21) & ((1 << 21) - 1)
+    num_other = counts >> 42
+    blank = (num_tokens == 0) & (num_commas == 0) & (num_other == 0)
+    is_edge = (num_tokens == 2) & (num_commas <= 1) & (num_other == 0)
+
+    # a comma must sit between the two numbers of its line
+    if num_commas.any():
+        tokens_so_far = np.cumsum(tok_start)
+        comma_pos = np.flatnonzero(is_comma)
+        comma_line = np.searchsorted(line_end, comma_pos)
+        first_byte = line_start[comma_line]
+        tokens_before = tokens_so_far[comma_pos] - tokens_so_far[first_byte] + tok_start[first_byte]
+        is_edge[comma_line[tokens_before != 1]] = False
+
+    # numbers of more than 18 digits might not fit in an int64
+    starts = np.flatnonzero(tok_start)
+    lengths = np.flatnonzero(tok_end) + 1 - starts
+    token_line = np.repeat(np.arange(len(line_end)), num_tokens)
+    is_edge[token_line[lengths > 18]] = False
+
+    keep = is_edge[token_line]
+    starts = starts[keep]
+    lengths = lengths[keep]
+    values = np.zeros(len(starts), dtype=np.int64)
+    for k in range(int(lengths.max()) if len(lengths) else 0):
+        digit = buf[np.minimum(starts + k, len(buf) - 1)].astype(np.int64) - 48
+        values = np.where(lengths > k, values * 10 + digit, values)
+
+    edge_lines = np.flatnonzero(is_edge)
+    other_lines = np.flatnonzero(~is_edge & ~blank)
+    return values[0::2], values[1::2], edge_lines, other_lines, line_start, line_end
+
+
+def format_edge_lines(rows, cols):
+    """
+    Returns the bytes of the Matrix Market lines "row col 1", one for each
+    pair of entries of the int64 arrays rows and cols.
+    """
+    if len(rows) == 0:
+        return b""
+    if rows.min() < 0 or cols.min() < 0:
+        return "".join("{0} {1} 1\n".format(r, c) for r, c in zip(rows, cols)).encode()
+
+    # each line is first laid out in fixed width fields, with zero bytes in
+    # place of leading zeros, and the zero bytes are then squeezed out
+    def put_digits(out, values):
+        width = out.shape[1]
+        for j in range(width):
+            power = 10**(width - 1 - j)
+            digit = 48 + (values // power) % 10
+            if j < width - 1:
+                digit[values < power] = 0
+            out[:, j] = digit
+
+    row_width = len(str(rows.max()))
+    col_width = len(str(cols.max()))
+    out = np.empty((len(rows), row_width + col_width + 4), dtype=np.uint8)
+    put_digits(out[:, :row_width], rows)
+    out[:, row_width] = 32
+    put_digits(out[:, row_width+1:row_width+1+col_width], cols)
+    out[:, -3:] = (32, 49, 10)
+    out = out.ravel()
+    return out[out != 0].tobytes()
+
+
 def do_one_file(infp, outfp, infilename, outfilename, profile):
-    print("%%MatrixMarket matrix coordinate integer {0}".format(profile["mmio_type"]), file=outfp)
-    print("% Generated from input file: {0}".format(infilename), file=outfp)
+    """
+    Converts an edge list to Matrix Market format in a single pass.
+
+    The input is read from the binary file infp in blocks which are parsed
+    with numpy (parse_edge_block), and the edge processing of the profile is
+    applied with array masks.  Comment and skipped lines are written to the
+    binary file outfp as they are met, while the edge lines are spooled to a
+    temporary file in the output directory; the size line is written once
+    the edges have been counted, followed by the spooled edges.  Since the
+    input is never rewound it may be a pipe or a gzip stream.
+    """
+    outfp.write("%%MatrixMarket matrix coordinate integer {0}\n".format(profile["mmio_type"]).encode())
+    outfp.write("% Generated from input file: {0}\n".format(infilename).encode())
 
     num_edges = 0
     max_vertex = 0
-
-    pattern_two_nums = re.compile("([0-9]+)(?:[ \t]*,[ \t]*|[ \t]+)([0-9]+)")
-
-    for linenumber, line in enumerate(infp):
-        stripline = line.strip()
-        if stripline == "":
-            pass
-        elif stripline[0] == '#':
-            print("% [{0}] >>> {1}".format(linenumber+1, stripline), file=outfp)
-        elif stripline[0] == '%':
-            print("% [{0}] >>> {1}".format(linenumber+1, stripline), file=outfp)
-        else:
-            match_result = pattern_two_nums.fullmatch(stripline)
-            if match_result:
-                first_entry = int(match_result.group(1))
-                second_entry = int(match_result.group(2))
-                first_entry += profile["vertex_shift"]
-                second_entry += profile["vertex_shift"]
-                max_vertex = max(max_vertex, first_entry, second_entry)
-
-                if first_entry < second_entry:
-                    edge_proc = profile["up_edges"]
-                elif first_entry > second_entry:
-                    edge_proc = profile["down_edges"]
+    vertex_shift = profile["vertex_shift"]
+    up_code = edge_action_codes[profile["up_edges"]]
+    down_code = edge_action_codes[profile["down_edges"]]
+    self_code = edge_action_codes[profile["self_edges"]]
+    # number of output lines written for each action code
+    lines_per_action = np.array([1, 1, 2, 0, 0], dtype=np.int64)
+
+    spool_dir = os.path.dirname(os.path.abspath(outfilename))
+    with tempfile.TemporaryFile(dir=spool_dir) as spool:
+        lines_before = 0
+        for block in read_line_blocks(infp):
+            first, second, edge_lines, other_lines, line_start, line_end = parse_edge_block(block)
+            comments = []
+
+            def line_text(i):
+                return block[line_start[i]:line_end[i]].decode("utf-8", "replace").strip()
+
+            # the few lines the vectorized parser did not take
+            extra = []
+            for i in other_lines:
+                stripline = line_text(i)
+                if stripline == "":
+                    continue
+                if stripline[0] in "#%":
+                    comments.append((i, "% [{0}] >>> {1}".format(lines_before+i+1, stripline)))
+                    continue
+                match_result = pattern_two_nums.fullmatch(stripline)
+                if match_result:
+                    extra.append((i, int(match_result.group(1)), int(match_result.group(2))))
                 else:
-                    edge_proc = profile["self_edges"]
-
-                if edge_proc in ("Output", "Reverse"):
-                    num_edges += 1
-                elif edge_proc in ("Double"):
-                    num_edges += 2
-                elif edge_proc == "Skip":
-                    print("% [{0}] SKIP >>> {1}".format(linenumber+1, stripline), file=outfp)
-                elif edge_proc == "Fail":
-                    assert False, "Bad edge {0} {1} encountered; translation failed.".format(
-                            first_entry, second_entry )
-            else:
-                print("% [{0}] ??? >>> {1}".format(linenumber+1, stripline), file=outfp)
-
-    print("{0} {0} {1}".format(max_vertex, num_edges), file=outfp)
+                    comments.append((i, "% [{0}] ??? >>> {1}".format(lines_before+i+1, stripline)))
+            if extra:
+                # object arrays keep numbers too big for an int64 exact
+                # (an int array would become uint64 or float64)
+                edge_lines = np.concatenate((edge_lines, np.array([e[0] for e in extra], dtype=np.int64)))
+                first = np.concatenate((first, np.array([e[1] for e in extra], dtype=object)))
+                second = np.concatenate((second, np.array([e[2] for e in extra], dtype=object)))
+                order = np.argsort(edge_lines, kind="stable")
+                edge_lines, first, second = edge_lines[order], first[order], second[order]
+
+            if len(edge_lines) > 0:
+                first = first + vertex_shift
+                second = second + vertex_shift
+                max_vertex = max(max_vertex, first.max(), second.max())
+
+                action = np.where(first < second, up_code,
+                                  np.where(first > second, down_code, self_code))
+                failed = np.flatnonzero(action == edge_action_codes["Fail"])
+                assert len(failed) == 0, "Bad edge {0} {1} encountered; translation failed.".format(
+                        first[failed[0]], second[failed[0]] )
+                for j in np.flatnonzero(action == edge_action_codes["Skip"]):
+                    i = edge_lines[j]
+                    comments.append((i, "% [{0}] SKIP >>> {1}".format(lines_before+i+1, line_text(i))))
+
+                # each edge gives 0, 1 or 2 output lines; the second line
+                # of a Double edge is the reversed edge
+                edge = np.repeat(np.arange(len(action)), lines_per_action[action])
+                is_second = np.zeros(len(edge), dtype=bool)
+                is_second[1:] = (edge[1:] == edge[:-1])
+                swap = (action[edge] == edge_action_codes["Reverse"]) ^ is_second
+                rows = np.where(swap, second[edge], first[edge])
+                cols = np.where(swap, first[edge], second[edge])
+                num_edges += len(rows)
+                if rows.dtype == object:
+                    spool.write("".join("{0} {1} 1\n".format(r, c) for r, c in zip(rows, cols)).encode())
+                else:
+                    spool.write(format_edge_lines(rows, cols))
 
-    infp.seek(0)
-    for line in infp:
-        stripline = line.strip()
-        if stripline == "":
-            pass
-        elif stripline[0] == '#':
-            pass
-        elif stripline[0] == '%':
-            pass
-        else:
-            match_result = pattern_two_nums.fullmatch(stripline)
-            if match_result:
-                first_entry = int(match_result.group(1))
-                second_entry = int(match_result.group(2))
-                first_entry += profile["vertex_shift"]
-                second_entry += profile["vertex_shift"]
+            for i, comment in sorted(comments):
+                outfp.write(comment.encode() + b"\n")
+            lines_before += len(line_end)
 
-                if first_entry < second_entry:
-                    edge_proc = profile["up_edges"]
-                elif first_entry > second_entry:
-                    edge_proc = profile["down_edges"]
-                else:
-                    edge_proc = profile["self_edges"]
-
-                if edge_proc == "Output":
-                    print("{0} {1} 1".format(first_entry, second_entry), file=outfp)
-                elif edge_proc == "Reverse":
-                    print("{1} {0} 1".format(first_entry, second_entry), file=outfp)
-                elif edge_proc in ("Double"):
-                    print("{0} {1} 1".format(first_entry, second_entry), file=outfp)
-                    print("{1} {0} 1".format(first_entry, second_entry), file=outfp)
-                elif edge_proc == "Skip":
-                    pass
-                elif edge_proc == "Fail":
-                    assert False
-            else:
-                pass
+        outfp.write("{0} {0} {1}\n".format(max_vertex, num_edges).encode())
+        spool.seek(0)
+        shutil.copyfileobj(spool, outfp, 1 << 20)
 
 
 def scan_input_file(infp, infilename):
@@ -325,7 +480,7 @@ def execute_command(argstruct):
     infilename = argstruct.infile
     outfilename = argstruct.outfile
     try:
-        infp = open(infilename, "r")
+        infp = open_input_file(infilename, "rt" if argstruct.scan else "rb")
     except Exception as err:
         print("ERROR: Exception encountered while trying to open input file '{0}':".format(infilename))
         print(" ---> {0}".format(err))
@@ -336,7 +491,7 @@ def execute_command(argstruct):
                 scan_input_file(infp, infilename)
             else:
                 try:
-                    outfp = open(outfilename, "w")
+                    outfp = open(outfilename, "wb")
                 except Exception as err:
                     print("ERROR: Exception encountered while trying to open output file '{0}':".format(
                             outfilename ))
@@ -374,12 +529,19 @@ def expand_and_validate_args(argstruct):
 
     # Supply default outfilename if user did not supply one.
     if argstruct.outfile == None:
+        if argstruct.infile == "-":
+            print("ERROR: An output file name is required when reading standard input.")
+            print("PROGRAM TERMINATING!")
+            sys.exit(1)
         argstruct.defaulted_outfile = True
-        suffix_position = argstruct.infile.rfind('.')
+        infile = argstruct.infile
+        if infile.endswith(".gz"):
+            infile = infile[:-3]
+        suffix_position = infile.rfind('.')
         if suffix_position < 0:
-            argstruct.outfile = argstruct.infile + ".mmio"
+            argstruct.outfile = infile + ".mmio"
         else:
-            argstruct.outfile = argstruct.infile[:suffix_position] + ".mmio"
+            argstruct.outfile = infile[:suffix_position] + ".mmio"
     else:
         argstruct.defaulted_outfile = False
 
@@ -397,7 +559,7 @@ def expand_and_validate_args(argstruct):
 
 def run_from_main():
     parser = argparse.ArgumentParser(description="Convert Stanford SNAP data file to LARC mmio.")
-    parser.add_argument("infile", help="input file name")
+    parser.add_argument("infile", help="input file name (may end in .gz, or be - for standard input)")
     parser.add_argument("outfile", nargs="?", help="output file name")
     parser.add_argument("-f", "--force", action="store_true", help="overwrite existing output file")
     parser.add_argument("-q", "--quiet", action="store_true", help="supress informational messages")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCcontributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+
+"""
+This is a program to convert a Matrix Market (.mm) or tab separated (.tsv)
+graph file to the binary edge format that read_edge_file loads directly
+into the LARC matrix store (see MyPyLARC/src/edge_io.h). The vertices
+may be relabeled on the way (see MyPyLARC/src/vertex_order.py), in which
+case the relabeling is saved next to the output file as a numpy array
+with new_label[old vertex] = new vertex.
+"""
+
+import argparse
+import os
+import os.path
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src"))
+import edge_files
+import vertex_order
+
+
+def run_from_main():
+    parser = argparse.ArgumentParser(description="Convert a .mm or .tsv graph file to a LARC binary edge file.")
+    parser.add_argument("infile", help="input file name (may end in .gz)")
+    parser.add_argument("outfile", nargs="?", help="output file name (default: infile with suffix .edges)")
+    parser.add_argument("-f", "--force", action="store_true", help="overwrite existing output file")
+    parser.add_argument("-s", "--vertex-shift", type=int, default=-1,
+                        help="added to vertex numbers to make them start at 0 (default -1)")
+    parser.add_argument("-o", "--order", choices=vertex_order.VERTEX_ORDERINGS, default="none",
+                        help="relabel the vertices to improve LARC compression (default none)")
+    argstruct = parser.parse_args()
+
+    outfilename = argstruct.outfile
+    if outfilename == None:
+        base = argstruct.infile[:-3] if argstruct.infile.endswith(".gz") else argstruct.infile
+        suffix_position = base.rfind('.')
+        if suffix_position < 0:
+            outfilename = base + ".edges"
+        else:
+            outfilename = base[:suffix_position] + ".edges"
+    if os.path.exists(outfilename) and not argstruct.force:
+        print("ERROR: Output file '{0}' already exists.".format(outfilename))
+        print("Specify '--force' to overwrite output file.")
+        print("PROGRAM TERMINATING!")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    rows, cols, num_vertices = edge_files.edges_from_text(argstruct.infile, argstruct.vertex_shift)
+    if argstruct.order != "none":
+        new_label = vertex_order.vertex_ordering(rows, cols, num_vertices, argstruct.order)
+        rows, cols = vertex_order.relabel_edges(rows, cols, new_label)
+        np.save(outfilename + ".labels.npy", new_label)
+    num_edges = edge_files.write_edge_file(outfilename, rows, cols, num_vertices)
+    print("Wrote {0} edges on {1} vertices to '{2}' in {3:.3f} seconds.".format(
+            num_edges, num_vertices, outfilename, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    run_from_main()
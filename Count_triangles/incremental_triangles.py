@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+ #*################################################################
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCcontributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*################################################################
+
+from __future__ import print_function, division
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import numpy as np
+import time
+
+## \file incremental_triangles.py
+#
+#  \brief Keeps a triangle count up to date as edges are added to a graph.
+#
+# Instead of recomputing trace(A^3) for every snapshot of a growing graph,
+# IncrementalTriangleCounter holds A and B = A^2 in the matrix store and
+# applies each batch of new edges as a 0/1 matrix D (built in one call by
+# edges_to_pID). Since the trace is invariant under cyclic shifts,
+#     trace((A+D)^3) = trace(A^3) + 3 trace(A^2 D) + 3 trace(A D^2)
+#                      + trace(D^3),
+# so the count changes by a few trace_of_product calls on the sparse D and
+# D^2, and A^2 is brought up to date as (A+D)^2 = A^2 + AD + DA + D^2.
+#
+# Run as a program it streams a graph into the counter in batches:
+#     python incremental_triangles.py data_path batch_size [initial_fraction]
+#
+
+
+##
+# \brief Returns the value of trace(X Y) as a Python integer
+def _trace_product_value(X_ID, Y_ID):
+    value = mypy.get_scalar_value_string(mypy.trace_of_product(X_ID, Y_ID))
+    try:
+        return int(value)
+    except ValueError:
+        # non-integer scalarTypes print e.g. "6.000000"
+        return int(round(float(value)))
+
+
+##
+# \brief The triangle count of an undirected graph that grows by batches
+#
+# The adjacency matrix A and its square B are held, so that cleaning the
+# matrix store between batches (clean()) keeps them. The graph is kept
+# simple: edges are made symmetric, and self loops and edges already in A
+# are dropped before the update.
+class IncrementalTriangleCounter(object):
+
+    ##
+    # \brief Builds the counter for an initial graph
+    #
+    # \param level The row and column level of the adjacency matrix
+    # \param rows Row indices of the initial edges (default: no edges)
+    # \param cols Column indices of the initial edges
+    def __init__(self, level, rows=(), cols=()):
+        self.level = level
+        rows, cols = self._symmetric_edges(rows, cols)
+        self.A_ID = mypy.edges_to_pID(rows, cols, level)
+        self.B_ID = mypy.matrix_mult(self.A_ID, self.A_ID)
+        mypy.set_hold_matrix(self.A_ID)
+        mypy.set_hold_matrix(self.B_ID)
+        # six times the number of triangles, as trace(A^3)
+        self.trace_A3 = _trace_product_value(self.A_ID, self.B_ID)
+        self.num_edges = len(rows)
+
+    ## \brief The number of triangles in the graph
+    @property
+    def triangles(self):
+        return self.trace_A3 // 6
+
+    ##
+    # \brief Returns the edges in both directions, without loops or repeats
+    def _symmetric_edges(self, rows, cols):
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        keep = rows != cols
+        rows, cols = rows[keep], cols[keep]
+        both_rows = np.concatenate((rows, cols))
+        both_cols = np.concatenate((cols, rows))
+        # sort on (row, col) pairs rather than packed keys, which would
+        # overflow int64 for levels of 32 and above
+        order = np.lexsort((both_cols, both_rows))
+        both_rows, both_cols = both_rows[order], both_cols[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = ((both_rows[1:] != both_rows[:-1])
+                     | (both_cols[1:] != both_cols[:-1]))
+        return both_rows[first], both_cols[first]
+
+    ##
+    # \brief Adds a batch of edges and updates the triangle count
+    #
+    # \param rows Row indices of the new edges (either direction will do)
+    # \param cols Column indices of the new edges
+    # \return The number of triangles the batch created
+    def add_edges(self, rows, cols):
+        rows, cols = self._symmetric_edges(rows, cols)
+        if len(rows) and self.num_edges:
+            new = mypy.gather(self.A_ID, rows, cols) == 0
+            rows, cols = rows[new], cols[new]
+        if len(rows) == 0:
+            return 0
+
+        D_ID = mypy.edges_to_pID(rows, cols, self.level)
+        D2_ID = mypy.matrix_mult(D_ID, D_ID)
+        delta = (3 * _trace_product_value(self.B_ID, D_ID)
+                 + 3 * _trace_product_value(self.A_ID, D2_ID)
+                 + _trace_product_value(D_ID, D2_ID))
+
+        A_ID = mypy.matrix_add(self.A_ID, D_ID)
+        cross_ID = mypy.matrix_add(mypy.matrix_mult(self.A_ID, D_ID),
+                                   mypy.matrix_mult(D_ID, self.A_ID))
+        B_ID = mypy.matrix_add(mypy.matrix_add(self.B_ID, cross_ID), D2_ID)
+        mypy.set_hold_matrix(A_ID)
+        mypy.set_hold_matrix(B_ID)
+        mypy.release_hold_matrix(self.A_ID)
+        mypy.release_hold_matrix(self.B_ID)
+        self.A_ID, self.B_ID = A_ID, B_ID
+
+        self.trace_A3 += delta
+        self.num_edges += len(rows)
+        return delta // 6
+
+    ##
+    # \brief Removes everything but the held A and A^2 from the matrix store
+    def clean(self):
+        mypy.clean_matrix_storage()
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python incremental_triangles.py data_path batch_size [initial_fraction]")
+        print("  data_path:  a .mm or .tsv graph file, or a .edges file")
+        print("  batch_size:  the number of edges added at a time")
+        print("  initial_fraction:  the part of the edges in the first graph (default 0.5)")
+        sys.exit(1)
+    data_path = sys.argv[1]
+    batch_size = int(sys.argv[2])
+    initial_fraction = float(sys.argv[3]) if len(sys.argv) == 4 else 0.5
+
+    if data_path.endswith(".edges"):
+        rows, cols, num_vertices = mypy.edge_arrays_from_file(data_path)
+    else:
+        rows, cols, num_vertices = mypy.edges_from_text(data_path)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    # add the edges in a random order, as a stream would
+    order = np.random.default_rng(0).permutation(len(rows))
+    rows, cols = rows[order], cols[order]
+
+    plan, report = mypy.plan_init_params(num_vertices, len(rows))
+    mypy.initialize_larc(plan['matrix_exponent'], plan['op_exponent'],
+                         plan['max_level'], plan['regionbitparam'],
+                         plan['zeroregionbitparam'], 0)
+
+    start = time.perf_counter()
+    initial = int(initial_fraction * len(rows))
+    counter = IncrementalTriangleCounter(plan['max_level'], rows[:initial],
+                                         cols[:initial])
+    print("%10s %12s %12s %10s" %("edges", "triangles", "new", "seconds"))
+    print("%10d %12d %12s %10.3f" %(counter.num_edges // 2, counter.triangles,
+          "-", time.perf_counter() - start))
+    for first in range(initial, len(rows), batch_size):
+        start = time.perf_counter()
+        new = counter.add_edges(rows[first:first+batch_size],
+                                cols[first:first+batch_size])
+        counter.clean()
+        print("%10d %12d %12d %10.3f" %(counter.num_edges // 2,
+              counter.triangles, new, time.perf_counter() - start))
@@ -255,3 +255,8 @@ if __name__ == '__main__':
     mypy.print_naive(mm_ID)
     print("\n")
 
+    # the parallel reader must give the same matrix
+    for num_threads in [1, 2, 4]:
+        par_ID = mypy.read_matrixMarket_parallel("data/test1.mm", -1, num_threads)
+        print("read_matrixMarket_parallel with %d threads agrees: %s"
+              %(num_threads, par_ID == mm_ID))
@@ -78,7 +78,9 @@ if __name__ == '__main__':
     currTime = startTime
 
     if 5 == len(sys.argv):
-        max_level = int(sys.argv[1]) 
+        # max_level 'auto' lets store_planner choose all the parameters
+        plan_params = (sys.argv[1] == 'auto')
+        max_level = -1 if plan_params else int(sys.argv[1])
         verbose = int(sys.argv[2])
         LARC_verbose = int(sys.argv[3])
         data_path = sys.argv[4]
@@ -87,9 +89,12 @@ if __name__ == '__main__':
         print("\nThis program requires three commandline integer inputs")
         print("and a path to a matrix market data file in sparse format:")
         print("   max_level:  matrices will be up to (2**max_level)^2 size")
+        print("               ('auto' plans the level and table sizes from the")
+        print("               graph and the available memory).")
         print("   verbose:  the verbosity level for this program")
         print("   LARC_verbose:  the verbosity level for the LARC package")
-        print("   data_path:  the path to the matrix market data file.")
+        print("   data_path:  the path to the matrix market data file")
+        print("               (or a binary .edges file from convert_to_edges.py).")
         mypy.explain_verbosity()
         print("\nSample Usage:")
         print("  python triangle_counter.py 3 2 0 data/test1.mm")
@@ -105,7 +110,7 @@ if __name__ == '__main__':
         sys.exit()
 
 
-    if (verbose > 1):
+    if (verbose > 1) and not plan_params:
         dim = 2**max_level
         print("\nmax_level=%d: Program will use %d by %d matrices."
               %(max_level,dim,dim))
@@ -123,7 +128,7 @@ if __name__ == '__main__':
     if (verbose > 1):
         print("\nThis code counts the number of triangles in a graph")
         print("from the adjacency matrix, by taking the trace of")
-        print("the third power of the matrix.")
+        print("the third power of the matrix (without computing it).")
 
 
     #*######################
@@ -153,7 +158,9 @@ if __name__ == '__main__':
         print("We will use this to select which computing_env to read from parameter file.")
         print("You could write code to select computing_env automatically.")
 
-    if (memory_available > 200):
+    if plan_params:
+        computing_env = 'auto'
+    elif (memory_available > 200):
         if (verbose > 0):
             print("\nThis memory is more than 200 GiB\n")
         computing_env = 'large'
@@ -191,27 +198,39 @@ if __name__ == '__main__':
     # computing_env = "large"    
     
     # read the parameter file into a python dictionary
-    with open('../InitParams/count_triangles.init_params','r') as init_file:
-        init_param = json.load(init_file)
-        for p in init_param[computing_env]:
-            if (verbose > 1):
-                print('MatrixExponent: %d' %(p['matrix_exponent']))
-                print('OpExponent: %d' %(p['op_exponent']))
-                print('MaxLevel: %d' %(p['max_level']))
-                print('RegionBitParam: %d' %(p['regionbitparam']))
-                print('ZeroRegionBitParam: %d' %(p['zeroregionbitparam']))
-                print('ReportIntervalSecs: %d' %(p['report_interval_seconds']))
-                print('MinMemRequiredGiB: %d' %(p['min_memGiB_required']))
-                print('Verbose: %d' %(p['verbose']))
-                print('')
-            matrix_exponent = p['matrix_exponent']
-            op_exponent = p['op_exponent']
-            p_max_level= p['max_level']
-            regionbitparam = p['regionbitparam']
-            zeroregionbitparam = p['zeroregionbitparam']
-            report_interval_seconds = p['report_interval_seconds']
-            min_memGiB_required = p['min_memGiB_required']
-            p_verbose = p['verbose']
+    if plan_params:
+        dimension, nnz = mypy.graph_statistics(data_path)
+        plan, plan_report = mypy.plan_init_params(dimension, nnz,
+                                                  memory_available)
+        init_param = {computing_env: [plan]}
+        if (verbose > 0):
+            print("Planned for %d vertices and %d nonzeros: about %d matrices, %.2f GiB"
+                  %(dimension, nnz, plan_report['predicted_matrix_entries'],
+                    plan_report['predicted_GiB']))
+        if not plan_report['fits']:
+            print("WARN: the planned tables may not fit in the available memory.")
+    else:
+        with open('../InitParams/count_triangles.init_params','r') as init_file:
+            init_param = json.load(init_file)
+    for p in init_param[computing_env]:
+        if (verbose > 1):
+            print('MatrixExponent: %d' %(p['matrix_exponent']))
+            print('OpExponent: %d' %(p['op_exponent']))
+            print('MaxLevel: %d' %(p['max_level']))
+            print('RegionBitParam: %d' %(p['regionbitparam']))
+            print('ZeroRegionBitParam: %d' %(p['zeroregionbitparam']))
+            print('ReportIntervalSecs: %d' %(p['report_interval_seconds']))
+            print('MinMemRequiredGiB: %d' %(p['min_memGiB_required']))
+            print('Verbose: %d' %(p['verbose']))
+            print('')
+        matrix_exponent = p['matrix_exponent']
+        op_exponent = p['op_exponent']
+        p_max_level= p['max_level']
+        regionbitparam = p['regionbitparam']
+        zeroregionbitparam = p['zeroregionbitparam']
+        report_interval_seconds = p['report_interval_seconds']
+        min_memGiB_required = p['min_memGiB_required']
+        p_verbose = p['verbose']
 
     # warn if the commandline value for LARC_verbose differs from p_verbose
     # warn if the commandline value for max_level differs from p_max_level
@@ -279,63 +298,70 @@ if __name__ == '__main__':
     # This file has level 16 so if the initialization max_level is not
     # 2 it will crash:
     # print("WARNING: About to read level 16 matrix.")
-    A_ID = mypy.read_matrixMarketExchange_file(data_path)
+    if data_path.endswith(".edges"):
+        # binary edge file written by convert_to_edges.py
+        A_ID = mypy.read_edge_file(data_path, -1)
+    else:
+        # parse and build the matrix with one thread per CPU
+        A_ID = mypy.read_matrixMarket_parallel(data_path, -1, 0)
+        if mypy.matrix_is_invalid(A_ID):
+            # e.g. complex entries, which only the serial reader handles
+            A_ID = mypy.read_matrixMarketExchange_file(data_path)
     print("Read %s and assigned the matrix MatrixID" %data_path)
     print(A_ID)
-    size_A = mypy.fprint_larcMatrixFile(
-        A_ID,"amat")
+    size_A = mypy.count_unique_nodes(A_ID)
     print("The LARCsize of this matrix is ", size_A)
+    if print_naive:
+        print("The adjacency matrix is:\n")
+        mypy.print_naive(A_ID)
+        print("\n")
 
     nextTime = time.process_time()
     print("Time to read in matrix: %g seconds" %(nextTime-currTime))
     currTime = nextTime
-    
-    # A_str = [0, 1, 0, 1, 1, 0, 1, 1, 0, 1, 0, 0, 1, 1, 0, 0]
-    # A_arr = mypy.map_to_str(A_str,scalarTypeStr)
-
-    # dim_whole = 2**level
 
-    # creating or finding the matrix associated with the array
-    # A_ID = mypy.row_major_list_to_store(A_arr, level, level, dim_whole)
-    # print("The adjacency matrix is:\n")
-    # mypy.print_naive(A_ID)
-    # print("\n")
-
-    B_ID = mypy.matrix_mult(A_ID,A_ID)
-    print("The adjacency matrix squared is:\n")
-    mypy.print_naive(B_ID)
-    print("\n")
-    size_B = mypy.fprint_larcMatrixFile(
-        B_ID,"bmat")
-    print("The LARCsize of this matrix is ", size_B)
+    # A^3 is the largest and least compressible matrix of the calculation,
+    # so it is never built: trace(A^3) is found as trace(A*B) with B = A^2,
+    # summing trace(A_ij*B_ji) over quadrants.  It is also the sum of the
+    # entries of (A*A) o A, which does not build A^2 either; that second
+    # full recursion is only run as a cross-check when verbose > 1.
+    B_ID = mypy.counted_matrix_mult(A_ID,A_ID)
+    size_B = mypy.count_unique_nodes(B_ID)
+    print("The LARCsize of the adjacency matrix squared is ", size_B)
+    if print_naive:
+        print("The adjacency matrix squared is:\n")
+        mypy.print_naive(B_ID)
+        print("\n")
     nextTime = time.process_time()
-    print("Time for first matrix multiply: %g seconds" %(nextTime-currTime))
+    print("Time for matrix multiply: %g seconds" %(nextTime-currTime))
     currTime = nextTime
 
-    C_ID = mypy.matrix_mult(A_ID,B_ID)
-    print("The adjacency matrix to the third power is:\n")
-    mypy.print_naive(C_ID)
+    traceStr = mypy.get_scalar_value_string(mypy.trace_of_product(A_ID,B_ID))
+    print("The trace of the adjacency matrix to the third power is:\n")
+    print(traceStr)
     print("\n")
-    size_C = mypy.fprint_larcMatrixFile(
-        C_ID,"cmat")
-    print("The LARCsize of this matrix is ", size_C)
     nextTime = time.process_time()
-    print("Time for second matrix multiply: %g seconds" %(nextTime-currTime))
+    print("Time for trace of A times A^2: %g seconds" %(nextTime-currTime))
     currTime = nextTime
 
-    traceStr = mypy.traceID(C_ID)
-    print("The trace of the adjacency matrix to the third power is:\n")
-    print(traceStr)
-    print("\n")
+    maskedStr = None
+    if (verbose > 1):
+        maskedStr = mypy.get_scalar_value_string(mypy.masked_product_sum(A_ID,A_ID,A_ID))
+        print("The sum of the entries of (A*A) o A is:\n")
+        print(maskedStr)
+        print("\n")
+        nextTime = time.process_time()
+        print("Time for masked sum of (A*A) o A: %g seconds" %(nextTime-currTime))
+        currTime = nextTime
 
     if (scalarTypeStr in ('Integer','Real','MPInteger','MPReal','MPRational')):
         num_triangles = int(float(traceStr)) // 6
         print("The number of triangles is %d\n" %num_triangles)
+        if (maskedStr is not None) and (int(float(maskedStr)) != int(float(traceStr))):
+            print("WARNING: the masked sum differs from the trace; is the graph undirected?\n")
     else:
         print("Divide this number by 6 to get the number of triangles:\n")
 
-    nextTime = time.process_time()
-    print("Time for trace/division: %g seconds" %(nextTime-currTime))
     print("Total time for calculation: %g seconds" %(nextTime-startTime))
     
 
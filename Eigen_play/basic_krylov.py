@@ -280,6 +280,11 @@ if __name__ == '__main__':
     vIDvec = [-1]*savedIDs
     vIDvec[0] = invec
 
+    # every vector of the Krylov sequence is used again when rows are added
+    # to A, so they are kept as roots while the matrix store is cleaned
+    mypy.add_root(invec)
+    store_gc = mypy.StoreGC(occupancy=0.75, verbose=(verbose > 1))
+
     normID = mypy.normID(invec,mypy.L_2)
     print('norm of invec is ',
         mypy.get_readableString_scalar_from_pID_and_coords(normID,0,0))
@@ -308,10 +313,12 @@ if __name__ == '__main__':
         print("\nStarting power method loop!")
         for counter in range(1,savedIDs):
             print("counter = ",counter)
+            store_gc.maybe_collect()
     
             # multiply by power method matrices to get next vector
             v_temp_ID = mypy.matrix_mult(powMatrix,vIDvec[counter-1])
             vIDvec[counter] = v_temp_ID
+            mypy.add_root(v_temp_ID)
 #            print("created vIDvec[",counter,"]")
             if mypy.matrix_is_zero(vIDvec[counter]):
                 print("\tpower method produced zero vector!")
@@ -323,10 +330,10 @@ if __name__ == '__main__':
 #                mypy.get_readableString_scalar_from_pID_and_coords(normID,0,0))
 
             # get numpy col vector of dimension counter-1 containing mpf data
-            z_ID = [mypy.get_scalarID_from_pID_and_coords(vIDvec[counter],
-                r_index[i],0) for i in range(counter)]
-            z_str = [mypy.get_readableString_scalar_from_pID_and_coords(z_ID[i],
-                0, 0) for i in range(counter)]
+            z_ID = mypy.gather(vIDvec[counter], r_index[:counter], 0,
+                ids=True)
+            z_str = [mypy.get_readableString_scalar_from_pID_and_coords(
+                int(z_ID[i]), 0, 0) for i in range(counter)]
             np_cvec = np.matrix([[mpmath.mpmathify(z_str[i])]
                 for i in range(counter)])
     #        print("np_cvec = ",np_cvec)
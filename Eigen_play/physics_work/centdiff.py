@@ -106,6 +106,8 @@ def recursive_build_central_diff_matrix(level):
     return diagID, rodID, lodID
 
 ## \brief builds a matrix which approximates the second derivative
+#  (kept in the matrix cache when one is set, see matrix_cache.py)
+@mypy.cached_matrix()
 def build_central_diff_matrix(level, deltaX):
     """
     This routine returns a specific tridiagonal matrix which is the matrix
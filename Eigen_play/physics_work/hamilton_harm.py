@@ -196,3 +196,7 @@ if __name__ == '__main__':
 
     mypy.fprint_larcMatrixFile(invHamID,
          "Data/invertHarmonic_L" + str(level) + "_xmax" + str(xmax) + ".json")
+    # binary copy for power_ham.py, which load_matrix prefers to the json
+    mypy.save_matrix(invHamID,
+         "Data/invertHarmonic_L" + str(level) + "_xmax" + str(xmax) + ".lmb",
+         info_names=("OTHERINFO", "OTHERMATRIX", "COMMENT"))
@@ -237,4 +237,8 @@ if __name__ == '__main__':
     # write the matrix to disk
     mypy.fprint_larcMatrixFile(invHamID,
          "Data/invertMorse_L" + str(level) + "_rmax" + str(rmax) + ".json")
+    # binary copy for power_ham.py, which load_matrix prefers to the json
+    mypy.save_matrix(invHamID,
+         "Data/invertMorse_L" + str(level) + "_rmax" + str(rmax) + ".lmb",
+         info_names=("OTHERINFO", "OTHERMATRIX", "COMMENT"))
 
@@ -101,7 +101,8 @@ if __name__ == '__main__':
         print("   verbose:  the verbosity level for this program")
         print("   LARC_verbose:  the verbosity level for the LARC package")
         print("   input_filename: an inverted Hamiltonian matrix, stored")
-        print("       in LARCMatrix (json) format")
+        print("       in LARCMatrix (json) format; a newer binary .lmb copy")
+        print("       beside it is read instead")
         print("   output_filename: the eigenvector found by this routine")
         print("       (list of 2**level values)")
         print("\nSample Usage:")
@@ -238,7 +239,7 @@ if __name__ == '__main__':
     #* read in inverted Hamiltonian matrix *#
     #*#####################################*#
 
-    invHamID = mypy.read_larcMatrixFile(input_filename)
+    invHamID = mypy.load_matrix(input_filename)
     adjustEigStr = mypy.info_get(mypy.OTHERMATRIX,invHamID)
     print("the adjustment value is %s" %adjustEigStr)
     adjustEigID = mypy.get_valID_from_valString(adjustEigStr)
@@ -306,7 +307,17 @@ if __name__ == '__main__':
     # MARK claims: v_norm decreasing is also a stopping condition
 
     loop_hash_table = set()
-    
+
+    # clean the matrix store as the loop runs, keeping the matrix, the last
+    # gc_history vectors (so that a cycle among them is still detected by
+    # comparing matrixIDs), the current maximal element and the vectors in
+    # loop_hash_table as roots
+    gc_history = 64
+    mypy.add_root(invHamID)
+    recent_vectors = mypy.RecentRoots(gc_history)
+    recent_vectors.push(v_new_ID)
+    max_element = mypy.RecentRoots(1)
+    store_gc = mypy.StoreGC(occupancy=0.75, verbose=(verbose > 1))
 
     print("\nStarting power method loop!")
     #while (v_old_ID != v_new_ID): # (v_old_ID = v_new_ID) converged  
@@ -334,6 +345,8 @@ if __name__ == '__main__':
             norm_ID = mypy.normID(v_temp_ID,mypy.L_2)
             v_new_ID = mypy.scalar_divide(v_temp_ID,norm_ID)
             maxEl_ID = mypy.scalar_divide(one_ID,norm_ID)
+        recent_vectors.push(v_new_ID)
+        max_element.push(maxEl_ID)
             
         # print("The normalized vector has ID %d\n" %normalizedID1)
         # mypy.print_naive(normalizedID1)
@@ -350,6 +363,7 @@ if __name__ == '__main__':
                 print("\n\tnew is %d, old is %d" %(v_new_ID,v_old_ID))
                 print("\tadding ID %d to hash table" %v_new_ID)
                 loop_hash_table.add(v_new_ID)
+                mypy.add_root(v_new_ID)
         counter += 1
         if (counter%1000 == 0):
             evalue_str = mypy.get_scalar_value_string(eval_ID)
@@ -361,9 +375,15 @@ if __name__ == '__main__':
             # print("The ID for v_new is %d and it is" %v_new_ID)
             # mypy.print_naive(v_new_ID)
             print("The ID for v_new is %d" %v_new_ID)
+        # everything but the roots may now be removed
+        store_gc.maybe_collect()
 
     print("After loop the counter is %d, the eigenvalue is %s"
           %(counter,evalue_str))
+    if (verbose > 1):
+        print("The matrix store was cleaned %d times, freeing %d matrices in %g seconds"
+              %(store_gc.stats['collections'], store_gc.stats['matrices_freed'],
+                store_gc.stats['pause_seconds']))
     print("and the eigenvector is")
     mypy.print_naive(v_new_ID)
 
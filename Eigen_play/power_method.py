@@ -566,34 +566,46 @@ if __name__ == '__main__':
     # MARK claims: v_norm decreasing is also a stopping condition
 
     loop_hash_table = set()
-    
+
+    # clean the matrix store as the loop runs, keeping the matrix, the last
+    # gc_history vectors (so that a cycle among them is still detected by
+    # comparing matrixIDs), the current maximal element and the vectors in
+    # loop_hash_table as roots
+    gc_history = 64
+    mypy.add_root(E_ID)
+    recent_vectors = mypy.RecentRoots(gc_history)
+    recent_vectors.push(v_new_ID)
+    max_element = mypy.RecentRoots(1)
+    store_gc = mypy.StoreGC(occupancy=0.75, verbose=(verbose > 1))
 
     print("\nStarting power method loop!")
     #while (v_old_ID != v_new_ID): # (v_old_ID = v_new_ID) converged  
     while (1):
         v_old_ID = v_new_ID
         old_maxEl_ID = maxEl_ID
-        v_unnorm_ID = mypy.matrix_mult(E_ID,v_old_ID)
+        v_unnorm_ID = mypy.counted_matrix_mult(E_ID,v_old_ID)
         maxEl_ID = mypy.matrix_element_with_maxNorm(v_unnorm_ID)
         # eventually, the eigenvalue will be given by the ratio
         # of the new maximum ID element and the old maximum ID element
-        eval_ID = mypy.scalar_divide(maxEl_ID,old_maxEl_ID)
+        eval_ID = mypy.counted_scalar_divide(maxEl_ID,old_maxEl_ID)
         if (maxnorm):
             # dividing by the element with maximal norm makes the
             # value of this element in the vector equal to 1.0
             # (+ 0.0i if complex); it remains maximal
-            v_new_ID = mypy.scalar_divide(v_unnorm_ID, maxEl_ID)
+            v_new_ID = mypy.counted_scalar_divide(v_unnorm_ID, maxEl_ID)
             # when using l\infty norm, the vector is now normalized
             maxEl_ID = one_ID
         else:
             # dividing by the element with maximal norm makes the
             # value of this element in the vector equal to 1.0
             # (+ 0.0i if complex); it remains maximal
-            v_temp_ID = mypy.scalar_divide(v_unnorm_ID, maxEl_ID)
+            v_temp_ID = mypy.counted_scalar_divide(v_unnorm_ID, maxEl_ID)
             # when using l2 norm, we still need to normalize
             norm_ID = mypy.normID(v_temp_ID,mypy.L_2)
-            v_new_ID = mypy.scalar_divide(v_temp_ID,norm_ID)
-            maxEl_ID = mypy.scalar_divide(one_ID,norm_ID)
+            v_new_ID = mypy.counted_scalar_divide(v_temp_ID,norm_ID)
+            maxEl_ID = mypy.counted_scalar_divide(one_ID,norm_ID)
+        recent_vectors.push(v_new_ID)
+        max_element.push(maxEl_ID)
             
         # print("The normalized vector has ID %d\n" %normalizedID1)
         # mypy.print_naive(normalizedID1)
@@ -610,6 +622,7 @@ if __name__ == '__main__':
                 print("\n\tnew is %d, old is %d" %(v_new_ID,v_old_ID))
                 print("\tadding ID %d to hash table" %v_new_ID)
                 loop_hash_table.add(v_new_ID)
+                mypy.add_root(v_new_ID)
         counter += 1
         if (1): #counter%100 == 0):
             evalue_str = mypy.get_scalar_value_string(eval_ID)
@@ -619,13 +632,20 @@ if __name__ == '__main__':
             # mypy.print_naive(v_old_ID)
             print("The IDs for v_new is %d and it is" %v_new_ID)
             mypy.print_naive(v_new_ID)
+        # everything but the roots may now be removed
+        store_gc.maybe_collect()
 
     print("After loop the counter is %d, the eigenvalue is %s"
           %(counter,evalue_str))
+    if (verbose > 1):
+        print("The matrix store was cleaned %d times, freeing %d matrices in %g seconds"
+              %(store_gc.stats['collections'], store_gc.stats['matrices_freed'],
+                store_gc.stats['pause_seconds']))
+        print(mypy.larc_op_counter_array())
     print("and the eigenvector is")
     mypy.print_naive(v_new_ID)
 
-    v_diff_ID = mypy.matrix_diff(v_new_ID,v_old_ID)
+    v_diff_ID = mypy.counted_matrix_diff(v_new_ID,v_old_ID)
 #    v_diff_norm_str = chosen_norm(v_diff_ID)
     v_diff_norm_ID = mypy.normID(v_diff_ID,chosen_norm)
     v_diff_norm_str = mypy.traceID(v_diff_norm_ID)
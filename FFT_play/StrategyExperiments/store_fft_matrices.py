@@ -65,6 +65,13 @@ import numpy as np
 import random
 from pathlib import Path
 
+# the FFT factors are kept in the matrix cache when one is set
+# (see src/matrix_cache.py)
+create_invShufMat = mypy.cached_matrix(name="create_invShufMat")(
+    mypy.create_invShufMat)
+create_FFT_CMat = mypy.cached_matrix(name="create_FFT_CMat")(
+    mypy.create_FFT_CMat)
+
 
 if __name__ == '__main__':
 
@@ -334,13 +341,16 @@ if __name__ == '__main__':
     #*################################################
     path_matrices = "MatricesDFT/Level"+str(level)
     Path(path_matrices).mkdir(parents=True,exist_ok=True)
+    # every matrix written below is also put in one archive, in which the
+    # subtrees the matrices share are stored once
+    archive_matrices = {}
         
     #*##############################################
     #* write out the Ism, inverse shuffle matrices #*
     #*##############################################
     Ism = [0]*vlen
     for i in range(vlen):
-        Ism[i] = mypy.create_invShufMat(i)
+        Ism[i] = create_invShufMat(i)
     # Ism_size = mypy.fprint_larcMatrixFile(
     #           Ism[level],path_matrices+"/ISM_"+str(level))
     # print("LARCsize of the largest inverse shuffle matrix is %d\n" %Ism_size)
@@ -358,6 +368,7 @@ if __name__ == '__main__':
                expand_Ism[i],path_matrices+"/expandISM_"+str(i))
         expand_Ism_size = mypy.fprint_larcMatrixFile(
                expand_Ism[i],path_matrices+"/expandISM_"+str(i))
+        archive_matrices["expandISM_"+str(i)] = expand_Ism[i]
         print("expand_Ism[%d] has LARCsize %d, matrixID %d"
           %(i,expand_Ism_size,expand_Ism[i]))
     print("");
@@ -368,10 +379,14 @@ if __name__ == '__main__':
     #*###############################################
     if (use_Pbar == 1):
         prod_Ism = Iden[level]
-        for i in range(2,vlen):
-            prod_Ism = mypy.matrix_mult(prod_Ism,expand_Ism[i])
+        if (vlen > 2):
+            prod_Ism, chain_report = mypy.chain_product(expand_Ism[2:vlen])
+            print("prod_Ism product tree %s, peak matrices in store %d"
+                  %(chain_report['tree_string'],
+                    chain_report['peak_matrices_in_store']))
         prod_Ism_size = mypy.fprint_larcMatrixFile(
             prod_Ism,path_matrices+"/prodISM_"+str(level))
+        archive_matrices["prodISM_"+str(level)] = prod_Ism
         print("prod_Ism_%d has LARCsize %d, matrixID is %d"
               %(level,prod_Ism_size,prod_Ism))
         print("");
@@ -382,7 +397,7 @@ if __name__ == '__main__':
     #*###############################
     Cmat = [0]*vlen
     for i in range(1,vlen):
-        Cmat[i] = mypy.create_FFT_CMat(i)
+        Cmat[i] = create_FFT_CMat(i)
 #        Cmat_size = mypy.fprint_larcMatrixFile(
 #            Cmat[i],path_matrices+"/CMAT_"+str(i))
 #        print("LARCsize of the C matrix of level %d is %d, matrixID is %d"
@@ -400,6 +415,7 @@ if __name__ == '__main__':
         expand_C[i]=mypy.kronecker_product(Iden[i],Cmat[level-i])
         expand_C_size = mypy.fprint_larcMatrixFile(
             expand_C[i],path_matrices+"/expandC_"+str(i))
+        archive_matrices["expandC_"+str(i)] = expand_C[i]
         print("LARCsize of %i-th expand_C matrix is %d, matrixID is %d"
               %(i,expand_C_size,expand_C[i]))
     print("\n")
@@ -411,12 +427,14 @@ if __name__ == '__main__':
     #*###############################################
     if (use_Cbar == 1):
         prod_C = Iden[level]
-        for i in range(level):
-            print("input to multiplication are matrices: %d %d"
-                  %(prod_C,expand_C[i]))
-            prod_C = mypy.matrix_mult(prod_C,expand_C[i])
+        if (level > 0):
+            prod_C, chain_report = mypy.chain_product(expand_C[0:level])
+            print("prod_C product tree %s, peak matrices in store %d"
+                  %(chain_report['tree_string'],
+                    chain_report['peak_matrices_in_store']))
         prod_C_size = mypy.fprint_larcMatrixFile(
             prod_C,path_matrices+"/prodC_"+str(level))
+        archive_matrices["prodC_"+str(level)] = prod_C
         print("LARCsize of the prod_C_%d matrix is %d, has matID %d"
             %(level,prod_C_size,prod_C))
         print("\n")
@@ -433,6 +451,7 @@ if __name__ == '__main__':
         DFT_stages = mypy.matrix_mult(DFT_stages,expand_C[i])
         DFT_stages_size = mypy.fprint_larcMatrixFile(
             DFT_stages,path_matrices+"/DFT_stages_Cportion"+str(i))
+        archive_matrices["DFT_stages_Cportion"+str(i)] = DFT_stages
         print("partial DFT matrix C_stage %d has LARCsize %d, and matID %d"
               %(i,DFT_stages_size,DFT_stages))
     print("\n")
@@ -441,10 +460,16 @@ if __name__ == '__main__':
         DFT_stages =mypy.matrix_mult(DFT_stages,expand_Ism[i])
         DFT_stages_size = mypy.fprint_larcMatrixFile(
             DFT_stages,path_matrices+"/DFT_stages_IsmPortion_"+str(i))
+        archive_matrices["DFT_stages_IsmPortion_"+str(i)] = DFT_stages
         print("partial DFT matrix Ism_stage %d has LARCsize %d, and matID %d"
               %(i,DFT_stages_size,DFT_stages))
     print("");
 
+    archive_size = mypy.save_matrix_archive(
+        path_matrices+"/fft_matrices"+mypy.ARCHIVE_SUFFIX, archive_matrices)
+    print("archive of %d matrices holds %d distinct submatrices"
+          %(len(archive_matrices),archive_size))
+
   
 
 # YOU ARE HERE
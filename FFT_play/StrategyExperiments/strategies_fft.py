@@ -332,6 +332,8 @@ if __name__ == '__main__':
           %num_matrices)
 
     path_matrices = "MatricesDFT/Level"+str(level)
+    # written by store_fft_matrices.py; used when it holds the matrices needed
+    archive_name = path_matrices+"/fft_matrices"+mypy.ARCHIVE_SUFFIX
             
     vlen = level + 1
             
@@ -404,8 +406,8 @@ if __name__ == '__main__':
     #     print("")
 
     if (use_Pbar == 1): 
-        prodISM_ID = mypy.read_larcMatrixFile(
-            path_matrices+"/prodISM_"+str(level))
+        prodISM_ID = mypy.load_matrices(path_matrices,
+            ["prodISM_"+str(level)], archive_name)[0]
         if (verbose > 1):
             print("P_bar is set and the P_bar matrix is:")
             mypy.print_naive(prodISM_ID)
@@ -417,9 +419,8 @@ if __name__ == '__main__':
               %num_matrices)
     elif (use_Cbar == 1):
         expandISM_ID = [0]*vlen
-        for i in range(2,vlen):
-            expandISM_ID[i] = mypy.read_larcMatrixFile(
-                            path_matrices+"/expandISM_"+str(i))
+        expandISM_ID[2:vlen] = mypy.load_matrices(path_matrices,
+                ["expandISM_"+str(i) for i in range(2,vlen)], archive_name)
         if (verbose > 1):
             print("P_bar is 0 and the array of matrixIDs are:")
             print([expandISM_ID[i] for i in range(2,vlen)])
@@ -432,8 +433,8 @@ if __name__ == '__main__':
 
         
     if ((use_Pbar == 2) and (use_Cbar == 2)): 
-        prodISM_ID = mypy.read_larcMatrixFile(
-            path_matrices+"/prodISM_"+str(level))
+        prodISM_ID = mypy.load_matrices(path_matrices,
+            ["prodISM_"+str(level)], archive_name)[0]
         if (verbose > 1):
             print("P_bar is set and the P_bar matrix is:")
             mypy.print_naive(prodISM_ID)
@@ -444,9 +445,8 @@ if __name__ == '__main__':
         print("After loading combined ISM the matrix store has size %d"
               %num_matrices)
         expandISM_ID = [0]*vlen
-        for i in range(2,vlen):
-            expandISM_ID[i] = mypy.read_larcMatrixFile(
-                            path_matrices+"/expandISM_"+str(i))
+        expandISM_ID[2:vlen] = mypy.load_matrices(path_matrices,
+                ["expandISM_"+str(i) for i in range(2,vlen)], archive_name)
         if (verbose > 1):
             print("P_bar is 0 and the array of matrixIDs are:")
             print([expandISM_ID[i] for i in range(2,vlen)])
@@ -506,8 +506,8 @@ if __name__ == '__main__':
     #     print("\n")
 
     if (use_Cbar == 1):
-        prodC_ID = mypy.read_larcMatrixFile(
-            path_matrices+"/prodC_"+str(level))
+        prodC_ID = mypy.load_matrices(path_matrices,
+            ["prodC_"+str(level)], archive_name)[0]
         if (verbose > 1):
             print("C_bar is set and the C_bar matrix is:")
             mypy.print_naive(prodC_ID)
@@ -518,10 +518,8 @@ if __name__ == '__main__':
         print("After loading combined C matrix the matrix store has size %d"
               %num_matrices)
     elif (use_Pbar == 1):
-        expandC_ID = [0]*(vlen-1)
-        for i in range(vlen-1):
-            expandC_ID[i] = mypy.read_larcMatrixFile(
-                            path_matrices+"/expandC_"+str(i))
+        expandC_ID = mypy.load_matrices(path_matrices,
+                ["expandC_"+str(i) for i in range(vlen-1)], archive_name)
         if (verbose > 1):
             print("C_bar is 0 and the array of matrixIDs are:")
             print(expandC_ID)
@@ -533,8 +531,8 @@ if __name__ == '__main__':
               %num_matrices)
         
     if ((use_Cbar == 2) and (use_Pbar == 2)):
-        prodC_ID = mypy.read_larcMatrixFile(
-            path_matrices+"/prodC_"+str(level))
+        prodC_ID = mypy.load_matrices(path_matrices,
+            ["prodC_"+str(level)], archive_name)[0]
         if (verbose > 1):
             print("C_bar is set and the C_bar matrix is:")
             mypy.print_naive(prodC_ID)
@@ -544,10 +542,8 @@ if __name__ == '__main__':
         num_matrices = mypy.num_matrices_in_store()   
         print("After loading combined C matrix the matrix store has size %d"
               %num_matrices)
-        expandC_ID = [0]*(vlen-1)
-        for i in range(vlen-1):
-            expandC_ID[i] = mypy.read_larcMatrixFile(
-                            path_matrices+"/expandC_"+str(i))
+        expandC_ID = mypy.load_matrices(path_matrices,
+                ["expandC_"+str(i) for i in range(vlen-1)], archive_name)
         if (verbose > 1):
             print("C_bar is 0 and the array of matrixIDs are:")
             print(expandC_ID)
@@ -585,8 +581,8 @@ if __name__ == '__main__':
 
 
     if ((use_Pbar == 0) and (use_Cbar == 0)) or ((use_Pbar == 2) and (use_Cbar == 2)):
-        FFT_ID = mypy.read_larcMatrixFile(
-            path_matrices+"/DFT_stages_IsmPortion_"+str(level))
+        FFT_ID = mypy.load_matrices(path_matrices,
+            ["DFT_stages_IsmPortion_"+str(level)], archive_name)[0]
         if (verbose > 1):
             print("Using the FFT matrix:")
             mypy.print_naive(FFT_ID)
@@ -615,7 +611,7 @@ if __name__ == '__main__':
 
     if (vector_state == 1):
         # read the vector
-        v_ID = mypy.read_larcMatrixFile(
+        v_ID = mypy.load_matrix(
             path_matrices+"/fixedRandomVector_"+str(i))
         print("Read previously stored random vector from file")
         mypy.print_naive(v_ID)
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCcontributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+
+
+from __future__ import print_function, division
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import store_planner
+
+## \file calibrate_store_model.py
+#
+# \brief This program fits the store model used by plan_init_params.py.
+#
+# It counts triangles (A^2 followed by trace_of_product, as in
+# triangle_counter.py) for the .mm graphs in Count_triangles/data and for
+# random synthetic graphs over a range of levels and degrees, each in a
+# fresh process and for several op_exponent offsets. From the number of
+# matrices in the store, the peak resident set size and the times it fits
+#   - the coefficients of the log-linear matrix count model,
+#   - the bytes used per matrix store entry, and
+#   - the smallest op_exponent offset within 10% of the fastest run, and
+#   - the regionbitparam and zeroregionbitparam in REGION_PARAMS which
+#     stores the fewest matrices while giving the same triangle count as
+#     the LARC defaults on every graph,
+# and writes them, with the measured points, to the model file. Run it on
+# the machine (and with the scalarType) that will do the counting:
+#   python3 calibrate_store_model.py [-o store_model.json] [--max-level 14]
+#
+
+OP_OFFSETS = [-3, -2, -1, 0, 1]
+DEGREES = [4, 16]
+TIME_TOLERANCE = 1.10
+# (regionbitparam, zeroregionbitparam) pairs to try; the first is the LARC
+# default, and LARC ignores a zeroregionbitparam that is not smaller than
+# the regionbitparam
+REGION_PARAMS = [(-1, -1), (1000, 53), (100, 53), (50, 40), (20, 16)]
+
+
+##
+# \brief Counts triangles in this process and prints a JSON result line
+#
+# \param data_path A .mm or .edges graph file
+# \param matrix_exponent The matrix store hash exponent
+# \param op_exponent The op store hash exponent
+# \param level The max_level for LARC
+# \param regionbitparam The regionbitparam for LARC
+# \param zeroregionbitparam The zeroregionbitparam for LARC
+def run_worker(data_path, matrix_exponent, op_exponent, level,
+               regionbitparam, zeroregionbitparam):
+    import MyPyLARC as mypy
+    mypy.initialize_larc(matrix_exponent, op_exponent, level,
+                         regionbitparam, zeroregionbitparam, 0)
+    init_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if data_path.endswith(".edges"):
+        A_ID = mypy.read_edge_file(data_path, level)
+    else:
+        A_ID = mypy.read_matrixMarketExchange_file(data_path)
+    B_ID = mypy.matrix_mult(A_ID, A_ID)
+    trace = mypy.get_scalar_value_string(mypy.trace_of_product(A_ID, B_ID))
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "trace": trace,
+                      "matrices_in_store": mypy.num_matrices_in_store(),
+                      "added_rss_MiB": (peak_rss - init_rss)/1024.0}))
+
+
+##
+# \brief Runs one triangle count in a child process
+#
+# \return The result dictionary, or None if the child failed
+def run_in_child(data_path, matrix_exponent, op_exponent, level,
+                 regionbitparam=-1, zeroregionbitparam=-1):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__),
+                           "worker", data_path, str(matrix_exponent),
+                           str(op_exponent), str(level), str(regionbitparam),
+                           str(zeroregionbitparam)],
+                          stdout=subprocess.PIPE, universal_newlines=True)
+    if proc.returncode != 0:
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+##
+# \brief Writes a random symmetric graph with about degree*2**level nonzeros
+#
+# \return The name of the edge file
+def write_synthetic_graph(tmpdir, level, degree, seed):
+    from edge_files import write_edge_file
+    rng = np.random.default_rng(seed)
+    num_vertices = 2**level
+    num_edges = degree * num_vertices // 2
+    rows = rng.integers(0, num_vertices, num_edges)
+    cols = rng.integers(0, num_vertices, num_edges)
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+    path = os.path.join(tmpdir, "random_%d_%d.edges" %(level, degree))
+    write_edge_file(path, np.concatenate((rows, cols)),
+                    np.concatenate((cols, rows)), num_vertices)
+    return path
+
+
+##
+# \brief Fits the model coefficients to the calibration points
+#
+# \param model The model to update
+# \param points A list of dictionaries with keys graph, nnz, level,
+#               op_offset, regionbitparam, zeroregionbitparam, seconds,
+#               trace, matrices_in_store and added_rss_MiB
+def fit_model(model, points):
+    # the matrix count does not depend on the op table, so use one point
+    # per graph; the coefficients and offset come from the default runs
+    graphs = {}
+    for p in points:
+        if (p["regionbitparam"], p["zeroregionbitparam"]) == REGION_PARAMS[0]:
+            graphs.setdefault(p["graph"], []).append(p)
+    X = []
+    y = []
+    bytes_per_entry = []
+    for runs in graphs.values():
+        p = runs[0]
+        X.append([1.0, np.log2(max(p["nnz"], 1)), np.log2(p["level"] + 1)])
+        y.append(np.log2(max(max(r["matrices_in_store"] for r in runs), 2)))
+        for r in runs:
+            bytes_per_entry.append(r["added_rss_MiB"] * 2**20
+                                   / max(r["matrices_in_store"], 1))
+    if len(X) >= 3:
+        coeff = np.linalg.lstsq(np.array(X), np.array(y), rcond=None)[0]
+        model["matrix_entries"] = {"log2_const": float(coeff[0]),
+                                   "log2_nnz": float(coeff[1]),
+                                   "log2_level": float(coeff[2])}
+    # peak RSS also holds the touched hash table slots, so this is an
+    # upper bound on the node size, which is the safe side for planning
+    model["bytes_per_matrix_entry"] = float(np.median(bytes_per_entry))
+
+    # the smallest offset that is close to the fastest on every graph
+    for offset in sorted(OP_OFFSETS):
+        if all(any(r["op_offset"] == offset and r["seconds"] <=
+                   TIME_TOLERANCE * min(s["seconds"] for s in runs)
+                   for r in runs)
+               for runs in graphs.values()):
+            model["op_exponent_offset"] = offset
+            break
+
+    model["regionbitparam"], model["zeroregionbitparam"] = \
+        choose_region_params(graphs, points)
+    model["calibration"] = points
+    return model
+
+
+##
+# \brief Chooses the region parameters from the calibration points
+#
+# A setting qualifies if it ran on every graph and gave the same trace as
+# the default run; the one storing the fewest matrices in total wins, and
+# the default is kept unless another setting stores fewer.
+#
+# \param graphs The default runs, by graph name
+# \param points All the calibration points
+# \return A pair (regionbitparam, zeroregionbitparam)
+def choose_region_params(graphs, points):
+    best = REGION_PARAMS[0]
+    best_total = None
+    for params in REGION_PARAMS:
+        total = 0
+        for name, runs in graphs.items():
+            trials = [p for p in points if p["graph"] == name and
+                      (p["regionbitparam"], p["zeroregionbitparam"]) == params]
+            if not trials or any(p["trace"] != runs[0]["trace"]
+                                 for p in trials):
+                break
+            total += min(p["matrices_in_store"] for p in trials)
+        else:
+            if best_total is None or total < best_total:
+                best, best_total = params, total
+    return best
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) == 8 and sys.argv[1] == "worker":
+        run_worker(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]),
+                   int(sys.argv[5]), int(sys.argv[6]), int(sys.argv[7]))
+        sys.exit()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Fit the LARC store model used by plan_init_params.py.")
+    parser.add_argument("-o", "--output", default=os.path.join(here, "store_model.json"),
+                        help="model file to write (default: store_model.json)")
+    parser.add_argument("--min-level", type=int, default=6,
+                        help="smallest level of the synthetic graphs (default 6)")
+    parser.add_argument("--max-level", type=int, default=14,
+                        help="largest level of the synthetic graphs (default 14)")
+    parser.add_argument("graphs", nargs="*",
+                        help="graph files (default: Count_triangles/data/*.mm)")
+    args = parser.parse_args()
+
+    model = store_planner.load_store_model()
+    graphs = args.graphs or sorted(glob.glob(os.path.join(here, "../Count_triangles/data/*.mm")))
+    points = []
+
+    print("%-36s %10s %6s %7s %10s %10s %12s %10s" %("graph", "nnz", "level",
+          "offset", "regionbits", "seconds", "matrices", "added MiB"))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        seed = 0
+        for level in range(args.min_level, args.max_level + 1, 2):
+            for degree in DEGREES:
+                seed += 1
+                graphs.append(write_synthetic_graph(tmpdir, level, degree, seed))
+        for data_path in graphs:
+            dimension, nnz = store_planner.graph_statistics(data_path)
+            # size the tables for the current model's prediction, with
+            # plenty of memory so that the tables are not squeezed
+            plan = store_planner.plan_init_params(dimension, nnz, 1e6, model)[0]
+            level = plan['max_level']
+            # every op offset with the default region parameters, then
+            # every other region setting with the model's op offset
+            trials = [(offset, REGION_PARAMS[0]) for offset in OP_OFFSETS]
+            trials += [(model["op_exponent_offset"], params)
+                       for params in REGION_PARAMS[1:]]
+            for offset, (region, zeroregion) in trials:
+                op_exponent = max(plan['matrix_exponent'] + offset,
+                                  model["min_exponent"])
+                r = run_in_child(data_path, plan['matrix_exponent'],
+                                 op_exponent, level, region, zeroregion)
+                name = os.path.basename(data_path)
+                regionbits = "%d/%d" %(region, zeroregion)
+                if r is None:
+                    print("%-36s %10d %6d %7d %10s %10s" %(name, nnz, level,
+                          offset, regionbits, "failed"))
+                    continue
+                print("%-36s %10d %6d %7d %10s %10.3f %12d %10.1f" %(name, nnz,
+                      level, offset, regionbits, r["seconds"],
+                      r["matrices_in_store"], r["added_rss_MiB"]))
+                r.update({"graph": name, "nnz": nnz, "level": level,
+                          "op_offset": offset, "regionbitparam": region,
+                          "zeroregionbitparam": zeroregion})
+                points.append(r)
+
+    if not points:
+        print("No calibration runs succeeded; %s is unchanged." %args.output)
+        sys.exit(1)
+    fit_model(model, points)
+    model["comment"] = "Fitted by calibrate_store_model.py on %s." %time.strftime("%Y-%m-%d")
+    model["calibrated"] = True
+    with open(args.output, "w") as outfile:
+        json.dump(model, outfile, indent=" ")
+    print("Wrote %s:" %args.output)
+    print("  log2(matrices) = %.3f + %.3f*log2(nnz) + %.3f*log2(level+1)"
+          %(model["matrix_entries"]["log2_const"],
+            model["matrix_entries"]["log2_nnz"],
+            model["matrix_entries"]["log2_level"]))
+    print("  bytes per matrix entry %.1f, op_exponent offset %d"
+          %(model["bytes_per_matrix_entry"], model["op_exponent_offset"]))
+    print("  regionbitparam %d, zeroregionbitparam %d"
+          %(model["regionbitparam"], model["zeroregionbitparam"]))
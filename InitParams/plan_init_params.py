@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCcontributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+
+
+from __future__ import print_function, division
+
+import argparse
+import json
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import store_planner
+
+## \file plan_init_params.py
+#
+# \brief This program plans the initialization parameters for a graph.
+#
+# It reads the dimension and number of nonzeros of the graph from its file
+# header and, using the store model fitted by calibrate_store_model.py,
+# chooses the smallest max_level holding the adjacency matrix and the
+# matrix_exponent and op_exponent that fit in the available memory. The
+# result is printed, and can be written into a parameter file as a new
+# computing environment, for example
+#   python3 plan_init_params.py ../Count_triangles/data/test2.mm \
+#           -p count_triangles.init_params -e auto
+#
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Plan LARC initialization parameters for a graph.")
+    parser.add_argument("data_path", help="a .mm/.mtx, .edges or .tsv graph file")
+    parser.add_argument("-p", "--param-file", help="parameter file to add the plan to")
+    parser.add_argument("-e", "--env", default="auto",
+                        help="computing environment name for the plan (default: auto)")
+    parser.add_argument("-m", "--memory", type=float,
+                        help="memory in GiB to plan for (default: memory available now)")
+    parser.add_argument("--model", help="store model file (default: store_model.json)")
+    args = parser.parse_args()
+
+    model = store_planner.load_store_model(args.model)
+    dimension, nnz = store_planner.graph_statistics(args.data_path)
+    entry, report = store_planner.plan_init_params(dimension, nnz,
+                                                   args.memory, model)
+
+    print("Graph %s: %d vertices, %d nonzeros" %(args.data_path, dimension, nnz))
+    print("Predicted %d matrices needing %.2f GiB of %.2f GiB available"
+          %(report['predicted_matrix_entries'], report['predicted_GiB'],
+            report['memory_GiB']))
+    if not report['calibrated']:
+        print("WARNING: store_model.json is uncalibrated placeholder data;")
+        print("run calibrate_store_model.py for a fitted prediction.")
+    if not report['fits']:
+        print("WARNING: the prediction does not fit; the tables are sized for")
+        print("the memory available and the run will depend on cleaning.")
+    print(json.dumps({args.env: [entry]}, indent=" "))
+
+    if args.param_file is not None:
+        store_planner.write_init_params_entry(args.param_file, args.env, entry)
+        print("Wrote computing environment '%s' to %s" %(args.env, args.param_file))
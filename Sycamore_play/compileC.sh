@@ -55,5 +55,7 @@
 LARCD=`readlink -f ..`
 ANAD=/usr/public/opt/Anaconda3-2023.07-1
 
-gcc -c -o sycamore_testrun.o -O0 -g -pg -Wall -fPIC -DGIT_COMMIT_DATE="" -I${LARCD}/larc/src -I${ANAD}/include -std=gnu99 sycamore_testrun.c
-gcc -o sycamore_testrun -O0 -g -pg -Wall -fPIC -DGIT_COMMIT_DATE="" -I${LARCD}/larc/src -I${ANAD}/include -std=gnu99 -L${LARCD}/larc/lib sycamore_testrun.o -L${ANAD}/lib -l:liblarc.a -lm -lrt -lmpfr -lmpc -lgmp -lpthread -lcurses -ltinfo -Wl,-rpath=${ANAD}/lib:${LARCD}/larc/lib
+gcc -c -o sycamore_testrun.o -O0 -g -pg -Wall -fPIC -DGIT_COMMIT_DATE="" -I${LARCD}/larc/src -I${LARCD}/src -I${ANAD}/include -std=gnu99 sycamore_testrun.c
+gcc -c -o matrix_binary.o -O0 -g -pg -Wall -fPIC -DGIT_COMMIT_DATE="" -I${LARCD}/larc/src -I${ANAD}/include -std=gnu99 ${LARCD}/src/matrix_binary.c
+gcc -c -o traversal.o -O0 -g -pg -Wall -fPIC -DGIT_COMMIT_DATE="" -I${LARCD}/larc/src -I${ANAD}/include -std=gnu99 ${LARCD}/src/traversal.c
+gcc -o sycamore_testrun -O0 -g -pg -Wall -fPIC -DGIT_COMMIT_DATE="" -I${LARCD}/larc/src -I${ANAD}/include -std=gnu99 -L${LARCD}/larc/lib sycamore_testrun.o matrix_binary.o traversal.o -L${ANAD}/lib -l:liblarc.a -lm -lrt -lmpfr -lmpc -lgmp -lpthread -lcurses -ltinfo -Wl,-rpath=${ANAD}/lib:${LARCD}/larc/lib
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCContributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+from __future__ import print_function, division
+
+import os
+import sys
+import json
+import random
+import resource
+import subprocess
+import tempfile
+import time
+import numpy as np
+
+## \file sycamore_benchmark.py
+#
+#  \brief Compares the time and memory of three ways of simulating a random
+#  Sycamore circuit: the LARC full-unitary product (sycamore_run.py), the
+#  LARC state-vector mode (sycamore_statevector.py, with and without cleaning
+#  between cycles, and with link matrices instead of apply_sycamore_2gate as
+#  larc_sv_matrix), and the numpy full-unitary product (numpy_run.py).
+#
+#  Usage: python sycamore_benchmark.py [min_qubits max_qubits [max_full]]
+#  Qubit counts run from min_qubits to max_qubits (default 6 to 16) over the
+#  layouts in LAYOUTS. The full-unitary paths are skipped above max_full
+#  qubits (default 12) and numpy is skipped when its matrices would not fit
+#  in half of the physical memory. Each run is made in a fresh process, so
+#  that the peak resident set size (RSS) belongs to that run alone. The
+#  column "max diff" is the largest difference between the run's final
+#  amplitudes (column 0 of the circuit matrix) and the state-vector result.
+#
+
+# qubit count -> (num_rows, num_cols) of the Sycamore layout
+LAYOUTS = {6: (3, 2), 8: (4, 2), 9: (3, 3), 10: (5, 2), 12: (4, 3),
+           14: (7, 2), 15: (5, 3), 16: (4, 4)}
+NUM_CYCLES = 13
+MODES = ['larc_full', 'larc_sv_matrix', 'larc_sv', 'larc_sv_clean',
+         'numpy_full']
+
+
+##
+# \brief Runs one simulation in this process and prints a JSON result line
+#
+# \param mode One of MODES
+# \param num_rows The number of rows in the layout
+# \param num_cols The number of columns in the layout
+# \param amp_file A .npy file to receive the final amplitudes
+def run_worker(mode, num_rows, num_cols, amp_file):
+    import sycamore_generate
+    import sycamore_sim as sim
+    import MyPyLARC as mypy
+    random.seed(num_rows*100 + num_cols)
+    config = sycamore_generate.generate_sycamore_config(num_rows, num_cols,
+                                                        0, NUM_CYCLES)
+    system_size = config["num_qubits"]
+    if mode != 'numpy_full':
+        sim.initialize_larc_for_sycamore(system_size)
+
+    start = time.perf_counter()
+    if mode == 'larc_full':
+        circuit_pID = sim.full_circuit_matrix(config)
+        amplitudes = mypy.pID_to_numpy(circuit_pID, cols=1).ravel()
+    elif mode == 'numpy_full':
+        amplitudes = sim.numpy_circuit_matrix(config)[:, 0]
+    elif mode == 'larc_sv_matrix':
+        state_pID = sim.statevector_run(config, 0, False, direct=False)
+        amplitudes = mypy.pID_to_numpy(state_pID)
+    else:
+        state_pID = sim.statevector_run(config, 0, mode == 'larc_sv_clean')
+        amplitudes = mypy.pID_to_numpy(state_pID)
+    elapsed = time.perf_counter() - start
+
+    result = {"seconds": elapsed,
+              "peak_rss_MiB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.0}
+    if mode != 'numpy_full':
+        result["matrices_in_store"] = mypy.num_matrices_in_store()
+    np.save(amp_file, amplitudes)
+    print(json.dumps(result))
+
+
+##
+# \brief Runs one simulation in a child process
+#
+# \return The result dictionary, with the amplitudes added, or None if the
+#         child failed
+def run_in_child(mode, num_rows, num_cols, tmpdir):
+    amp_file = os.path.join(tmpdir, "%s_%d_%d.npy" % (mode, num_rows, num_cols))
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__),
+                           "worker", mode, str(num_rows), str(num_cols),
+                           amp_file], stdout=subprocess.PIPE,
+                          universal_newlines=True)
+    if proc.returncode != 0:
+        return None
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["amplitudes"] = np.load(amp_file)
+    return result
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) == 6 and sys.argv[1] == "worker":
+        run_worker(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]),
+                   sys.argv[5])
+        sys.exit()
+
+    min_qubits = 6
+    max_qubits = 16
+    max_full = 12
+    if len(sys.argv) >= 3:
+        min_qubits = int(sys.argv[1])
+        max_qubits = int(sys.argv[2])
+    if len(sys.argv) >= 4:
+        max_full = int(sys.argv[3])
+
+    physical_bytes = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+    print("%6s %-14s %10s %12s %10s %10s" %("qubits","mode","seconds",
+          "peak RSS MiB","matrices","max diff"))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for num_qubits in sorted(LAYOUTS):
+            if not min_qubits <= num_qubits <= max_qubits:
+                continue
+            num_rows, num_cols = LAYOUTS[num_qubits]
+            # numpy_run.py keeps about four 2^n x 2^n complex128 matrices
+            numpy_bytes = 4 * 16 * 4**num_qubits
+            results = {}
+            for mode in ['larc_sv', 'larc_sv_clean', 'larc_sv_matrix', 'larc_full',
+                         'numpy_full']:
+                if mode.endswith('_full') and num_qubits > max_full:
+                    continue
+                if mode == 'numpy_full' and numpy_bytes > physical_bytes//2:
+                    continue
+                results[mode] = run_in_child(mode, num_rows, num_cols, tmpdir)
+            reference = results['larc_sv']
+            for mode in MODES:
+                if mode not in results:
+                    print("%6d %-14s %10s" %(num_qubits, mode, "skipped"))
+                    continue
+                r = results[mode]
+                if r is None:
+                    print("%6d %-14s %10s" %(num_qubits, mode, "failed"))
+                    continue
+                diff = "-"
+                if reference is not None:
+                    diff = "%.2e" % np.max(np.abs(r["amplitudes"] -
+                                                  reference["amplitudes"]))
+                print("%6d %-14s %10.3f %12.1f %10s %10s" %(num_qubits, mode,
+                      r["seconds"], r["peak_rss_MiB"],
+                      r.get("matrices_in_store", "-"), diff))
@@ -79,20 +79,18 @@ class Links:
             print("  Link {0:2d} - {1:2d} has type {2}.".format(q1, q2, c))
 
 
-if __name__ == '__main__':
-
-    verbose = 1
-    debug = 0
-
-    #*################################*#
-    #*    Basic Parameter Setting     *#
-    #*################################*#
-
-    num_rows = 3
-    num_cols = 2
-    layout = 0
-    num_cycles = 13
-    output_filename = "sycamore_config.json"
+##
+# \brief Creates the data for a Sycamore configuration file
+#
+# \param num_rows The number of rows of qubits in the layout
+# \param num_cols The number of columns of qubits in the layout
+# \param layout 0 for the SUPREMACY REGIME (ABCD) links, 1 for the
+#        CLASSICALLY VERIFIABLE (EFGH) links
+# \param num_cycles The number of cycles in the circuit
+# \param verbose If positive, print the layout and links
+# \return A dictionary in the format of sycamore_config.json
+def generate_sycamore_config(num_rows, num_cols, layout=0, num_cycles=13,
+                             verbose=0):
 
     #*################################*#
     #*    JSON Data Initialization    *#
@@ -179,6 +177,27 @@ if __name__ == '__main__':
         jdata["circuit"].append(jcycle)
         last_1qubit_cycle = next_1qubit_cycle
 
+    return jdata
+
+
+if __name__ == '__main__':
+
+    verbose = 1
+    debug = 0
+
+    #*################################*#
+    #*    Basic Parameter Setting     *#
+    #*################################*#
+
+    num_rows = 3
+    num_cols = 2
+    layout = 0
+    num_cycles = 13
+    output_filename = "sycamore_config.json"
+
+    jdata = generate_sycamore_config(num_rows, num_cols, layout, num_cycles,
+                                     verbose)
+
     #*################################*#
     #*    Output JSON File            *#
     #*################################*#
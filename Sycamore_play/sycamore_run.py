@@ -253,18 +253,22 @@ if __name__ == '__main__':
     for k, (gate_string, link_type) in enumerate(config_data["circuit"]):
         gate_sequence = ["sqrt" + gate_name for gate_name in gate_string]
         first_matrixID = mypy.build_sycamore_gate_sequence(gate_sequence, system_size)
+        print("  cycle {0}: reused {1} of {2} single qubit gate levels".format(
+            k, mypy.sycamore_gate_sequence_levels_reused(), system_size))
         this_cycle_matrixID = mypy.matrix_mult(first_matrixID, two_qubit_matrices[link_type])
         cycle_matrix_list.append(this_cycle_matrixID)
         out_file_name = output_path + "sycamore_cycle_{0}_matrix.json".format(k)
         # print("Writing cycle {0} matrix to file '{1}'.".format(k, out_file_name))
         mypy.fprint_larcMatrixFile(this_cycle_matrixID, out_file_name)
+        # binary copy, preferred by sycamore_testrun.c
+        mypy.fprint_larcMatrixBinary(this_cycle_matrixID,
+                out_file_name[:-len(".json")] + ".lmb")
 
     print()
     print("Computing matrix for entire circuit.")
-    circuit_matrixID = mypy.get_identity_pID(system_size)
-    for k, cycle_matrixID in enumerate(cycle_matrix_list):
-        print("Multiplying cycle matrix {0} into circuit...".format(k))
-        circuit_matrixID = mypy.matrix_mult(circuit_matrixID, cycle_matrixID)
+    circuit_matrixID, chain_report = mypy.chain_product(cycle_matrix_list, 'balanced')
+    print("  Product tree of cycle matrices: {0}".format(chain_report['tree_string']))
+    print("  Peak number of matrices in store: {0}".format(chain_report['peak_matrices_in_store']))
     out_file_name = output_path + "sycamore_full_circuit_matrix.json"
     # print("Writing full circuit matrix to file '{0}'.".format(out_file_name))
     mypy.fprint_larcMatrixFile(circuit_matrixID, out_file_name)
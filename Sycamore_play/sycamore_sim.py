@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCContributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+from __future__ import print_function, division
+
+import os
+import glob
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import numpy as np
+import json
+
+## \file sycamore_sim.py
+#
+#  \brief Routines shared by the Sycamore simulation programs: LARC set up,
+#  the two qubit link matrices, the full circuit unitary, the state-vector
+#  simulation, and the numpy equivalents used by numpy_run.py.
+#
+#  The circuit matrix built by sycamore_run.py is the product
+#  C_0 C_1 ... C_(k-1) of the cycle matrices C_j = (one qubit layer j) times
+#  (link matrix j). The state-vector mode computes the same thing applied to
+#  a basis vector, so it applies the cycles to the vector last cycle first.
+
+
+##
+# \brief Reads a Sycamore configuration file
+#
+# \param filename The name of the JSON file written by sycamore_generate.py
+# \return The configuration dictionary, or None if the file cannot be read
+def load_sycamore_config(filename="sycamore_config.json"):
+    try:
+        with open(filename, "r") as config_fp:
+            return json.load(config_fp)
+    except (IOError, ValueError):
+        return None
+
+
+##
+# \brief Makes an output directory, asking before overwriting an old one
+#
+# \param output_path The directory name (ending in "/")
+# \param verbose If nonzero, report a newly created directory
+def prepare_output_dir(output_path, verbose=0):
+    if not os.path.isdir(output_path):
+       os.umask(7) # corresponds to "chmod 770"
+       os.makedirs(output_path)
+       if verbose:
+              print("The new data is in is "+output_path)
+    else:
+       while True:
+          print("Output directory "+output_path+" already exists.")
+          user_input=input("Do you want to overwrite this directory (y/n)?")
+          if user_input in['y','n']:
+             break
+          else:
+             print ("Not a valid input.")
+       if user_input=='n':
+          print ("Rename this directory and try again.")
+          sys.exit()
+       else:
+          # delete old files so new reports are not appended to old ones
+          files=glob.glob(output_path+'/sycamore*')
+          for f in files:
+             os.remove(f)
+
+
+##
+# \brief Initializes LARC with parameters suited to a Sycamore system
+#
+# The store sizes come from ../InitParams/tutorial.init_params, choosing the
+# computing environment from the available memory as sycamore_run.py does;
+# the maximum matrix level is raised to the number of qubits if necessary.
+#
+# \param system_size The number of qubits
+# \param verbose The LARC verbosity (0=SILENT, 1=BASIC, 2=CHATTY, 3=DEBUG)
+def initialize_larc_for_sycamore(system_size, verbose=0):
+    memory_available = mypy.memory_available_GiB()
+    if (memory_available > 200):
+        computing_env = 'large'
+    elif (memory_available > 50):
+        computing_env = 'medium'
+    else:
+        computing_env = 'small'
+    param_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              '../InitParams/tutorial.init_params')
+    with open(param_file, 'r') as init_file:
+        p = json.load(init_file)[computing_env][0]
+    max_level = max(p['max_level'], system_size)
+    mypy.initialize_larc(p['matrix_exponent'], p['op_exponent'], max_level,
+                         p['regionbitparam'], p['zeroregionbitparam'],
+                         verbose)
+
+
+##
+# \brief Builds the two qubit system matrix for each link type
+#
+# \param config The Sycamore configuration dictionary
+# \param hold If True, hold the matrices so they survive cleaning
+# \return A dictionary mapping link type to matrixID
+def build_link_matrices(config, hold=False):
+    two_qubit_matrices = _link_matrices(config["num_qubits"], config["linkinfo"])
+    if hold:
+        for link_matrixID in two_qubit_matrices.values():
+            mypy.set_hold_matrix(link_matrixID)
+    return two_qubit_matrices
+
+
+##
+# \brief Multiplies out the two qubit gates of each link type
+#
+# The result is kept in the matrix cache when one is set (see matrix_cache.py).
+#
+# \param system_size The number of qubits
+# \param linkinfo The "linkinfo" dictionary of the configuration
+# \return A dictionary mapping link type to matrixID
+@mypy.cached_matrix(name="sycamore_link_matrices")
+def _link_matrices(system_size, linkinfo):
+    two_qubit_matrices = {}
+    for link_type, pair_list in linkinfo.items():
+        link_matrixID = mypy.get_identity_pID(system_size)
+        for qubit1, qubit2 in pair_list:
+            next_matrixID = mypy.build_sycamore_2gate(qubit1, qubit2, system_size)
+            link_matrixID = mypy.matrix_mult(link_matrixID, next_matrixID)
+        two_qubit_matrices[link_type] = link_matrixID
+    return two_qubit_matrices
+
+
+##
+# \brief Builds the one qubit gate layer of a cycle
+#
+# \param gate_string The gates for the cycle, one of "X", "Y", "W" per qubit
+# \param system_size The number of qubits
+# \return The matrixID of the layer
+def build_one_qubit_layer(gate_string, system_size):
+    gate_sequence = ["sqrt" + gate_name for gate_name in gate_string]
+    return mypy.build_sycamore_gate_sequence(gate_sequence, system_size)
+
+
+##
+# \brief Computes the full circuit matrix, as sycamore_run.py does
+#
+# \param config The Sycamore configuration dictionary
+# \return The matrixID of the circuit matrix
+def full_circuit_matrix(config):
+    system_size = config["num_qubits"]
+    two_qubit_matrices = build_link_matrices(config)
+    cycle_matrix_list = []
+    for gate_string, link_type in config["circuit"]:
+        first_matrixID = build_one_qubit_layer(gate_string, system_size)
+        cycle_matrix_list.append(mypy.matrix_mult(first_matrixID,
+                                 two_qubit_matrices[link_type]))
+    circuit_matrixID, chain_report = mypy.chain_product(cycle_matrix_list)
+    return circuit_matrixID
+
+
+##
+# \brief Builds a computational basis state as a LARC column vector
+#
+# Qubit 0 is the most significant bit of basis_index, matching the order of
+# the Kronecker factors in the gate matrices.
+#
+# \param system_size The number of qubits
+# \param basis_index The index of the basis state, 0 <= index < 2**system_size
+# \return The matrixID of the column vector
+def basis_state_pID(system_size, basis_index):
+    if not 0 <= basis_index < 2**system_size:
+        raise ValueError("basis index %d out of range for %d qubits"
+                         % (basis_index, system_size))
+    ket = [mypy.numpy_to_pID(np.array([1, 0], dtype=np.complex128)),
+           mypy.numpy_to_pID(np.array([0, 1], dtype=np.complex128))]
+    state_pID = mypy.get_identity_pID(0)
+    for qubit in range(system_size):
+        bit = (basis_index >> (system_size - 1 - qubit)) & 1
+        state_pID = mypy.kronecker_product(state_pID, ket[bit])
+    return state_pID
+
+
+##
+# \brief Applies the Sycamore circuit to a basis state
+#
+# Each cycle is applied to the vector by its link gates and then its one qubit
+# layer, so no 2^n by 2^n product of cycle matrices is ever formed. With
+# direct set, each two qubit gate of a link is applied to the vector with
+# apply_sycamore_2gate; otherwise the link matrix is built and multiplied.
+# With clean set, only the current vector (and any link matrices) are held
+# and the matrix store is cleaned after every cycle. With store_gc set, they
+# are roots instead and the policy decides when to clean (see store_gc.py).
+#
+# \param config The Sycamore configuration dictionary
+# \param basis_index The index of the starting basis state
+# \param clean If True, clean the matrix store between cycles
+# \param direct If True, apply the two qubit gates without building them
+# \param store_gc A StoreGC policy checked after every cycle, or None
+# \return The matrixID of the final state (a column vector), which is held
+#         if clean is True and a root if store_gc is set
+def statevector_run(config, basis_index=0, clean=False, direct=True,
+                    store_gc=None):
+    system_size = config["num_qubits"]
+    if not direct:
+        two_qubit_matrices = build_link_matrices(config, hold=clean)
+        if store_gc is not None:
+            for link_matrixID in two_qubit_matrices.values():
+                mypy.add_root(link_matrixID)
+    state_pID = basis_state_pID(system_size, basis_index)
+    if clean:
+        mypy.set_hold_matrix(state_pID)
+    state_root = mypy.RecentRoots(1)
+    if store_gc is not None:
+        state_root.push(state_pID)
+    # the circuit is C_0 C_1 ... C_(k-1), so C_(k-1) acts on the vector first
+    for gate_string, link_type in reversed(config["circuit"]):
+        if direct:
+            # the link matrix is G_1 G_2 ... G_m, so G_m acts first
+            next_pID = state_pID
+            for qubit1, qubit2 in reversed(config["linkinfo"][link_type]):
+                next_pID = mypy.apply_sycamore_2gate(next_pID, qubit1, qubit2)
+        else:
+            next_pID = mypy.matrix_mult(two_qubit_matrices[link_type],
+                                        state_pID)
+        layer_pID = build_one_qubit_layer(gate_string, system_size)
+        next_pID = mypy.matrix_mult(layer_pID, next_pID)
+        if clean:
+            mypy.set_hold_matrix(next_pID)
+            mypy.release_hold_matrix(state_pID)
+            mypy.clean_matrix_storage()
+        if store_gc is not None:
+            state_root.push(next_pID)
+            store_gc.maybe_collect()
+        state_pID = next_pID
+    if clean and not direct:
+        for link_matrixID in two_qubit_matrices.values():
+            mypy.release_hold_matrix(link_matrixID)
+    if store_gc is not None and not direct:
+        for link_matrixID in two_qubit_matrices.values():
+            mypy.drop_root(link_matrixID)
+    return state_pID
+
+
+##
+# \brief Returns the numpy one qubit Sycamore gates, as in numpy_run.py
+#
+# \return A dictionary mapping "X", "Y", "W" to 2x2 complex128 arrays
+def numpy_one_qubit_gates():
+    root2 = np.sqrt(np.complex128(2))
+    one_w = np.array([[0.5+0.5j, -0.5j], [0.5, 0.5+0.5j]], dtype=np.complex128)
+    one_w[0,1] *= root2
+    one_w[1,0] *= root2
+    return {"X": np.array([[0.5+0.5j, 0.5-0.5j], [0.5-0.5j, 0.5+0.5j]],
+                          dtype=np.complex128),
+            "Y": np.array([[0.5+0.5j, -0.5-0.5j], [0.5+0.5j, 0.5+0.5j]],
+                          dtype=np.complex128),
+            "W": one_w}
+
+
+##
+# \brief Builds the numpy two qubit Sycamore gate on qubits q1, q2
+#
+# \param qubit1 The index of the first qubit
+# \param qubit2 The index of the second qubit
+# \param system_size The number of qubits
+# \return The 2^n by 2^n complex128 array
+def numpy_2gate(qubit1, qubit2, system_size):
+    omega = (np.sqrt(np.complex128(3)) + np.complex128(1j)) / np.complex128(2)
+    # the gate is the sum over four terms of (first factor) x (second factor)
+    first = [np.array([[1, 0], [0, 0]]), np.array([[0, 1], [0, 0]]),
+             np.array([[0, 0], [1, 0]]), np.array([[0, 0], [0, 1]])]
+    second = [np.array([[1, 0], [0, 0]]), np.array([[0, 0], [1j, 0]]),
+              np.array([[0, 1j], [0, 0]]), np.array([[0, 0], [0, omega]])]
+    gate = 0
+    for a, b in zip(first, second):
+        part = np.identity(1, dtype=np.complex128)
+        for i in range(system_size-1, -1, -1):
+            if i == qubit1:
+                factor = a
+            elif i == qubit2:
+                factor = b
+            else:
+                factor = np.identity(2)
+            part = np.kron(factor.astype(np.complex128), part)
+        gate = gate + part
+    return gate
+
+
+##
+# \brief Computes the full circuit matrix with numpy, as numpy_run.py does
+#
+# \param config The Sycamore configuration dictionary
+# \return The 2^n by 2^n complex128 circuit matrix
+def numpy_circuit_matrix(config):
+    system_size = config["num_qubits"]
+    matrix_size = 2**system_size
+    one_qubit_gates = numpy_one_qubit_gates()
+    two_qubit_matrices = {}
+    for link_type, pair_list in config["linkinfo"].items():
+        link_matrix = np.identity(matrix_size, dtype=np.complex128)
+        for qubit1, qubit2 in pair_list:
+            link_matrix = np.matmul(link_matrix,
+                                    numpy_2gate(qubit1, qubit2, system_size))
+        two_qubit_matrices[link_type] = link_matrix
+    circuit_matrix = np.identity(matrix_size, dtype=np.complex128)
+    for gate_string, link_type in config["circuit"]:
+        first_matrix = np.identity(1, dtype=np.complex128)
+        for i in range(system_size-1, -1, -1):
+            first_matrix = np.kron(one_qubit_gates[gate_string[i]], first_matrix)
+        circuit_matrix = np.matmul(circuit_matrix,
+                          np.matmul(first_matrix, two_qubit_matrices[link_type]))
+    return circuit_matrix
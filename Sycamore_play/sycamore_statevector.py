@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCContributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../src"))
+import MyPyLARC as mypy
+import numpy as np
+import time
+import sycamore_sim as sim
+
+## \file sycamore_statevector.py
+#
+#  \brief Simulates the Sycamore circuit in sycamore_config.json by applying
+#  it to a basis state vector, instead of forming the full circuit matrix.
+#
+#  Usage: python sycamore_statevector.py [basis_index] [clean|gc]
+#  The starting state is the basis state basis_index (default 0). If the
+#  second argument is "clean", the matrix store is cleaned after each cycle;
+#  if it is "gc", a StoreGC policy cleans it when the store is half full.
+#  The final amplitudes are the basis_index column of the matrix computed by
+#  sycamore_run.py.
+#
+if __name__ == '__main__':
+
+    verbose = 0
+
+    basis_index = 0
+    clean = False
+    store_gc = None
+    if len(sys.argv) > 1:
+        basis_index = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        clean = (sys.argv[2] == "clean")
+        if sys.argv[2] == "gc":
+            store_gc = mypy.StoreGC(occupancy=0.5)
+
+    config_data = sim.load_sycamore_config("sycamore_config.json")
+    if config_data == None:
+        print("No Sycamore config file found.")
+        sys.exit()
+    system_size = config_data["num_qubits"]
+
+    sim.initialize_larc_for_sycamore(system_size, verbose)
+    scalarTypeStr = mypy.cvar.scalarTypeStr
+    if scalarTypeStr not in ('Complex', 'MPComplex', 'MPRatComplex', 'Clifford'):
+        raise Exception('Recompile with complex scalarType, not %s.'
+                        %scalarTypeStr)
+
+    print("\n    ######################################################################")
+    print("    ##  State-vector simulation of a Sycamore circuit.                  ##" )
+    print("    ######################################################################\n")
+
+    output_path = "statevectorFiles/"
+    sim.prepare_output_dir(output_path, verbose)
+
+    print("Processing Sycamore configuration file.")
+    print("  Number of qubits  = {0}".format(system_size))
+    print("  Number of cycles  = {0}".format(config_data["num_cycles"]))
+    print("  Layout = {0}".format(config_data["layout"]))
+    print("  Starting basis state = {0}".format(basis_index))
+    print("  Clean between cycles = {0}".format(clean))
+    print("  Automatic cleaning = {0}".format(store_gc is not None))
+
+    start = time.perf_counter()
+    state_pID = sim.statevector_run(config_data, basis_index, clean,
+                                    store_gc=store_gc)
+    elapsed = time.perf_counter() - start
+    print()
+    print("Simulation took {0:.3f} seconds.".format(elapsed))
+    if store_gc is not None:
+        stats = store_gc.stats
+        print("Cleaned {0} times, freeing {1} matrices (about {2:.1f} MiB) "
+              "in {3:.3f} seconds.".format(stats['collections'],
+                                           stats['matrices_freed'],
+                                           stats['bytes_reclaimed'] / 2**20,
+                                           stats['pause_seconds']))
+    print("Matrices in store: {0}".format(mypy.num_matrices_in_store()))
+
+    out_file_name = output_path + "sycamore_final_state.json"
+    mypy.fprint_larcMatrixFile(state_pID, out_file_name)
+
+    amplitudes = mypy.pID_to_numpy(state_pID)
+    probabilities = np.abs(amplitudes)**2
+    print("Sum of probabilities = {0}".format(probabilities.sum()))
+
+    out_file_name = output_path + "sycamore_amplitudes.txt"
+    print("Writing amplitudes to file '{0}'.".format(out_file_name))
+    with open(out_file_name, "w") as fp:
+        for i, val in enumerate(amplitudes):
+            print("{0} -> {1}".format(i, val), file=fp)
+
+    out_file_name = output_path + "sycamore_probabilities.txt"
+    print("Writing probabilities to file '{0}'.".format(out_file_name))
+    with open(out_file_name, "w") as fp:
+        for i, val in enumerate(probabilities):
+            print("{0} -> {1}".format(i, val), file=fp)
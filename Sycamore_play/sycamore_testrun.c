@@ -80,6 +80,7 @@
 #include "organize.h"
 #include "scalars.h"
 #include "exampleLARC.h"
+#include "matrix_binary.h"
 
 int main()
 {
@@ -113,8 +114,15 @@ int main()
     for (int i=0;i<no_cycles_to_use;++i)
     {
         printf("Multiplying cycle matrix %d into circuit...",i);
-        sprintf(cycleMatrix,"matrixFiles/sycamore_cycle_%d_matrix.json",i);
-        cycleMatrixID = read_larcMatrixFile(cycleMatrix);
+        // a binary copy of the cycle matrix loads without parsing JSON
+        sprintf(cycleMatrix,"matrixFiles/sycamore_cycle_%d_matrix.lmb",i);
+        if (access(cycleMatrix, R_OK) == 0)
+            cycleMatrixID = read_larcMatrixBinary(cycleMatrix);
+        else
+        {
+            sprintf(cycleMatrix,"matrixFiles/sycamore_cycle_%d_matrix.json",i);
+            cycleMatrixID = read_larcMatrixFile(cycleMatrix);
+        }
         circuitMatrixID = matrix_mult(circuitMatrixID, cycleMatrixID);
 //        empty_op_store();
     }
@@ -383,9 +383,10 @@ if __name__ == '__main__':
     filename = "Data/Out/nandNOcleaned.%s.store" %scalarTypeStr
     mypy.fprint_store_info_for_matrixID_range(0,end,os.path.join(os.path.dirname(__file__),filename),"Removed NAND and cleaned matrix store")
 
-    # clean the op store 
-    for hash in range(1<<op_store_exp):
-        mypy.clean_op_hash_chain(hash) 
+    # clean the op store (every hash chain, in one call)
+    sweep = mypy.sweep_op_store(0, -1)
+    print("cleaned %d op hash chains in %g seconds"
+          % (sweep.chains_cleaned, sweep.seconds))
 
     # print ops store report after deletion of a matrix
     mypy.op_store_report("stdout")
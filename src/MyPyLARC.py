@@ -80,4 +80,27 @@ gv.SWIG_TO_USE = 'mplSWIG'
 # larc_utilities is in larc/src/python
 sys.path.append(os.path.join(current_directory,'../larc/src/python'))
 from larc_utilities import *
-
+# numpy_io holds the MyPyLARC routines which use numpy buffers directly
+from numpy_io import *
+# chain_product multiplies lists of matrices in a balanced or cost-driven order
+from chain_product import *
+# circuit holds a small circuit representation which fuses gates before building
+from circuit import *
+# edge_files writes and maps the binary edge files loaded by read_edge_file
+from edge_files import *
+# vertex_order relabels graph vertices so adjacency matrices compress better
+from vertex_order import *
+# store_planner chooses init_params entries from the graph size and memory
+from store_planner import *
+# matrix_files loads and saves matrices in the JSON or binary format
+from matrix_files import *
+# matrix_cache keeps the results of expensive matrix builders on disk
+from matrix_cache import *
+# store_gc cleans the matrix store automatically, keeping a root set of matrices
+from store_gc import *
+# larc_matrix holds LarcMatrix, a handle which keeps its matrix held while live
+from larc_matrix import *
+# memo_counters returns the memo table counters as a dict or numpy array
+from memo_counters import *
+# memo_table sizes and cleans the memo table along with the LARC op store
+from memo_table import *
@@ -0,0 +1,675 @@
+//buffer_io.c
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+
+// Standard Libraries
+#include <stdio.h>
+#include <stdlib.h>
+#include <inttypes.h>
+#include <stdint.h>
+#include <string.h>
+#include <complex.h>
+#include <math.h>
+
+// Our header files structures and functions
+#include "buffer_io.h"
+
+/*!
+ * \file buffer_io.c
+ * \brief Transfer matrices between LARC and raw numeric buffers.
+ *
+ * These routines replace the map_to_str / row_major_list_to_store round trip
+ * (one Python string per element, parsed again in C) with a direct walk over
+ * the memory of a numpy array.
+ */
+
+// description of a row-major buffer; row_stride is counted in elements
+typedef struct buffer_desc {
+  const char *data;
+  int dtype;
+  size_t item_size;
+  int64_t row_stride;
+} buffer_desc_t;
+
+static size_t buffer_item_size(int dtype)
+{
+  switch (dtype)
+  {
+    case BUFFER_FLOAT64:    return sizeof(double);
+    case BUFFER_COMPLEX128: return 2*sizeof(double);
+    case BUFFER_INT64:      return sizeof(int64_t);
+  }
+  return 0;
+}
+
+// numeric value of a scalar from the matrix store, in the forms needed for
+// writing it into a buffer
+typedef struct scalar_number {
+  double re;
+  double im;
+  int64_t ival;
+} scalar_number_t;
+
+#if !defined(USE_COMPLEX) && !defined(USE_REAL) && !defined(USE_INTEGER) \
+  && !defined(USE_BOOLEAN) && !defined(USE_MPINTEGER) \
+  && !defined(USE_MPRATIONAL) && !defined(USE_MPREAL) && !defined(USE_MPCOMPLEX)
+// reads one real number, allowing the "p/q" form used for rationals
+static double parse_real_part(const char *str, char **end)
+{
+  double val = strtod(str, end);
+  if (**end == '/')
+  {
+    double denom = strtod(*end+1, end);
+    val /= denom;
+  }
+  return val;
+}
+
+// parses the output of sca_get_str for the scalarTypes which have no direct
+// numeric conversion below; accepts "x", "p/q", "x+I*y", "x-I*y" and "I*y"
+static void parse_scalar_string(const char *str, double *re, double *im)
+{
+  char *end;
+  *re = *im = 0.0;
+  while (*str == ' ') ++str;
+  if ((str[0] == 'I') || ((str[0] == '-') && (str[1] == 'I')))
+  {
+    double sign = (str[0] == '-') ? -1.0 : 1.0;
+    str += (str[0] == '-') ? 2 : 1;
+    *im = (*str == '*') ? sign*parse_real_part(str+1, &end) : sign;
+    return;
+  }
+  *re = parse_real_part(str, &end);
+  while (*end == ' ') ++end;
+  if (((end[0] == '+') || (end[0] == '-')) && (end[1] == 'I'))
+  {
+    double sign = (end[0] == '-') ? -1.0 : 1.0;
+    *im = (end[2] == '*') ? sign*parse_real_part(end+3, &end) : sign;
+  }
+}
+#endif
+
+// converts the scalar with packedID s_pID to double (and int64) form
+static void scalar_number_from_pID(int64_t s_pID, scalar_number_t *num)
+{
+  mats_ptr_t s_ptr = (mats_ptr_t)get_recordPTR_from_pID(s_pID, "",
+          __func__, 0);
+  num->im = 0.0;
+#if defined(USE_COMPLEX)
+  num->re = (double)creall(s_ptr->scalar_value);
+  num->im = (double)cimagl(s_ptr->scalar_value);
+  num->ival = (int64_t)llroundl(creall(s_ptr->scalar_value));
+#elif defined(USE_REAL)
+  num->re = (double)s_ptr->scalar_value;
+  num->ival = (int64_t)llroundl(s_ptr->scalar_value);
+#elif defined(USE_INTEGER) || defined(USE_BOOLEAN)
+  num->ival = (int64_t)s_ptr->scalar_value;
+  num->re = (double)num->ival;
+#elif defined(USE_MPINTEGER)
+  num->re = mpz_get_d(s_ptr->scalar_value);
+  num->ival = mpz_get_si(s_ptr->scalar_value);
+#elif defined(USE_MPRATIONAL)
+  num->re = mpq_get_d(s_ptr->scalar_value);
+  num->ival = (int64_t)llround(num->re);
+#elif defined(USE_MPREAL)
+  num->re = mpfr_get_d(s_ptr->scalar_value, MPFR_RNDN);
+  num->ival = (int64_t)llround(num->re);
+#elif defined(USE_MPCOMPLEX)
+  num->re = mpfr_get_d(mpc_realref(s_ptr->scalar_value), MPFR_RNDN);
+  num->im = mpfr_get_d(mpc_imagref(s_ptr->scalar_value), MPFR_RNDN);
+  num->ival = (int64_t)llround(num->re);
+#else
+  char *str = sca_get_str(s_ptr->scalar_value);
+  parse_scalar_string(str, &(num->re), &(num->im));
+  free(str);
+  num->ival = (int64_t)llround(num->re);
+#endif
+}
+
+// returns the base-2 logarithm of n, or -1 if n is not a power of two
+static int log2_of_dim(int64_t n)
+{
+  if ((n <= 0) || (n & (n-1))) return -1;
+  int level = 0;
+  while (((int64_t)1 << level) < n) ++level;
+  return level;
+}
+
+// enters the (row, col) element of the buffer into the scalar store
+static int64_t scalar_pID_from_buffer(const buffer_desc_t *b, int64_t row,
+        int64_t col, scalarType *scratch)
+{
+  const char *elem = b->data + (row*b->row_stride + col)*b->item_size;
+  long double re, im = 0.0L;
+  if (b->dtype == BUFFER_INT64)
+  {
+    int64_t v;
+    memcpy(&v, elem, sizeof(v));
+    re = (long double)v;
+  }
+  else
+  {
+    double v[2] = {0.0, 0.0};
+    memcpy(v, elem, b->item_size);
+    re = (long double)v[0];
+    im = (long double)v[1];
+  }
+  sca_set_2ldoubles(scratch, re, im);
+  return get_scalarPTR_for_scalarVal(*scratch)->packedID;
+}
+
+// recursively builds the 2^row_level by 2^col_level block of the buffer
+// whose top left corner is at (row, col)
+static int64_t build_from_buffer(const buffer_desc_t *b, int64_t row,
+        int64_t col, mat_level_t row_level, mat_level_t col_level,
+        scalarType *scratch)
+{
+  if ((row_level == 0) && (col_level == 0))
+    return scalar_pID_from_buffer(b, row, col, scratch);
+
+  int64_t panel[4];
+  panel[0] = panel[1] = panel[2] = panel[3] = MATRIX_ID_INVALID;
+  mat_level_t sub_row_level = row_level ? row_level-1 : 0;
+  mat_level_t sub_col_level = col_level ? col_level-1 : 0;
+  int64_t half_rows = row_level ? ((int64_t)1 << sub_row_level) : 0;
+  int64_t half_cols = col_level ? ((int64_t)1 << sub_col_level) : 0;
+
+  panel[0] = build_from_buffer(b, row, col, sub_row_level, sub_col_level,
+          scratch);
+  if (col_level)    // not a column vector
+    panel[1] = build_from_buffer(b, row, col+half_cols, sub_row_level,
+            sub_col_level, scratch);
+  if (row_level)    // not a row vector
+  {
+    panel[2] = build_from_buffer(b, row+half_rows, col, sub_row_level,
+            sub_col_level, scratch);
+    if (col_level)
+      panel[3] = build_from_buffer(b, row+half_rows, col+half_cols,
+              sub_row_level, sub_col_level, scratch);
+  }
+  return get_pID_from_four_sub_pIDs(panel[0], panel[1], panel[2], panel[3],
+          row_level, col_level);
+}
+
+int64_t buffer_to_store(const void *buf_data, int buf_dtype,
+        int64_t buf_rows, int64_t buf_cols)
+{
+  size_t item_size = buffer_item_size(buf_dtype);
+  if (item_size == 0)
+  {
+    printf("ERROR in %s: unrecognized buffer element type %d.\n",
+        __func__, buf_dtype);
+    return MATRIX_ID_INVALID;
+  }
+
+#ifndef IS_COMPLEX
+  if (buf_dtype == BUFFER_COMPLEX128)
+  {
+    printf("ERROR in %s: complex buffer given for a non-complex scalarType.\n",
+        __func__);
+    return MATRIX_ID_INVALID;
+  }
+#endif
+
+  int row_level = log2_of_dim(buf_rows);
+  int col_level = log2_of_dim(buf_cols);
+  if ((row_level < 0) || (col_level < 0))
+  {
+    printf("ERROR in %s: buffer dimensions %" PRId64 " x %" PRId64
+        " are not powers of two.\n", __func__, buf_rows, buf_cols);
+    return MATRIX_ID_INVALID;
+  }
+  if ((row_level > (int)max_level_allowed_matrixStore()) ||
+      (col_level > (int)max_level_allowed_matrixStore()))
+  {
+    printf("ERROR in %s: buffer dimensions exceed the maximum level %d.\n",
+        __func__, (int)max_level_allowed_matrixStore());
+    return MATRIX_ID_INVALID;
+  }
+
+  buffer_desc_t desc;
+  desc.data = (const char *)buf_data;
+  desc.dtype = buf_dtype;
+  desc.item_size = item_size;
+  desc.row_stride = buf_cols;
+
+  scalarType scratch;
+  sca_init(&scratch);
+  int64_t pID = build_from_buffer(&desc, 0, 0, (mat_level_t)row_level,
+          (mat_level_t)col_level, &scratch);
+  sca_clear(&scratch);
+  return pID;
+}
+
+// converted scalars, direct mapped on the low bits of the packedID; a
+// matrix usually holds few distinct scalars, so most lookups hit
+#define SCALAR_CACHE_SIZE 1024
+
+typedef struct scalar_cache {
+  int64_t pID[SCALAR_CACHE_SIZE];
+  scalar_number_t num[SCALAR_CACHE_SIZE];
+} scalar_cache_t;
+
+static void scalar_cache_init(scalar_cache_t *cache)
+{
+  for (int i = 0; i < SCALAR_CACHE_SIZE; ++i)
+    cache->pID[i] = MATRIX_ID_INVALID;
+}
+
+// returns the converted form of scalar s_pID, converting it if necessary
+static const scalar_number_t *scalar_cache_lookup(scalar_cache_t *cache,
+        int64_t s_pID)
+{
+  int slot = (int)((uint64_t)s_pID % SCALAR_CACHE_SIZE);
+  if (cache->pID[slot] != s_pID)
+  {
+    scalar_number_from_pID(s_pID, &(cache->num[slot]));
+    cache->pID[slot] = s_pID;
+  }
+  return &(cache->num[slot]);
+}
+
+// writes a converted scalar to one buffer element
+static void write_scalar_number(char *elem, int dtype, size_t item_size,
+        const scalar_number_t *num)
+{
+  if (dtype == BUFFER_INT64)
+    memcpy(elem, &(num->ival), sizeof(int64_t));
+  else
+  {
+    double v[2] = {num->re, num->im};
+    memcpy(elem, v, item_size);
+  }
+}
+
+// state shared by the recursive calls of store_to_buffer; the window is the
+// block of the matrix which is written to the buffer
+typedef struct export_state {
+  char *data;
+  int dtype;
+  size_t item_size;
+  int64_t win_row;
+  int64_t win_col;
+  int64_t win_rows;
+  int64_t win_cols;
+  scalar_cache_t cache;
+} export_state_t;
+
+// writes the scalar s_pID to buffer position (row, col)
+static void export_scalar(export_state_t *st, int64_t row, int64_t col,
+        int64_t s_pID)
+{
+  char *elem = st->data + (row*st->win_cols + col)*st->item_size;
+  write_scalar_number(elem, st->dtype, st->item_size,
+          scalar_cache_lookup(&(st->cache), s_pID));
+}
+
+// zeroes the num_rows x num_cols block at buffer position (row, col)
+static void export_zeros(export_state_t *st, int64_t row, int64_t col,
+        int64_t num_rows, int64_t num_cols)
+{
+  size_t row_bytes = (size_t)num_cols*st->item_size;
+  for (int64_t i = 0; i < num_rows; ++i)
+    memset(st->data + ((row+i)*st->win_cols + col)*st->item_size, 0,
+            row_bytes);
+}
+
+// writes the part of the submatrix m_pID (whose top left corner is at
+// matrix position (row, col)) that lies inside the window
+static void export_submatrix(export_state_t *st, int64_t m_pID, int64_t row,
+        int64_t col, mat_level_t row_level, mat_level_t col_level)
+{
+  int64_t lo_row = (row > st->win_row) ? row : st->win_row;
+  int64_t lo_col = (col > st->win_col) ? col : st->win_col;
+  int64_t hi_row = row + ((int64_t)1 << row_level);
+  int64_t hi_col = col + ((int64_t)1 << col_level);
+  if (hi_row > st->win_row + st->win_rows) hi_row = st->win_row + st->win_rows;
+  if (hi_col > st->win_col + st->win_cols) hi_col = st->win_col + st->win_cols;
+  if ((lo_row >= hi_row) || (lo_col >= hi_col)) return;
+
+  if ((row_level == 0) && (col_level == 0))
+  {
+    export_scalar(st, row - st->win_row, col - st->win_col, m_pID);
+    return;
+  }
+  if (matrix_is_zero(m_pID))
+  {
+    export_zeros(st, lo_row - st->win_row, lo_col - st->win_col,
+            hi_row - lo_row, hi_col - lo_col);
+    return;
+  }
+
+  mat_level_t sub_row_level = row_level ? row_level-1 : 0;
+  mat_level_t sub_col_level = col_level ? col_level-1 : 0;
+  int64_t half_rows = row_level ? ((int64_t)1 << sub_row_level) : 0;
+  int64_t half_cols = col_level ? ((int64_t)1 << sub_col_level) : 0;
+  export_submatrix(st, get_pID_of_indexed_submatrix(m_pID, 0), row, col,
+          sub_row_level, sub_col_level);
+  if (col_level)    // not a column vector
+    export_submatrix(st, get_pID_of_indexed_submatrix(m_pID, 1), row,
+            col+half_cols, sub_row_level, sub_col_level);
+  if (row_level)    // not a row vector
+  {
+    export_submatrix(st, get_pID_of_indexed_submatrix(m_pID, 2),
+            row+half_rows, col, sub_row_level, sub_col_level);
+    if (col_level)
+      export_submatrix(st, get_pID_of_indexed_submatrix(m_pID, 3),
+              row+half_rows, col+half_cols, sub_row_level, sub_col_level);
+  }
+}
+
+int store_to_buffer(void *buf_data, int buf_dtype, int64_t buf_rows,
+        int64_t buf_cols, int64_t m_pID, int64_t row_offset,
+        int64_t col_offset)
+{
+  size_t item_size = buffer_item_size(buf_dtype);
+  if (item_size == 0)
+  {
+    printf("ERROR in %s: unrecognized buffer element type %d.\n",
+        __func__, buf_dtype);
+    return -1;
+  }
+  if (matrix_is_invalid(m_pID))
+  {
+    printf("ERROR in %s: packedID %" PRId64 " is not a valid matrix.\n",
+        __func__, m_pID);
+    return -1;
+  }
+
+  mat_level_t row_level = matrix_row_level(m_pID);
+  mat_level_t col_level = matrix_col_level(m_pID);
+  if ((row_offset < 0) || (col_offset < 0) || (buf_rows < 0) ||
+      (buf_cols < 0) ||
+      (row_offset + buf_rows > ((int64_t)1 << row_level)) ||
+      (col_offset + buf_cols > ((int64_t)1 << col_level)))
+  {
+    printf("ERROR in %s: block of %" PRId64 " x %" PRId64 " at (%" PRId64
+        ", %" PRId64 ") does not fit in a level (%d, %d) matrix.\n",
+        __func__, buf_rows, buf_cols, row_offset, col_offset,
+        (int)row_level, (int)col_level);
+    return -1;
+  }
+
+  export_state_t *st = malloc(sizeof(export_state_t));
+  if (st == NULL)
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    return -1;
+  }
+  st->data = (char *)buf_data;
+  st->dtype = buf_dtype;
+  st->item_size = item_size;
+  st->win_row = row_offset;
+  st->win_col = col_offset;
+  st->win_rows = buf_rows;
+  st->win_cols = buf_cols;
+  scalar_cache_init(&(st->cache));
+
+  export_submatrix(st, m_pID, 0, 0, row_level, col_level);
+  free(st);
+  return 0;
+}
+
+// state shared by the recursive calls of the gather routines; entry k of
+// the request has coordinates (row[k], col[k]) and receives result[k]
+typedef struct gather_state {
+  const int64_t *row;
+  const int64_t *col;
+  int64_t *result;
+} gather_state_t;
+
+// reorders idx[lo..hi) so that requests with the given bit clear in their
+// coordinate come first, and returns the index of the first with it set
+static int64_t partition_on_bit(int64_t *idx, int64_t lo, int64_t hi,
+        const int64_t *coord, int64_t bit)
+{
+  while (lo < hi)
+  {
+    if (!(coord[idx[lo]] & bit)) ++lo;
+    else if (coord[idx[hi-1]] & bit) --hi;
+    else
+    {
+      int64_t t = idx[lo];
+      idx[lo++] = idx[hi-1];
+      idx[--hi] = t;
+    }
+  }
+  return lo;
+}
+
+// resolves requests idx[lo..hi), all of which lie inside submatrix m_pID;
+// the requests are split among the quadrants so that each node on a path
+// shared by several coordinates is visited only once
+static void gather_submatrix(gather_state_t *st, int64_t *idx, int64_t lo,
+        int64_t hi, int64_t m_pID, mat_level_t row_level,
+        mat_level_t col_level)
+{
+  if (lo == hi) return;
+  if ((row_level == 0) && (col_level == 0))
+  {
+    for (int64_t k = lo; k < hi; ++k) st->result[idx[k]] = m_pID;
+    return;
+  }
+  if (matrix_is_zero(m_pID))
+  {
+    for (int64_t k = lo; k < hi; ++k) st->result[idx[k]] = packedID_scalar0;
+    return;
+  }
+
+  mat_level_t sub_row_level = row_level ? row_level-1 : 0;
+  mat_level_t sub_col_level = col_level ? col_level-1 : 0;
+  // split on the row bit, then split each half on the column bit
+  int64_t mid = row_level ? partition_on_bit(idx, lo, hi, st->row,
+          (int64_t)1 << sub_row_level) : hi;
+  int64_t top_mid = col_level ? partition_on_bit(idx, lo, mid, st->col,
+          (int64_t)1 << sub_col_level) : mid;
+  int64_t bot_mid = col_level ? partition_on_bit(idx, mid, hi, st->col,
+          (int64_t)1 << sub_col_level) : hi;
+
+  if (top_mid > lo)
+    gather_submatrix(st, idx, lo, top_mid,
+            get_pID_of_indexed_submatrix(m_pID, 0),
+            sub_row_level, sub_col_level);
+  if (mid > top_mid)
+    gather_submatrix(st, idx, top_mid, mid,
+            get_pID_of_indexed_submatrix(m_pID, 1),
+            sub_row_level, sub_col_level);
+  if (bot_mid > mid)
+    gather_submatrix(st, idx, mid, bot_mid,
+            get_pID_of_indexed_submatrix(m_pID, 2),
+            sub_row_level, sub_col_level);
+  if (hi > bot_mid)
+    gather_submatrix(st, idx, bot_mid, hi,
+            get_pID_of_indexed_submatrix(m_pID, 3),
+            sub_row_level, sub_col_level);
+}
+
+// finds the scalar packedIDs at the coordinates (row[k], col[k]) of m_pID,
+// storing them in result[k]; returns 0 on success, -1 on error
+static int gather_pIDs(int64_t m_pID, const int64_t *row, const int64_t *col,
+        int64_t count, int64_t *result, const char *caller)
+{
+  if (matrix_is_invalid(m_pID))
+  {
+    printf("ERROR in %s: packedID %" PRId64 " is not a valid matrix.\n",
+        caller, m_pID);
+    return -1;
+  }
+  mat_level_t row_level = matrix_row_level(m_pID);
+  mat_level_t col_level = matrix_col_level(m_pID);
+  int64_t num_rows = (int64_t)1 << row_level;
+  int64_t num_cols = (int64_t)1 << col_level;
+  for (int64_t k = 0; k < count; ++k)
+  {
+    if ((row[k] < 0) || (row[k] >= num_rows) ||
+        (col[k] < 0) || (col[k] >= num_cols))
+    {
+      printf("ERROR in %s: coordinates (%" PRId64 ", %" PRId64 ") are "
+          "outside the level (%d, %d) matrix.\n", caller, row[k], col[k],
+          (int)row_level, (int)col_level);
+      return -1;
+    }
+  }
+
+  int64_t *idx = malloc(count*sizeof(int64_t));
+  if ((idx == NULL) && (count > 0))
+  {
+    printf("ERROR in %s: out of memory.\n", caller);
+    return -1;
+  }
+  for (int64_t k = 0; k < count; ++k) idx[k] = k;
+  gather_state_t st = {row, col, result};
+  gather_submatrix(&st, idx, 0, count, m_pID, row_level, col_level);
+  free(idx);
+  return 0;
+}
+
+int gather_scalar_pIDs(void *buf_data, int buf_dtype, int64_t buf_rows,
+        int64_t buf_cols, int64_t m_pID)
+{
+  if ((buf_dtype != BUFFER_INT64) || (buf_cols != 2))
+  {
+    printf("ERROR in %s: expected an N x 2 buffer of int64 coordinates.\n",
+        __func__);
+    return -1;
+  }
+  int64_t *coords = (int64_t *)buf_data;
+  int64_t *row = malloc(2*buf_rows*sizeof(int64_t));
+  if ((row == NULL) && (buf_rows > 0))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    return -1;
+  }
+  int64_t *col = row + buf_rows;
+  for (int64_t k = 0; k < buf_rows; ++k)
+  {
+    row[k] = coords[2*k];
+    col[k] = coords[2*k+1];
+  }
+  int64_t *result = malloc(buf_rows*sizeof(int64_t));
+  int ret = -1;
+  if ((result == NULL) && (buf_rows > 0))
+    printf("ERROR in %s: out of memory.\n", __func__);
+  else if (0 == (ret = gather_pIDs(m_pID, row, col, buf_rows, result,
+          __func__)))
+  {
+    for (int64_t k = 0; k < buf_rows; ++k) coords[2*k] = result[k];
+  }
+  free(result);
+  free(row);
+  return ret;
+}
+
+int gather_values(void *buf_data, int buf_dtype, int64_t buf_rows,
+        int64_t buf_cols, int64_t m_pID)
+{
+  size_t item_size = buffer_item_size(buf_dtype);
+  if ((item_size == 0) || (buf_cols != 2))
+  {
+    printf("ERROR in %s: expected an N x 2 buffer of coordinates.\n",
+        __func__);
+    return -1;
+  }
+  char *data = (char *)buf_data;
+  int64_t *row = malloc(3*buf_rows*sizeof(int64_t));
+  if ((row == NULL) && (buf_rows > 0))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    return -1;
+  }
+  int64_t *col = row + buf_rows;
+  int64_t *result = col + buf_rows;
+
+  // read the coordinates; in a float buffer they must be exact integers
+  for (int64_t k = 0; k < 2*buf_rows; ++k)
+  {
+    int64_t *dest = (k % 2) ? &col[k/2] : &row[k/2];
+    if (buf_dtype == BUFFER_INT64)
+      memcpy(dest, data + k*item_size, sizeof(int64_t));
+    else
+    {
+      double d;
+      memcpy(&d, data + k*item_size, sizeof(double));
+      if ((d != floor(d)) || (d < 0.0) || (d >= 9007199254740992.0))
+      {
+        printf("ERROR in %s: %g is not a usable coordinate.\n", __func__, d);
+        free(row);
+        return -1;
+      }
+      *dest = (int64_t)d;
+    }
+  }
+
+  int ret = gather_pIDs(m_pID, row, col, buf_rows, result, __func__);
+  if (ret == 0)
+  {
+    scalar_cache_t *cache = malloc(sizeof(scalar_cache_t));
+    if (cache == NULL)
+    {
+      printf("ERROR in %s: out of memory.\n", __func__);
+      ret = -1;
+    }
+    else
+    {
+      scalar_cache_init(cache);
+      for (int64_t k = 0; k < buf_rows; ++k)
+        write_scalar_number(data + 2*k*item_size, buf_dtype, item_size,
+            scalar_cache_lookup(cache, result[k]));
+      free(cache);
+    }
+  }
+  free(row);
+  return ret;
+}
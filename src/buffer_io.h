@@ -0,0 +1,155 @@
+//buffer_io.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+#ifndef MPL_BUFFER_IO_H
+#define MPL_BUFFER_IO_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* The functions in buffer_io.c move blocks of scalars between LARC and      *
+ * raw row-major memory buffers (such as the data of a C-contiguous numpy    *
+ * array) without creating a Python object or a string for each element.    *
+ * The SWIG interface in mplSWIG.i converts any Python object supporting     *
+ * the buffer protocol into the (data, dtype, rows, cols) argument group.    */
+
+/* element types understood by the buffer routines (numpy dtype in comment) */
+#define BUFFER_FLOAT64     0      /* numpy.float64    */
+#define BUFFER_COMPLEX128  1      /* numpy.complex128 */
+#define BUFFER_INT64       2      /* numpy.int64      */
+
+/*!
+ * \brief Create a LARC matrix from a row-major buffer of numbers
+ *
+ * The buffer holds num_rows x num_cols elements in C (row-major) order, and
+ * both dimensions must be powers of two. A buffer with a single column is
+ * loaded as a column vector. Each element is converted with
+ * sca_set_2ldoubles and entered with get_scalarPTR_for_scalarVal, so the
+ * scalarType rounding and region snapping are the same ones applied by
+ * row_major_list_to_store; the difference is that the value entering LARC
+ * is the binary value held in the buffer rather than a decimal string.
+ *
+ * \param buf_data Pointer to the first element of the buffer
+ * \param buf_dtype One of BUFFER_FLOAT64, BUFFER_COMPLEX128, BUFFER_INT64
+ * \param buf_rows The number of rows in the buffer
+ * \param buf_cols The number of columns in the buffer
+ * \result The packedID of the matrix, or MATRIX_ID_INVALID on error
+ */
+int64_t buffer_to_store(const void *buf_data, int buf_dtype,
+        int64_t buf_rows, int64_t buf_cols);
+
+/*!
+ * \brief Write a block of a LARC matrix into a row-major buffer of numbers
+ *
+ * The buffer receives the buf_rows x buf_cols block of the matrix whose top
+ * left entry is at (row_offset, col_offset). The block may be any size that
+ * fits inside the matrix. The quadtree is traversed once; zero submatrices
+ * are written with memset instead of being visited, and repeated scalars
+ * are converted to numbers only once. A float64 buffer receives the real
+ * part of complex scalars, and an int64 buffer receives integer scalars
+ * exactly (other scalars are rounded to the nearest integer).
+ *
+ * \param buf_data Pointer to the first element of the (writable) buffer
+ * \param buf_dtype One of BUFFER_FLOAT64, BUFFER_COMPLEX128, BUFFER_INT64
+ * \param buf_rows The number of rows in the buffer
+ * \param buf_cols The number of columns in the buffer
+ * \param m_pID The packedID of the matrix to be written
+ * \param row_offset The matrix row written to the first buffer row
+ * \param col_offset The matrix column written to the first buffer column
+ * \result 0 on success, -1 on error
+ */
+int store_to_buffer(void *buf_data, int buf_dtype, int64_t buf_rows,
+        int64_t buf_cols, int64_t m_pID, int64_t row_offset,
+        int64_t col_offset);
+
+/*!
+ * \brief Find the scalar packedIDs at many coordinates of one matrix
+ *
+ * The buffer is an N x 2 int64 array whose rows are (row, col) coordinates.
+ * The coordinates are sorted among the quadrants during a single descent of
+ * the quadtree, so nodes on paths shared by several coordinates are visited
+ * once. On return, the first column of each buffer row holds the packedID
+ * of the scalar at that coordinate (the second column is unchanged).
+ *
+ * \param buf_data Pointer to the first element of the (writable) buffer
+ * \param buf_dtype Must be BUFFER_INT64
+ * \param buf_rows The number of coordinates N
+ * \param buf_cols Must be 2
+ * \param m_pID The packedID of the matrix
+ * \result 0 on success, -1 on error
+ */
+int gather_scalar_pIDs(void *buf_data, int buf_dtype, int64_t buf_rows,
+        int64_t buf_cols, int64_t m_pID);
+
+/*!
+ * \brief Find the values at many coordinates of one matrix
+ *
+ * As gather_scalar_pIDs, except that the buffer may hold any of the buffer
+ * element types (float coordinates must be exact integers), and on return
+ * the first element of each buffer row holds the value of the scalar at that
+ * coordinate, converted as in store_to_buffer.
+ *
+ * \param buf_data Pointer to the first element of the (writable) buffer
+ * \param buf_dtype One of BUFFER_FLOAT64, BUFFER_COMPLEX128, BUFFER_INT64
+ * \param buf_rows The number of coordinates N
+ * \param buf_cols Must be 2
+ * \param m_pID The packedID of the matrix
+ * \result 0 on success, -1 on error
+ */
+int gather_values(void *buf_data, int buf_dtype, int64_t buf_rows,
+        int64_t buf_cols, int64_t m_pID);
+
+#endif
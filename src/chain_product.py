@@ -0,0 +1,133 @@
+#              chain_product.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+
+## \file chain_product.py
+#  \brief Multiplies a list of LARC matrices with a chosen association order.
+#
+#  Multiplying a long operator list left to right into an accumulator makes
+#  every intermediate product span the whole prefix of the list; these often
+#  compress much worse than products of shorter, balanced runs. The routine
+#  here is imported into the MyPyLARC namespace as mypy.chain_product.
+
+from __future__ import print_function, division
+
+import larc_utilities as lu
+
+__all__ = ['chain_product']
+
+
+##
+# \brief Formats a product tree of list indices as a string
+#
+# \param tree A list index, or a pair of trees
+# \return The tree with parentheses, for example "((0*1)*(2*3))"
+def _tree_string(tree):
+    if isinstance(tree, tuple):
+        return "(%s*%s)" % (_tree_string(tree[0]), _tree_string(tree[1]))
+    return str(tree)
+
+
+##
+# \brief Multiplies a list of LARC matrices in the order given by a strategy
+#
+# The orders are:
+#   - 'left': ((A0*A1)*A2)*..., the usual accumulator loop
+#   - 'balanced': adjacent pairs are multiplied in rounds, as in a tournament
+#   - 'cost': at each step the adjacent pair with the smallest estimated cost,
+#     the product of their LARCsizes (count_unique_nodes), is multiplied
+#
+# \param pIDs A nonempty list of matrixIDs with compatible dimensions
+# \param order 'balanced' (default), 'cost' or 'left'
+# \return A pair (pID, report): the matrixID of the product, and a dictionary
+#   with 'tree' (nested pairs of list indices), 'tree_string', 'order',
+#   'num_mults' and 'peak_matrices_in_store' (the largest value of
+#   num_matrices_in_store seen after each matrix_mult)
+def chain_product(pIDs, order='balanced'):
+    if len(pIDs) == 0:
+        raise ValueError("chain_product needs at least one matrix")
+    if order not in ('balanced', 'cost', 'left'):
+        raise ValueError("unknown chain_product order '%s'" % order)
+
+    # each item is [matrixID, tree, LARCsize (or None if not needed)]
+    items = [[pID, i, None] for i, pID in enumerate(pIDs)]
+    if order == 'cost':
+        for item in items:
+            item[2] = lu.count_unique_nodes(item[0])
+    report = {'order': order, 'num_mults': 0,
+              'peak_matrices_in_store': lu.num_matrices_in_store()}
+
+    while len(items) > 1:
+        # choose the list positions i whose pairs (i, i+1) are multiplied
+        if order == 'left':
+            starts = [0]
+        elif order == 'balanced':
+            starts = list(range(0, len(items) - 1, 2))
+        else:
+            starts = [min(range(len(items) - 1),
+                          key=lambda i: items[i][2] * items[i+1][2])]
+
+        for i in reversed(starts):
+            pID = lu.counted_matrix_mult(items[i][0], items[i+1][0])
+            report['peak_matrices_in_store'] = max(
+                report['peak_matrices_in_store'], lu.num_matrices_in_store())
+            size = lu.count_unique_nodes(pID) if order == 'cost' else None
+            items[i:i+2] = [[pID, (items[i][1], items[i+1][1]), size]]
+        report['num_mults'] += len(starts)
+
+    report['tree'] = items[0][1]
+    report['tree_string'] = _tree_string(items[0][1])
+    return items[0][0], report
@@ -0,0 +1,274 @@
+#              circuit.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+
+## \file circuit.py
+#  \brief A small reversible circuit representation which is compiled into
+#  a short list of LARC operators before any matrix is built.
+#
+#  A Circuit is a list of gates on wire indices. Its matrix is the product
+#  G_0 G_1 ... G_(m-1) of its gate matrices, in the order the gates were
+#  added, as when a script multiplies each new gate into an accumulator with
+#  circuit_mID = matrix_mult(circuit_mID, gate_mID). compile() cancels
+#  adjacent self-inverse pairs and fuses runs of gates into blocks on a few
+#  wires; build() makes one LARC operator per block, and product() multiplies
+#  the blocks with chain_product.
+
+from __future__ import print_function, division
+
+from collections import namedtuple
+import larc_utilities as lu
+from chain_product import chain_product
+
+__all__ = ['Circuit']
+
+
+## \brief One gate: the payload (None for NOT) is applied to the targets when
+#  every control is 1 and every negative control is 0.
+Gate = namedtuple('Gate', ['controls', 'neg_controls', 'targets', 'payload'])
+
+
+def _wires(gate):
+    return gate.controls | gate.neg_controls | gate.targets
+
+
+## \brief Returns True if the two gates are known to commute
+#
+# Gates on disjoint wires commute. Two NOT-type gates also commute when
+# neither one's target is among the other's wires (they may share controls).
+def _commute(g1, g2):
+    if not (_wires(g1) & _wires(g2)):
+        return True
+    if g1.payload is None and g2.payload is None:
+        return not (g1.targets & _wires(g2)) and not (g2.targets & _wires(g1))
+    return False
+
+
+## \brief Applies a NOT-type gate to a basis state given as a dict wire->bit
+def _apply_not_gate(gate, state):
+    if all(state[w] for w in gate.controls) and \
+       not any(state[w] for w in gate.neg_controls):
+        for w in gate.targets:
+            state[w] ^= 1
+
+
+##
+# \brief A reversible circuit built from NOT, CNOT, CCNOT and controlled gates
+class Circuit(object):
+
+    ##
+    # \brief Creates an empty circuit
+    #
+    # The gate builders of gate.c make operators on
+    # max_level_allowed_matrixStore() wires, so a circuit has that many.
+    #
+    # \param num_wires The number of wires (default: the LARC max level);
+    # any other value raises ValueError
+    def __init__(self, num_wires=None):
+        max_level = lu.max_level_allowed_matrixStore()
+        if num_wires is None:
+            num_wires = max_level
+        if num_wires != max_level:
+            raise ValueError("a circuit has max_level_allowed_matrixStore() "
+                             "= %d wires, not %d" % (max_level, num_wires))
+        self.num_wires = num_wires
+        self.gates = []
+        self.blocks = None
+        self.stats = {}
+
+    def _add(self, controls, neg_controls, targets, payload):
+        gate = Gate(frozenset(controls), frozenset(neg_controls),
+                    frozenset(targets), payload)
+        wires = list(gate.controls) + list(gate.neg_controls) + list(gate.targets)
+        if len(set(wires)) != len(wires) or not gate.targets:
+            raise ValueError("gate wires must be distinct, with a target")
+        if min(wires) < 0 or max(wires) >= self.num_wires:
+            raise ValueError("wire out of range 0 to %d" % (self.num_wires-1))
+        self.gates.append(gate)
+        self.blocks = None
+        return self
+
+    ## \brief Adds NOT gates on the given wires
+    def not_gate(self, *targets):
+        return self._add((), (), targets, None)
+
+    ## \brief Adds a CNOT gate (reverse logic triggers on a 0 control)
+    def cnot(self, control, target, is_reverse_logic=0):
+        if is_reverse_logic:
+            return self._add((), (control,), (target,), None)
+        return self._add((control,), (), (target,), None)
+
+    ## \brief Adds a CCNOT (Toffoli) gate
+    def ccnot(self, control1, control2, target):
+        return self._add((control1, control2), (), (target,), None)
+
+    ## \brief Adds a gate applying a 2x2 payload matrixID (None for NOT)
+    def controlled(self, controls, neg_controls, targets, payload_pID=None):
+        return self._add(controls, neg_controls, targets, payload_pID)
+
+    ##
+    # \brief Cancels self-inverse pairs and fuses gates into blocks
+    #
+    # A NOT-type gate cancels an identical gate found earlier when every gate
+    # in between commutes with it. The remaining gates are then grouped, in
+    # order, into blocks: a run of plain NOT gates becomes one NOT layer,
+    # and a run of NOT-type gates on at most max_block_wires wires becomes
+    # one local permutation. Gates with other payloads are their own block.
+    #
+    # \param max_block_wires The largest number of wires in a fused block
+    # \return self, with self.blocks and self.stats set
+    def compile(self, max_block_wires=3):
+        kept = []
+        cancelled = 0
+        for gate in self.gates:
+            if gate.payload is None:
+                for i in range(len(kept)-1, -1, -1):
+                    if kept[i] == gate:
+                        del kept[i]
+                        gate = None
+                        cancelled += 2
+                        break
+                    if not _commute(kept[i], gate):
+                        break
+            if gate is not None:
+                kept.append(gate)
+
+        blocks = []
+        for gate in kept:
+            last = blocks[-1] if blocks else None
+            if gate.payload is None and last is not None:
+                is_not = not (gate.controls or gate.neg_controls)
+                if last[0] == 'not' and is_not:
+                    last[1].append(gate)
+                    continue
+                if last[0] in ('not', 'perm'):
+                    wires = set(_wires(gate))
+                    for g in last[1]:
+                        wires |= _wires(g)
+                    if len(wires) <= max_block_wires:
+                        last[1].append(gate)
+                        last[0] = 'perm'
+                        continue
+                blocks.append(['not' if is_not else 'perm', [gate]])
+            elif gate.payload is None:
+                plain = not (gate.controls or gate.neg_controls)
+                blocks.append(['not' if plain else 'perm', [gate]])
+            else:
+                blocks.append(['controlled', [gate]])
+
+        self.blocks = blocks
+        self.stats = {'gates': len(self.gates), 'cancelled': cancelled,
+                      'blocks': len(blocks)}
+        return self
+
+    ##
+    # \brief Builds the LARC operator of one compiled block
+    def _build_block(self, kind, gates):
+        if kind == 'not':
+            # plain NOTs commute, and a NOT applied twice is the identity
+            wires = set()
+            for g in gates:
+                wires ^= set(g.targets)
+            if not wires:
+                return lu.get_identity_pID(self.num_wires)
+            targets = lu.intArray(len(wires))
+            for i, w in enumerate(sorted(wires)):
+                targets[i] = w
+            return lu.build_not_gates(targets, len(wires))
+        if kind == 'controlled':
+            g = gates[0]
+            return lu.build_controlled_gate(
+                sum(1 << w for w in g.controls),
+                sum(1 << w for w in g.neg_controls),
+                sum(1 << w for w in g.targets), g.payload)
+        if len(gates) == 1:
+            g = gates[0]
+            return lu.build_controlled_gate(
+                sum(1 << w for w in g.controls),
+                sum(1 << w for w in g.neg_controls),
+                sum(1 << w for w in g.targets), lu.cvar.packedID_NOT)
+        # the block matrix is g_0 g_1 ... g_k, so g_k acts on a state first
+        wires = sorted(set().union(*[_wires(g) for g in gates]))
+        wire_array = lu.intArray(len(wires))
+        for j, w in enumerate(wires):
+            wire_array[j] = w
+        perm = lu.intArray(2**len(wires))
+        for x in range(2**len(wires)):
+            state = dict((w, (x >> j) & 1) for j, w in enumerate(wires))
+            for g in reversed(gates):
+                _apply_not_gate(g, state)
+            perm[x] = sum(state[w] << j for j, w in enumerate(wires))
+        return lu.build_local_permutation_gate(wire_array, len(wires), perm)
+
+    ##
+    # \brief Builds the LARC operators of the compiled blocks
+    #
+    # \return The list of block matrixIDs, in circuit order
+    def build(self):
+        if self.blocks is None:
+            self.compile()
+        return [self._build_block(kind, gates) for kind, gates in self.blocks]
+
+    ##
+    # \brief Builds the matrix of the whole circuit
+    #
+    # \param order The chain_product association order
+    # \return A pair (pID, report) as returned by chain_product
+    def product(self, order='balanced'):
+        operators = self.build()
+        if not operators:
+            return lu.get_identity_pID(self.num_wires), {'tree_string': ''}
+        return chain_product(operators, order)
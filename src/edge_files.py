@@ -0,0 +1,224 @@
+#              edge_files.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+
+## \file edge_files.py
+#  \brief Reading and writing the binary edge files loaded by read_edge_file
+#  (see edge_io.h for the format).
+#
+#  An edge file holds the (row, col) pairs of a 0/1 adjacency matrix, with
+#  indices starting at 0, sorted by (row, col) and without repeats, after a
+#  32 byte header. The pairs are stored as uint32 when the number of
+#  vertices allows it and as uint64 otherwise, so a file can be memory
+#  mapped by numpy (edge_arrays_from_file) or by LARC (read_edge_file).
+
+from __future__ import print_function, division
+
+import gzip
+import struct
+import numpy as np
+
+__all__ = ['write_edge_file', 'edge_arrays_from_file', 'edges_from_text',
+           'edges_to_pID']
+
+EDGE_FILE_MAGIC = b"LARCEDGE"
+EDGE_FILE_VERSION = 1
+_header = struct.Struct("=8sIIQQ")
+
+
+##
+# \brief Sorts edges by (row, col) and removes repeats
+#
+# \param rows int64 array of row indices
+# \param cols int64 array of column indices
+# \return The pair (rows, cols) of sorted unique edges
+def _sorted_unique_edges(rows, cols):
+    order = np.lexsort((cols, rows))
+    rows = rows[order]
+    cols = cols[order]
+    if len(rows) > 1:
+        new = np.ones(len(rows), dtype=bool)
+        new[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        rows = rows[new]
+        cols = cols[new]
+    return rows, cols
+
+
+##
+# \brief Writes a binary edge file
+#
+# The edges are sorted by (row, col) and repeated edges are written once.
+#
+# \param filename The name of the file to write
+# \param rows Array-like of row indices, starting at 0
+# \param cols Array-like of column indices, starting at 0
+# \param num_vertices The matrix dimension (default: the largest index + 1)
+# \return The number of edges written
+def write_edge_file(filename, rows, cols, num_vertices=None):
+    rows = np.asarray(rows, dtype=np.int64).ravel()
+    cols = np.asarray(cols, dtype=np.int64).ravel()
+    if rows.shape != cols.shape:
+        raise ValueError("rows and cols must have the same length")
+    if len(rows) and (rows.min() < 0 or cols.min() < 0):
+        raise ValueError("edge indices must not be negative")
+    if num_vertices is None:
+        num_vertices = int(max(rows.max(), cols.max())) + 1 if len(rows) else 0
+    elif len(rows) and max(rows.max(), cols.max()) >= num_vertices:
+        raise ValueError("edge index out of range for %d vertices" % num_vertices)
+
+    rows, cols = _sorted_unique_edges(rows, cols)
+    index_dtype = np.uint32 if num_vertices <= 2**32 else np.uint64
+    pairs = np.empty((len(rows), 2), dtype=index_dtype)
+    pairs[:, 0] = rows
+    pairs[:, 1] = cols
+    with open(filename, "wb") as fp:
+        fp.write(_header.pack(EDGE_FILE_MAGIC, EDGE_FILE_VERSION,
+                              pairs.itemsize, num_vertices, len(pairs)))
+        pairs.tofile(fp)
+    return len(pairs)
+
+
+##
+# \brief Memory maps the edges of a binary edge file
+#
+# \param filename The name of the edge file
+# \return A triple (rows, cols, num_vertices), where rows and cols are
+# read-only views of the mapped file
+def edge_arrays_from_file(filename):
+    with open(filename, "rb") as fp:
+        header = fp.read(_header.size)
+    if len(header) < _header.size:
+        raise ValueError("%s is too short to be an edge file" % filename)
+    magic, version, index_bytes, num_vertices, num_edges = _header.unpack(header)
+    if magic != EDGE_FILE_MAGIC or version != EDGE_FILE_VERSION or \
+       index_bytes not in (4, 8):
+        raise ValueError("%s is not a version %d edge file"
+                         % (filename, EDGE_FILE_VERSION))
+    if num_edges == 0:
+        empty = np.zeros(0, dtype=np.uint32)
+        return empty, empty, num_vertices
+    pairs = np.memmap(filename, mode="r", offset=_header.size,
+                      dtype=np.uint32 if index_bytes == 4 else np.uint64,
+                      shape=(num_edges, 2))
+    return pairs[:, 0], pairs[:, 1], num_vertices
+
+
+##
+# \brief Reads the edges of a Matrix Market or tab separated text file
+#
+# Only the first two numbers of each entry are used. A Matrix Market file
+# (name ending in .mm or .mtx) gives the number of vertices in its size
+# line, and a symmetric one has the transposed entries added. For other
+# files the lines are edges "row col [...]", with comment lines starting
+# with '#' or '%', and the number of vertices is the largest index + 1 after
+# the shift. Names ending in .gz are read through gzip.
+#
+# \param filename The name of the text file
+# \param vertex_shift Added to every index so that indices start at 0
+# (the default -1 suits the 1-based indices of Matrix Market files)
+# \return A triple (rows, cols, num_vertices) of int64 arrays and an int
+def edges_from_text(filename, vertex_shift=-1):
+    opener = gzip.open if filename.endswith(".gz") else open
+    base = filename[:-3] if filename.endswith(".gz") else filename
+    num_vertices = None
+    with opener(filename, "rt") as fp:
+        if base.endswith((".mm", ".mtx")):
+            symmetric = "symmetric" in fp.readline().lower()
+            line = fp.readline()
+            while line.startswith("%") or not line.strip():
+                line = fp.readline()
+            size = line.split()
+            num_vertices = max(int(size[0]), int(size[1]))
+        else:
+            symmetric = False
+        edges = np.loadtxt(fp, dtype=np.int64, usecols=(0, 1), ndmin=2,
+                           comments=("#", "%"))
+    rows = edges[:, 0] + vertex_shift
+    cols = edges[:, 1] + vertex_shift
+    if symmetric:
+        rows, cols = np.concatenate((rows, cols)), np.concatenate((cols, rows))
+    if num_vertices is None:
+        num_vertices = int(max(rows.max(), cols.max())) + 1 if len(rows) else 0
+    return rows, cols, num_vertices
+
+
+##
+# \brief Loads edges held in memory into LARC as an adjacency matrix
+#
+# This is the in-memory counterpart of read_edge_file (see edges_to_store
+# in edge_io.c), for example to build a batch of new edges without
+# writing a file. Repeated edges are entered once.
+#
+# \param rows Array-like of row indices, starting at 0
+# \param cols Array-like of column indices, starting at 0
+# \param level The row and column level of the matrix
+# \return The packedID of the adjacency matrix in the LARC matrix store
+def edges_to_pID(rows, cols, level):
+    # the file routines above do not need LARC, so only import it here
+    import larc_utilities as lu
+    rows = np.asarray(rows, dtype=np.int64).ravel()
+    cols = np.asarray(cols, dtype=np.int64).ravel()
+    if rows.shape != cols.shape:
+        raise ValueError("rows and cols must have the same length")
+    rows, cols = _sorted_unique_edges(rows, cols)
+    pairs = np.empty((len(rows), 2), dtype=np.int64)
+    pairs[:, 0] = rows
+    pairs[:, 1] = cols
+    pID = lu.edges_to_store(pairs, level)
+    if pID == -1:
+        raise ValueError("edges_to_store failed for %d edges at level %d"
+                         % (len(pairs), level))
+    return pID
@@ -0,0 +1,1014 @@
+//edge_io.c
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+// Standard Libraries
+#include <stdio.h>
+#include <stdlib.h>
+#include <inttypes.h>
+#include <stdint.h>
+#include <string.h>
+#include <strings.h>
+#include <ctype.h>
+#include <pthread.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+// Our header files structures and functions
+#include "edge_io.h"
+#include "buffer_io.h"
+
+/*!
+ * \file edge_io.c
+ * \brief Build sparse matrices bottom-up from binary edge files, edge
+ * buffers and Matrix Market files.
+ */
+
+typedef struct edge_file_header {
+  char magic[8];
+  uint32_t version;
+  uint32_t index_bytes;
+  uint64_t num_vertices;
+  uint64_t num_edges;
+} edge_file_header_t;
+
+// the nodes of one level of the quadtree, sorted by (row, col)
+typedef struct node_list {
+  uint64_t *row;
+  uint64_t *col;
+  int64_t *pID;
+  int64_t count;
+} node_list_t;
+
+static int node_list_init(node_list_t *list, int64_t capacity)
+{
+  if (capacity < 1) capacity = 1;
+  list->row = malloc(capacity*sizeof(uint64_t));
+  list->col = malloc(capacity*sizeof(uint64_t));
+  list->pID = malloc(capacity*sizeof(int64_t));
+  list->count = 0;
+  return ((list->row == NULL) || (list->col == NULL) || (list->pID == NULL))
+      ? -1 : 0;
+}
+
+static void node_list_free(node_list_t *list)
+{
+  free(list->row);
+  free(list->col);
+  free(list->pID);
+}
+
+/* The distinct nodes of one level of a subtree that is built away from the
+ * matrix store.  Node i has the four quadrants sub[4*i] to sub[4*i+3], which
+ * are scalar packedIDs at level 1 and indices of nodes of the level below
+ * (or -1 for a zero quadrant) above it.  Repeated nodes are found with an
+ * open addressing hash table of node indices. */
+typedef struct node_table {
+  int64_t *sub;
+  int64_t count;
+  int64_t *slots;            // node indices, -1 if empty
+  uint64_t mask;
+  int64_t zero_sub;          // the quadrant used for a missing one
+} node_table_t;
+
+static int node_table_init(node_table_t *table, int64_t capacity,
+    int64_t zero_sub)
+{
+  if (capacity < 1) capacity = 1;
+  uint64_t num_slots = 2;
+  while (num_slots < 2*(uint64_t)capacity) num_slots *= 2;
+  table->sub = malloc(4*capacity*sizeof(int64_t));
+  table->slots = malloc(num_slots*sizeof(int64_t));
+  table->count = 0;
+  table->mask = num_slots - 1;
+  table->zero_sub = zero_sub;
+  if ((table->sub == NULL) || (table->slots == NULL)) return -1;
+  memset(table->slots, 0xff, num_slots*sizeof(int64_t));
+  return 0;
+}
+
+static void node_table_free(node_table_t *table)
+{
+  free(table->sub);
+  free(table->slots);
+}
+
+// the index of the node with quadrants sub, which is added if it is new
+static int64_t node_table_index(node_table_t *table, const int64_t sub[4])
+{
+  uint64_t h = 0;
+  for (int k = 0; k < 4; ++k)
+    h = (h ^ (uint64_t)sub[k]) * UINT64_C(0x9e3779b97f4a7c15);
+  for (h = (h ^ (h >> 29)) & table->mask; ; h = (h + 1) & table->mask)
+  {
+    int64_t i = table->slots[h];
+    if (i < 0) break;
+    if (memcmp(&table->sub[4*i], sub, 4*sizeof(int64_t)) == 0) return i;
+  }
+  memcpy(&table->sub[4*table->count], sub, 4*sizeof(int64_t));
+  table->slots[h] = table->count;
+  return table->count++;
+}
+
+static inline uint64_t edge_index(const unsigned char *data, int index_bytes,
+    int64_t i)
+{
+  if (index_bytes == 4) return ((const uint32_t *)data)[i];
+  return ((const uint64_t *)data)[i];
+}
+
+/* Merges the nodes of level - 1 in the list in (whose coordinates are in
+ * blocks of that level) into the nodes of level in the list out.  The two
+ * child rows 2r and 2r+1 of each parent row r are adjacent in the list, so
+ * the parents come out sorted by (row, col) as well.  If local is NULL the
+ * parents are stored in the matrix store; otherwise they are only added to
+ * the table local, out gets their indices in it, and nothing is done in
+ * the matrix store, so several threads can merge disjoint parts of a
+ * matrix at once. */
+static int merge_level(const node_list_t *in, node_list_t *out,
+    mat_level_t level, node_table_t *local)
+{
+  int64_t zero_pID = (local == NULL) ? get_zero_pID(level-1, level-1)
+      : local->zero_sub;
+  int64_t i = 0;
+  out->count = 0;
+  while (i < in->count)
+  {
+    uint64_t parent_row = in->row[i] >> 1;
+    int64_t a = i, a_end = i, b, b_end;
+    if ((in->row[i] & 1) == 0)
+      while ((a_end < in->count) && (in->row[a_end] == in->row[i])) a_end++;
+    b = b_end = a_end;
+    while ((b_end < in->count) && (in->row[b_end] == 2*parent_row + 1)) b_end++;
+
+    while ((a < a_end) || (b < b_end))
+    {
+      uint64_t parent_col;
+      if (a == a_end) parent_col = in->col[b] >> 1;
+      else if (b == b_end) parent_col = in->col[a] >> 1;
+      else parent_col = ((in->col[a] < in->col[b]) ? in->col[a] : in->col[b]) >> 1;
+
+      int64_t sub[4] = {zero_pID, zero_pID, zero_pID, zero_pID};
+      for ( ; (a < a_end) && ((in->col[a] >> 1) == parent_col); ++a)
+        sub[in->col[a] & 1] = in->pID[a];
+      for ( ; (b < b_end) && ((in->col[b] >> 1) == parent_col); ++b)
+        sub[2 + (in->col[b] & 1)] = in->pID[b];
+
+      int64_t pID = (local != NULL) ? node_table_index(local, sub)
+          : get_pID_from_four_sub_pIDs(sub[0], sub[1], sub[2], sub[3],
+              level, level);
+      if (pID == MATRIX_ID_INVALID) return -1;
+      out->row[out->count] = parent_row;
+      out->col[out->count] = parent_col;
+      out->pID[out->count] = pID;
+      out->count++;
+    }
+    i = b_end;
+  }
+  return 0;
+}
+
+/* Builds the matrix of a validated, sorted edge list held in the mapped
+ * file, starting from its entries as the nodes of level 0. */
+static int64_t build_from_edges(const unsigned char *data, int index_bytes,
+    int64_t num_edges, mat_level_t level)
+{
+  if (num_edges == 0) return get_zero_pID(level, level);
+  if (level == 0) return packedID_scalar1;
+
+  node_list_t lists[2];
+  if ((node_list_init(&lists[0], num_edges) != 0)
+      || (node_list_init(&lists[1], num_edges) != 0))
+  {
+    printf("ERROR in %s: out of memory for %" PRId64 " edges.\n",
+        __func__, num_edges);
+    node_list_free(&lists[0]);
+    node_list_free(&lists[1]);
+    return MATRIX_ID_INVALID;
+  }
+
+  // level 0: every entry is the scalar 1
+  node_list_t *in = &lists[0], *out = &lists[1];
+  for (int64_t i = 0; i < num_edges; ++i)
+  {
+    in->row[i] = edge_index(data, index_bytes, 2*i);
+    in->col[i] = edge_index(data, index_bytes, 2*i+1);
+    in->pID[i] = packedID_scalar1;
+  }
+  in->count = num_edges;
+
+  int64_t result = MATRIX_ID_INVALID;
+  mat_level_t l;
+  for (l = 1; l <= level; ++l)
+  {
+    if (merge_level(in, out, l, NULL) != 0)
+    {
+      printf("ERROR in %s: could not store a node at level %u.\n",
+          __func__, l);
+      break;
+    }
+    node_list_t *t = in; in = out; out = t;
+  }
+  if (l > level) result = in->pID[0];
+  node_list_free(&lists[0]);
+  node_list_free(&lists[1]);
+  return result;
+}
+
+/* The loader relies on the sort order, so check it (and the range) of an
+ * edge list before building. */
+static int check_edges(const unsigned char *data, int index_bytes,
+    uint64_t num_edges, uint64_t num_vertices, const char *caller)
+{
+  for (uint64_t i = 0; i < num_edges; ++i)
+  {
+    uint64_t row = edge_index(data, index_bytes, 2*i);
+    uint64_t col = edge_index(data, index_bytes, 2*i+1);
+    if ((row >= num_vertices) || (col >= num_vertices))
+    {
+      printf("ERROR in %s: edge %" PRIu64 " (%" PRIu64 ", %" PRIu64
+          ") is out of range.\n", caller, i, row, col);
+      return -1;
+    }
+    if (i > 0)
+    {
+      uint64_t prev_row = edge_index(data, index_bytes, 2*i-2);
+      uint64_t prev_col = edge_index(data, index_bytes, 2*i-1);
+      if ((row < prev_row) || ((row == prev_row) && (col <= prev_col)))
+      {
+        printf("ERROR in %s: edge %" PRIu64 " is out of order.\n",
+            caller, i);
+        return -1;
+      }
+    }
+  }
+  return 0;
+}
+
+int64_t read_edge_file(char *path, int level)
+{
+  int fd = open(path, O_RDONLY);
+  if (fd < 0)
+  {
+    printf("ERROR in %s: could not open %s.\n", __func__, path);
+    return MATRIX_ID_INVALID;
+  }
+  struct stat st;
+  if ((fstat(fd, &st) != 0) || (st.st_size < EDGE_FILE_HEADER_BYTES))
+  {
+    printf("ERROR in %s: %s is too short to be an edge file.\n",
+        __func__, path);
+    close(fd);
+    return MATRIX_ID_INVALID;
+  }
+  unsigned char *map = mmap(NULL, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+  close(fd);
+  if (map == MAP_FAILED)
+  {
+    printf("ERROR in %s: could not map %s.\n", __func__, path);
+    return MATRIX_ID_INVALID;
+  }
+  madvise(map, st.st_size, MADV_SEQUENTIAL);
+
+  int64_t result = MATRIX_ID_INVALID;
+  edge_file_header_t header;
+  memcpy(&header, map, sizeof(header));
+  const unsigned char *data = map + EDGE_FILE_HEADER_BYTES;
+  int index_bytes = header.index_bytes;
+
+  if ((memcmp(header.magic, EDGE_FILE_MAGIC, 8) != 0)
+      || (header.version != EDGE_FILE_VERSION)
+      || ((index_bytes != 4) && (index_bytes != 8))
+      || ((uint64_t)(st.st_size - EDGE_FILE_HEADER_BYTES)
+          != 2*index_bytes*header.num_edges))
+  {
+    printf("ERROR in %s: %s is not a version %d edge file.\n",
+        __func__, path, EDGE_FILE_VERSION);
+    goto done;
+  }
+
+  if (level < 0)
+    for (level = 0; (level < 63) && (((uint64_t)1 << level) < header.num_vertices);
+        ++level) ;
+  if ((mat_level_t)level > max_level_allowed_matrixStore()
+      || (((uint64_t)1 << level) < header.num_vertices))
+  {
+    printf("ERROR in %s: %" PRIu64 " vertices do not fit in level %d "
+        "(max level %u).\n", __func__, header.num_vertices, level,
+        max_level_allowed_matrixStore());
+    goto done;
+  }
+
+  if (check_edges(data, index_bytes, header.num_edges, header.num_vertices,
+      __func__) != 0)
+    goto done;
+
+  result = build_from_edges(data, index_bytes, header.num_edges, level);
+
+done:
+  munmap(map, st.st_size);
+  return result;
+}
+
+int64_t edges_to_store(const void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols, int level)
+{
+  if ((buf_dtype != BUFFER_INT64) || (buf_cols != 2))
+  {
+    printf("ERROR in %s: edges must be an int64 array with two columns.\n",
+        __func__);
+    return MATRIX_ID_INVALID;
+  }
+  if ((level < 0) || ((mat_level_t)level > max_level_allowed_matrixStore()))
+  {
+    printf("ERROR in %s: level %d is out of range (max level %u).\n",
+        __func__, level, max_level_allowed_matrixStore());
+    return MATRIX_ID_INVALID;
+  }
+  // negative indices become huge unsigned values and fail the range check
+  if (check_edges(buf_data, 8, buf_rows, (uint64_t)1 << level, __func__) != 0)
+    return MATRIX_ID_INVALID;
+  return build_from_edges(buf_data, 8, buf_rows, level);
+}
+/* The parallel Matrix Market reader calls into the matrix and scalar
+ * stores from one thread only.  First, each thread parses a byte range of
+ * the file body (split on line boundaries) into a run of entries, which it
+ * sorts by (row, col); an entry holds the index of its value string among
+ * the distinct strings of its run.  Each distinct string is then stored as
+ * a scalar once, and explicit zeros are dropped.  Next the rows of the
+ * matrix are split into num_bands bands of 2**band_level rows, which are
+ * aligned with the quadtree; each thread merges the slices of the sorted
+ * runs that fall in its bands and builds each band's subtree up to
+ * band_level in node tables of its own, with merge_level.  Finally a single
+ * thread stores the distinct nodes of the tables, bottom-up, and merges the
+ * levels above band_level. */
+
+// the smallest byte range worth giving to a thread of its own
+#ifndef MM_MIN_CHUNK_BYTES
+#define MM_MIN_CHUNK_BYTES (1 << 16)
+#endif
+
+// the longest value string accepted
+#define MM_MAX_VALUE_CHARS 127
+
+typedef struct mm_entry {
+  uint64_t row;
+  uint64_t col;
+  int64_t pID;               // the index of the value string until stored
+} mm_entry_t;
+
+typedef struct mm_parse_job {
+  const char *start;
+  const char *end;
+  int pattern;
+  int symmetric;
+  uint64_t num_rows;
+  uint64_t num_cols;
+  mm_entry_t *entries;       // the sorted run
+  int64_t count;
+  int64_t capacity;
+  int64_t lines;             // entry lines parsed
+  const char **values;       // the distinct value strings, in the file
+  int *value_len;
+  int64_t num_values;
+  int64_t values_capacity;
+  int64_t *value_slots;      // value indices, -1 if empty
+  uint64_t value_mask;
+  int error;
+} mm_parse_job_t;
+
+typedef struct mm_band_job {
+  int thread;
+  int num_threads;
+  const mm_parse_job_t *runs;
+  int num_runs;
+  int64_t num_bands;
+  mat_level_t band_level;
+  int64_t zero_scalar;       // the packedID of the scalar 0
+  node_list_t *bands;        // the nodes at band_level of each band
+  node_table_t *tables;      // the tables of levels 1 to band_level of each band
+  int error;
+} mm_band_job_t;
+
+// reads an unsigned decimal number, stopping at end; returns 0 on failure
+static int parse_uint(const char **p, const char *end, uint64_t *value)
+{
+  const char *q = *p;
+  while ((q < end) && ((*q == ' ') || (*q == '\t'))) q++;
+  if ((q == end) || !isdigit((unsigned char)*q)) return 0;
+  uint64_t v = 0;
+  while ((q < end) && isdigit((unsigned char)*q)) v = 10*v + (uint64_t)(*q++ - '0');
+  *p = q;
+  *value = v;
+  return 1;
+}
+
+static int add_mm_entry(mm_parse_job_t *job, uint64_t row, uint64_t col,
+    int64_t pID)
+{
+  if (job->count == job->capacity)
+  {
+    int64_t capacity = (job->capacity < 1024) ? 1024 : 2*job->capacity;
+    mm_entry_t *entries = realloc(job->entries, capacity*sizeof(mm_entry_t));
+    if (entries == NULL) return -1;
+    job->entries = entries;
+    job->capacity = capacity;
+  }
+  job->entries[job->count].row = row;
+  job->entries[job->count].col = col;
+  job->entries[job->count].pID = pID;
+  job->count++;
+  return 0;
+}
+
+static uint64_t hash_value_string(const char *token, int len)
+{
+  uint64_t h = UINT64_C(1469598103934665603);
+  for (int k = 0; k < len; ++k)
+    h = (h ^ (unsigned char)token[k]) * UINT64_C(1099511628211);
+  return h;
+}
+
+/* The index of a value string among the distinct value strings of a run,
+ * which it is added to if it is new; -1 if out of memory.  The strings are
+ * not copied, as they stay in the mapped file. */
+static int64_t mm_value_index(mm_parse_job_t *job, const char *token, int len)
+{
+  if (job->num_values == job->values_capacity)
+  {
+    int64_t capacity = (job->values_capacity < 64) ? 64 : 2*job->values_capacity;
+    const char **values = realloc(job->values, capacity*sizeof(char *));
+    if (values == NULL) return -1;
+    job->values = values;
+    int *value_len = realloc(job->value_len, capacity*sizeof(int));
+    if (value_len == NULL) return -1;
+    job->value_len = value_len;
+    int64_t *slots = malloc(2*capacity*sizeof(int64_t));
+    if (slots == NULL) return -1;
+    memset(slots, 0xff, 2*capacity*sizeof(int64_t));
+    free(job->value_slots);
+    job->value_slots = slots;
+    job->value_mask = 2*capacity - 1;
+    job->values_capacity = capacity;
+    for (int64_t i = 0; i < job->num_values; ++i)
+    {
+      uint64_t h = hash_value_string(job->values[i], job->value_len[i])
+          & job->value_mask;
+      while (slots[h] >= 0) h = (h + 1) & job->value_mask;
+      slots[h] = i;
+    }
+  }
+  uint64_t h = hash_value_string(token, len) & job->value_mask;
+  for ( ; job->value_slots[h] >= 0; h = (h + 1) & job->value_mask)
+  {
+    int64_t i = job->value_slots[h];
+    if ((job->value_len[i] == len) && (memcmp(job->values[i], token, len) == 0))
+      return i;
+  }
+  job->values[job->num_values] = token;
+  job->value_len[job->num_values] = len;
+  job->value_slots[h] = job->num_values;
+  return job->num_values++;
+}
+
+static int compare_mm_entries(const void *a, const void *b)
+{
+  const mm_entry_t *x = a, *y = b;
+  if (x->row != y->row) return (x->row < y->row) ? -1 : 1;
+  if (x->col != y->col) return (x->col < y->col) ? -1 : 1;
+  return 0;
+}
+
+static void *parse_mm_range(void *arg)
+{
+  mm_parse_job_t *job = arg;
+  const char *p = job->start, *end = job->end;
+  // the previous value token, since values often repeat
+  const char *last_token = NULL;
+  size_t last_len = 0;
+  int64_t last_index = -1;
+
+  while (p < end)
+  {
+    while ((p < end) && isspace((unsigned char)*p)) p++;
+    if (p == end) break;
+    if (*p == '%')
+    {
+      while ((p < end) && (*p != '\n')) p++;
+      continue;
+    }
+    uint64_t row, col;
+    if (!parse_uint(&p, end, &row) || !parse_uint(&p, end, &col)
+        || (row < 1) || (row > job->num_rows) || (col < 1) || (col > job->num_cols))
+    {
+      job->error = 1;
+      break;
+    }
+    int64_t pID = packedID_scalar1;
+    if (!job->pattern)
+    {
+      while ((p < end) && ((*p == ' ') || (*p == '\t'))) p++;
+      const char *token = p;
+      while ((p < end) && !isspace((unsigned char)*p)) p++;
+      size_t len = p - token;
+      if ((len == 0) || (len > MM_MAX_VALUE_CHARS))
+      {
+        job->error = 1;
+        break;
+      }
+      if ((len != last_len) || (memcmp(token, last_token, len) != 0))
+      {
+        last_index = mm_value_index(job, token, (int)len);
+        last_token = token;
+        last_len = len;
+      }
+      if (last_index < 0)
+      {
+        job->error = 1;
+        break;
+      }
+      pID = last_index;
+    }
+    while ((p < end) && (*p != '\n')) p++;
+    job->lines++;
+
+    if ((add_mm_entry(job, row-1, col-1, pID) != 0)
+        || (job->symmetric && (row != col)
+            && (add_mm_entry(job, col-1, row-1, pID) != 0)))
+    {
+      job->error = 1;
+      break;
+    }
+  }
+  if (!job->error && (job->count > 0))
+    qsort(job->entries, job->count, sizeof(mm_entry_t), compare_mm_entries);
+  return NULL;
+}
+
+/* Stores each distinct value string of a run as a scalar, replaces the
+ * value indices of its entries by the scalars and drops explicit zeros, as
+ * they are left out of a quadtree.  The run stays sorted. */
+static int store_mm_values(mm_parse_job_t *run)
+{
+  if (run->pattern) return 0;
+  int64_t *pIDs = malloc((run->num_values + 1)*sizeof(int64_t));
+  if (pIDs == NULL) return -1;
+  char value[MM_MAX_VALUE_CHARS + 1];
+  for (int64_t i = 0; i < run->num_values; ++i)
+  {
+    memcpy(value, run->values[i], run->value_len[i]);
+    value[run->value_len[i]] = '\0';
+    pIDs[i] = get_valID_from_valString(value);
+    if (pIDs[i] == MATRIX_ID_INVALID)
+    {
+      free(pIDs);
+      return -1;
+    }
+  }
+  int64_t kept = 0;
+  for (int64_t i = 0; i < run->count; ++i)
+  {
+    int64_t pID = pIDs[run->entries[i].pID];
+    if (pID == packedID_scalar0) continue;
+    run->entries[kept] = run->entries[i];
+    run->entries[kept].pID = pID;
+    kept++;
+  }
+  run->count = kept;
+  free(pIDs);
+  return 0;
+}
+
+// the first entry of a sorted run with row >= row
+static int64_t lower_bound_row(const mm_parse_job_t *run, uint64_t row)
+{
+  int64_t lo = 0, hi = run->count;
+  while (lo < hi)
+  {
+    int64_t mid = lo + (hi - lo)/2;
+    if (run->entries[mid].row < row) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+static void *build_mm_bands(void *arg)
+{
+  mm_band_job_t *job = arg;
+  int64_t *pos = malloc(2*job->num_runs*sizeof(int64_t));
+  if (pos == NULL)
+  {
+    job->error = 1;
+    return NULL;
+  }
+  int64_t *stop = pos + job->num_runs;
+
+  for (int64_t b = job->thread; b < job->num_bands; b += job->num_threads)
+  {
+    uint64_t first_row = (uint64_t)b << job->band_level;
+    uint64_t last_row = (uint64_t)(b+1) << job->band_level;
+    int64_t total = 0;
+    for (int r = 0; r < job->num_runs; ++r)
+    {
+      pos[r] = lower_bound_row(&job->runs[r], first_row);
+      stop[r] = lower_bound_row(&job->runs[r], last_row);
+      total += stop[r] - pos[r];
+    }
+    node_list_t lists[2];
+    if ((node_list_init(&lists[0], total) != 0)
+        || (node_list_init(&lists[1], total) != 0))
+    {
+      node_list_free(&lists[0]);
+      node_list_free(&lists[1]);
+      job->error = 1;
+      break;
+    }
+
+    // merge the slices of the sorted runs into one sorted list of level 0
+    node_list_t *in = &lists[0], *out = &lists[1];
+    while (in->count < total)
+    {
+      int best = -1;
+      for (int r = 0; r < job->num_runs; ++r)
+        if ((pos[r] < stop[r]) && ((best < 0) || (compare_mm_entries(
+            &job->runs[r].entries[pos[r]], &job->runs[best].entries[pos[best]]) < 0)))
+          best = r;
+      const mm_entry_t *e = &job->runs[best].entries[pos[best]++];
+      if ((in->count > 0) && (in->row[in->count-1] == e->row)
+          && (in->col[in->count-1] == e->col))
+      {
+        printf("ERROR in %s: entry (%" PRIu64 ", %" PRIu64 ") is repeated.\n",
+            __func__, e->row + 1, e->col + 1);
+        job->error = 1;
+        break;
+      }
+      in->row[in->count] = e->row;
+      in->col[in->count] = e->col;
+      in->pID[in->count] = e->pID;
+      in->count++;
+    }
+
+    // the band's nodes go into its own tables, not the matrix store
+    for (mat_level_t l = 1; (l <= job->band_level) && !job->error; ++l)
+    {
+      node_table_t *table = &job->tables[b*job->band_level + l-1];
+      if ((node_table_init(table, in->count,
+              (l == 1) ? job->zero_scalar : -1) != 0)
+          || (merge_level(in, out, l, table) != 0))
+        job->error = 1;
+      node_list_t *t = in; in = out; out = t;
+    }
+    node_list_free(out);
+    job->bands[b] = *in;
+    if (job->error) break;
+  }
+  free(pos);
+  return NULL;
+}
+
+/* Stores the nodes of the tables of a band in the matrix store, level by
+ * level, and replaces the table indices of the band's nodes by their
+ * packedIDs. */
+static int store_mm_band(node_list_t *band, const node_table_t *tables,
+    mat_level_t band_level)
+{
+  int64_t *below = NULL;     // the packedIDs of the level below
+  for (mat_level_t l = 1; l <= band_level; ++l)
+  {
+    const node_table_t *table = &tables[l-1];
+    int64_t *pIDs = malloc((table->count + 1)*sizeof(int64_t));
+    if (pIDs == NULL)
+    {
+      free(below);
+      return -1;
+    }
+    int64_t zero_pID = get_zero_pID(l-1, l-1);
+    for (int64_t i = 0; i < table->count; ++i)
+    {
+      int64_t sub[4];
+      for (int k = 0; k < 4; ++k)
+      {
+        int64_t s = table->sub[4*i + k];
+        sub[k] = (l == 1) ? s : ((s < 0) ? zero_pID : below[s]);
+      }
+      pIDs[i] = get_pID_from_four_sub_pIDs(sub[0], sub[1], sub[2], sub[3],
+          l, l);
+      if (pIDs[i] == MATRIX_ID_INVALID)
+      {
+        free(pIDs);
+        free(below);
+        return -1;
+      }
+    }
+    free(below);
+    below = pIDs;
+  }
+  if (band_level > 0)
+    for (int64_t i = 0; i < band->count; ++i) band->pID[i] = below[band->pID[i]];
+  free(below);
+  return 0;
+}
+
+int64_t read_matrixMarket_parallel(char *path, int level, int num_threads)
+{
+  int fd = open(path, O_RDONLY);
+  if (fd < 0)
+  {
+    printf("ERROR in %s: could not open %s.\n", __func__, path);
+    return MATRIX_ID_INVALID;
+  }
+  struct stat st;
+  if ((fstat(fd, &st) != 0) || (st.st_size == 0))
+  {
+    printf("ERROR in %s: %s is empty.\n", __func__, path);
+    close(fd);
+    return MATRIX_ID_INVALID;
+  }
+  const char *map = mmap(NULL, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+  close(fd);
+  if (map == MAP_FAILED)
+  {
+    printf("ERROR in %s: could not map %s.\n", __func__, path);
+    return MATRIX_ID_INVALID;
+  }
+  const char *end = map + st.st_size;
+  int64_t result = MATRIX_ID_INVALID;
+  mm_parse_job_t *runs = NULL;
+  mm_band_job_t *band_jobs = NULL;
+  node_list_t *bands = NULL;
+  node_table_t *tables = NULL;
+  pthread_t *threads = NULL;
+  int64_t num_bands = 0;
+  mat_level_t band_level = 0;
+
+  // banner: %%MatrixMarket matrix coordinate <field> <symmetry>
+  char banner[256], object[64], format[64], field[64], symmetry[64];
+  const char *p = memchr(map, '\n', st.st_size);
+  size_t len = (p == NULL) ? (size_t)st.st_size : (size_t)(p - map);
+  if (len >= sizeof(banner)) len = sizeof(banner) - 1;
+  memcpy(banner, map, len);
+  banner[len] = '\0';
+  if ((sscanf(banner, "%%%%MatrixMarket %63s %63s %63s %63s", object, format,
+          field, symmetry) != 4)
+      || strcasecmp(object, "matrix") || strcasecmp(format, "coordinate")
+      || (strcasecmp(field, "pattern") && strcasecmp(field, "integer")
+          && strcasecmp(field, "real"))
+      || (strcasecmp(symmetry, "general") && strcasecmp(symmetry, "symmetric")))
+  {
+    printf("ERROR in %s: %s is not a general or symmetric coordinate file of "
+        "pattern, integer or real entries.\n", __func__, path);
+    goto done;
+  }
+
+  // skip comments to the size line
+  p = (p == NULL) ? end : p + 1;
+  while ((p < end) && ((*p == '%') || (*p == '\n') || (*p == '\r')))
+    while ((p < end) && (*p++ != '\n')) ;
+  uint64_t num_rows, num_cols, nnz;
+  if (!parse_uint(&p, end, &num_rows) || !parse_uint(&p, end, &num_cols)
+      || !parse_uint(&p, end, &nnz))
+  {
+    printf("ERROR in %s: could not read the size line of %s.\n", __func__, path);
+    goto done;
+  }
+  while ((p < end) && (*p++ != '\n')) ;
+
+  uint64_t dim = (num_rows > num_cols) ? num_rows : num_cols;
+  if (level < 0)
+    for (level = 0; (level < 63) && (((uint64_t)1 << level) < dim); ++level) ;
+  if (((mat_level_t)level > max_level_allowed_matrixStore())
+      || (((uint64_t)1 << level) < dim))
+  {
+    printf("ERROR in %s: a %" PRIu64 " by %" PRIu64 " matrix does not fit in "
+        "level %d (max level %u).\n", __func__, num_rows, num_cols, level,
+        max_level_allowed_matrixStore());
+    goto done;
+  }
+
+  if (num_threads <= 0) num_threads = (int)sysconf(_SC_NPROCESSORS_ONLN);
+  if (num_threads < 1) num_threads = 1;
+  // small bodies are not worth splitting
+  if ((end - p) / MM_MIN_CHUNK_BYTES + 1 < num_threads)
+    num_threads = (int)((end - p) / MM_MIN_CHUNK_BYTES + 1);
+
+  runs = calloc(num_threads, sizeof(mm_parse_job_t));
+  threads = malloc(num_threads*sizeof(pthread_t));
+  if ((runs == NULL) || (threads == NULL))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    goto done;
+  }
+
+  // phase 1: parse and sort a range of lines in each thread
+  const char *start = p;
+  for (int t = 0; t < num_threads; ++t)
+  {
+    const char *stop = (t == num_threads - 1) ? end
+        : p + (end - p) * (int64_t)(t + 1) / num_threads;
+    if (stop < start) stop = start;
+    while ((stop < end) && (stop[-1] != '\n')) stop++;
+    runs[t].start = start;
+    runs[t].end = stop;
+    runs[t].pattern = (strcasecmp(field, "pattern") == 0);
+    runs[t].symmetric = (strcasecmp(symmetry, "symmetric") == 0);
+    runs[t].num_rows = num_rows;
+    runs[t].num_cols = num_cols;
+    start = stop;
+  }
+  int started = 0;
+  for ( ; started < num_threads; ++started)
+    if (pthread_create(&threads[started], NULL, parse_mm_range, &runs[started]) != 0)
+      break;
+  for (int t = 0; t < started; ++t) pthread_join(threads[t], NULL);
+  if (started < num_threads)
+    for (int t = started; t < num_threads; ++t) parse_mm_range(&runs[t]);
+  uint64_t lines = 0;
+  for (int t = 0; t < num_threads; ++t)
+  {
+    if (runs[t].error)
+    {
+      printf("ERROR in %s: could not parse an entry of %s (thread %d).\n",
+          __func__, path, t);
+      goto done;
+    }
+    lines += runs[t].lines;
+  }
+  if (lines != nnz)
+  {
+    printf("ERROR in %s: %s has %" PRIu64 " entries but its header says %"
+        PRIu64 ".\n", __func__, path, lines, nnz);
+    goto done;
+  }
+
+  // phase 2: store each distinct value string of each run once
+  for (int t = 0; t < num_threads; ++t)
+    if (store_mm_values(&runs[t]) != 0)
+    {
+      printf("ERROR in %s: could not store the values of %s.\n",
+          __func__, path);
+      goto done;
+    }
+
+  // phase 3: build the bands of rows concurrently, away from the store
+  int band_bits = 0;
+  while (((1 << band_bits) < num_threads) && (band_bits < level)) band_bits++;
+  num_bands = (int64_t)1 << band_bits;
+  band_level = level - band_bits;
+  bands = calloc(num_bands, sizeof(node_list_t));
+  tables = calloc(num_bands*band_level + 1, sizeof(node_table_t));
+  band_jobs = calloc(num_threads, sizeof(mm_band_job_t));
+  if ((bands == NULL) || (tables == NULL) || (band_jobs == NULL))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    goto done;
+  }
+  int64_t zero_scalar = get_zero_pID(0, 0);
+  for (int t = 0; t < num_threads; ++t)
+  {
+    band_jobs[t].thread = t;
+    band_jobs[t].num_threads = num_threads;
+    band_jobs[t].runs = runs;
+    band_jobs[t].num_runs = num_threads;
+    band_jobs[t].num_bands = num_bands;
+    band_jobs[t].band_level = band_level;
+    band_jobs[t].zero_scalar = zero_scalar;
+    band_jobs[t].bands = bands;
+    band_jobs[t].tables = tables;
+  }
+  for (started = 0; started < num_threads; ++started)
+    if (pthread_create(&threads[started], NULL, build_mm_bands, &band_jobs[started]) != 0)
+      break;
+  for (int t = 0; t < started; ++t) pthread_join(threads[t], NULL);
+  if (started < num_threads)
+    for (int t = started; t < num_threads; ++t) build_mm_bands(&band_jobs[t]);
+  for (int t = 0; t < num_threads; ++t)
+    if (band_jobs[t].error)
+    {
+      printf("ERROR in %s: could not build the rows of %s (thread %d).\n",
+          __func__, path, t);
+      goto done;
+    }
+
+  // phase 4: store the nodes of the bands in this thread
+  for (int64_t b = 0; b < num_bands; ++b)
+    if (store_mm_band(&bands[b], &tables[b*band_level], band_level) != 0)
+    {
+      printf("ERROR in %s: could not store the rows of %s.\n", __func__, path);
+      goto done;
+    }
+
+  // phase 5: merge the levels above the bands in this thread
+  int64_t total = 0;
+  for (int64_t b = 0; b < num_bands; ++b) total += bands[b].count;
+  if (total == 0)
+  {
+    result = get_zero_pID(level, level);
+    goto done;
+  }
+  node_list_t lists[2];
+  if ((node_list_init(&lists[0], total) != 0)
+      || (node_list_init(&lists[1], total) != 0))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    node_list_free(&lists[0]);
+    node_list_free(&lists[1]);
+    goto done;
+  }
+  node_list_t *in = &lists[0], *out = &lists[1];
+  for (int64_t b = 0; b < num_bands; ++b)
+  {
+    memcpy(in->row + in->count, bands[b].row, bands[b].count*sizeof(uint64_t));
+    memcpy(in->col + in->count, bands[b].col, bands[b].count*sizeof(uint64_t));
+    memcpy(in->pID + in->count, bands[b].pID, bands[b].count*sizeof(int64_t));
+    in->count += bands[b].count;
+  }
+  mat_level_t l;
+  for (l = band_level + 1; l <= (mat_level_t)level; ++l)
+  {
+    if (merge_level(in, out, l, NULL) != 0)
+    {
+      printf("ERROR in %s: could not store a node at level %u.\n",
+          __func__, l);
+      break;
+    }
+    node_list_t *t = in; in = out; out = t;
+  }
+  if (l > (mat_level_t)level) result = in->pID[0];
+  node_list_free(&lists[0]);
+  node_list_free(&lists[1]);
+
+done:
+  if (bands != NULL)
+    for (int64_t b = 0; b < num_bands; ++b) node_list_free(&bands[b]);
+  if (tables != NULL)
+    for (int64_t i = 0; i < num_bands*band_level; ++i)
+      node_table_free(&tables[i]);
+  if (runs != NULL)
+    for (int t = 0; t < num_threads; ++t)
+    {
+      free(runs[t].entries);
+      free(runs[t].values);
+      free(runs[t].value_len);
+      free(runs[t].value_slots);
+    }
+  free(bands);
+  free(tables);
+  free(band_jobs);
+  free(runs);
+  free(threads);
+  munmap((void *)map, st.st_size);
+  return result;
+}
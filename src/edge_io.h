@@ -0,0 +1,136 @@
+//edge_io.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+#ifndef MPL_EDGE_IO_H
+#define MPL_EDGE_IO_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* A binary edge file holds the nonzero entries of a 0/1 adjacency matrix.   *
+ * It starts with a 32 byte header                                           *
+ *     char     magic[8]       "LARCEDGE"                                    *
+ *     uint32_t version        EDGE_FILE_VERSION                             *
+ *     uint32_t index_bytes    4 or 8                                        *
+ *     uint64_t num_vertices   the matrix is num_vertices by num_vertices    *
+ *     uint64_t num_edges                                                    *
+ * followed by num_edges (row, col) pairs of unsigned integers of            *
+ * index_bytes bytes each, in native byte order. Indices start at 0, and     *
+ * the pairs are sorted by (row, col) with no repeats. Such files are        *
+ * written by edge_files.py.                                                 */
+
+#define EDGE_FILE_MAGIC "LARCEDGE"
+#define EDGE_FILE_VERSION 1
+#define EDGE_FILE_HEADER_BYTES 32
+
+/*!
+ * \brief Load a binary edge file into the matrix store as an adjacency matrix
+ *
+ * The file is memory mapped and the quadtree is built bottom-up, one level
+ * at a time: the sorted nodes of each level are merged, two rows at a time,
+ * into the sorted nodes of the level above with get_pID_from_four_sub_pIDs.
+ * Missing quadrants are the shared zero matrix of their level, so no work
+ * is done for zero blocks and no entry is inserted into a full matrix.
+ *
+ * \param path The name of the binary edge file
+ * \param level The row and column level of the matrix, or -1 for the
+ * smallest level that holds num_vertices
+ * \result The packedID of the adjacency matrix, or MATRIX_ID_INVALID on error
+ */
+int64_t read_edge_file(char *path, int level);
+
+/*!
+ * \brief Build an adjacency matrix from an array of edges in memory
+ *
+ * This is read_edge_file for edges that are already in memory, such as a
+ * batch of new edges held in a numpy array: the buffer holds one (row, col)
+ * pair of int64 indices per row, sorted by (row, col) with no repeats.
+ *
+ * \param buf_data The edges, buf_rows x 2 int64 values in row-major order
+ * \param buf_dtype Must be BUFFER_INT64
+ * \param buf_rows The number of edges
+ * \param buf_cols Must be 2
+ * \param level The row and column level of the matrix
+ * \result The packedID of the adjacency matrix, or MATRIX_ID_INVALID on error
+ */
+int64_t edges_to_store(const void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols, int level);
+
+/*!
+ * \brief Read a Matrix Market coordinate file using several threads
+ *
+ * This reads the same files as read_matrixMarketExchange_file for general
+ * or symmetric matrices of pattern, integer or real entries. The body of
+ * the memory mapped file is split on line boundaries into one byte range
+ * per thread, and each thread parses its range into a run of entries
+ * sorted by (row, col), keeping each distinct value string once, and the
+ * calling thread stores each of those strings with get_valID_from_valString.
+ * The rows of the matrix are then split into bands aligned with the
+ * quadtree, and each thread k-way merges the runs of its bands and builds
+ * their subtrees in node tables of its own, in which repeated nodes are
+ * kept once. The threads make no calls into the matrix or scalar stores:
+ * the calling thread then stores each node of the tables with
+ * get_pID_from_four_sub_pIDs and builds the levels above the bands.
+ *
+ * \param path The name of the Matrix Market file
+ * \param level The row and column level of the matrix, or -1 for the
+ * smallest level that holds the matrix
+ * \param num_threads The number of threads, or 0 for one per online CPU
+ * \result The packedID of the matrix, or MATRIX_ID_INVALID on error
+ */
+int64_t read_matrixMarket_parallel(char *path, int level, int num_threads);
+
+#endif
@@ -66,6 +66,7 @@
 // Our header files structures and functions
 // #include "../larc/src/global.h"
 // #include "../larc/src/matrix_store.h"
+#include "kron_cache.h"
 #include "gate.h"
 
 /*!
@@ -80,6 +81,9 @@
  * NOT to all given targets simultaneously.
  */
 
+// partial products of earlier NOT layers, keyed by their leading bits
+static kron_cache_t *not_layer_cache = NULL;
+
 int64_t build_not_gates(int* targets, int num_targets)
 {
 
@@ -91,18 +95,58 @@ int64_t build_not_gates(int* targets, int num_targets)
   { bitflags ^= ((uint64_t)1 << targets[i]); }
   
   // LARC has global variables for the matrixIDs of the 2x2 identity (packedID_I1)
-  // and NOT matrix (packedID_NOT). We also need the scalar1 for the initial state
-  // of out_pID.
+  // and NOT matrix (packedID_NOT); these are factors 0 and 1 of the cache.
+  int64_t factors[2] = { packedID_I1, packedID_NOT };
+  if (not_layer_cache == NULL)
+    not_layer_cache = kron_cache_create(2, factors);
+  else
+    kron_cache_set_factors(not_layer_cache, factors);
+  if (not_layer_cache == NULL)
+    return -1;
 
-  int64_t out_pID = packedID_scalar1;
+  int codes[64];
+  for (int bit_index = 0; bit_index < max_level; ++bit_index)
+    codes[bit_index] = (bitflags>>bit_index)&1;
 
-  // recursively construct 2^n by 2^n matrix starting with scalar 1 value
-  for (int bit_index = max_level-1; bit_index >= 0; --bit_index)
+  // construct the 2^n by 2^n matrix, reusing the longest matching run of
+  // low-index factors from an earlier call
+  return kron_cache_build(not_layer_cache, codes, max_level);
+}
+
+int not_gates_levels_reused(void)
+{
+  if (not_layer_cache == NULL)
+    return 0;
+  return kron_cache_levels_reused(not_layer_cache);
+}
+
+// the held 2x2 projectors P00 = |0><0| and P11 = |1><1|, built on first use
+static int64_t projector_pIDs[2] = { MATRIX_ID_INVALID, MATRIX_ID_INVALID };
+
+int64_t get_projector_pID(int bit)
+{
+  if ((bit != 0) && (bit != 1))
   {
-    int64_t pID_loop = ((bitflags>>bit_index)&1) ? packedID_NOT : packedID_I1;
-    out_pID = kronecker_product(pID_loop, out_pID);
+    printf("ERROR in %s: bit must be 0 or 1, not %d.\n", __func__, bit);
+    return MATRIX_ID_INVALID;
   }
-  return out_pID;
+  if ((projector_pIDs[bit] == MATRIX_ID_INVALID) ||
+      matrix_is_invalid(projector_pIDs[bit]))
+  {
+    int64_t panel[4];
+    panel[0] = packedID_scalar1;
+    panel[1] = panel[2] = panel[3] = packedID_scalar0;
+    projector_pIDs[0] = get_pID_from_four_sub_pIDs(panel[0], panel[1],
+            panel[2], panel[3], 1, 1);
+    panel[3] = panel[0];
+    panel[0] = panel[1];
+    projector_pIDs[1] = get_pID_from_four_sub_pIDs(panel[0], panel[1],
+            panel[2], panel[3], 1, 1);
+    // hold them so they survive clean_matrix_storage
+    set_hold_matrix(projector_pIDs[0]);
+    set_hold_matrix(projector_pIDs[1]);
+  }
+  return projector_pIDs[bit];
 }
 
 int64_t build_cnot_gate(int control, int target, int is_reverse_logic)
@@ -128,15 +172,8 @@ int64_t build_cnot_gate(int control, int target, int is_reverse_logic)
   int64_t t0_pID = (is_reverse_logic) ? packedID_NOT : packedID_I1;
   int64_t t1_pID = (is_reverse_logic) ? packedID_I1 : packedID_NOT;
 
-  int64_t panel[4];
-  panel[0] = packedID_scalar1;
-  panel[1] = panel[2] = panel[3] = packedID_scalar0;
-  int64_t packedID_P00 = get_pID_from_four_sub_pIDs(panel[0], panel[1],
-          panel[2], panel[3], 1, 1);
-  panel[3] = panel[0];
-  panel[0] = panel[1];
-  int64_t packedID_P11 = get_pID_from_four_sub_pIDs(panel[0], panel[1],
-          panel[2], panel[3], 1, 1);
+  int64_t packedID_P00 = get_projector_pID(0);
+  int64_t packedID_P11 = get_projector_pID(1);
 
   // recursively construct 2^n x 2^n matrix starting with scalar 1 value
   tmp0_pID = tmp1_pID = packedID_scalar1;
@@ -197,15 +234,8 @@ int64_t build_ccnot_gate(int control1, int control2, int target)
   int64_t  tmp01_pID, tmp10_pID, tmp11_pID;
   int64_t  tmp1x_sum_pID;
 
-  int64_t panel[4];
-  panel[0] = packedID_scalar1;
-  panel[1] = panel[2] = panel[3] = packedID_scalar0;
-  int64_t packedID_P00 = get_pID_from_four_sub_pIDs(panel[0], panel[1],
-             panel[2], panel[3], 1, 1);
-  panel[3] = panel[0];
-  panel[0] = panel[1];
-  int64_t packedID_P11 = get_pID_from_four_sub_pIDs(panel[0], panel[1],
-             panel[2], panel[3], 1, 1);
+  int64_t packedID_P00 = get_projector_pID(0);
+  int64_t packedID_P11 = get_projector_pID(1);
 
   // recursively construct Ccnot gate starting with scalar 1 value
   tmp01_pID = tmp10_pID = tmp11_pID = packedID_scalar1;
@@ -243,3 +273,163 @@ int64_t build_ccnot_gate(int control1, int control2, int target)
 
 }
 
+int64_t build_controlled_gate(uint64_t control_mask, uint64_t neg_control_mask,
+        uint64_t target_mask, int64_t payload_pID)
+{
+  mat_level_t max_level = max_level_allowed_matrixStore();
+  uint64_t all_wires = (max_level >= 64) ? ~(uint64_t)0
+      : (((uint64_t)1 << max_level) - 1);
+
+  if (control_mask & neg_control_mask)
+  {
+    printf("ERROR in %s: a wire cannot be both a control and a negative control.\n",
+        __func__);
+    return -1;
+  }
+
+  if (target_mask == 0)
+  {
+    printf("ERROR in %s: there must be at least one target.\n", __func__);
+    return -1;
+  }
+
+  if (target_mask & (control_mask | neg_control_mask))
+  {
+    printf("ERROR in %s: a target cannot also be a control.\n", __func__);
+    return -1;
+  }
+
+  if ((control_mask | neg_control_mask | target_mask) & ~all_wires)
+  {
+    printf("ERROR in %s: wire index out of valid range 0 to %d.\n",
+        __func__, (int)max_level - 1);
+    return -1;
+  }
+
+  if (matrix_is_invalid(payload_pID) || (matrix_row_level(payload_pID) != 1)
+      || (matrix_col_level(payload_pID) != 1))
+  {
+    printf("ERROR in %s: the payload must be a valid 2x2 matrix.\n",
+        __func__);
+    return -1;
+  }
+
+  int64_t packedID_P00 = get_projector_pID(0);
+  int64_t packedID_P11 = get_projector_pID(1);
+
+  // The gate is I + active - passive, where both chains carry the control
+  // projectors (P11 for a control, P00 for a negative control): active has
+  // the payload on the targets and passive has the identity there. So the
+  // payload acts exactly on the states where every control is satisfied.
+  int64_t active_pID, passive_pID;
+  active_pID = passive_pID = packedID_scalar1;
+  for (int bit_index = max_level-1; bit_index >= 0; --bit_index)
+  {
+    uint64_t bit = (uint64_t)1 << bit_index;
+    if (control_mask & bit)
+    {
+      active_pID = kronecker_product(packedID_P11, active_pID);
+      passive_pID = kronecker_product(packedID_P11, passive_pID);
+    }
+    else if (neg_control_mask & bit)
+    {
+      active_pID = kronecker_product(packedID_P00, active_pID);
+      passive_pID = kronecker_product(packedID_P00, passive_pID);
+    }
+    else if (target_mask & bit)
+    {
+      active_pID = kronecker_product(payload_pID, active_pID);
+      passive_pID = kronecker_product(packedID_I1, passive_pID);
+    }
+    else
+    {
+      active_pID = kronecker_product(packedID_I1, active_pID);
+      passive_pID = kronecker_product(packedID_I1, passive_pID);
+    }
+  }
+
+  int64_t change_pID = matrix_diff(active_pID, passive_pID);
+  return matrix_add(get_identity_pID(max_level), change_pID);
+}
+
+// the held 2x2 matrix units E_ab = |a><b|, indexed by 2*a+b, built on first
+// use (E_00 and E_11 are the projectors P00 and P11)
+static int64_t unit_pIDs[4] = { MATRIX_ID_INVALID, MATRIX_ID_INVALID,
+                                MATRIX_ID_INVALID, MATRIX_ID_INVALID };
+
+static int64_t get_matrix_unit_pID(int a, int b)
+{
+  int index = 2*a + b;
+  if ((unit_pIDs[index] == MATRIX_ID_INVALID) ||
+      matrix_is_invalid(unit_pIDs[index]))
+  {
+    for (int k = 0; k < 4; ++k)
+    {
+      int64_t panel[4];
+      panel[0] = panel[1] = panel[2] = panel[3] = packedID_scalar0;
+      panel[k] = packedID_scalar1;
+      unit_pIDs[k] = get_pID_from_four_sub_pIDs(panel[0], panel[1],
+              panel[2], panel[3], 1, 1);
+      set_hold_matrix(unit_pIDs[k]);
+    }
+  }
+  return unit_pIDs[index];
+}
+
+int64_t build_local_permutation_gate(int *wires, int num_wires, int *perm)
+{
+  mat_level_t max_level = max_level_allowed_matrixStore();
+
+  if ((num_wires < 1) || (num_wires > 8))
+  {
+    printf("ERROR in %s: num_wires (= %d) out of valid range 1 to 8.\n",
+        __func__, num_wires);
+    return -1;
+  }
+
+  int num_states = 1 << num_wires;
+  uint64_t used = 0;
+  for (int j = 0; j < num_wires; ++j)
+  {
+    if ((wires[j] < 0) || (wires[j] >= max_level) ||
+        (used & ((uint64_t)1 << wires[j])))
+    {
+      printf("ERROR in %s: wire %d is out of range or repeated.\n",
+          __func__, wires[j]);
+      return -1;
+    }
+    used |= (uint64_t)1 << wires[j];
+  }
+  int seen[256] = {0};
+  for (int x = 0; x < num_states; ++x)
+  {
+    if ((perm[x] < 0) || (perm[x] >= num_states) || seen[perm[x]]++)
+    {
+      printf("ERROR in %s: perm is not a permutation of 0 to %d.\n",
+          __func__, num_states - 1);
+      return -1;
+    }
+  }
+
+  // The gate is the sum over local states x of |perm[x]><x| on the wires
+  // (bit j of a local state is the value of wires[j]) and I elsewhere.
+  int64_t sum_pID = MATRIX_ID_INVALID;
+  for (int x = 0; x < num_states; ++x)
+  {
+    int64_t term_pID = packedID_scalar1;
+    for (int bit_index = max_level-1; bit_index >= 0; --bit_index)
+    {
+      int64_t factor_pID = packedID_I1;
+      for (int j = 0; j < num_wires; ++j)
+      {
+        if (wires[j] != bit_index) continue;
+        factor_pID = get_matrix_unit_pID((perm[x] >> j) & 1, (x >> j) & 1);
+        break;
+      }
+      term_pID = kronecker_product(factor_pID, term_pID);
+    }
+    sum_pID = (sum_pID == MATRIX_ID_INVALID) ? term_pID
+        : matrix_add(sum_pID, term_pID);
+  }
+  return sum_pID;
+}
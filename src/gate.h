@@ -80,6 +80,19 @@
  */
 int64_t build_not_gates(int *targets, int num_targets);
 
+/*!
+ * \brief Report how many levels of the most recent build_not_gates matrix
+ * were reused from earlier calls
+ *
+ * The NOT layers are built low-index wire first, and every partial
+ * Kronecker product is remembered, so a layer which begins with the same
+ * pattern of NOT and identity as an earlier layer only computes the levels
+ * after the shared run.
+ *
+ * \result The number of levels (out of the matrix level) that were reused
+ */
+int not_gates_levels_reused(void);
+
 /*!
  * \brief Create a matrix which applies a controlled-NOT gate to a circuit
  *
@@ -114,5 +127,54 @@ int64_t build_cnot_gate(int control, int target, int is_reverse_logic);
  */
 int64_t build_ccnot_gate(int control1, int control2, int target);
 
+/*!
+ * \brief Return the matrixID of a one wire projector
+ *
+ * The projectors P00 (onto |0>) and P11 (onto |1>) are built once and held,
+ * so that they survive clean_matrix_storage; they are rebuilt if they are
+ * found to be no longer in the matrix store.
+ *
+ * \param bit 0 for P00, 1 for P11
+ * \result The matrixID of the 2x2 projector
+ */
+int64_t get_projector_pID(int bit);
+
+/*!
+ * \brief Create a matrix which applies a multiply-controlled gate to a circuit
+ *
+ * The 2x2 payload is applied to every target wire, on exactly those states
+ * in which every wire in control_mask has value 1 and every wire in
+ * neg_control_mask has value 0; all other states are unchanged. For example
+ * a k-controlled NOT has k bits in control_mask and payload packedID_NOT.
+ * Wire i corresponds to bit i of the masks. The matrix is built with two
+ * chains of max_level Kronecker products and one sum and one difference.
+ *
+ * \param control_mask The wires which must be 1 (positive controls)
+ * \param neg_control_mask The wires which must be 0 (negative controls)
+ * \param target_mask The wires to which the payload is applied
+ * \param payload_pID The matrixID of the 2x2 payload matrix
+ * \result The matrixID for the gate matrix
+ *
+ */
+int64_t build_controlled_gate(uint64_t control_mask, uint64_t neg_control_mask,
+        uint64_t target_mask, int64_t payload_pID);
+
+/*!
+ * \brief Create a matrix which permutes the states of a few wires
+ *
+ * Any reversible gate (or fused run of NOT, CNOT and CCNOT gates) acting on
+ * a small set of wires is a permutation of the states of those wires. Bit j
+ * of a local state is the value of wires[j]; the matrix sends local state x
+ * to local state perm[x] and leaves the other wires unchanged. It is built
+ * as a sum of 2^num_wires Kronecker chains of 2x2 matrix units.
+ *
+ * \param wires An array of distinct wire indices
+ * \param num_wires The size of the wires array (at most 8)
+ * \param perm An array of 2^num_wires entries holding a permutation
+ * \result The matrixID for the gate matrix
+ *
+ */
+int64_t build_local_permutation_gate(int *wires, int num_wires, int *perm);
+
 
 #endif
@@ -0,0 +1,208 @@
+//kron_cache.c
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+// Standard Libraries
+#include <stdio.h>
+#include <stdlib.h>
+#include <inttypes.h>
+#include <stdint.h>
+#include <string.h>
+
+// Our header files structures and functions
+#include "kron_cache.h"
+
+/*!
+ * \file kron_cache.c
+ * \brief A trie of partial Kronecker products, used to build layers of
+ * one qubit gates which share their low-index gates with earlier layers.
+ */
+
+// one node of the trie; pID is the product of the factors on the path from
+// the root, and child[c] extends that product by factor c
+typedef struct kron_node {
+  int64_t pID;
+  struct kron_node **child;
+} kron_node_t;
+
+struct kron_cache {
+  int num_codes;
+  int64_t *code_pIDs;
+  kron_node_t root;          // the empty product, i.e. scalar 1
+  int last_levels_reused;
+};
+
+static kron_node_t **new_children(int num_codes)
+{
+  return calloc(num_codes, sizeof(kron_node_t *));
+}
+
+// frees the descendants of node (but not node itself)
+static void free_subtrie(kron_node_t *node, int num_codes)
+{
+  if (node->child == NULL) return;
+  for (int c = 0; c < num_codes; ++c)
+  {
+    if (node->child[c] == NULL) continue;
+    free_subtrie(node->child[c], num_codes);
+    free(node->child[c]);
+  }
+  free(node->child);
+  node->child = NULL;
+}
+
+kron_cache_t *kron_cache_create(int num_codes, const int64_t *code_pIDs)
+{
+  if (num_codes <= 0)
+  {
+    printf("ERROR in %s: need at least one factor matrix.\n", __func__);
+    return NULL;
+  }
+  kron_cache_t *cache = malloc(sizeof(kron_cache_t));
+  if (cache == NULL)
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    return NULL;
+  }
+  cache->num_codes = num_codes;
+  cache->code_pIDs = malloc(num_codes*sizeof(int64_t));
+  if (cache->code_pIDs == NULL)
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    free(cache);
+    return NULL;
+  }
+  memcpy(cache->code_pIDs, code_pIDs, num_codes*sizeof(int64_t));
+  cache->root.pID = packedID_scalar1;
+  cache->root.child = NULL;
+  cache->last_levels_reused = 0;
+  return cache;
+}
+
+void kron_cache_free(kron_cache_t *cache)
+{
+  if (cache == NULL) return;
+  free_subtrie(&(cache->root), cache->num_codes);
+  free(cache->code_pIDs);
+  free(cache);
+}
+
+void kron_cache_set_factors(kron_cache_t *cache, const int64_t *code_pIDs)
+{
+  if (0 == memcmp(cache->code_pIDs, code_pIDs,
+          cache->num_codes*sizeof(int64_t)))
+    return;
+  memcpy(cache->code_pIDs, code_pIDs, cache->num_codes*sizeof(int64_t));
+  free_subtrie(&(cache->root), cache->num_codes);
+}
+
+int64_t kron_cache_build(kron_cache_t *cache, const int *codes, int length)
+{
+  cache->last_levels_reused = 0;
+  for (int index = 0; index < length; ++index)
+  {
+    if ((codes[index] < 0) || (codes[index] >= cache->num_codes))
+    {
+      printf("ERROR in %s: unrecognized code (%d) at index %d.\n",
+          __func__, codes[index], index);
+      return MATRIX_ID_INVALID;
+    }
+  }
+
+  // the product grows on the right, so the trie path is the run of leading
+  // codes; a remembered product is reused unless it has left the store
+  kron_node_t *node = &(cache->root);
+  int64_t out_pID = packedID_scalar1;
+  for (int index = 0; index < length; ++index)
+  {
+    int c = codes[index];
+    if (node->child == NULL)
+    {
+      node->child = new_children(cache->num_codes);
+      if (node->child == NULL)
+      {
+        printf("ERROR in %s: out of memory.\n", __func__);
+        return MATRIX_ID_INVALID;
+      }
+    }
+    kron_node_t *next = node->child[c];
+    if ((next != NULL) && !matrix_is_invalid(next->pID))
+    {
+      out_pID = next->pID;
+      cache->last_levels_reused++;
+    }
+    else
+    {
+      if (next == NULL)
+      {
+        next = calloc(1, sizeof(kron_node_t));
+        if (next == NULL)
+        {
+          printf("ERROR in %s: out of memory.\n", __func__);
+          return MATRIX_ID_INVALID;
+        }
+        node->child[c] = next;
+      }
+      out_pID = kronecker_product(out_pID, cache->code_pIDs[c]);
+      next->pID = out_pID;
+    }
+    node = next;
+  }
+  return out_pID;
+}
+
+int kron_cache_levels_reused(const kron_cache_t *cache)
+{
+  return cache->last_levels_reused;
+}
@@ -0,0 +1,121 @@
+//kron_cache.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+#ifndef MPL_KRON_CACHE_H
+#define MPL_KRON_CACHE_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* A kron_cache builds Kronecker products g[c_0] (x) g[c_1] (x) ... (x)     *
+ * g[c_(n-1)] of small matrices g[0..num_codes-1] chosen by integer codes.  *
+ * Every partial product g[c_0] (x) ... (x) g[c_k] is remembered in a trie  *
+ * keyed by the codes c_0..c_k, so a product that shares its leading codes  *
+ * (the low-index qubits of a layer of gates) with an earlier product only  *
+ * recomputes the factors after the shared run. The partial products are    *
+ * not held; any that are removed by clean_matrix_storage are rebuilt.      */
+
+typedef struct kron_cache kron_cache_t;
+
+/*!
+ * \brief Create an empty Kronecker product cache
+ *
+ * \param num_codes The number of distinct factor matrices
+ * \param code_pIDs The matrixIDs of the factors, indexed by code
+ * \result A pointer to the new cache, or NULL on error
+ */
+kron_cache_t *kron_cache_create(int num_codes, const int64_t *code_pIDs);
+
+/*!
+ * \brief Free a Kronecker product cache (the matrices are not affected)
+ *
+ * \param cache The cache to free
+ */
+void kron_cache_free(kron_cache_t *cache);
+
+/*!
+ * \brief Replace the factor matrices of a cache
+ *
+ * If any matrixID differs from those already in the cache, all of the
+ * remembered partial products are discarded.
+ *
+ * \param cache The cache
+ * \param code_pIDs The matrixIDs of the factors, indexed by code (the
+ *      number of codes is that given to kron_cache_create)
+ */
+void kron_cache_set_factors(kron_cache_t *cache, const int64_t *code_pIDs);
+
+/*!
+ * \brief Build the Kronecker product of the factors with the given codes
+ *
+ * \param cache The cache
+ * \param codes The array of factor codes, outermost (index 0) first
+ * \param length The number of factors
+ * \result The matrixID of the product, or MATRIX_ID_INVALID on error
+ */
+int64_t kron_cache_build(kron_cache_t *cache, const int *codes, int length);
+
+/*!
+ * \brief Report how many levels the most recent kron_cache_build reused
+ *
+ * \param cache The cache
+ * \result The number of partial products (out of the length of the most
+ *      recent build) found in the cache rather than computed
+ */
+int kron_cache_levels_reused(const kron_cache_t *cache);
+
+#endif
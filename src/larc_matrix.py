@@ -0,0 +1,244 @@
+#              larc_matrix.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+## \file larc_matrix.py
+#  \brief LarcMatrix, a handle on a packedID which keeps its matrix live,
+#  with Python operators for the LARC matrix operations.
+#
+#  While any LarcMatrix handle on a packedID exists, the packedID is in the
+#  root set of store_gc.py and the matrix is held, so neither
+#  clean_matrix_storage nor a StoreGC collection removes it. When the last
+#  handle is dropped (or released), the hold is released and the matrix can
+#  be collected. The operators call the packedID routines through their
+#  counted versions (op_counters.h), so they show in larc_op_counter_array,
+#       A @ B        matrix_mult(A, B)
+#       A + B        matrix_add(A, B)
+#       A - B        matrix_diff(A, B)
+#       -A           scalar_mult(-1, A)
+#       c * A        scalar_mult(c, A), where c is a number or a 1x1 matrix
+#       A / c        scalar_divide(A, c)
+#       kron(A, B)   kronecker_product(A, B)
+#  so each costs the LARC call, two clock reads and one set_hold_matrix for
+#  the new handle.
+#  Handles have no instance dictionary (__slots__), and the packedID is
+#  always available as A.pID for the other MyPyLARC routines.
+
+from __future__ import print_function, division
+
+import numbers
+import larc_utilities as lu
+from store_gc import add_root, drop_root
+
+__all__ = ['LarcMatrix', 'kron']
+
+
+##
+# \brief Returns the packedID of a number, as a 1x1 matrix
+def _scalar_pID(value):
+    if isinstance(value, complex):
+        # loaded from its binary value, so no string format is involved
+        import numpy_io
+        return numpy_io.numpy_to_pID([value])
+    return lu.get_valID_from_valString(str(value))
+
+
+##
+# \brief Wraps the result of a LARC call, which is -1 if the call failed
+def _result(pID, name):
+    if pID == -1:
+        raise ValueError("%s failed" % name)
+    return LarcMatrix(pID)
+
+
+##
+# \brief A reference-counted handle on a matrix in the LARC matrix store
+class LarcMatrix(object):
+    __slots__ = ('pID',)
+
+    ##
+    # \brief Creates a handle on a packedID, holding the matrix
+    #
+    # \param pID The packedID of a matrix in the store
+    def __init__(self, pID):
+        add_root(pID)
+        self.pID = pID
+
+    def __del__(self):
+        pID = getattr(self, 'pID', -1)
+        # at interpreter exit the store_gc module may already be gone
+        if pID != -1 and drop_root is not None:
+            drop_root(pID)
+
+    ##
+    # \brief Drops this handle's hold now, instead of when it is deleted
+    def release(self):
+        if self.pID != -1:
+            drop_root(self.pID)
+            self.pID = -1
+
+    ##
+    # \brief Creates a handle on a matrix loaded from a numpy array
+    @classmethod
+    def from_numpy(cls, array):
+        import numpy_io
+        return cls(numpy_io.numpy_to_pID(array))
+
+    ##
+    # \brief Creates a handle on the identity matrix of a level
+    @classmethod
+    def identity(cls, level):
+        return cls(lu.get_identity_pID(level))
+
+    ##
+    # \brief Returns the matrix as a numpy array (see pID_to_numpy)
+    def to_numpy(self, dtype=None):
+        import numpy_io
+        return numpy_io.pID_to_numpy(self.pID, dtype=dtype)
+
+    @property
+    def row_level(self):
+        return lu.matrix_row_level(self.pID)
+
+    @property
+    def col_level(self):
+        return lu.matrix_col_level(self.pID)
+
+    def __matmul__(self, other):
+        if not isinstance(other, LarcMatrix):
+            return NotImplemented
+        return _result(lu.counted_matrix_mult(self.pID, other.pID),
+                       "matrix_mult")
+
+    def __add__(self, other):
+        if not isinstance(other, LarcMatrix):
+            return NotImplemented
+        return _result(lu.counted_matrix_add(self.pID, other.pID),
+                       "matrix_add")
+
+    def __sub__(self, other):
+        if not isinstance(other, LarcMatrix):
+            return NotImplemented
+        return _result(lu.counted_matrix_diff(self.pID, other.pID),
+                       "matrix_diff")
+
+    def __neg__(self):
+        return _result(lu.counted_scalar_mult(_scalar_pID(-1), self.pID),
+                       "scalar_mult")
+
+    ##
+    # \brief Scalar multiplication; use @ for the matrix product
+    def __mul__(self, other):
+        if isinstance(other, numbers.Number):
+            scalar_pID = _scalar_pID(other)
+            matrix_pID = self.pID
+        elif isinstance(other, LarcMatrix):
+            if other.row_level == 0 and other.col_level == 0:
+                scalar_pID, matrix_pID = other.pID, self.pID
+            elif self.row_level == 0 and self.col_level == 0:
+                scalar_pID, matrix_pID = self.pID, other.pID
+            else:
+                raise TypeError("* needs a scalar operand; use @ for the "
+                                "matrix product")
+        else:
+            return NotImplemented
+        return _result(lu.counted_scalar_mult(scalar_pID, matrix_pID),
+                       "scalar_mult")
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        if isinstance(other, numbers.Number):
+            scalar_pID = _scalar_pID(other)
+        elif isinstance(other, LarcMatrix):
+            scalar_pID = other.pID
+        else:
+            return NotImplemented
+        return _result(lu.counted_scalar_divide(self.pID, scalar_pID),
+                       "scalar_divide")
+
+    __div__ = __truediv__
+
+    ##
+    # \brief The Kronecker product of this matrix with another
+    def kron(self, other):
+        return _result(lu.counted_kronecker_product(self.pID, other.pID),
+                       "kronecker_product")
+
+    ##
+    # \brief Handles are equal when their packedIDs are, since LARC stores
+    # each matrix once
+    def __eq__(self, other):
+        if not isinstance(other, LarcMatrix):
+            return NotImplemented
+        return self.pID == other.pID
+
+    def __ne__(self, other):
+        if not isinstance(other, LarcMatrix):
+            return NotImplemented
+        return self.pID != other.pID
+
+    def __hash__(self):
+        return hash(self.pID)
+
+    def __repr__(self):
+        return "LarcMatrix(%d)" % self.pID
+
+
+##
+# \brief The Kronecker product of two LarcMatrix handles
+def kron(A, B):
+    return A.kron(B)
@@ -0,0 +1,796 @@
+//matrix_binary.c
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+
+// Standard Libraries
+#include <stdio.h>
+#include <stdlib.h>
+#include <inttypes.h>
+#include <stdint.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+// Our header files structures and functions
+#include "matrix_binary.h"
+#include "traversal.h"
+#include "buffer_io.h"
+
+
+/*!
+ * \file matrix_binary.c
+ * \brief Write and read larcMatrix files and archives in a binary, memory
+ * mappable form.
+ */
+
+typedef struct matrix_binary_header {
+  char magic[8];
+  uint32_t version;
+  uint32_t scalar_encoding;
+  char scalar_type[16];
+  uint32_t scalar_bytes;
+  uint32_t row_level;
+  uint32_t col_level;
+  uint32_t reserved;
+  uint64_t num_scalars;
+  uint64_t num_nodes;
+  uint64_t scalar_table_bytes;
+} matrix_binary_header_t;
+
+typedef struct matrix_archive_header {
+  char magic[8];
+  uint32_t version;
+  uint32_t scalar_encoding;
+  char scalar_type[16];
+  uint32_t scalar_bytes;
+  uint32_t num_roots;
+  uint64_t name_table_bytes;
+  uint64_t num_scalars;
+  uint64_t num_nodes;
+  uint64_t scalar_table_bytes;
+} matrix_archive_header_t;
+
+typedef struct matrix_binary_node {
+  int64_t child[4];
+  uint32_t row_level;
+  uint32_t col_level;
+} matrix_binary_node_t;
+
+// scalarTypes whose values are plain C numbers can be written as bytes
+#if defined(USE_INTEGER) || defined(USE_BOOLEAN) || defined(USE_REAL) \
+    || defined(USE_COMPLEX)
+#define SCALAR_ENCODING MATRIX_BINARY_RAW
+#else
+#define SCALAR_ENCODING MATRIX_BINARY_TEXT
+#endif
+
+// While the quadtree is walked, a node's children are recorded as the
+// index s of a scalar or as -(j+2) for the node with index j, since the
+// number of scalars is not known until the end; -1 is a missing panel.
+#define NODE_REF(j) (-(j)-2)
+#define IS_NODE_REF(r) ((r) < -1)
+#define NODE_OF_REF(r) (-(r)-2)
+#define INDEX_OF_REF(r, num_scalars) \
+    (IS_NODE_REF(r) ? (num_scalars) + NODE_OF_REF(r) : (r))
+
+// growable arrays of the scalars and nodes, in the order they are written
+typedef struct matrix_binary_lists {
+  int64_t *scalar_pID;
+  int64_t num_scalars;
+  int64_t scalar_capacity;
+  matrix_binary_node_t *node;
+  int64_t num_nodes;
+  int64_t node_capacity;
+  char **strings;              // the scalars as text, for MATRIX_BINARY_TEXT
+  uint64_t scalar_table_bytes;
+} matrix_binary_lists_t;
+
+static int grow_array(void **array, int64_t *capacity, int64_t count,
+    size_t item_size)
+{
+  if (count < *capacity) return 0;
+  int64_t new_capacity = (*capacity < 1024) ? 1024 : 2*(*capacity);
+  void *bigger = realloc(*array, new_capacity*item_size);
+  if (bigger == NULL) return -1;
+  *array = bigger;
+  *capacity = new_capacity;
+  return 0;
+}
+
+static void free_lists(matrix_binary_lists_t *lists)
+{
+  if (lists->strings != NULL)
+    for (int64_t i = 0; i < lists->num_scalars; ++i) free(lists->strings[i]);
+  free(lists->strings);
+  free(lists->scalar_pID);
+  free(lists->node);
+}
+
+/* Lists the distinct scalars and nodes of the matrices with children before
+ * parents, by a depth first walk in which a node is listed when it is
+ * popped for the second time (after all its children have been). Subtrees
+ * shared between the matrices are listed once. The reference of each root
+ * is stored in root_ref. */
+static int list_matrix_nodes(const int64_t *roots, int64_t num_roots,
+    matrix_binary_lists_t *lists, int64_t *root_ref)
+{
+  pID_map_t index;
+  int64_t stack_size = 1024, top = 0;
+  int64_t *stack = malloc(2*stack_size*sizeof(int64_t));
+  if ((stack == NULL) || (pID_map_init(&index, 1024) != 0))
+  {
+    free(stack);
+    return -1;
+  }
+
+  int error = 0;
+  for (int64_t r = 0; (r < num_roots) && !error; ++r)
+  {
+    stack[0] = roots[r];
+    stack[1] = 0;
+    top = 1;
+    while ((top > 0) && !error)
+    {
+      --top;
+      int64_t pID = stack[2*top];
+      int expanded = (int)stack[2*top+1];
+      int64_t ref;
+      if (!expanded && pID_map_get(&index, pID, &ref)) continue;
+
+      mat_level_t row_level = matrix_row_level(pID);
+      mat_level_t col_level = matrix_col_level(pID);
+      if ((row_level == 0) && (col_level == 0))
+      {
+        if (grow_array((void **)&lists->scalar_pID, &lists->scalar_capacity,
+                lists->num_scalars, sizeof(int64_t)) != 0)
+          error = 1;
+        else
+        {
+          lists->scalar_pID[lists->num_scalars] = pID;
+          error = (pID_map_put(&index, pID, lists->num_scalars++) != 0);
+        }
+        continue;
+      }
+
+      // vectors have only two panels: 0 and 2 (column) or 0 and 1 (row)
+      int64_t panel[4];
+      for (int k = 0; k < 4; ++k)
+        panel[k] = (((k & 1) && !col_level) || ((k & 2) && !row_level))
+            ? MATRIX_ID_INVALID : get_pID_of_indexed_submatrix(pID, k);
+
+      if (!expanded)
+      {
+        if (top + 5 > stack_size)
+        {
+          int64_t *bigger = realloc(stack, 4*stack_size*sizeof(int64_t));
+          if (bigger == NULL)
+          {
+            error = 1;
+            continue;
+          }
+          stack = bigger;
+          stack_size *= 2;
+        }
+        stack[2*top] = pID;
+        stack[2*top+1] = 1;
+        top++;
+        for (int k = 3; k >= 0; --k)
+          if ((panel[k] != MATRIX_ID_INVALID)
+              && !pID_map_get(&index, panel[k], &ref))
+          {
+            stack[2*top] = panel[k];
+            stack[2*top+1] = 0;
+            top++;
+          }
+        continue;
+      }
+
+      // all the children are listed, so list this node
+      if (pID_map_get(&index, pID, &ref)) continue;
+      if (grow_array((void **)&lists->node, &lists->node_capacity,
+              lists->num_nodes, sizeof(matrix_binary_node_t)) != 0)
+      {
+        error = 1;
+        continue;
+      }
+      matrix_binary_node_t *node = &lists->node[lists->num_nodes];
+      for (int k = 0; k < 4; ++k)
+      {
+        node->child[k] = -1;
+        if (panel[k] != MATRIX_ID_INVALID)
+          pID_map_get(&index, panel[k], &node->child[k]);
+      }
+      node->row_level = row_level;
+      node->col_level = col_level;
+      error = (pID_map_put(&index, pID, NODE_REF(lists->num_nodes)) != 0);
+      lists->num_nodes++;
+    }
+    if (!error && (root_ref != NULL))
+      pID_map_get(&index, roots[r], &root_ref[r]);
+  }
+
+  free(stack);
+  pID_map_free(&index);
+  return error ? -1 : 0;
+}
+
+/* Works out the size of the scalar table (and, for text scalars, the
+ * strings that go in it) once the scalars have been listed. */
+static int prepare_scalar_table(matrix_binary_lists_t *lists)
+{
+#if SCALAR_ENCODING == MATRIX_BINARY_RAW
+  lists->scalar_table_bytes = lists->num_scalars * sizeof(scalarType);
+#else
+  lists->strings = calloc(lists->num_scalars, sizeof(char *));
+  if (lists->strings == NULL) return -1;
+  lists->scalar_table_bytes = 0;
+  for (int64_t i = 0; i < lists->num_scalars; ++i)
+  {
+    mats_ptr_t s_ptr = (mats_ptr_t)get_recordPTR_from_pID(
+        lists->scalar_pID[i], "", __func__, 0);
+    lists->strings[i] = sca_get_str(s_ptr->scalar_value);
+    if (lists->strings[i] == NULL) return -1;
+    lists->scalar_table_bytes += strlen(lists->strings[i]) + 1;
+  }
+#endif
+  return 0;
+}
+
+/* Writes the padded scalar table and the node table; returns 1 on success */
+static int write_tables(FILE *fp, const matrix_binary_lists_t *lists)
+{
+  int ok = 1;
+  for (int64_t i = 0; ok && (i < lists->num_scalars); ++i)
+  {
+#if SCALAR_ENCODING == MATRIX_BINARY_RAW
+    mats_ptr_t s_ptr = (mats_ptr_t)get_recordPTR_from_pID(
+        lists->scalar_pID[i], "", __func__, 0);
+    ok = (fwrite(&(s_ptr->scalar_value), sizeof(scalarType), 1, fp) == 1);
+#else
+    ok = (fwrite(lists->strings[i], strlen(lists->strings[i]) + 1, 1, fp)
+        == 1);
+#endif
+  }
+  static const char zeros[8] = {0};
+  size_t padding = (8 - lists->scalar_table_bytes % 8) % 8;
+  if (ok && padding) ok = (fwrite(zeros, padding, 1, fp) == 1);
+
+  // node references become indices now that the scalars are counted
+  for (int64_t j = 0; ok && (j < lists->num_nodes); ++j)
+  {
+    matrix_binary_node_t node = lists->node[j];
+    for (int k = 0; k < 4; ++k)
+      node.child[k] = INDEX_OF_REF(node.child[k], lists->num_scalars);
+    ok = (fwrite(&node, sizeof(node), 1, fp) == 1);
+  }
+  return ok;
+}
+
+/* Maps a whole file for reading; returns NULL (after a message) on error */
+static unsigned char *map_file(const char *path, size_t min_bytes,
+    size_t *size, const char *caller)
+{
+  int fd = open(path, O_RDONLY);
+  if (fd < 0)
+  {
+    printf("ERROR in %s: could not open %s.\n", caller, path);
+    return NULL;
+  }
+  struct stat st;
+  if ((fstat(fd, &st) != 0) || ((size_t)st.st_size < min_bytes))
+  {
+    printf("ERROR in %s: %s is too short to be a binary larcMatrix file.\n",
+        caller, path);
+    close(fd);
+    return NULL;
+  }
+  unsigned char *map = mmap(NULL, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+  close(fd);
+  if (map == MAP_FAILED)
+  {
+    printf("ERROR in %s: could not map %s.\n", caller, path);
+    return NULL;
+  }
+  madvise(map, st.st_size, MADV_SEQUENTIAL);
+  *size = st.st_size;
+  return map;
+}
+
+/* Checks the scalar fields shared by the two headers against this build */
+static int check_scalar_type(char *scalar_type, uint32_t encoding,
+    uint32_t scalar_bytes, uint64_t num_scalars, uint64_t table_bytes,
+    const char *path, const char *caller)
+{
+  scalar_type[15] = '\0';
+  if ((strcmp(scalar_type, scalarTypeStr) != 0)
+      || (encoding != SCALAR_ENCODING)
+      || ((SCALAR_ENCODING == MATRIX_BINARY_RAW)
+          && (scalar_bytes != sizeof(scalarType))))
+  {
+    printf("ERROR in %s: %s holds %s scalars, but this build uses %s.\n",
+        caller, path, scalar_type, scalarTypeStr);
+    return -1;
+  }
+  if ((SCALAR_ENCODING == MATRIX_BINARY_RAW)
+      && (table_bytes != num_scalars*sizeof(scalarType)))
+  {
+    printf("ERROR in %s: the tables of %s have the wrong size.\n",
+        caller, path);
+    return -1;
+  }
+  return 0;
+}
+
+/* Enters the scalars and nodes of the mapped tables into the store, in
+ * file order, putting the packedID of entry i in pIDs[i]. If needed is not
+ * NULL, only the entries i with needed[i] set are entered. */
+static int load_tables(const unsigned char *table, uint64_t table_bytes,
+    uint64_t num_scalars, uint64_t num_nodes, const char *needed,
+    int64_t *pIDs, const char *path, const char *caller)
+{
+  scalarType scratch;
+  sca_init(&scratch);
+  uint64_t offset = 0, i;
+  for (i = 0; i < num_scalars; ++i)
+  {
+#if SCALAR_ENCODING == MATRIX_BINARY_RAW
+    if ((needed != NULL) && !needed[i]) continue;
+    memcpy(&scratch, table + i*sizeof(scalarType), sizeof(scalarType));
+#else
+    const char *str = (const char *)table + offset;
+    size_t len = strnlen(str, table_bytes - offset);
+    if (offset + len >= table_bytes)
+    {
+      printf("ERROR in %s: scalar %" PRIu64 " of %s is not terminated.\n",
+          caller, i, path);
+      break;
+    }
+    offset += len + 1;
+    if ((needed != NULL) && !needed[i]) continue;
+    sca_set_str(&scratch, str);
+#endif
+    pIDs[i] = get_scalarPTR_for_scalarVal(scratch)->packedID;
+  }
+  sca_clear(&scratch);
+  if (i < num_scalars) return -1;
+  if ((SCALAR_ENCODING == MATRIX_BINARY_TEXT) && (offset != table_bytes))
+  {
+    printf("ERROR in %s: the scalar table of %s has extra bytes.\n",
+        caller, path);
+    return -1;
+  }
+
+  // nodes, children first
+  const matrix_binary_node_t *node = (const matrix_binary_node_t *)
+      (table + (table_bytes + 7) / 8 * 8);
+  uint64_t j;
+  for (j = 0; j < num_nodes; ++j)
+  {
+    uint64_t here = num_scalars + j;
+    if ((needed != NULL) && !needed[here]) continue;
+    int64_t child[4];
+    int bad = (node[j].row_level > max_level_allowed_matrixStore())
+        || (node[j].col_level > max_level_allowed_matrixStore());
+    for (int k = 0; k < 4; ++k)
+    {
+      int64_t c = node[j].child[k];
+      if ((c < -1) || (c >= (int64_t)here)) bad = 1;
+      else child[k] = (c < 0) ? MATRIX_ID_INVALID : pIDs[c];
+    }
+    if (bad) break;
+    pIDs[here] = get_pID_from_four_sub_pIDs(child[0], child[1], child[2],
+        child[3], node[j].row_level, node[j].col_level);
+    if (pIDs[here] == MATRIX_ID_INVALID) break;
+  }
+  if (j < num_nodes)
+  {
+    printf("ERROR in %s: node %" PRIu64 " of %s is not valid.\n",
+        caller, j, path);
+    return -1;
+  }
+  return 0;
+}
+
+int64_t fprint_larcMatrixBinary(int64_t m_pID, char *path)
+{
+  if (matrix_is_invalid(m_pID))
+  {
+    printf("ERROR in %s: packedID %" PRId64 " is not a valid matrix.\n",
+        __func__, m_pID);
+    return -1;
+  }
+  matrix_binary_lists_t lists;
+  memset(&lists, 0, sizeof(lists));
+  int64_t result = -1;
+
+  if ((list_matrix_nodes(&m_pID, 1, &lists, NULL) != 0)
+      || (prepare_scalar_table(&lists) != 0))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    goto done;
+  }
+
+  matrix_binary_header_t header;
+  memset(&header, 0, sizeof(header));
+  memcpy(header.magic, MATRIX_BINARY_MAGIC, 8);
+  header.version = MATRIX_BINARY_VERSION;
+  header.scalar_encoding = SCALAR_ENCODING;
+  strncpy(header.scalar_type, scalarTypeStr, sizeof(header.scalar_type) - 1);
+  header.scalar_bytes = sizeof(scalarType);
+  header.row_level = matrix_row_level(m_pID);
+  header.col_level = matrix_col_level(m_pID);
+  header.num_scalars = lists.num_scalars;
+  header.num_nodes = lists.num_nodes;
+  header.scalar_table_bytes = lists.scalar_table_bytes;
+
+  FILE *fp = fopen(path, "wb");
+  if (fp == NULL)
+  {
+    printf("ERROR in %s: could not open %s for writing.\n", __func__, path);
+    goto done;
+  }
+  int ok = (fwrite(&header, sizeof(header), 1, fp) == 1)
+      && write_tables(fp, &lists);
+  if (fclose(fp) != 0) ok = 0;
+  if (!ok)
+    printf("ERROR in %s: could not write %s.\n", __func__, path);
+  else
+    result = lists.num_scalars + lists.num_nodes;
+
+done:
+  free_lists(&lists);
+  return result;
+}
+
+int64_t read_larcMatrixBinary(char *path)
+{
+  size_t size;
+  unsigned char *map = map_file(path, MATRIX_BINARY_HEADER_BYTES, &size,
+      __func__);
+  if (map == NULL) return MATRIX_ID_INVALID;
+
+  int64_t result = MATRIX_ID_INVALID;
+  int64_t *pIDs = NULL;
+  matrix_binary_header_t header;
+  memcpy(&header, map, sizeof(header));
+  uint64_t padded_table = (header.scalar_table_bytes + 7) / 8 * 8;
+
+  if ((memcmp(header.magic, MATRIX_BINARY_MAGIC, 8) != 0)
+      || (header.version != MATRIX_BINARY_VERSION))
+  {
+    printf("ERROR in %s: %s is not a version %d binary larcMatrix file.\n",
+        __func__, path, MATRIX_BINARY_VERSION);
+    goto done;
+  }
+  if (check_scalar_type(header.scalar_type, header.scalar_encoding,
+          header.scalar_bytes, header.num_scalars, header.scalar_table_bytes,
+          path, __func__) != 0)
+    goto done;
+  if ((header.num_scalars == 0)
+      || ((uint64_t)size != MATRIX_BINARY_HEADER_BYTES + padded_table
+          + header.num_nodes*sizeof(matrix_binary_node_t))
+      || ((header.num_nodes == 0) && (header.num_scalars != 1)))
+  {
+    printf("ERROR in %s: the tables of %s have the wrong size.\n",
+        __func__, path);
+    goto done;
+  }
+  if ((header.row_level > max_level_allowed_matrixStore())
+      || (header.col_level > max_level_allowed_matrixStore()))
+  {
+    printf("ERROR in %s: %s needs max level %u, above the limit %u.\n",
+        __func__, path, (header.row_level > header.col_level)
+        ? header.row_level : header.col_level, max_level_allowed_matrixStore());
+    goto done;
+  }
+
+  uint64_t total = header.num_scalars + header.num_nodes;
+  pIDs = malloc(total*sizeof(int64_t));
+  if (pIDs == NULL)
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    goto done;
+  }
+  if (load_tables(map + MATRIX_BINARY_HEADER_BYTES, header.scalar_table_bytes,
+          header.num_scalars, header.num_nodes, NULL, pIDs, path,
+          __func__) == 0)
+    result = pIDs[total - 1];
+
+done:
+  free(pIDs);
+  munmap(map, size);
+  return result;
+}
+
+int64_t fprint_larcMatrixArchive(const void *buf_data, int buf_dtype,
+    int64_t buf_rows, int64_t buf_cols, char **names, char *path)
+{
+  int64_t num_roots = buf_rows * buf_cols;
+  const int64_t *roots = buf_data;
+  int64_t num_names = 0;
+  while ((names != NULL) && (names[num_names] != NULL)) num_names++;
+  if ((buf_dtype != BUFFER_INT64) || (num_names != num_roots)
+      || (num_roots < 1) || (num_roots > UINT32_MAX))
+  {
+    printf("ERROR in %s: need one int64 packedID for each of the names.\n",
+        __func__);
+    return -1;
+  }
+  uint64_t name_table_bytes = 0;
+  for (int64_t r = 0; r < num_roots; ++r)
+  {
+    if (matrix_is_invalid(roots[r]))
+    {
+      printf("ERROR in %s: packedID %" PRId64 " is not a valid matrix.\n",
+          __func__, roots[r]);
+      return -1;
+    }
+    int bad = (names[r][0] == '\0') || (strchr(names[r], '\n') != NULL);
+    for (int64_t s = 0; s < r; ++s)
+      bad |= (strcmp(names[s], names[r]) == 0);
+    if (bad)
+    {
+      printf("ERROR in %s: matrix name '%s' is empty, repeated or has a "
+          "newline.\n", __func__, names[r]);
+      return -1;
+    }
+    name_table_bytes += strlen(names[r]) + 1;
+  }
+
+  matrix_binary_lists_t lists;
+  memset(&lists, 0, sizeof(lists));
+  int64_t result = -1;
+  int64_t *root_index = malloc(num_roots*sizeof(int64_t));
+  if ((root_index == NULL)
+      || (list_matrix_nodes(roots, num_roots, &lists, root_index) != 0)
+      || (prepare_scalar_table(&lists) != 0))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    goto done;
+  }
+  for (int64_t r = 0; r < num_roots; ++r)
+    root_index[r] = INDEX_OF_REF(root_index[r], lists.num_scalars);
+
+  matrix_archive_header_t header;
+  memset(&header, 0, sizeof(header));
+  memcpy(header.magic, MATRIX_ARCHIVE_MAGIC, 8);
+  header.version = MATRIX_BINARY_VERSION;
+  header.scalar_encoding = SCALAR_ENCODING;
+  strncpy(header.scalar_type, scalarTypeStr, sizeof(header.scalar_type) - 1);
+  header.scalar_bytes = sizeof(scalarType);
+  header.num_roots = num_roots;
+  header.name_table_bytes = name_table_bytes;
+  header.num_scalars = lists.num_scalars;
+  header.num_nodes = lists.num_nodes;
+  header.scalar_table_bytes = lists.scalar_table_bytes;
+
+  FILE *fp = fopen(path, "wb");
+  if (fp == NULL)
+  {
+    printf("ERROR in %s: could not open %s for writing.\n", __func__, path);
+    goto done;
+  }
+  int ok = (fwrite(&header, sizeof(header), 1, fp) == 1)
+      && write_tables(fp, &lists)
+      && (fwrite(root_index, sizeof(int64_t), num_roots, fp)
+          == (size_t)num_roots);
+  for (int64_t r = 0; ok && (r < num_roots); ++r)
+    ok = (fwrite(names[r], strlen(names[r]) + 1, 1, fp) == 1);
+  if (fclose(fp) != 0) ok = 0;
+  if (!ok)
+    printf("ERROR in %s: could not write %s.\n", __func__, path);
+  else
+    result = lists.num_scalars + lists.num_nodes;
+
+done:
+  free(root_index);
+  free_lists(&lists);
+  return result;
+}
+
+/* Maps an archive and checks its header and table sizes. On success the
+ * header is copied out and the map (of *size bytes) is returned. */
+static unsigned char *map_archive(char *path, matrix_archive_header_t *header,
+    size_t *size, const char *caller)
+{
+  unsigned char *map = map_file(path, MATRIX_BINARY_HEADER_BYTES, size,
+      caller);
+  if (map == NULL) return NULL;
+  memcpy(header, map, sizeof(*header));
+  uint64_t padded_table = (header->scalar_table_bytes + 7) / 8 * 8;
+  const char *names = (const char *)map + *size - header->name_table_bytes;
+
+  int ok = 0;
+  if ((memcmp(header->magic, MATRIX_ARCHIVE_MAGIC, 8) != 0)
+      || (header->version != MATRIX_BINARY_VERSION))
+    printf("ERROR in %s: %s is not a version %d larcMatrix archive.\n",
+        caller, path, MATRIX_BINARY_VERSION);
+  else if (check_scalar_type(header->scalar_type, header->scalar_encoding,
+          header->scalar_bytes, header->num_scalars,
+          header->scalar_table_bytes, path, caller) == 0)
+  {
+    ok = (header->num_scalars > 0) && (header->num_roots > 0)
+        && (header->name_table_bytes >= 2*header->num_roots)
+        && ((uint64_t)*size == MATRIX_BINARY_HEADER_BYTES + padded_table
+            + header->num_nodes*sizeof(matrix_binary_node_t)
+            + header->num_roots*sizeof(int64_t) + header->name_table_bytes)
+        && (names[header->name_table_bytes - 1] == '\0');
+    if (!ok)
+      printf("ERROR in %s: the tables of %s have the wrong size.\n",
+          caller, path);
+  }
+  if (ok) return map;
+  munmap(map, *size);
+  return NULL;
+}
+
+char *larcMatrixArchive_names(char *path)
+{
+  matrix_archive_header_t header;
+  size_t size;
+  unsigned char *map = map_archive(path, &header, &size, __func__);
+  if (map == NULL) return NULL;
+
+  // the names are NUL terminated; return them separated by newlines
+  char *list = malloc(header.name_table_bytes);
+  if (list == NULL)
+    printf("ERROR in %s: out of memory.\n", __func__);
+  else
+  {
+    memcpy(list, map + size - header.name_table_bytes,
+        header.name_table_bytes);
+    for (uint64_t i = 0; i + 1 < header.name_table_bytes; ++i)
+      if (list[i] == '\0') list[i] = '\n';
+  }
+  munmap(map, size);
+  return list;
+}
+
+int read_larcMatrixArchive(void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols, char **names, char *path)
+{
+  int64_t num_wanted = buf_rows * buf_cols;
+  int64_t *wanted_pID = buf_data;
+  int64_t num_names = 0;
+  while ((names != NULL) && (names[num_names] != NULL)) num_names++;
+  if ((buf_dtype != BUFFER_INT64) || (num_names != num_wanted))
+  {
+    printf("ERROR in %s: need an int64 buffer with room for each name.\n",
+        __func__);
+    return -1;
+  }
+
+  matrix_archive_header_t header;
+  size_t size;
+  unsigned char *map = map_archive(path, &header, &size, __func__);
+  if (map == NULL) return -1;
+
+  int result = -1;
+  uint64_t total = header.num_scalars + header.num_nodes;
+  const unsigned char *table = map + MATRIX_BINARY_HEADER_BYTES;
+  const matrix_binary_node_t *node = (const matrix_binary_node_t *)
+      (table + (header.scalar_table_bytes + 7) / 8 * 8);
+  const int64_t *root_index = (const int64_t *)(node + header.num_nodes);
+  const char *name = (const char *)(root_index + header.num_roots);
+  const char *names_end = (const char *)map + size;
+  int64_t *pIDs = malloc(total*sizeof(int64_t));
+  int64_t *wanted_index = malloc((num_wanted + 1)*sizeof(int64_t));
+  char *needed = calloc(total, 1);
+  if ((pIDs == NULL) || (wanted_index == NULL) || (needed == NULL))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    goto done;
+  }
+
+  // find the requested roots by name
+  for (int64_t w = 0; w < num_wanted; ++w) wanted_index[w] = -1;
+  for (uint32_t r = 0; r < header.num_roots; ++r)
+  {
+    if (name >= names_end)
+    {
+      printf("ERROR in %s: the name table of %s is short.\n", __func__, path);
+      goto done;
+    }
+    for (int64_t w = 0; w < num_wanted; ++w)
+      if (strcmp(names[w], name) == 0) wanted_index[w] = root_index[r];
+    name += strlen(name) + 1;
+  }
+  for (int64_t w = 0; w < num_wanted; ++w)
+  {
+    if ((wanted_index[w] < 0) || ((uint64_t)wanted_index[w] >= total))
+    {
+      printf("ERROR in %s: %s has no matrix named '%s'.\n",
+          __func__, path, names[w]);
+      goto done;
+    }
+    needed[wanted_index[w]] = 1;
+  }
+
+  // mark everything below the requested roots; parents follow children,
+  // so one backward sweep over the node table reaches every descendant
+  for (uint64_t j = header.num_nodes; j-- > 0; )
+  {
+    uint64_t here = header.num_scalars + j;
+    if (!needed[here]) continue;
+    for (int k = 0; k < 4; ++k)
+    {
+      int64_t c = node[j].child[k];
+      if ((c < -1) || (c >= (int64_t)here))
+      {
+        printf("ERROR in %s: node %" PRIu64 " of %s is not valid.\n",
+            __func__, j, path);
+        goto done;
+      }
+      if (c >= 0) needed[c] = 1;
+    }
+  }
+
+  if (load_tables(table, header.scalar_table_bytes, header.num_scalars,
+          header.num_nodes, needed, pIDs, path, __func__) == 0)
+  {
+    for (int64_t w = 0; w < num_wanted; ++w)
+      wanted_pID[w] = pIDs[wanted_index[w]];
+    result = 0;
+  }
+
+done:
+  free(needed);
+  free(wanted_index);
+  free(pIDs);
+  munmap(map, size);
+  return result;
+}
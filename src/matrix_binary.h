@@ -0,0 +1,178 @@
+//matrix_binary.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+#ifndef MPL_MATRIX_BINARY_H
+#define MPL_MATRIX_BINARY_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* A binary larcMatrix file holds the same quadtree as the JSON files of     *
+ * fprint_larcMatrixFile, laid out so that it can be memory mapped and       *
+ * loaded without parsing text. It starts with a 72 byte header              *
+ *     char     magic[8]            "LARCMATB"                               *
+ *     uint32_t version             MATRIX_BINARY_VERSION                    *
+ *     uint32_t scalar_encoding     MATRIX_BINARY_RAW or MATRIX_BINARY_TEXT  *
+ *     char     scalar_type[16]     scalarTypeStr, NUL padded                *
+ *     uint32_t scalar_bytes        sizeof(scalarType) for raw scalars       *
+ *     uint32_t row_level           of the matrix                            *
+ *     uint32_t col_level                                                    *
+ *     uint32_t reserved            0                                        *
+ *     uint64_t num_scalars                                                  *
+ *     uint64_t num_nodes           the non-scalar nodes                     *
+ *     uint64_t scalar_table_bytes                                           *
+ * followed by the scalar table, zero padded to a multiple of 8 bytes, and   *
+ * the node table. The scalar table holds num_scalars values, either as the  *
+ * bytes of a scalarType (for the fixed size types Integer, Boolean, Real    *
+ * and Complex) or as NUL terminated strings from sca_get_str (for the       *
+ * multiprecision and other types). The node table holds num_nodes records   *
+ *     int64_t  child[4]            panel indices, -1 for a missing panel    *
+ *     uint32_t row_level                                                    *
+ *     uint32_t col_level                                                    *
+ * in which index i < num_scalars is scalar i and index num_scalars + j is   *
+ * node j. Children come before their parents, so the nodes can be entered   *
+ * into the matrix store in file order; the matrix is the last node (or the  *
+ * only scalar, for a 1 by 1 matrix). All numbers are in native byte order.  *
+ *                                                                           *
+ * A larcMatrix archive holds several named matrices which share one scalar  *
+ * table and one node table, so a subtree common to several of them is       *
+ * stored once. Its 72 byte header is that of a binary larcMatrix file with  *
+ * the magic "LARCMATA" and with row_level, col_level and reserved replaced  *
+ *     uint32_t num_roots           the number of named matrices             *
+ *     uint64_t name_table_bytes                                             *
+ * and the node table is followed by num_roots int64_t indices of the named  *
+ * matrices and by their names, NUL terminated, in the same order.           */
+
+#define MATRIX_BINARY_MAGIC "LARCMATB"
+#define MATRIX_ARCHIVE_MAGIC "LARCMATA"
+#define MATRIX_BINARY_VERSION 1
+#define MATRIX_BINARY_HEADER_BYTES 72
+#define MATRIX_BINARY_RAW 0
+#define MATRIX_BINARY_TEXT 1
+
+/*!
+ * \brief Write a matrix to a binary larcMatrix file
+ *
+ * This is the binary counterpart of fprint_larcMatrixFile: each distinct
+ * node of the quadtree is written once, after its children.
+ *
+ * \param m_pID The packedID of the matrix
+ * \param path The name of the file to write
+ * \result The number of distinct scalars and nodes written (the LARCsize
+ * of the matrix), or -1 on error
+ */
+int64_t fprint_larcMatrixBinary(int64_t m_pID, char *path);
+
+/*!
+ * \brief Read a binary larcMatrix file into the matrix store
+ *
+ * The file is memory mapped, its scalars are entered into the store, and
+ * its nodes are entered in file order with get_pID_from_four_sub_pIDs. The
+ * file must have been written with the scalarType of this build.
+ *
+ * \param path The name of the binary larcMatrix file
+ * \result The packedID of the matrix, or MATRIX_ID_INVALID on error
+ */
+int64_t read_larcMatrixBinary(char *path);
+
+/*!
+ * \brief Write several named matrices to one larcMatrix archive
+ *
+ * The matrices are walked together, so each node they share is written
+ * once. From Python, pass an int64 numpy array of packedIDs and a list of
+ * names of the same length.
+ *
+ * \param buf_data The packedIDs of the matrices
+ * \param buf_dtype Must be BUFFER_INT64
+ * \param buf_rows The number of packedIDs (with buf_cols)
+ * \param buf_cols See buf_rows
+ * \param names The names of the matrices, which must be distinct, nonempty
+ * and without newlines
+ * \param path The name of the archive to write
+ * \result The number of distinct scalars and nodes written, or -1 on error
+ */
+int64_t fprint_larcMatrixArchive(const void *buf_data, int buf_dtype,
+    int64_t buf_rows, int64_t buf_cols, char **names, char *path);
+
+/*!
+ * \brief List the names of the matrices in a larcMatrix archive
+ *
+ * \param path The name of the archive
+ * \result A malloc'd string of the names separated by newlines, in the order
+ * they were written, or NULL on error
+ */
+char *larcMatrixArchive_names(char *path);
+
+/*!
+ * \brief Read some or all of the matrices of a larcMatrix archive
+ *
+ * The archive is memory mapped and the nodes below the requested matrices
+ * are found by one backward sweep of the node table; only those are then
+ * entered into the store, in one forward pass.
+ *
+ * \param buf_data An int64 buffer which receives the packedIDs
+ * \param buf_dtype Must be BUFFER_INT64
+ * \param buf_rows The number of packedIDs (with buf_cols)
+ * \param buf_cols See buf_rows
+ * \param names The names of the matrices to read, one per packedID
+ * \param path The name of the archive
+ * \result 0 on success, -1 on error
+ */
+int read_larcMatrixArchive(void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols, char **names, char *path);
+
+#endif
@@ -0,0 +1,376 @@
+#              matrix_cache.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+
+
+## \file matrix_cache.py
+#  \brief An on-disk cache of matrices made by expensive builder functions,
+#  keyed by the builder, its parameters and the LARC configuration.
+#
+#  A cache entry is found by a SHA-256 digest of
+#       (builder name, parameters, scalarType, LARC version,
+#        MyPyLARC version, regionbitparam, zeroregionbitparam)
+#  so a matrix is only reused when it would be rebuilt exactly the same way.
+#  A builder returning one packedID is stored as a binary larcMatrix file; one
+#  returning a list, tuple or dict of packedIDs is stored as an archive (see
+#  matrix_files.py), which keeps the subtrees the matrices share once. The
+#  index (index.json in the cache directory) records each entry's key, size,
+#  file checksum and time of last use. When the files exceed max_bytes the
+#  least recently used entries are removed. A file whose checksum no longer
+#  matches is discarded and rebuilt, and a newly written file is read back
+#  and must give the packedID that was built, the same equality test as
+#  equal_matrices_in_larcMatrix_files but made in the store.
+#
+#  Builders opt in with the cached_matrix decorator. It uses the default
+#  cache, which is off until set_matrix_cache is called or the environment
+#  variable MYPYLARC_MATRIX_CACHE names a directory, so decorated functions
+#  behave as before unless caching is asked for. Parameters must be JSON
+#  values (numbers, strings, lists, dicts), not packedIDs, since packedIDs
+#  differ from run to run.
+
+from __future__ import print_function, division
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+import larc_utilities as lu
+import matrix_files
+
+__all__ = ['MatrixCache', 'set_matrix_cache', 'get_matrix_cache',
+           'cached_matrix']
+
+_INDEX_NAME = "index.json"
+
+
+##
+# \brief Returns the MyPyLARC version as a string, such as "2.0.1"
+def _mypylarc_version_string():
+    return "%d.%d.%d" % (lu.MYPYLARC_MAJOR_VERSION, lu.MYPYLARC_MINOR_VERSION,
+                         lu.MYPYLARC_PATCH_VERSION)
+
+
+##
+# \brief Returns the SHA-256 digest of a file, as hex
+def _file_digest(filename):
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+##
+# \brief A directory of cached matrices with an LRU size bound
+class MatrixCache(object):
+
+    ##
+    # \brief Opens (or creates) a cache directory
+    #
+    # \param directory The directory holding the cache
+    # \param max_bytes The largest total size of the cached files
+    # \param verify If True, each newly written file is read back and checked
+    def __init__(self, directory, max_bytes=2**32, verify=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.verify = verify
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'corrupt': 0}
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._index_name = os.path.join(directory, _INDEX_NAME)
+        self._index = self._read_index()
+
+    def _read_index(self):
+        try:
+            with open(self._index_name) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write_index(self):
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_name, self._index_name)
+
+    def _path(self, digest, kind):
+        suffix = matrix_files.BINARY_SUFFIX if kind == 'matrix' \
+            else matrix_files.ARCHIVE_SUFFIX
+        return os.path.join(self.directory, digest + suffix)
+
+    ##
+    # \brief Returns the key of a builder call and its digest
+    #
+    # The rounding parameters are read from LARC here, so matrices built
+    # under different regionbitparam or zeroregionbitparam never share keys.
+    #
+    # \param name The builder name
+    # \param args The positional parameters of the call
+    # \param kwargs The keyword parameters of the call
+    # \return A pair (digest, key) of the hex digest and the key dict
+    def key(self, name, args=(), kwargs=None):
+        key = {'builder': name, 'args': list(args),
+               'kwargs': dict(kwargs or {}),
+               'scalarType': lu.cvar.scalarTypeStr,
+               'larc_version': lu.get_string_larc_version(),
+               'version': _mypylarc_version_string(),
+               'regionbitparam': lu.get_regionbitparam(),
+               'zeroregionbitparam': lu.get_zeroregionbitparam()}
+        try:
+            text = json.dumps(key, sort_keys=True)
+        except TypeError:
+            raise TypeError("parameters of %s must be JSON values to be cached"
+                            % name)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest(), key
+
+    def _remove(self, digest):
+        entry = self._index.pop(digest, None)
+        if entry is not None:
+            filename = self._path(digest, entry['kind'])
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    ##
+    # \brief Looks up a builder call
+    #
+    # \param name The builder name
+    # \param args The positional parameters of the call
+    # \param kwargs The keyword parameters of the call
+    # \return The cached result (a packedID, or a list, tuple or dict of
+    # them) or None on a miss
+    def get(self, name, args=(), kwargs=None):
+        digest, key = self.key(name, args, kwargs)
+        entry = self._index.get(digest)
+        filename = None if entry is None else self._path(digest, entry['kind'])
+        if entry is None or not os.path.exists(filename):
+            self.stats['misses'] += 1
+            return None
+        if _file_digest(filename) != entry['sha256']:
+            self.stats['corrupt'] += 1
+            self.stats['misses'] += 1
+            self._remove(digest)
+            self._write_index()
+            return None
+        if entry['kind'] == 'matrix':
+            result = matrix_files.load_matrix(filename)
+        else:
+            found = matrix_files.load_matrix_archive(filename)
+            if entry['kind'] == 'dict':
+                result = found
+            else:
+                result = [found[str(i)] for i in range(len(found))]
+                if entry['kind'] == 'tuple':
+                    result = tuple(result)
+        entry['last_used'] = time.time()
+        self._write_index()
+        self.stats['hits'] += 1
+        return result
+
+    ##
+    # \brief Stores the result of a builder call
+    #
+    # Entries are removed, least recently used first, until the cache fits
+    # in max_bytes; a result bigger than max_bytes is not stored.
+    #
+    # \param name The builder name
+    # \param args The positional parameters of the call
+    # \param kwargs The keyword parameters of the call
+    # \param result A packedID, or a list, tuple or dict of packedIDs
+    def put(self, name, args, kwargs, result):
+        digest, key = self.key(name, args, kwargs)
+        if isinstance(result, dict):
+            if not all(isinstance(n, str) for n in result):
+                raise TypeError("%s must return a dict with string keys"
+                                % name)
+            kind, matrices = 'dict', list(result.items())
+        elif isinstance(result, (list, tuple)):
+            kind = 'tuple' if isinstance(result, tuple) else 'list'
+            matrices = [(str(i), pID) for i, pID in enumerate(result)]
+        else:
+            kind, matrices = 'matrix', [('0', result)]
+        self._remove(digest)
+        filename = self._path(digest, kind)
+        if kind == 'matrix':
+            matrix_files.save_matrix(result, filename, binary=True)
+            if self.verify:
+                found = {'0': lu.read_larcMatrixBinary(filename)}
+        else:
+            matrix_files.save_matrix_archive(filename, matrices)
+            if self.verify:
+                found = matrix_files.load_matrix_archive(filename)
+        if self.verify and any(found[n] != pID for n, pID in matrices):
+            os.remove(filename)
+            self._write_index()
+            raise ValueError("cached copy of %s does not match" % name)
+        size = os.path.getsize(filename)
+        if size > self.max_bytes:
+            os.remove(filename)
+            self._write_index()
+            return
+        self._index[digest] = {'key': key, 'kind': kind, 'bytes': size,
+                               'sha256': _file_digest(filename),
+                               'last_used': time.time()}
+        self.evict()
+
+    ##
+    # \brief Removes least recently used entries until the cache fits
+    #
+    # \param max_bytes The size to shrink to (default: the cache's max_bytes)
+    # \return The number of entries removed
+    def evict(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        total = sum(entry['bytes'] for entry in self._index.values())
+        removed = 0
+        for digest in sorted(self._index,
+                             key=lambda d: self._index[d]['last_used']):
+            if total <= max_bytes:
+                break
+            total -= self._index[digest]['bytes']
+            self._remove(digest)
+            removed += 1
+        self.stats['evictions'] += removed
+        self._write_index()
+        return removed
+
+    ##
+    # \brief Removes every entry of the cache
+    def clear(self):
+        for digest in list(self._index):
+            self._remove(digest)
+        self._write_index()
+
+    ##
+    # \brief Returns the total size in bytes of the cached files
+    def size(self):
+        return sum(entry['bytes'] for entry in self._index.values())
+
+    ##
+    # \brief Returns a cached result, or builds and caches it on a miss
+    #
+    # \param name The builder name, which is part of the key
+    # \param builder The function making the result from the parameters
+    # \param args The positional parameters for builder
+    # \param kwargs The keyword parameters for builder
+    # \return The result of builder(*args, **kwargs)
+    def get_or_build(self, name, builder, *args, **kwargs):
+        result = self.get(name, args, kwargs)
+        if result is None:
+            result = builder(*args, **kwargs)
+            self.put(name, args, kwargs, result)
+        return result
+
+
+_default_cache = None
+_default_checked = False
+
+
+##
+# \brief Sets (or turns off) the default cache used by cached_matrix
+#
+# \param directory The cache directory, or None to turn caching off
+# \param max_bytes The largest total size of the cached files
+# \return The new default MatrixCache, or None
+def set_matrix_cache(directory, max_bytes=2**32):
+    global _default_cache, _default_checked
+    _default_checked = True
+    _default_cache = None if directory is None else \
+        MatrixCache(directory, max_bytes)
+    return _default_cache
+
+
+##
+# \brief Returns the default cache, or None if caching is off
+#
+# If set_matrix_cache has not been called, the directory named by the
+# environment variable MYPYLARC_MATRIX_CACHE (if any) is used.
+def get_matrix_cache():
+    global _default_checked
+    if not _default_checked:
+        _default_checked = True
+        if os.environ.get('MYPYLARC_MATRIX_CACHE'):
+            set_matrix_cache(os.environ['MYPYLARC_MATRIX_CACHE'])
+    return _default_cache
+
+
+##
+# \brief Decorator which caches the matrices returned by a builder function
+#
+# For example
+#     \@mypy.cached_matrix()
+#     def build_central_diff_matrix(level, deltaX): ...
+# makes build_central_diff_matrix load its result from the cache when the
+# same level and deltaX were built before (with the same LARC settings).
+#
+# \param name The builder name used in the key (default: module.function)
+# \param cache The MatrixCache to use (default: get_matrix_cache())
+# \return The decorator
+def cached_matrix(name=None, cache=None):
+    def decorate(builder):
+        builder_name = name or "%s.%s" % (builder.__module__,
+                                          builder.__name__)
+
+        @functools.wraps(builder)
+        def wrapper(*args, **kwargs):
+            use_cache = cache if cache is not None else get_matrix_cache()
+            if use_cache is None:
+                return builder(*args, **kwargs)
+            return use_cache.get_or_build(builder_name, builder,
+                                          *args, **kwargs)
+        return wrapper
+    return decorate
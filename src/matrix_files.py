@@ -0,0 +1,295 @@
+#              matrix_files.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+
+
+## \file matrix_files.py
+#  \brief Loads and saves LARC matrices in either the JSON larcMatrixFile
+#  format or the binary format of matrix_binary.c, and converts between them.
+#
+#  A binary file starts with the 8 bytes "LARCMATB", so load_matrix can tell
+#  the formats apart without relying on the file name. By convention binary
+#  files end in ".lmb". The binary format holds only the matrix; info store
+#  entries named by the caller are kept in a small JSON file beside it (the
+#  file name plus ".info").
+#
+#  An archive (".lma") holds several named matrices which share one node
+#  table, so a family of related matrices (such as the FFT factors written
+#  by FFT_play/StrategyExperiments/store_fft_matrices.py) is written and read
+#  with each common subtree handled once.
+#
+#  These are imported into the MyPyLARC namespace, so after
+#  "import MyPyLARC as mypy" they may be called as mypy.load_matrix(...).
+
+from __future__ import print_function, division
+
+import json
+import os
+import numpy as np
+import larc_utilities as lu
+
+__all__ = ['BINARY_SUFFIX', 'ARCHIVE_SUFFIX', 'is_binary_matrix_file',
+           'binary_name', 'load_matrix', 'save_matrix', 'convert_matrix_file',
+           'save_matrix_archive', 'matrix_archive_names',
+           'load_matrix_archive', 'load_matrices']
+
+## The file name suffix used for binary larcMatrix files
+BINARY_SUFFIX = ".lmb"
+
+## The file name suffix used for larcMatrix archives
+ARCHIVE_SUFFIX = ".lma"
+
+_MAGIC = b"LARCMATB"
+
+
+##
+# \brief Returns True if the file starts with the binary larcMatrix magic
+#
+# \param filename The path of the file
+# \return True for a binary larcMatrix file, False otherwise
+def is_binary_matrix_file(filename):
+    with open(filename, 'rb') as f:
+        return f.read(len(_MAGIC)) == _MAGIC
+
+
+##
+# \brief Returns the name of the binary file that goes with a JSON file name
+#
+# A ".json" suffix is replaced by ".lmb"; any other name has ".lmb" added.
+#
+# \param filename A larcMatrix file name
+# \return The corresponding binary file name
+def binary_name(filename):
+    root, ext = os.path.splitext(filename)
+    if ext == ".json":
+        return root + BINARY_SUFFIX
+    if ext == BINARY_SUFFIX:
+        return filename
+    return filename + BINARY_SUFFIX
+
+
+##
+# \brief Returns the name of the info file kept beside a binary matrix file
+#
+# \param filename A binary larcMatrix file name
+# \return The name of its info file
+def _info_name(filename):
+    return filename + ".info"
+
+
+##
+# \brief Reads a matrix from a JSON or binary larcMatrix file
+#
+# The format is taken from the contents of the file. If the file does not
+# exist but its binary twin (see binary_name) does, the twin is read, so
+# callers can keep using the JSON names once the files are converted. If
+# both exist, the binary file is read when it is at least as new. For a
+# binary file, the info store entries saved with it are restored.
+#
+# \param filename The path of the file
+# \return The packedID of the matrix
+def load_matrix(filename):
+    twin = binary_name(filename)
+    if twin != filename and os.path.exists(twin) and (
+            not os.path.exists(filename)
+            or os.path.getmtime(twin) >= os.path.getmtime(filename)):
+        filename = twin
+    if is_binary_matrix_file(filename):
+        pID = lu.read_larcMatrixBinary(filename)
+        if pID != -1 and os.path.exists(_info_name(filename)):
+            with open(_info_name(filename)) as f:
+                for name, data in json.load(f).items():
+                    lu.info_set(lu.get_info_type_from_string_name(name),
+                                pID, data)
+    else:
+        pID = lu.read_larcMatrixFile(filename)
+    if pID == -1:
+        raise ValueError("could not read a LARC matrix from %s" % filename)
+    return pID
+
+
+##
+# \brief Writes a matrix to a JSON or binary larcMatrix file
+#
+# \param pID The packedID of the matrix
+# \param filename The path of the file
+# \param binary True for the binary format, False for JSON, or None to
+# choose from the file name (binary if it ends in ".lmb")
+# \param info_names Names of info store entries (such as "COMMENT") to keep
+# with a binary file; a JSON file always holds all of them
+# \return The LARCsize of the matrix (the number of distinct stored
+# submatrices written)
+def save_matrix(pID, filename, binary=None, info_names=()):
+    if binary is None:
+        binary = filename.endswith(BINARY_SUFFIX)
+    if binary:
+        size = lu.fprint_larcMatrixBinary(pID, filename)
+        info = {}
+        for name in info_names:
+            data = lu.info_get(lu.get_info_type_from_string_name(name), pID)
+            if data:
+                info[name] = data
+        if info:
+            with open(_info_name(filename), 'w') as f:
+                json.dump(info, f, indent=1)
+        elif os.path.exists(_info_name(filename)):
+            os.remove(_info_name(filename))
+    else:
+        size = lu.fprint_larcMatrixFile(pID, filename)
+    if size == -1:
+        raise ValueError("could not write LARC matrix %d to %s"
+                         % (pID, filename))
+    return size
+
+
+##
+# \brief Converts a larcMatrix file from JSON to binary or back
+#
+# The matrix is read into the store and written out in the other format
+# (or in the format of out_filename, see save_matrix).
+#
+# \param in_filename The file to convert
+# \param out_filename The new file (default: the binary or JSON twin)
+# \param info_names Names of info store entries to carry over, as in
+# save_matrix
+# \return The name of the file written
+def convert_matrix_file(in_filename, out_filename=None, info_names=()):
+    to_binary = not is_binary_matrix_file(in_filename)
+    if out_filename is None:
+        if to_binary:
+            out_filename = binary_name(in_filename)
+        else:
+            out_filename = os.path.splitext(in_filename)[0] + ".json"
+    # load_matrix would prefer an existing twin, so read the file directly
+    if to_binary:
+        pID = lu.read_larcMatrixFile(in_filename)
+    else:
+        pID = lu.read_larcMatrixBinary(in_filename)
+    if pID == -1:
+        raise ValueError("could not read a LARC matrix from %s" % in_filename)
+    save_matrix(pID, out_filename, binary=to_binary, info_names=info_names)
+    return out_filename
+
+
+##
+# \brief Writes several named matrices to one archive
+#
+# \param filename The path of the archive
+# \param matrices A dict (or list of pairs) from names to packedIDs; the
+# names are kept in this order
+# \return The number of distinct stored submatrices written, which is less
+# than the sum of the LARCsizes when the matrices share subtrees
+def save_matrix_archive(filename, matrices):
+    if hasattr(matrices, 'items'):
+        matrices = matrices.items()
+    pairs = list(matrices)
+    names = [name for name, pID in pairs]
+    pIDs = np.array([pID for name, pID in pairs], dtype=np.int64)
+    size = lu.fprint_larcMatrixArchive(pIDs, names, filename)
+    if size == -1:
+        raise ValueError("could not write LARC matrix archive %s" % filename)
+    return size
+
+
+##
+# \brief Lists the names of the matrices in an archive
+#
+# \param filename The path of the archive
+# \return The list of names, in the order they were written
+def matrix_archive_names(filename):
+    names = lu.larcMatrixArchive_names(filename)
+    if names is None:
+        raise ValueError("could not read LARC matrix archive %s" % filename)
+    return names.split("\n")
+
+
+##
+# \brief Reads matrices from an archive in a single pass
+#
+# Only the nodes below the requested matrices are entered into the store.
+#
+# \param filename The path of the archive
+# \param names The names of the matrices to read (default: all of them)
+# \return A dict from the names to the packedIDs, in the order of names
+def load_matrix_archive(filename, names=None):
+    if names is None:
+        names = matrix_archive_names(filename)
+    names = list(names)
+    pIDs = np.empty(len(names), dtype=np.int64)
+    if lu.read_larcMatrixArchive(pIDs, names, filename) != 0:
+        raise ValueError("could not read %s from LARC matrix archive %s"
+                         % (names, filename))
+    return dict(zip(names, (int(pID) for pID in pIDs)))
+
+
+##
+# \brief Reads a list of matrices, from an archive if it holds them all
+#
+# This lets a program which used to read one file per matrix (named
+# directory/name) read the same matrices from an archive when one has been
+# written, falling back to load_matrix for each file otherwise.
+#
+# \param directory The directory holding the individual files
+# \param names The names of the matrices (and of their files)
+# \param archive The path of an archive to try first (may be None)
+# \return The list of packedIDs, in the order of names
+def load_matrices(directory, names, archive=None):
+    names = list(names)
+    if archive is not None and os.path.exists(archive) \
+            and set(names) <= set(matrix_archive_names(archive)):
+        found = load_matrix_archive(archive, names)
+        return [found[name] for name in names]
+    return [load_matrix(os.path.join(directory, name)) for name in names]
@@ -0,0 +1,312 @@
+//memo.c
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+// Standard Libraries
+#include <stdio.h>
+#include <stdlib.h>
+#include <inttypes.h>
+#include <stdint.h>
+#include <string.h>
+#include <time.h>
+
+// Our header files structures and functions
+#include "memo.h"
+#include "buffer_io.h"
+
+/*!
+ * \file memo.c
+ * \brief A direct mapped table of results for MyPyLARC recursive operations.
+ */
+
+#define MEMO_DEFAULT_EXPONENT 16
+
+typedef struct memo_entry {
+  int64_t a;
+  int64_t b;
+  int64_t c;
+  int64_t result;
+  int op;
+} memo_entry_t;
+
+static memo_entry_t *memo_table = NULL;
+static uint64_t memo_mask = 0;
+
+static uint64_t memo_counts[NUM_MEMO_OPS][NUM_MEMO_COUNTS];
+static uint64_t memo_store_counts[NUM_MEMO_STORE_COUNTS];
+
+// the number of memo misses not yet matched by an insert in this thread,
+// which is the depth of the recursion through remembered subproblems
+static __thread int memo_depth = 0;
+
+static const char *memo_op_names[NUM_MEMO_OPS] = {
+  "SYCAMORE_2GATE", "SYCAMORE_2GATE_MIX", "TRACE_PRODUCT",
+  "MASKED_PRODUCT_SUM" };
+
+// the counters are only ever added to, so relaxed ordering is enough
+static inline void memo_count(uint64_t *counter, uint64_t n)
+{
+  __atomic_fetch_add(counter, n, __ATOMIC_RELAXED);
+}
+
+static void memo_count_max(uint64_t *counter, uint64_t value)
+{
+  uint64_t old = __atomic_load_n(counter, __ATOMIC_RELAXED);
+  while ((old < value) && !__atomic_compare_exchange_n(counter, &old, value,
+             1, __ATOMIC_RELAXED, __ATOMIC_RELAXED))
+    ;
+}
+
+// counts a miss, which the caller will follow by recursing and an insert
+static void memo_count_miss(int op)
+{
+  memo_count(&memo_counts[op][MEMO_COUNT_MISSES], 1);
+  memo_count_max(&memo_counts[op][MEMO_COUNT_MAX_DEPTH], ++memo_depth);
+}
+
+static int64_t now_ns(void)
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return (int64_t)ts.tv_sec*1000000000 + ts.tv_nsec;
+}
+
+// mixes the key into a table index
+static uint64_t memo_hash(int op, int64_t a, int64_t b, int64_t c)
+{
+  uint64_t h = (uint64_t)op * 0x9E3779B97F4A7C15ULL;
+  h ^= (uint64_t)a + 0x9E3779B97F4A7C15ULL + (h << 6) + (h >> 2);
+  h ^= (uint64_t)b + 0x9E3779B97F4A7C15ULL + (h << 6) + (h >> 2);
+  h ^= (uint64_t)c + 0x9E3779B97F4A7C15ULL + (h << 6) + (h >> 2);
+  h ^= h >> 31;
+  return h & memo_mask;
+}
+
+int memo_init(int memo_exponent)
+{
+  if ((memo_exponent < 1) || (memo_exponent > 40))
+  {
+    printf("ERROR in %s: memo_exponent %d out of range 1 to 40.\n",
+        __func__, memo_exponent);
+    return -1;
+  }
+  memo_free();
+  uint64_t size = (uint64_t)1 << memo_exponent;
+  memo_table = malloc(size*sizeof(memo_entry_t));
+  if (memo_table == NULL)
+  {
+    printf("ERROR in %s: could not allocate 2^%d entries.\n",
+        __func__, memo_exponent);
+    return -1;
+  }
+  memo_mask = size - 1;
+  memo_clear();
+  return 0;
+}
+
+void memo_clear(void)
+{
+  if (memo_table == NULL) return;
+  for (uint64_t i = 0; i <= memo_mask; ++i)
+  {
+    memo_table[i].op = -1;
+    memo_table[i].result = MATRIX_ID_INVALID;
+  }
+}
+
+void memo_free(void)
+{
+  free(memo_table);
+  memo_table = NULL;
+  memo_mask = 0;
+}
+
+int64_t memo_lookup(int op, int64_t a, int64_t b, int64_t c)
+{
+  if ((op < 0) || (op >= NUM_MEMO_OPS)) return MATRIX_ID_INVALID;
+  memo_count(&memo_store_counts[MEMO_STORE_LOOKUPS], 1);
+  if (memo_table != NULL)
+  {
+    const memo_entry_t *e = &memo_table[memo_hash(op, a, b, c)];
+    if ((e->op == op) && (e->a == a) && (e->b == b) && (e->c == c)
+        && !matrix_is_invalid(e->result))
+    {
+      memo_count(&memo_counts[op][MEMO_COUNT_HITS], 1);
+      return e->result;
+    }
+  }
+  memo_count_miss(op);
+  return MATRIX_ID_INVALID;
+}
+
+void memo_insert(int op, int64_t a, int64_t b, int64_t c, int64_t result)
+{
+  // this insert ends the recursion begun by a miss
+  if (memo_depth > 0) --memo_depth;
+  if ((op < 0) || (op >= NUM_MEMO_OPS)) return;
+  memo_count(&memo_store_counts[MEMO_STORE_INSERTS], 1);
+  if ((memo_table == NULL) && (memo_init(MEMO_DEFAULT_EXPONENT) != 0))
+    return;
+  memo_entry_t *e = &memo_table[memo_hash(op, a, b, c)];
+  // a live entry of another key is evicted by the new one
+  if ((e->op != -1) && !matrix_is_invalid(e->result)
+      && ((e->op != op) || (e->a != a) || (e->b != b) || (e->c != c)))
+    memo_count(&memo_counts[e->op][MEMO_COUNT_EVICTIONS], 1);
+  e->op = op;
+  e->a = a;
+  e->b = b;
+  e->c = c;
+  e->result = result;
+  memo_count(&memo_counts[op][MEMO_COUNT_INSERTS], 1);
+}
+
+const char *memo_op_name(int op)
+{
+  if ((op < 0) || (op >= NUM_MEMO_OPS)) return NULL;
+  return memo_op_names[op];
+}
+
+memo_call_t memo_call_begin(int op)
+{
+  memo_call_t call;
+  call.op = op;
+  call.depth = memo_depth;
+  call.start_ns = now_ns();
+  return call;
+}
+
+void memo_call_end(memo_call_t call)
+{
+  // a call which failed part way may have left misses without inserts
+  memo_depth = call.depth;
+  if ((call.op < 0) || (call.op >= NUM_MEMO_OPS)) return;
+  memo_count(&memo_counts[call.op][MEMO_COUNT_CALLS], 1);
+  memo_count(&memo_counts[call.op][MEMO_COUNT_NS], now_ns() - call.start_ns);
+}
+
+void memo_reset_counts(void)
+{
+  for (int op = 0; op < NUM_MEMO_OPS; ++op)
+    for (int k = 0; k < NUM_MEMO_COUNTS; ++k)
+      __atomic_store_n(&memo_counts[op][k], 0, __ATOMIC_RELAXED);
+  for (int k = 0; k < NUM_MEMO_STORE_COUNTS; ++k)
+    __atomic_store_n(&memo_store_counts[k], 0, __ATOMIC_RELAXED);
+}
+
+// copies n counters into an int64 buffer of n entries
+static int copy_counters(const char *caller, const uint64_t *counters,
+    int64_t n, void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols)
+{
+  if ((buf_dtype != BUFFER_INT64) || (buf_rows*buf_cols != n))
+  {
+    printf("ERROR in %s: need an int64 buffer of %" PRId64 " entries.\n",
+        caller, n);
+    return -1;
+  }
+  int64_t *out = buf_data;
+  for (int64_t i = 0; i < n; ++i)
+    out[i] = (int64_t)__atomic_load_n(&counters[i], __ATOMIC_RELAXED);
+  return 0;
+}
+
+int memo_op_counters(void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols)
+{
+  return copy_counters(__func__, &memo_counts[0][0],
+      NUM_MEMO_OPS*NUM_MEMO_COUNTS, buf_data, buf_dtype, buf_rows, buf_cols);
+}
+
+int memo_store_counters(void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols)
+{
+  return copy_counters(__func__, memo_store_counts, NUM_MEMO_STORE_COUNTS,
+      buf_data, buf_dtype, buf_rows, buf_cols);
+}
+
+int memo_report(char *outfilepath)
+{
+  FILE *f = stdout;
+  if (strcmp(outfilepath, "stdout"))
+  {
+    f = fopen(outfilepath, "a");
+    if (f == NULL)
+    {
+      printf("ERROR in %s: could not open %s\n", __func__, outfilepath);
+      return -1;
+    }
+  }
+  fprintf(f, "MyPyLARC memo table: %" PRIu64 " entries, direct mapped\n",
+      (memo_table == NULL) ? 0 : memo_mask+1);
+  fprintf(f, "%-20s %10s %10s %10s %10s %10s %12s %6s\n",
+      "operation", "calls", "hits", "misses", "inserts", "evictions",
+      "seconds", "depth");
+  for (int op = 0; op < NUM_MEMO_OPS; ++op)
+  {
+    uint64_t n[NUM_MEMO_COUNTS];
+    for (int k = 0; k < NUM_MEMO_COUNTS; ++k)
+      n[k] = __atomic_load_n(&memo_counts[op][k], __ATOMIC_RELAXED);
+    fprintf(f, "%-20s %10" PRIu64 " %10" PRIu64 " %10" PRIu64 " %10" PRIu64
+        " %10" PRIu64 " %12.6f %6" PRIu64 "\n",
+        memo_op_names[op], n[MEMO_COUNT_CALLS], n[MEMO_COUNT_HITS],
+        n[MEMO_COUNT_MISSES], n[MEMO_COUNT_INSERTS],
+        n[MEMO_COUNT_EVICTIONS], 1e-9*n[MEMO_COUNT_NS],
+        n[MEMO_COUNT_MAX_DEPTH]);
+  }
+  fprintf(f, "table: %" PRIu64 " lookups, %" PRIu64 " inserts\n",
+      __atomic_load_n(&memo_store_counts[MEMO_STORE_LOOKUPS], __ATOMIC_RELAXED),
+      __atomic_load_n(&memo_store_counts[MEMO_STORE_INSERTS], __ATOMIC_RELAXED));
+  if (f != stdout) fclose(f);
+  return 0;
+}
@@ -0,0 +1,221 @@
+//memo.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+#ifndef MPL_MEMO_H
+#define MPL_MEMO_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* The functions in memo.c keep a table of the results of MyPyLARC recursive *
+ * operations which are not among the LARC op store operations, so that      *
+ * repeated subproblems (the same operands reached along different paths of  *
+ * the quadtree, or in later calls) are computed only once. An entry is       *
+ * keyed by an operation code and up to three int64 operands; operands which  *
+ * are packedIDs identify their matrices uniquely, because LARC never reuses  *
+ * a packedID. The table is direct mapped, so a new entry simply replaces an  *
+ * older one in the same slot, and a remembered result that has been removed  *
+ * from the matrix store (by clean_matrix_storage) is treated as a miss.      *
+ * The op store cannot hold these results: it is keyed by the LARC op_type_t  *
+ * operations, and new operations cannot be added to it from outside LARC.    *
+ * memo_table.py sizes the table from op_exponent in initialize_larc and      *
+ * empties it whenever the matrix store or op store is cleaned.               *
+ *                                                                            *
+ * Each operation has a block of counters (see the MEMO_COUNT_* columns), and *
+ * the table has counters of its own (MEMO_STORE_*). They are updated with    *
+ * relaxed atomic operations, so they may be left on and read at any time,    *
+ * but a snapshot taken while operations run need not be consistent across    *
+ * counters. memo_report prints them, and memo_op_counters and                *
+ * memo_store_counters copy them into int64 buffers.                          */
+
+/* operation codes for the memo table */
+#define MEMO_OP_SYCAMORE_2GATE      0   /* apply_sycamore_2gate subproblem   */
+#define MEMO_OP_SYCAMORE_2GATE_MIX  1   /* its per-pair recombination step   */
+#define MEMO_OP_TRACE_PRODUCT       2   /* trace_of_product subproblem       */
+#define MEMO_OP_MASKED_PRODUCT_SUM  3   /* masked_product_sum subproblem     */
+#define NUM_MEMO_OPS                4
+
+/* the columns of memo_op_counters, one row per operation */
+#define MEMO_COUNT_CALLS            0   /* top-level calls of its routine    */
+#define MEMO_COUNT_HITS             1   /* lookups which found a result      */
+#define MEMO_COUNT_MISSES           2   /* lookups which did not             */
+#define MEMO_COUNT_INSERTS          3   /* results remembered                */
+#define MEMO_COUNT_EVICTIONS        4   /* its entries replaced by others    */
+#define MEMO_COUNT_NS               5   /* nanoseconds in top-level calls    */
+#define MEMO_COUNT_MAX_DEPTH        6   /* deepest nesting of its misses     */
+#define NUM_MEMO_COUNTS             7
+
+/* the entries of memo_store_counters */
+#define MEMO_STORE_LOOKUPS          0   /* calls of memo_lookup              */
+#define MEMO_STORE_INSERTS          1   /* calls of memo_insert              */
+#define NUM_MEMO_STORE_COUNTS       2
+
+/* what memo_call_begin records for memo_call_end */
+typedef struct memo_call {
+  int op;
+  int depth;
+  int64_t start_ns;
+} memo_call_t;
+
+/*!
+ * \brief Set the size of the memo table, discarding all entries
+ *
+ * The table is created with 2^16 entries on first use if this is not called.
+ * The counters are not changed.
+ *
+ * \param memo_exponent The table holds 2^memo_exponent entries
+ * \result 0 on success, -1 on error
+ */
+int memo_init(int memo_exponent);
+
+/*!
+ * \brief Discard all entries of the memo table (its size is unchanged)
+ */
+void memo_clear(void);
+
+/*!
+ * \brief Free the memory used by the memo table
+ */
+void memo_free(void);
+
+/*!
+ * \brief Look up a result in the memo table
+ *
+ * \param op The operation code (one of the MEMO_OP_* values)
+ * \param a The first operand
+ * \param b The second operand
+ * \param c The third operand
+ * \result The remembered packedID, or MATRIX_ID_INVALID if there is none
+ */
+int64_t memo_lookup(int op, int64_t a, int64_t b, int64_t c);
+
+/*!
+ * \brief Remember a result in the memo table
+ *
+ * \param op The operation code (one of the MEMO_OP_* values)
+ * \param a The first operand
+ * \param b The second operand
+ * \param c The third operand
+ * \param result The packedID of the result
+ */
+void memo_insert(int op, int64_t a, int64_t b, int64_t c, int64_t result);
+
+/*!
+ * \brief Get the name of an operation, such as "TRACE_PRODUCT"
+ *
+ * \param op The operation code (one of the MEMO_OP_* values)
+ * \result The name without the MEMO_OP_ prefix, or NULL if op is out of range
+ */
+const char *memo_op_name(int op);
+
+/*!
+ * \brief Start timing a top-level call of a routine which uses the table
+ *
+ * \param op The operation code of the routine (one of the MEMO_OP_* values)
+ * \result The record to pass to memo_call_end when the call returns
+ */
+memo_call_t memo_call_begin(int op);
+
+/*!
+ * \brief Count a top-level call and the time since memo_call_begin
+ *
+ * \param call The record returned by memo_call_begin
+ */
+void memo_call_end(memo_call_t call);
+
+/*!
+ * \brief Set every operation and table counter to zero
+ */
+void memo_reset_counts(void);
+
+/*!
+ * \brief Copy the operation counters into an int64 buffer
+ *
+ * The buffer has NUM_MEMO_OPS rows (indexed by MEMO_OP_*) of NUM_MEMO_COUNTS
+ * columns (indexed by MEMO_COUNT_*).
+ *
+ * \param buf_data The buffer
+ * \param buf_dtype Must be BUFFER_INT64
+ * \param buf_rows The number of rows of the buffer
+ * \param buf_cols The number of columns of the buffer
+ * \result 0 on success, -1 if the buffer has the wrong type or size
+ */
+int memo_op_counters(void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols);
+
+/*!
+ * \brief Copy the table counters into an int64 buffer
+ *
+ * \param buf_data The buffer, of NUM_MEMO_STORE_COUNTS entries (indexed by
+ * MEMO_STORE_*)
+ * \param buf_dtype Must be BUFFER_INT64
+ * \param buf_rows The number of rows of the buffer
+ * \param buf_cols The number of columns of the buffer
+ * \result 0 on success, -1 if the buffer has the wrong type or size
+ */
+int memo_store_counters(void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols);
+
+/*!
+ * \brief Print the counters of each operation, and of the table
+ *
+ * \param outfilepath A file name, or "stdout" for the screen
+ * \result 0 on success, -1 if the file could not be opened
+ */
+int memo_report(char *outfilepath);
+
+#endif
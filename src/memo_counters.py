@@ -0,0 +1,198 @@
+#              memo_counters.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+## \file memo_counters.py
+#  \brief Returns the counters of the MyPyLARC memo table (memo.c) and of
+#  the counted LARC operations (op_counters.c) as numbers, for monitoring,
+#  instead of the text of memo_report.
+#
+#  Each memo table operation has a block of counters: top-level calls of its
+#  routine, memo hits and misses, inserts, evictions, the nanoseconds spent
+#  in top-level calls and the deepest nesting of misses. The table has its
+#  own lookup and insert counts. The C side updates them with relaxed
+#  atomics, so they cost little enough to leave on, and a snapshot is two
+#  buffer copies (memo_op_counters and memo_store_counters) with no
+#  text formatting.
+#
+#  The LARC operations matrix_mult, matrix_add, matrix_diff, scalar_mult,
+#  scalar_divide and kronecker_product are counted at the MyPyLARC call
+#  sites which use their counted_ versions (op_counters.h): calls,
+#  nanoseconds, the longest call and the matrices created. Op store hits
+#  and misses, LARC's recursion depth and the lookups and chain walks of
+#  the LARC stores are kept inside the LARC core, which has no counter block
+#  to read; op_store_report and matrix_hashstats remain the only view of
+#  them.
+
+from __future__ import print_function, division
+
+import numpy as np
+import larc_utilities as lu
+
+__all__ = ['memo_counter_snapshot', 'memo_counter_array',
+           'larc_op_counter_array', 'reset_memo_counters']
+
+# the names of the MEMO_COUNT_* and MEMO_STORE_* constants of memo.h,
+# without their prefixes (the operation names come from memo_op_name)
+_COUNT_NAMES = ('CALLS', 'HITS', 'MISSES', 'INSERTS', 'EVICTIONS', 'NS',
+                'MAX_DEPTH')
+_STORE_NAMES = ('LOOKUPS', 'INSERTS')
+# the names of the OP_COUNT_* constants of op_counters.h, without the prefix
+_LARC_COUNT_NAMES = ('CALLS', 'NS', 'MAX_NS', 'MATRICES_CREATED')
+
+
+##
+# \brief Returns the names of the memo table operations, indexed by MEMO_OP_*
+def _op_names():
+    return [lu.memo_op_name(op) for op in range(lu.NUM_MEMO_OPS)]
+
+
+##
+# \brief Returns the names of the counted LARC operations, by COUNTED_OP_*
+def _larc_op_names():
+    return [lu.counted_op_name(op) for op in range(lu.NUM_COUNTED_OPS)]
+
+
+##
+# \brief Reads the counters of the counted LARC operations from the C side
+#
+# \return An int64 array, indexed as in op_counters.h
+def _read_larc_counters():
+    ops = np.zeros((lu.NUM_COUNTED_OPS, lu.NUM_OP_COUNTS), dtype=np.int64)
+    if lu.counted_op_counters(ops) != 0:
+        raise ValueError("could not read the LARC operation counters")
+    return ops
+
+
+##
+# \brief Builds a structured array with one record per row of counts
+def _records(counts, op_names, count_names, prefix):
+    dtype = [('op', 'U%d' % max(len(name) for name in op_names))]
+    dtype += [(name.lower(), np.int64) for name in count_names]
+    records = np.zeros(len(op_names), dtype=dtype)
+    for op, op_name in enumerate(op_names):
+        records[op]['op'] = op_name
+        for name in count_names:
+            records[op][name.lower()] = counts[op][getattr(lu, prefix + name)]
+    return records
+
+
+##
+# \brief Reads the operation and table counters from the C side
+#
+# \return A pair (ops, store) of int64 arrays, indexed as in memo.h
+def _read_counters():
+    ops = np.zeros((lu.NUM_MEMO_OPS, lu.NUM_MEMO_COUNTS), dtype=np.int64)
+    store = np.zeros(lu.NUM_MEMO_STORE_COUNTS, dtype=np.int64)
+    if (lu.memo_op_counters(ops) != 0 or
+            lu.memo_store_counters(store) != 0):
+        raise ValueError("could not read the memo counters")
+    return ops, store
+
+
+##
+# \brief Returns the memo table counters as a dictionary
+#
+# \return A dictionary with keys 'ops' (a dictionary from memo operation
+# name to a dictionary of its counters: calls, hits, misses, inserts,
+# evictions, ns and max_depth), 'memo_table' (lookups and inserts) and
+# 'larc_ops' (a dictionary from counted LARC operation name to a dictionary
+# of its counters: calls, ns, max_ns and matrices_created)
+def memo_counter_snapshot():
+    ops, store = _read_counters()
+    larc_ops = _read_larc_counters()
+    snapshot = {'ops': {}, 'memo_table': {}, 'larc_ops': {}}
+    for op, op_name in enumerate(_op_names()):
+        row = ops[op]
+        snapshot['ops'][op_name] = dict(
+            (name.lower(), int(row[getattr(lu, 'MEMO_COUNT_' + name)]))
+            for name in _COUNT_NAMES)
+    for name in _STORE_NAMES:
+        snapshot['memo_table'][name.lower()] = int(
+            store[getattr(lu, 'MEMO_STORE_' + name)])
+    for op, op_name in enumerate(_larc_op_names()):
+        snapshot['larc_ops'][op_name] = dict(
+            (name.lower(), int(larc_ops[op][getattr(lu, 'OP_COUNT_' + name)]))
+            for name in _LARC_COUNT_NAMES)
+    return snapshot
+
+
+##
+# \brief Returns the operation counters as a numpy structured array
+#
+# \return An array with one record per operation, with the field 'op' (its
+# name) and an int64 field for each counter (calls, hits, misses, inserts,
+# evictions, ns, max_depth)
+def memo_counter_array():
+    return _records(_read_counters()[0], _op_names(), _COUNT_NAMES,
+                    'MEMO_COUNT_')
+
+
+##
+# \brief Returns the counted LARC operation counters as a structured array
+#
+# \return An array with one record per operation, with the field 'op' (its
+# name) and an int64 field for each counter (calls, ns, max_ns,
+# matrices_created)
+def larc_op_counter_array():
+    return _records(_read_larc_counters(), _larc_op_names(),
+                    _LARC_COUNT_NAMES, 'OP_COUNT_')
+
+
+##
+# \brief Sets every memo table and counted LARC operation counter to zero
+def reset_memo_counters():
+    lu.memo_reset_counts()
+    lu.counted_op_reset_counts()
@@ -0,0 +1,136 @@
+#              memo_table.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+## \file memo_table.py
+#  \brief Keeps the MyPyLARC memo table (memo.c) sized and cleaned together
+#  with the LARC op store.
+#
+#  The recursive routines apply_sycamore_2gate, trace_of_product and
+#  masked_product_sum remember their subproblems in the memo table rather
+#  than in the op store, because the op store only holds the operation
+#  types of the LARC core (op_type_t); there is no way to register a new
+#  operation with it from outside LARC. The versions of initialize_larc,
+#  clean_matrix_storage, clean_op_store and empty_op_store here replace the
+#  LARC ones in the MyPyLARC namespace, and do the same to the memo table:
+#  initialize_larc sizes it from op_exponent, and the cleaning routines
+#  empty it. A remembered result whose matrix has been removed is never
+#  returned in any case (memo_lookup checks it), but its entry would
+#  otherwise stay until it is overwritten.
+
+from __future__ import print_function, division
+
+import larc_utilities as lu
+
+__all__ = ['initialize_larc', 'clean_matrix_storage', 'clean_op_store',
+           'empty_op_store', 'memo_exponent_for_op_exponent']
+
+
+##
+# \brief Returns the memo table exponent used with a given op store exponent
+#
+# A memo entry takes 40 bytes and an op store hash slot 8, so a table of
+# 2^(op_exponent-2) entries uses about as much memory as the op store's
+# hash table.
+#
+# \param op_exponent The op store exponent passed to initialize_larc
+# \return The memo table exponent
+def memo_exponent_for_op_exponent(op_exponent):
+    return max(int(op_exponent) - 2, 1)
+
+
+##
+# \brief initialize_larc, which also sizes the memo table
+#
+# The arguments are those of the LARC initialize_larc (matrix_exponent,
+# op_exponent, max_level, regionbitparam, zeroregionbitparam, verbose).
+# The keyword memo_exponent sets the memo table to 2^memo_exponent entries;
+# by default it follows op_exponent (memo_exponent_for_op_exponent).
+def initialize_larc(*args, **kwargs):
+    memo_exponent = kwargs.pop('memo_exponent', None)
+    result = lu.initialize_larc(*args, **kwargs)
+    if memo_exponent is None:
+        op_exponent = kwargs.get('op_exponent', args[1] if len(args) > 1
+                                 else None)
+        if op_exponent is None:
+            return result
+        memo_exponent = memo_exponent_for_op_exponent(op_exponent)
+    if lu.memo_init(int(memo_exponent)) != 0:
+        raise ValueError("could not make a memo table of 2^%d entries"
+                         % memo_exponent)
+    return result
+
+
+##
+# \brief clean_matrix_storage, which also empties the memo table
+def clean_matrix_storage(*args):
+    result = lu.clean_matrix_storage(*args)
+    lu.memo_clear()
+    return result
+
+
+##
+# \brief clean_op_store, which also empties the memo table
+def clean_op_store(*args):
+    result = lu.clean_op_store(*args)
+    lu.memo_clear()
+    return result
+
+
+##
+# \brief empty_op_store, which also empties the memo table
+def empty_op_store(*args):
+    result = lu.empty_op_store(*args)
+    lu.memo_clear()
+    return result
@@ -67,6 +67,7 @@
 %newobject matrix_count_entries;                      /* matmath.h */
 %newobject get_list_of_scalars_in_larcMatrixFile;     /* matmath.h */
 %newobject get_readableString_scalar_from_pID_and_coords;/* matrix_store.h */
+%newobject larcMatrixArchive_names;                   /* matrix_binary.h */
 
 %{
 #include "../larc/src/type.h"
@@ -82,8 +83,17 @@
 #include "../larc/src/organize.h"
 #include "../larc/src/scalars.h"
 #include "version.h"
+#include "kron_cache.h"
+#include "memo.h"
+#include "traversal.h"
 #include "gate.h"
 #include "sycamore.h"
+#include "buffer_io.h"
+#include "edge_io.h"
+#include "trace_product.h"
+#include "matrix_binary.h"
+#include "op_sweep.h"
+#include "op_counters.h"
 #include <complex.h>
 #include <gmp.h>
 #include <pthread.h>
@@ -149,6 +159,79 @@
     free((char *) $1);
 }
 
+/* This tells SWIG to input any object supporting the buffer protocol (for
+   example a C-contiguous numpy array of float64, complex128 or int64) as a
+   pointer to its data, an element type code from buffer_io.h, and its row
+   and column counts. A 1-dimensional buffer is treated as a single column.
+   The buffer group must be the first argument of the wrapped function, so
+   that the freearg below only ever releases a buffer we actually hold. */
+%typemap(in) (const void *buf_data, int buf_dtype, int64_t buf_rows, int64_t buf_cols) (Py_buffer view) {
+    if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0){
+        PyErr_SetString(PyExc_TypeError, "argument must be a C-contiguous buffer");
+        return NULL;
+    }
+    const char *fmt = (view.format != NULL) ? view.format : "B";
+    if ((fmt[0] == '@') || (fmt[0] == '=') || (fmt[0] == '<')) fmt++;
+    if ((0 == strcmp(fmt, "d")) && (view.itemsize == 8))
+        $2 = BUFFER_FLOAT64;
+    else if ((0 == strcmp(fmt, "Zd")) && (view.itemsize == 16))
+        $2 = BUFFER_COMPLEX128;
+    else if (((0 == strcmp(fmt, "l")) || (0 == strcmp(fmt, "q"))) && (view.itemsize == 8))
+        $2 = BUFFER_INT64;
+    else {
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_TypeError, "buffer elements must be float64, complex128 or int64");
+        return NULL;
+    }
+    if ((view.ndim < 1) || (view.ndim > 2)){
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_ValueError, "buffer must be 1- or 2-dimensional");
+        return NULL;
+    }
+    $1 = view.buf;
+    $3 = (int64_t) view.shape[0];
+    $4 = (view.ndim == 2) ? (int64_t) view.shape[1] : 1;
+}
+
+/* This releases the buffer we acquired before the function call. */
+%typemap(freearg) (const void *buf_data, int buf_dtype, int64_t buf_rows, int64_t buf_cols) {
+    PyBuffer_Release(&view$argnum);
+}
+
+/* The same for a buffer that the wrapped function writes into, so the
+   object must also be writable. */
+%typemap(in) (void *buf_data, int buf_dtype, int64_t buf_rows, int64_t buf_cols) (Py_buffer view) {
+    if (PyObject_GetBuffer($input, &view, PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0){
+        PyErr_SetString(PyExc_TypeError, "argument must be a writable C-contiguous buffer");
+        return NULL;
+    }
+    const char *fmt = (view.format != NULL) ? view.format : "B";
+    if ((fmt[0] == '@') || (fmt[0] == '=') || (fmt[0] == '<')) fmt++;
+    if ((0 == strcmp(fmt, "d")) && (view.itemsize == 8))
+        $2 = BUFFER_FLOAT64;
+    else if ((0 == strcmp(fmt, "Zd")) && (view.itemsize == 16))
+        $2 = BUFFER_COMPLEX128;
+    else if (((0 == strcmp(fmt, "l")) || (0 == strcmp(fmt, "q"))) && (view.itemsize == 8))
+        $2 = BUFFER_INT64;
+    else {
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_TypeError, "buffer elements must be float64, complex128 or int64");
+        return NULL;
+    }
+    if ((view.ndim < 1) || (view.ndim > 2)){
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_ValueError, "buffer must be 1- or 2-dimensional");
+        return NULL;
+    }
+    $1 = view.buf;
+    $3 = (int64_t) view.shape[0];
+    $4 = (view.ndim == 2) ? (int64_t) view.shape[1] : 1;
+}
+
+%typemap(freearg) (void *buf_data, int buf_dtype, int64_t buf_rows, int64_t buf_cols) {
+    PyBuffer_Release(&view$argnum);
+}
+
 
 // # NOTE: global.h uses the USE_INTEGER/REAL/COMPLEX that is #defined in
 // # type.h, so type.h must be before it in the list
@@ -166,8 +249,17 @@
 %include "../larc/src/organize.h"
 %include "../larc/src/scalars.h"
 %include "version.h"
+%include "kron_cache.h"
+%include "memo.h"
+%include "traversal.h"
 %include "gate.h"
 %include "sycamore.h"
+%include "buffer_io.h"
+%include "edge_io.h"
+%include "trace_product.h"
+%include "matrix_binary.h"
+%include "op_sweep.h"
+%include "op_counters.h"
 
 %array_class(complex, complexArray);
 %array_class(long int, int64Array); // works because SWIGWORDSIZE64 defined
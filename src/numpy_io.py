@@ -0,0 +1,205 @@
+#              numpy_io.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+## \file numpy_io.py
+#  \brief Routines which move numpy arrays into and out of LARC through the
+#  buffer protocol (see buffer_io.c), without the map_to_str string path.
+#
+#  These are imported into the MyPyLARC namespace, so after
+#       "import MyPyLARC as mypy"
+#  they may be called as mypy.numpy_to_pID(...) and so on.
+
+from __future__ import print_function, division
+
+import numpy as np
+import larc_utilities as lu
+
+__all__ = ['numpy_to_pID', 'pID_to_numpy', 'gather']
+
+
+##
+# \brief Converts an array-like object to the numpy layout used by buffer_io.c
+#
+# Complex data becomes complex128, other floating point data becomes float64,
+# and integer or boolean data becomes int64. The result is C-contiguous; no
+# copy is made when the input already has the right dtype and layout.
+#
+# \param array Any object accepted by numpy.asarray
+# \return A C-contiguous numpy array of float64, complex128 or int64
+def _as_larc_buffer(array):
+    arr = np.asarray(array)
+    if arr.dtype.kind == 'c':
+        arr = arr.astype(np.complex128, copy=False)
+    elif arr.dtype.kind == 'f':
+        arr = arr.astype(np.float64, copy=False)
+    elif arr.dtype.kind in 'iub':
+        arr = arr.astype(np.int64, copy=False)
+    else:
+        raise TypeError("cannot load numpy dtype %s into LARC" % arr.dtype)
+    return np.ascontiguousarray(arr)
+
+
+##
+# \brief Loads a numpy matrix or vector into the LARC matrix store
+#
+# This is a replacement for the pair of calls
+#     arr = mypy.map_to_str(alist, scalarTypeStr)
+#     pID = mypy.row_major_list_to_store(arr, row_level, col_level, dim)
+# which reads the numbers directly from the memory of the array. A 2-D
+# array must have power-of-two dimensions; a 1-D array of length 2**level
+# is loaded as a column vector. Complex arrays require a complex scalarType.
+#
+# \param array A numpy array (or anything numpy.asarray accepts)
+# \return The packedID of the matrix in the LARC matrix store
+def numpy_to_pID(array):
+    arr = _as_larc_buffer(array)
+    if arr.ndim == 0:
+        arr = arr.reshape(1)
+    pID = lu.buffer_to_store(arr)
+    if pID == -1:
+        raise ValueError("buffer_to_store failed for array of shape %s"
+                         % (arr.shape,))
+    return pID
+
+
+##
+# \brief Returns the numpy dtype that matches the current LARC scalarType
+#
+# Complex scalarTypes map to complex128, integer and boolean scalarTypes to
+# int64, and all other scalarTypes to float64.
+#
+# \return A numpy dtype
+def _default_dtype():
+    scalarTypeStr = lu.cvar.scalarTypeStr
+    if scalarTypeStr in ('Complex', 'MPComplex', 'MPRatComplex'):
+        return np.dtype(np.complex128)
+    if scalarTypeStr in ('Integer', 'MPInteger', 'Boolean'):
+        return np.dtype(np.int64)
+    return np.dtype(np.float64)
+
+
+##
+# \brief Copies a LARC matrix, or a block of it, into a numpy array
+#
+# This replaces reading the matrix one entry at a time with
+# get_readableString_scalar_from_pID_and_coords. The array is allocated
+# here and filled by a single traversal of the quadtree (store_to_buffer in
+# buffer_io.c), which writes zero blocks with memset. By default the whole
+# matrix is returned; rows/cols and the offsets select a block instead.
+# Column vectors are returned as 1-D arrays.
+#
+# \param pID The packedID of the matrix
+# \param rows The number of rows to copy (default: to the last row)
+# \param cols The number of columns to copy (default: to the last column)
+# \param row_offset The first matrix row to copy
+# \param col_offset The first matrix column to copy
+# \param dtype complex128, float64 or int64 (default: from the scalarType)
+# \return A numpy array holding the requested block of the matrix
+def pID_to_numpy(pID, rows=None, cols=None, row_offset=0, col_offset=0,
+                 dtype=None):
+    row_level = lu.matrix_row_level(pID)
+    col_level = lu.matrix_col_level(pID)
+    if rows is None:
+        rows = 2**row_level - row_offset
+    if cols is None:
+        cols = 2**col_level - col_offset
+    dtype = _default_dtype() if dtype is None else np.dtype(dtype)
+    if dtype not in (np.complex128, np.float64, np.int64):
+        raise TypeError("cannot export LARC matrix as numpy dtype %s" % dtype)
+    if col_level == 0 and cols == 1:
+        arr = np.empty(rows, dtype=dtype)
+    else:
+        arr = np.empty((rows, cols), dtype=dtype)
+    if arr.size == 0:
+        return arr
+    if lu.store_to_buffer(arr, pID, row_offset, col_offset) != 0:
+        raise ValueError("store_to_buffer failed for matrix %d" % pID)
+    return arr
+
+
+##
+# \brief Fetches the entries of a LARC matrix at many coordinates at once
+#
+# This replaces a list comprehension over get_scalarID_from_pID_and_coords
+# (and get_readableString_scalar_from_pID_and_coords) with a single call.
+# All coordinates are resolved by one descent of the quadtree which shares
+# the common path prefixes (see gather_scalar_pIDs in buffer_io.c).
+#
+# \param pID The packedID of the matrix
+# \param rows Row indices (an int or array-like of ints)
+# \param cols Column indices, broadcast against rows
+# \param ids If True, return the scalar packedIDs instead of the values
+# \param dtype complex128, float64 or int64 (default: from the scalarType)
+# \return A numpy array, of the broadcast shape of rows and cols, holding the
+# values (or int64 scalar packedIDs) at the coordinates
+def gather(pID, rows, cols, ids=False, dtype=None):
+    rows, cols = np.broadcast_arrays(np.asarray(rows, dtype=np.int64),
+                                     np.asarray(cols, dtype=np.int64))
+    if ids:
+        dtype = np.dtype(np.int64)
+        larc_gather = lu.gather_scalar_pIDs
+    else:
+        dtype = _default_dtype() if dtype is None else np.dtype(dtype)
+        larc_gather = lu.gather_values
+    if dtype not in (np.complex128, np.float64, np.int64):
+        raise TypeError("cannot gather LARC scalars as numpy dtype %s" % dtype)
+    # coordinates go in, and results come back in the first column
+    work = np.empty((rows.size, 2), dtype=dtype)
+    work[:, 0] = rows.ravel()
+    work[:, 1] = cols.ravel()
+    if larc_gather(work, pID) != 0:
+        raise ValueError("gather failed for matrix %d" % pID)
+    return np.ascontiguousarray(work[:, 0]).reshape(rows.shape)
@@ -0,0 +1,190 @@
+//op_counters.c
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+
+// Standard Libraries
+#include <stdio.h>
+#include <stdlib.h>
+#include <inttypes.h>
+#include <stdint.h>
+#include <time.h>
+
+// Our header files structures and functions
+#include "op_counters.h"
+#include "buffer_io.h"
+
+/*!
+ * \file op_counters.c
+ * \brief Counted versions of the LARC matrix operations.
+ */
+
+static uint64_t op_counts[NUM_COUNTED_OPS][NUM_OP_COUNTS];
+
+static const char *op_names[NUM_COUNTED_OPS] = {
+  "MATRIX_MULT", "MATRIX_ADD", "MATRIX_DIFF", "SCALAR_MULT",
+  "SCALAR_DIVIDE", "KRONECKER_PRODUCT" };
+
+typedef struct op_call {
+  int64_t start_ns;
+  int64_t start_created;
+} op_call_t;
+
+static int64_t now_ns(void)
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return (int64_t)ts.tv_sec*1000000000 + ts.tv_nsec;
+}
+
+static op_call_t op_call_begin(void)
+{
+  op_call_t call;
+  call.start_created = (int64_t)num_matrices_created();
+  call.start_ns = now_ns();
+  return call;
+}
+
+// the counters are only ever added to, so relaxed ordering is enough
+static void op_call_end(int op, op_call_t call)
+{
+  uint64_t ns = now_ns() - call.start_ns;
+  uint64_t *counts = op_counts[op];
+  __atomic_fetch_add(&counts[OP_COUNT_CALLS], 1, __ATOMIC_RELAXED);
+  __atomic_fetch_add(&counts[OP_COUNT_NS], ns, __ATOMIC_RELAXED);
+  __atomic_fetch_add(&counts[OP_COUNT_MATRICES_CREATED],
+      (int64_t)num_matrices_created() - call.start_created, __ATOMIC_RELAXED);
+  uint64_t old = __atomic_load_n(&counts[OP_COUNT_MAX_NS], __ATOMIC_RELAXED);
+  while ((old < ns) && !__atomic_compare_exchange_n(&counts[OP_COUNT_MAX_NS],
+             &old, ns, 1, __ATOMIC_RELAXED, __ATOMIC_RELAXED))
+    ;
+}
+
+int64_t counted_matrix_mult(int64_t A_pID, int64_t B_pID)
+{
+  op_call_t call = op_call_begin();
+  int64_t result = matrix_mult(A_pID, B_pID);
+  op_call_end(COUNTED_OP_MATRIX_MULT, call);
+  return result;
+}
+
+int64_t counted_matrix_add(int64_t A_pID, int64_t B_pID)
+{
+  op_call_t call = op_call_begin();
+  int64_t result = matrix_add(A_pID, B_pID);
+  op_call_end(COUNTED_OP_MATRIX_ADD, call);
+  return result;
+}
+
+int64_t counted_matrix_diff(int64_t A_pID, int64_t B_pID)
+{
+  op_call_t call = op_call_begin();
+  int64_t result = matrix_diff(A_pID, B_pID);
+  op_call_end(COUNTED_OP_MATRIX_DIFF, call);
+  return result;
+}
+
+int64_t counted_scalar_mult(int64_t scalar_pID, int64_t A_pID)
+{
+  op_call_t call = op_call_begin();
+  int64_t result = scalar_mult(scalar_pID, A_pID);
+  op_call_end(COUNTED_OP_SCALAR_MULT, call);
+  return result;
+}
+
+int64_t counted_scalar_divide(int64_t A_pID, int64_t scalar_pID)
+{
+  op_call_t call = op_call_begin();
+  int64_t result = scalar_divide(A_pID, scalar_pID);
+  op_call_end(COUNTED_OP_SCALAR_DIVIDE, call);
+  return result;
+}
+
+int64_t counted_kronecker_product(int64_t A_pID, int64_t B_pID)
+{
+  op_call_t call = op_call_begin();
+  int64_t result = kronecker_product(A_pID, B_pID);
+  op_call_end(COUNTED_OP_KRONECKER_PRODUCT, call);
+  return result;
+}
+
+const char *counted_op_name(int op)
+{
+  if ((op < 0) || (op >= NUM_COUNTED_OPS)) return NULL;
+  return op_names[op];
+}
+
+void counted_op_reset_counts(void)
+{
+  for (int op = 0; op < NUM_COUNTED_OPS; ++op)
+    for (int k = 0; k < NUM_OP_COUNTS; ++k)
+      __atomic_store_n(&op_counts[op][k], 0, __ATOMIC_RELAXED);
+}
+
+int counted_op_counters(void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols)
+{
+  int64_t n = NUM_COUNTED_OPS*NUM_OP_COUNTS;
+  if ((buf_dtype != BUFFER_INT64) || (buf_rows*buf_cols != n))
+  {
+    printf("ERROR in %s: need an int64 buffer of %" PRId64 " entries.\n",
+        __func__, n);
+    return -1;
+  }
+  int64_t *out = buf_data;
+  const uint64_t *counts = &op_counts[0][0];
+  for (int64_t i = 0; i < n; ++i)
+    out[i] = (int64_t)__atomic_load_n(&counts[i], __ATOMIC_RELAXED);
+  return 0;
+}
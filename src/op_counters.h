@@ -0,0 +1,179 @@
+//op_counters.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+
+#ifndef MPL_OP_COUNTERS_H
+#define MPL_OP_COUNTERS_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* The functions in op_counters.c are counted versions of the LARC matrix    *
+ * operations which MyPyLARC programs call most. Each takes the same         *
+ * arguments as the LARC function it calls, and adds to the counter block of *
+ * its operation: the calls, the nanoseconds spent in them, the longest      *
+ * call, and the matrices created during them (the growth of                 *
+ * num_matrices_created, which is the number of matrix store inserts the     *
+ * call made, counting those of its recursion). The counters use relaxed     *
+ * atomic operations, so they may be left on.                                *
+ *                                                                           *
+ * Only calls made through these functions are counted. What happens inside *
+ * LARC (op store hits and misses, recursion depth, the lookups and chain    *
+ * walks of each store) is not visible from MyPyLARC. If several threads     *
+ * call LARC at once, the matrices created are credited to whichever calls   *
+ * were running.                                                             */
+
+/* the operations counted */
+#define COUNTED_OP_MATRIX_MULT          0
+#define COUNTED_OP_MATRIX_ADD           1
+#define COUNTED_OP_MATRIX_DIFF          2
+#define COUNTED_OP_SCALAR_MULT          3
+#define COUNTED_OP_SCALAR_DIVIDE        4
+#define COUNTED_OP_KRONECKER_PRODUCT    5
+#define NUM_COUNTED_OPS                 6
+
+/* the columns of counted_op_counters, one row per operation */
+#define OP_COUNT_CALLS                  0   /* calls                         */
+#define OP_COUNT_NS                     1   /* nanoseconds in the calls      */
+#define OP_COUNT_MAX_NS                 2   /* nanoseconds of the longest    */
+#define OP_COUNT_MATRICES_CREATED       3   /* matrix store inserts made     */
+#define NUM_OP_COUNTS                   4
+
+/*!
+ * \brief matrix_mult, counted as COUNTED_OP_MATRIX_MULT
+ *
+ * \param A_pID The packedID of the left matrix
+ * \param B_pID The packedID of the right matrix
+ * \result The packedID of the product, as returned by matrix_mult
+ */
+int64_t counted_matrix_mult(int64_t A_pID, int64_t B_pID);
+
+/*!
+ * \brief matrix_add, counted as COUNTED_OP_MATRIX_ADD
+ *
+ * \param A_pID The packedID of the first matrix
+ * \param B_pID The packedID of the second matrix
+ * \result The packedID of the sum, as returned by matrix_add
+ */
+int64_t counted_matrix_add(int64_t A_pID, int64_t B_pID);
+
+/*!
+ * \brief matrix_diff, counted as COUNTED_OP_MATRIX_DIFF
+ *
+ * \param A_pID The packedID of the first matrix
+ * \param B_pID The packedID of the matrix subtracted
+ * \result The packedID of the difference, as returned by matrix_diff
+ */
+int64_t counted_matrix_diff(int64_t A_pID, int64_t B_pID);
+
+/*!
+ * \brief scalar_mult, counted as COUNTED_OP_SCALAR_MULT
+ *
+ * \param scalar_pID The packedID of the scalar
+ * \param A_pID The packedID of the matrix
+ * \result The packedID of the product, as returned by scalar_mult
+ */
+int64_t counted_scalar_mult(int64_t scalar_pID, int64_t A_pID);
+
+/*!
+ * \brief scalar_divide, counted as COUNTED_OP_SCALAR_DIVIDE
+ *
+ * \param A_pID The packedID of the matrix
+ * \param scalar_pID The packedID of the scalar divisor
+ * \result The packedID of the quotient, as returned by scalar_divide
+ */
+int64_t counted_scalar_divide(int64_t A_pID, int64_t scalar_pID);
+
+/*!
+ * \brief kronecker_product, counted as COUNTED_OP_KRONECKER_PRODUCT
+ *
+ * \param A_pID The packedID of the left matrix
+ * \param B_pID The packedID of the right matrix
+ * \result The packedID of the product, as returned by kronecker_product
+ */
+int64_t counted_kronecker_product(int64_t A_pID, int64_t B_pID);
+
+/*!
+ * \brief Get the name of a counted operation, such as "MATRIX_MULT"
+ *
+ * \param op The operation (one of the COUNTED_OP_* values)
+ * \result The name without the COUNTED_OP_ prefix, or NULL if op is out of
+ * range
+ */
+const char *counted_op_name(int op);
+
+/*!
+ * \brief Set every counter of the counted operations to zero
+ */
+void counted_op_reset_counts(void);
+
+/*!
+ * \brief Copy the counters of the counted operations into an int64 buffer
+ *
+ * The buffer has NUM_COUNTED_OPS rows (indexed by COUNTED_OP_*) of
+ * NUM_OP_COUNTS columns (indexed by OP_COUNT_*).
+ *
+ * \param buf_data The buffer
+ * \param buf_dtype Must be BUFFER_INT64
+ * \param buf_rows The number of rows of the buffer
+ * \param buf_cols The number of columns of the buffer
+ * \result 0 on success, -1 if the buffer has the wrong type or size
+ */
+int counted_op_counters(void *buf_data, int buf_dtype, int64_t buf_rows,
+    int64_t buf_cols);
+
+#endif
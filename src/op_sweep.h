@@ -0,0 +1,97 @@
+//op_sweep.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+#ifndef MPL_OP_SWEEP_H
+#define MPL_OP_SWEEP_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* The function in op_sweep.c removes stale entries (those which refer to    *
+ * matrices no longer in the matrix store) from a range of op store hash     *
+ * chains, or from all of them, in one call. This replaces the Python loop   *
+ *     for hash in range(1<<op_store_exp): mypy.clean_op_hash_chain(hash)    *
+ * which crosses the SWIG interface once per chain. The sweep is serial:     *
+ * LARC does not promise that clean_op_hash_chain may run concurrently (its  *
+ * store counters and removal bookkeeping are shared, and the cleaning reads *
+ * the matrix store), so the chains are cleaned one after another.           *
+ *                                                                           *
+ * clean_op_hash_chain does not say how many entries it examined or freed,   *
+ * so the report counts chains only; use op_store_report for entry counts.   */
+
+/* what sweep_op_store did; chains_cleaned is -1 if the request was invalid */
+typedef struct op_sweep_report {
+  int64_t first_hash;       /* the first chain cleaned                */
+  int64_t end_hash;         /* one past the last chain cleaned        */
+  int64_t chains_cleaned;   /* chains passed to clean_op_hash_chain   */
+  double seconds;           /* the elapsed (wall clock) time          */
+} op_sweep_report_t;
+
+/*!
+ * \brief Clean a range of op store hash chains
+ *
+ * Each chain in [first_hash, end_hash) is passed to clean_op_hash_chain, in
+ * order, in the calling thread.
+ *
+ * \param first_hash The first chain to clean
+ * \param end_hash One past the last chain, or -1 for the end of the table
+ * (2^get_op_store_exp())
+ * \result A report of the chains cleaned and the time taken
+ */
+op_sweep_report_t sweep_op_store(int64_t first_hash, int64_t end_hash);
+
+#endif
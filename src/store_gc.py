@@ -0,0 +1,294 @@
+#              store_gc.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+## \file store_gc.py
+#  \brief An automatic garbage collection policy for the LARC matrix store,
+#  which keeps a root set of live packedIDs and cleans the stores when they
+#  grow.
+#
+#  Iterative jobs make a new vector or matrix every iteration, and LARC keeps
+#  them all until clean_matrix_storage is called. The root set here records
+#  the matrices a script still needs: handle objects (LarcMatrix, see
+#  larc_matrix.py, and RecentRoots) call add_root and drop_root, and each
+#  root is counted. A pID is held with set_hold_matrix when its first handle
+#  adds it and released with release_hold_matrix when its last handle drops
+#  it, so it survives any cleaning while it is live. A StoreGC policy is
+#  checked at safe points with maybe_collect(), usually once per iteration.
+#  It fires after a given number of new matrices have been created, or when
+#  the nonscalar store reaches a given occupancy of its hash table. A
+#  collection runs clean_matrix_storage and the op store sweep
+#  (sweep_op_store, see op_sweep.h), and records the pause and the number
+#  of matrices freed.
+#
+#  A matrix should be either a root or held by hand with set_hold_matrix,
+#  not both, since dropping its last root releases the hold.
+#  Bytes reclaimed are estimated from the number of matrices freed and
+#  bytes_per_matrix_entry of the store model (see store_planner.py), since
+#  the C allocator need not return freed memory to the operating system.
+
+from __future__ import print_function, division
+
+from collections import deque
+import time
+import larc_utilities as lu
+import memo_table
+import store_planner
+
+__all__ = ['add_root', 'drop_root', 'root_pIDs', 'RecentRoots', 'StoreGC',
+           'set_store_gc', 'get_store_gc', 'maybe_collect']
+
+# the root set, as a count of the handles on each packedID
+_root_counts = {}
+
+# the policy used by maybe_collect
+_store_gc = None
+
+# used when the store model file cannot be read
+_DEFAULT_BYTES_PER_MATRIX = 160
+
+
+##
+# \brief Adds a packedID to the root set (once for each handle on it)
+#
+# The matrix is held while it is in the root set.
+#
+# \param pID The packedID of a matrix which must survive collections
+def add_root(pID):
+    count = _root_counts.get(pID, 0)
+    if count == 0:
+        lu.set_hold_matrix(pID)
+    _root_counts[pID] = count + 1
+
+
+##
+# \brief Removes one handle's claim on a packedID in the root set
+#
+# Once no handle is left the hold is released, and the matrix may be
+# removed by the next collection.
+#
+# \param pID A packedID previously passed to add_root
+def drop_root(pID):
+    count = _root_counts.get(pID, 0)
+    if count > 1:
+        _root_counts[pID] = count - 1
+    elif count == 1:
+        del _root_counts[pID]
+        lu.release_hold_matrix(pID)
+
+
+##
+# \brief Returns the packedIDs in the root set
+def root_pIDs():
+    return list(_root_counts)
+
+
+##
+# \brief A handle on the last few matrices of an iteration
+#
+# Iterative methods need the latest vector, and sometimes a short history
+# of them (to detect a cycle by comparing packedIDs, for example). push()
+# roots a new packedID and drops the oldest once there are more than maxlen.
+class RecentRoots(object):
+
+    ##
+    # \brief Creates an empty history
+    #
+    # \param maxlen The number of packedIDs kept live
+    def __init__(self, maxlen=1):
+        self.pIDs = deque()
+        self.maxlen = maxlen
+
+    ##
+    # \brief Roots a packedID, dropping the oldest beyond maxlen
+    def push(self, pID):
+        add_root(pID)
+        self.pIDs.append(pID)
+        while len(self.pIDs) > self.maxlen:
+            drop_root(self.pIDs.popleft())
+
+    ##
+    # \brief Drops every packedID in the history
+    def clear(self):
+        while self.pIDs:
+            drop_root(self.pIDs.popleft())
+
+
+##
+# \brief A tunable policy deciding when the matrix store is cleaned
+class StoreGC(object):
+
+    ##
+    # \brief Creates a policy; with no trigger set it only collects on demand
+    #
+    # \param every_created Collect after this many matrices have been created
+    # since the last collection (None for no such trigger)
+    # \param occupancy Collect when the nonscalar store holds this fraction
+    # of the number of slots in its hash table (None for no such trigger)
+    # \param min_growth After a collection, the occupancy trigger waits until
+    # the nonscalar store has grown by this fraction, so that a root set
+    # larger than the threshold does not cause a collection at every check
+    # \param clean_ops If True, also remove stale entries from the op store
+    # \param bytes_per_matrix The estimated bytes used by one matrix record
+    # (default: bytes_per_matrix_entry from the store model)
+    # \param verbose If nonzero, print a line for each collection
+    def __init__(self, every_created=None, occupancy=None, min_growth=0.25,
+                 clean_ops=True, bytes_per_matrix=None, verbose=0):
+        self.every_created = every_created
+        self.occupancy = occupancy
+        self.min_growth = min_growth
+        self.clean_ops = clean_ops
+        if bytes_per_matrix is None:
+            try:
+                model = store_planner.load_store_model()
+                bytes_per_matrix = model['bytes_per_matrix_entry']
+            except (IOError, OSError, KeyError, ValueError):
+                bytes_per_matrix = _DEFAULT_BYTES_PER_MATRIX
+        self.bytes_per_matrix = bytes_per_matrix
+        self.verbose = verbose
+        self.stats = {'collections': 0, 'matrices_freed': 0,
+                      'bytes_reclaimed': 0, 'pause_seconds': 0.0,
+                      'max_pause_seconds': 0.0}
+        self.last = None
+        self._last_created = lu.num_matrices_created()
+        self._last_count = lu.nonscalar_store_count()
+
+    ##
+    # \brief Returns the reason to collect now, or None
+    def _trigger(self):
+        if self.every_created is not None:
+            created = lu.num_matrices_created() - self._last_created
+            if created >= self.every_created:
+                return 'created'
+        if self.occupancy is not None:
+            count = lu.nonscalar_store_count()
+            slots = 2**lu.get_nonscalar_store_exp()
+            if (count >= self.occupancy * slots and
+                    count >= (1 + self.min_growth) * self._last_count):
+                return 'occupancy'
+        return None
+
+    ##
+    # \brief Collects if a trigger has fired
+    #
+    # This is cheap enough to call once per iteration of a loop.
+    #
+    # \return The report of the collection, or None if none was made
+    def maybe_collect(self):
+        reason = self._trigger()
+        if reason is None:
+            return None
+        return self.collect(reason)
+
+    ##
+    # \brief Cleans the matrix store (and op store); the roots are held
+    #
+    # \param reason The reason recorded in the report
+    # \return A dictionary with the reason, the number of roots, the
+    # matrices freed, the estimated bytes reclaimed and the pause in seconds
+    def collect(self, reason='requested'):
+        start = time.time()
+        in_store = lu.num_matrices_in_store()
+        memo_table.clean_matrix_storage()
+        if self.clean_ops:
+            lu.sweep_op_store(0, -1)
+        freed = in_store - lu.num_matrices_in_store()
+        pause = time.time() - start
+
+        self._last_created = lu.num_matrices_created()
+        self._last_count = lu.nonscalar_store_count()
+        report = {'reason': reason, 'roots': len(_root_counts),
+                  'matrices_freed': freed,
+                  'bytes_reclaimed': freed * self.bytes_per_matrix,
+                  'pause_seconds': pause}
+        self.stats['collections'] += 1
+        self.stats['matrices_freed'] += freed
+        self.stats['bytes_reclaimed'] += report['bytes_reclaimed']
+        self.stats['pause_seconds'] += pause
+        self.stats['max_pause_seconds'] = max(self.stats['max_pause_seconds'],
+                                              pause)
+        self.last = report
+        if self.verbose:
+            print("store_gc (%s): freed %d matrices (about %.1f MiB) in %.3f "
+                  "seconds, %d roots" % (reason, freed,
+                                         report['bytes_reclaimed'] / 2**20,
+                                         pause, report['roots']))
+        return report
+
+
+##
+# \brief Sets the policy used by maybe_collect (None turns it off)
+#
+# \return The policy
+def set_store_gc(policy):
+    global _store_gc
+    _store_gc = policy
+    return policy
+
+
+##
+# \brief Returns the policy used by maybe_collect, or None
+def get_store_gc():
+    return _store_gc
+
+
+##
+# \brief Collects with the policy set by set_store_gc, if one has fired
+#
+# \return The report of the collection, or None
+def maybe_collect():
+    if _store_gc is None:
+        return None
+    return _store_gc.maybe_collect()
@@ -0,0 +1,232 @@
+#              store_planner.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+## \file store_planner.py
+#  \brief Chooses the LARC initialization parameters for a graph from its
+#  size, the memory of the machine and a calibrated model.
+#
+#  The model (InitParams/store_model.json, written by
+#  InitParams/calibrate_store_model.py) predicts the number of matrix store
+#  entries a triangle count creates as
+#       log2(entries) = log2_const + log2_nnz*log2(nnz) + log2_level*log2(level+1)
+#  and the memory as bytes_per_matrix_entry per entry plus hash_slot_bytes
+#  per hash table slot. The planner picks the smallest level holding the
+#  matrix, a matrix_exponent whose table has about one slot per predicted
+#  entry, and op_exponent = matrix_exponent + op_exponent_offset. If the
+#  predicted entries would not fit in memory_fraction of the available
+#  memory, the tables are sized for the entries that do. The result is an
+#  init_params entry, in the format of the files in InitParams, so it can be
+#  used like any other entry.
+#
+#  The regionbitparam and zeroregionbitparam are the pair the calibration
+#  sweep found to store the fewest matrices without changing any triangle
+#  count. An uncalibrated model (its "calibrated" key is false, as in the
+#  shipped store_model.json) gets -1 for both, the LARC defaults.
+
+from __future__ import print_function, division
+
+import gzip
+import json
+import math
+import os
+
+__all__ = ['graph_statistics', 'available_memory_GiB', 'load_store_model',
+           'plan_init_params', 'write_init_params_entry']
+
+_default_model_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   "../InitParams/store_model.json")
+
+
+##
+# \brief Returns the dimension and number of nonzeros of a graph file
+#
+# Matrix Market files (.mm, .mtx, possibly gzipped) and binary edge files
+# (.edges) are described by their headers; other files are read with
+# edges_from_text.
+#
+# \param path The name of the graph file
+# \return A pair (dimension, nnz)
+def graph_statistics(path):
+    base = path[:-3] if path.endswith(".gz") else path
+    if base.endswith((".mm", ".mtx")):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt") as fp:
+            line = fp.readline()
+            while line.startswith("%") or not line.strip():
+                line = fp.readline()
+        rows, cols, nnz = [int(x) for x in line.split()[:3]]
+        return max(rows, cols), nnz
+    from edge_files import edge_arrays_from_file, edges_from_text
+    if base.endswith(".edges"):
+        rows, cols, num_vertices = edge_arrays_from_file(path)
+    else:
+        rows, cols, num_vertices = edges_from_text(path)
+    return num_vertices, len(rows)
+
+
+##
+# \brief Returns the memory available to a new process, in GiB
+#
+# This reads MemAvailable from /proc/meminfo, falling back to the number of
+# free physical pages, so it can be used before LARC is initialized.
+def available_memory_GiB():
+    try:
+        with open("/proc/meminfo") as fp:
+            for line in fp:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 2**20
+    except (IOError, OSError, ValueError):
+        pass
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 2**30
+
+
+##
+# \brief Reads a store model file
+#
+# \param model_file The model file (default: InitParams/store_model.json)
+# \return The model as a dictionary
+def load_store_model(model_file=None):
+    with open(model_file or _default_model_file) as fp:
+        return json.load(fp)
+
+
+##
+# \brief Predicts the matrix store entries of a triangle count
+def _predicted_entries(model, nnz, level):
+    coeff = model["matrix_entries"]
+    log2_entries = (coeff["log2_const"]
+                    + coeff["log2_nnz"] * math.log2(max(nnz, 1))
+                    + coeff["log2_level"] * math.log2(level + 1))
+    return 2.0**log2_entries
+
+
+##
+# \brief Chooses LARC initialization parameters for a graph
+#
+# \param dimension The number of rows (and columns) of the adjacency matrix
+# \param nnz The number of nonzero entries
+# \param memory_GiB The memory to plan for (default: available_memory_GiB())
+# \param model A store model (default: load_store_model())
+# \return A pair (entry, report): entry is a dictionary with the keys of an
+# init_params entry, and report holds the predictions behind it, including
+# 'fits', which is False if even the smallest tables would not fit, and
+# 'calibrated', which is False if the model is the uncalibrated placeholder
+def plan_init_params(dimension, nnz, memory_GiB=None, model=None):
+    if model is None:
+        model = load_store_model()
+    if memory_GiB is None:
+        memory_GiB = available_memory_GiB()
+
+    level = 0
+    while 2**level < dimension:
+        level += 1
+    entries = _predicted_entries(model, nnz, level)
+    min_exp = model["min_exponent"]
+    max_exp = model["max_exponent"]
+    offset = model["op_exponent_offset"]
+
+    # each matrix store entry costs its node, a matrix table slot and
+    # 2**offset op table slots; if the predicted entries will not fit,
+    # size the tables for the entries that do, and rely on cleaning
+    bytes_per_entry = (model["bytes_per_matrix_entry"]
+                       + (1 + 2.0**offset) * model["hash_slot_bytes"])
+    budget = memory_GiB * 2**30 * model["memory_fraction"]
+    fits = entries * bytes_per_entry <= budget
+    usable = min(entries, budget / bytes_per_entry)
+    matrix_exponent = int(math.ceil(math.log2(max(usable, 2))))
+    if not fits:
+        matrix_exponent = int(math.floor(math.log2(max(usable, 2))))
+    matrix_exponent = min(max(matrix_exponent, min_exp), max_exp)
+    op_exponent = min(max(matrix_exponent + offset, min_exp), max_exp)
+    needed_GiB = entries * bytes_per_entry / 2**30
+    calibrated = model.get("calibrated", False)
+    if calibrated:
+        regionbitparam = model["regionbitparam"]
+        zeroregionbitparam = model["zeroregionbitparam"]
+    else:
+        regionbitparam = zeroregionbitparam = -1
+
+    entry = {
+        'matrix_exponent': matrix_exponent,
+        'op_exponent': op_exponent,
+        'max_level': level,
+        'regionbitparam': regionbitparam,
+        'zeroregionbitparam': zeroregionbitparam,
+        'report_interval_seconds': model["report_interval_seconds"],
+        'min_memGiB_required': int(math.ceil(needed_GiB)),
+        'verbose': 1
+    }
+    report = {'dimension': dimension, 'nnz': nnz,
+              'predicted_matrix_entries': int(entries),
+              'predicted_GiB': needed_GiB, 'memory_GiB': memory_GiB,
+              'fits': fits, 'calibrated': calibrated}
+    return entry, report
+
+
+##
+# \brief Adds (or replaces) a computing environment in an init_params file
+#
+# \param param_file_name The init_params file; it is created if missing
+# \param computing_env The name of the entry, e.g. 'auto'
+# \param entry The parameters, as returned by plan_init_params
+def write_init_params_entry(param_file_name, computing_env, entry):
+    data = {}
+    if os.path.exists(param_file_name):
+        with open(param_file_name) as fp:
+            data = json.load(fp)
+    data[computing_env] = [entry]
+    with open(param_file_name, "w") as fp:
+        json.dump(data, fp, indent=" ")
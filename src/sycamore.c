@@ -69,6 +69,8 @@
 #include "matmath.h"
 #include "global.h"
 #include "fft.h"
+#include "kron_cache.h"
+#include "memo.h"
 #include "sycamore.h"
 
 /*!
@@ -78,41 +80,36 @@
 
 #ifdef IS_COMPLEX
 
-int64_t build_sycamore_gate_sequence(char **gate_list, int system_size)
+// names of the one qubit gates, indexed by their SYCAMORE_GATE_* codes
+static const char *sycamore_gate_names[NUM_SYCAMORE_GATES] = {
+    "I", "sqrtX", "sqrtY", "sqrtW" };
+
+// the gate registry: packedIDs of the held 2x2 gate matrices, built on first
+// use; MATRIX_ID_INVALID marks a gate that has not been built
+static int64_t sycamore_gate_pIDs[NUM_SYCAMORE_GATES] = {
+    MATRIX_ID_INVALID, MATRIX_ID_INVALID, MATRIX_ID_INVALID,
+    MATRIX_ID_INVALID };
+
+int sycamore_gate_code(const char *gate_name)
+{
+    for (int code = 0; code < NUM_SYCAMORE_GATES; ++code)
+        if (0 == strcmp(gate_name, sycamore_gate_names[code]))
+            return code;
+    return -1;
+}
+
+// builds all of the gate matrices, holding them so that they survive
+// clean_matrix_storage
+static void build_sycamore_gate_registry(void)
 {
     // Get scalar values contained in the gates. In most cases, we must
     // initialize these values and store them in the matrixStore. There are
     // a few values that are preloaded, and for those values we can just look
     // up the matrixID for the global variable of that value.
-
-#if 0
-    scalarType scalar0_5i0_5;
-    sca_init(&scalar0_5i0_5);
-    sca_set_2ldoubles(&scalar0_5i0_5, 0.5L, 0.5L);
-    tempPTR = get_valMatPTR_from_val(scalar0_5i0_5);
-    int64_t valID_0_5i0_5 = tempPTR->packedID;
-    sca_clear(&scalar0_5i0_5);
-
-    scalarType scalar0_5iM0_5;
-    sca_init(&scalar0_5iM0_5);
-    sca_set_2ldoubles(&scalar0_5iM0_5, 0.5L, -0.5L);
-    tempPTR = get_valMatPTR_from_val(scalar0_5iM0_5);
-    int64_t valID_0_5iM0_5 = tempPTR->packedID;
-    sca_clear(&scalar0_5iM0_5);
-
-    scalarType scalarM0_5iM0_5;
-    sca_init(&scalarM0_5iM0_5);
-    sca_set_2ldoubles(&scalarM0_5iM0_5, -0.5L, -0.5L);
-    tempPTR = get_valMatPTR_from_val(scalarM0_5iM0_5);
-    int64_t valID_M0_5iM0_5 = tempPTR->packedID;
-    sca_clear(&scalarM0_5iM0_5);
-#endif
-
     int64_t valID_0_5i0_5 = get_valID_from_valString("0.5+I*0.5");
     int64_t valID_0_5iM0_5 = get_valID_from_valString("0.5-I*0.5");
     int64_t valID_M0_5iM0_5 = get_valID_from_valString("-0.5-I*0.5");
 
-    int64_t valID_1 = packedID_scalar1;
 //  1.0/sqrt(2) is not preloaded, so we must provide it. Some of our Clifford
 //  scalarTypes have sqrt(2) as an algebraic extension to the rationals, so we
 //  can use sca_set_enum to get a good sqrt(2). The call does not add the value
@@ -125,46 +122,106 @@ int64_t build_sycamore_gate_sequence(char **gate_list, int system_size)
 //  kronecker product of scalars is equivalent to a scalar multiply
     int64_t valID_0iM1_div_sqrt_2 = kronecker_product(valID_0iM1,
          valID_inv_sqrt_2);
-    
-    // get pointers to addresses for required 2x2 matrices
-    int64_t packedID_I = get_identity_pID(1);
-
-    int64_t panels_sqrtX[4] = { valID_0_5i0_5,  valID_0_5iM0_5,
-                                  valID_0_5iM0_5, valID_0_5i0_5 };
-    int64_t packedID_sqrtX = get_pID_from_four_sub_pIDs(panels_sqrtX[0],
-       panels_sqrtX[1], panels_sqrtX[2], panels_sqrtX[3], 1, 1);
-
-    int64_t panels_sqrtY[4] = { valID_0_5i0_5,  valID_M0_5iM0_5,
-                                  valID_0_5i0_5, valID_0_5i0_5 };
-    int64_t packedID_sqrtY = get_pID_from_four_sub_pIDs(panels_sqrtY[0],
-       panels_sqrtY[1], panels_sqrtY[2], panels_sqrtY[3], 1, 1);
-
-    int64_t panels_sqrtW[4] = { valID_0_5i0_5,    valID_0iM1_div_sqrt_2,
-                                  valID_inv_sqrt_2, valID_0_5i0_5 };
-    int64_t packedID_sqrtW = get_pID_from_four_sub_pIDs(panels_sqrtW[0],
-       panels_sqrtW[1], panels_sqrtW[2], panels_sqrtW[3], 1, 1);
-
-    // iteratively construct 2^n by 2^n matrix starting with scalar 1 value
-    int64_t out_pID = valID_1;
-
-    int64_t packedID_loop;
-    for (int index = system_size-1; index >= 0; --index)
+
+    int64_t gates[NUM_SYCAMORE_GATES];
+    gates[SYCAMORE_GATE_I] = get_identity_pID(1);
+    gates[SYCAMORE_GATE_SQRTX] = get_pID_from_four_sub_pIDs(
+       valID_0_5i0_5,  valID_0_5iM0_5,
+       valID_0_5iM0_5, valID_0_5i0_5, 1, 1);
+    gates[SYCAMORE_GATE_SQRTY] = get_pID_from_four_sub_pIDs(
+       valID_0_5i0_5,  valID_M0_5iM0_5,
+       valID_0_5i0_5,  valID_0_5i0_5, 1, 1);
+    gates[SYCAMORE_GATE_SQRTW] = get_pID_from_four_sub_pIDs(
+       valID_0_5i0_5,    valID_0iM1_div_sqrt_2,
+       valID_inv_sqrt_2, valID_0_5i0_5, 1, 1);
+
+    for (int code = 0; code < NUM_SYCAMORE_GATES; ++code)
+    {
+        set_hold_matrix(gates[code]);
+        sycamore_gate_pIDs[code] = gates[code];
+    }
+}
+
+int64_t get_sycamore_gate_pID(int gate_code)
+{
+    if ((gate_code < 0) || (gate_code >= NUM_SYCAMORE_GATES))
     {
-        if (0 == strncmp(gate_list[index], "I", strlen("I")+1)) {
-            packedID_loop = packedID_I;
-        } else if (0 == strncmp(gate_list[index], "sqrtX", strlen("sqrtX")+1)) {
-            packedID_loop = packedID_sqrtX;
-        } else if (0 == strncmp(gate_list[index], "sqrtY", strlen("sqrtY")+1)) {
-            packedID_loop = packedID_sqrtY;
-        } else if (0 == strncmp(gate_list[index], "sqrtW", strlen("sqrtW")+1)) {
-            packedID_loop = packedID_sqrtW;
-        } else {
+        printf("ERROR in %s: unrecognized gate code %d.\n",
+            __func__, gate_code);
+        return MATRIX_ID_INVALID;
+    }
+    // the registry is rebuilt if it is empty, or if its matrices have
+    // disappeared from the store (for example, after the holds were released
+    // by release_sycamore_gates and the store was cleaned)
+    if ((sycamore_gate_pIDs[gate_code] == MATRIX_ID_INVALID) ||
+        matrix_is_invalid(sycamore_gate_pIDs[gate_code]))
+        build_sycamore_gate_registry();
+    return sycamore_gate_pIDs[gate_code];
+}
+
+void release_sycamore_gates(void)
+{
+    for (int code = 0; code < NUM_SYCAMORE_GATES; ++code)
+    {
+        if ((sycamore_gate_pIDs[code] != MATRIX_ID_INVALID) &&
+            !matrix_is_invalid(sycamore_gate_pIDs[code]))
+            release_hold_matrix(sycamore_gate_pIDs[code]);
+        sycamore_gate_pIDs[code] = MATRIX_ID_INVALID;
+    }
+}
+
+// partial products of earlier gate sequences, keyed by their leading codes
+static kron_cache_t *sycamore_layer_cache = NULL;
+
+int64_t build_sycamore_gate_sequence_from_codes(const int *gate_codes,
+        int system_size)
+{
+    // look up the gates once; the cache is emptied if they were rebuilt
+    int64_t gates[NUM_SYCAMORE_GATES];
+    for (int code = 0; code < NUM_SYCAMORE_GATES; ++code)
+        gates[code] = get_sycamore_gate_pID(code);
+    if (sycamore_layer_cache == NULL)
+        sycamore_layer_cache = kron_cache_create(NUM_SYCAMORE_GATES, gates);
+    else
+        kron_cache_set_factors(sycamore_layer_cache, gates);
+    if (sycamore_layer_cache == NULL)
+        return -1;
+
+    // construct the 2^n by 2^n matrix, reusing the longest matching run of
+    // low-index gates from an earlier sequence
+    int64_t out_pID = kron_cache_build(sycamore_layer_cache, gate_codes,
+        system_size);
+    return (out_pID == MATRIX_ID_INVALID) ? -1 : out_pID;
+}
+
+int sycamore_gate_sequence_levels_reused(void)
+{
+    if (sycamore_layer_cache == NULL)
+        return 0;
+    return kron_cache_levels_reused(sycamore_layer_cache);
+}
+
+int64_t build_sycamore_gate_sequence(char **gate_list, int system_size)
+{
+    // map the names to codes once, before the kronecker loop
+    int *gate_codes = malloc(system_size*sizeof(int));
+    if (gate_codes == NULL) {
+        printf("ERROR in %s: out of memory.\n", __func__);
+        return -1;
+    }
+    for (int index = 0; index < system_size; ++index)
+    {
+        gate_codes[index] = sycamore_gate_code(gate_list[index]);
+        if (gate_codes[index] < 0) {
             printf("ERROR in %s: unrecognized gate (%s) at index %d.\n",
                 __func__, gate_list[index], index);
+            free(gate_codes);
             return -1;
         }
-        out_pID = kronecker_product(packedID_loop, out_pID);
     }
+    int64_t out_pID = build_sycamore_gate_sequence_from_codes(gate_codes,
+        system_size);
+    free(gate_codes);
     return out_pID;
 }
 
@@ -266,5 +323,161 @@ int64_t build_sycamore_2gate(int target1, int target2, int system_size)
   return mat_supremacy_pID;
 }
 
+// the scalars i and omega = (sqrt(3) + i)/2 of the Sycamore two qubit gate
+typedef struct fsim_scalars {
+  int64_t val_1j_pID;
+  int64_t val_omega_pID;
+} fsim_scalars_t;
+
+// multiplies m_pID by the scalar val_pID, skipping multiplication by 1
+static int64_t fsim_scale(int64_t val_pID, int64_t m_pID)
+{
+  if (val_pID == packedID_scalar1) return m_pID;
+  return scalar_mult(val_pID, m_pID);
+}
+
+// Combines two blocks X and Y of rows from the two halves of the first
+// target qubit. Below this node there are d2 identity qubits before the
+// second target qubit, and at that qubit the output takes its upper half
+// from the sel half of X and its lower half from the sel half of Y:
+//   sel = 0:  out(q2=0) =   X(q2=0),  out(q2=1) = i*Y(q2=0)
+//   sel = 1:  out(q2=0) = i*X(q2=1),  out(q2=1) = omega*Y(q2=1)
+// which with X = rows(q1=0), Y = rows(q1=1) gives rows(q1=sel) of the output.
+static int64_t fsim_mix(const fsim_scalars_t *sc, int64_t x_pID,
+        int64_t y_pID, int d2, int sel)
+{
+  if (matrix_is_zero(x_pID) && matrix_is_zero(y_pID)) return x_pID;
+  int64_t memo_pID = memo_lookup(MEMO_OP_SYCAMORE_2GATE_MIX, x_pID, y_pID,
+      2*d2 + sel);
+  if (memo_pID != MATRIX_ID_INVALID) return memo_pID;
+
+  mat_level_t row_level = matrix_row_level(x_pID);
+  mat_level_t col_level = matrix_col_level(x_pID);
+  int64_t out[4] = { MATRIX_ID_INVALID, MATRIX_ID_INVALID,
+                     MATRIX_ID_INVALID, MATRIX_ID_INVALID };
+  if (d2 == 0)
+  {
+    int64_t sx = sel ? sc->val_1j_pID : packedID_scalar1;
+    int64_t sy = sel ? sc->val_omega_pID : sc->val_1j_pID;
+    out[0] = fsim_scale(sx, get_pID_of_indexed_submatrix(x_pID, 2*sel));
+    out[2] = fsim_scale(sy, get_pID_of_indexed_submatrix(y_pID, 2*sel));
+    if (col_level)
+    {
+      out[1] = fsim_scale(sx, get_pID_of_indexed_submatrix(x_pID, 2*sel+1));
+      out[3] = fsim_scale(sy, get_pID_of_indexed_submatrix(y_pID, 2*sel+1));
+    }
+  }
+  else
+  {
+    // an identity qubit: each quadrant is handled independently
+    for (int k = 0; k < 4; ++k)
+    {
+      if ((k & 1) && !col_level) continue;
+      out[k] = fsim_mix(sc, get_pID_of_indexed_submatrix(x_pID, k),
+          get_pID_of_indexed_submatrix(y_pID, k), d2-1, sel);
+    }
+  }
+  int64_t result_pID = get_pID_from_four_sub_pIDs(out[0], out[1], out[2],
+      out[3], row_level, col_level);
+  memo_insert(MEMO_OP_SYCAMORE_2GATE_MIX, x_pID, y_pID, 2*d2 + sel,
+      result_pID);
+  return result_pID;
+}
+
+// applies the gate to m_pID, whose first row split is d1 qubits above the
+// first target and d2 qubits above the second target (d1 < d2)
+static int64_t fsim_apply(const fsim_scalars_t *sc, int64_t m_pID, int d1,
+        int d2)
+{
+  if (matrix_is_zero(m_pID)) return m_pID;
+  int64_t memo_pID = memo_lookup(MEMO_OP_SYCAMORE_2GATE, m_pID, d1, d2);
+  if (memo_pID != MATRIX_ID_INVALID) return memo_pID;
+
+  mat_level_t row_level = matrix_row_level(m_pID);
+  mat_level_t col_level = matrix_col_level(m_pID);
+  int64_t in[4], out[4];
+  for (int k = 0; k < 4; ++k)
+  {
+    out[k] = MATRIX_ID_INVALID;
+    in[k] = ((k & 1) && !col_level) ? MATRIX_ID_INVALID
+        : get_pID_of_indexed_submatrix(m_pID, k);
+  }
+  if (d1 == 0)
+  {
+    // the first target: pair the upper and lower halves column by column
+    for (int k = 0; k < 2; ++k)
+    {
+      if (k && !col_level) continue;
+      out[k] = fsim_mix(sc, in[k], in[k+2], d2-1, 0);
+      out[k+2] = fsim_mix(sc, in[k], in[k+2], d2-1, 1);
+    }
+  }
+  else
+  {
+    for (int k = 0; k < 4; ++k)
+    {
+      if ((k & 1) && !col_level) continue;
+      out[k] = fsim_apply(sc, in[k], d1-1, d2-1);
+    }
+  }
+  int64_t result_pID = get_pID_from_four_sub_pIDs(out[0], out[1], out[2],
+      out[3], row_level, col_level);
+  memo_insert(MEMO_OP_SYCAMORE_2GATE, m_pID, d1, d2, result_pID);
+  return result_pID;
+}
+
+int64_t apply_sycamore_2gate(int64_t m_pID, int target1, int target2)
+{
+  if (matrix_is_invalid(m_pID))
+  {
+    printf("ERROR in %s: input matrix %" PRId64 " is invalid.\n",
+        __func__, m_pID);
+    return -1;
+  }
+
+  int system_size = matrix_row_level(m_pID);
+  if ((target1 < 0) || (target1 >= system_size))
+  {
+    printf("ERROR in %s: target1 (= %d) out of valid range 0 to %d.\n",
+        __func__, target1, system_size - 1);
+    return -1;
+  }
+
+  if ((target2 < 0) || (target2 >= system_size))
+  {
+    printf("ERROR in %s: target2 (= %d) out of valid range 0 to %d.\n",
+        __func__, target2, system_size - 1);
+    return -1;
+  }
+
+  if (target1 == target2)
+  {
+    printf("ERROR in %s: target1 (= %d) and target2 (= %d) cannot have the same value.\n",
+        __func__, target1, target2);
+    return -1;
+  }
+
+  // Because the supremacy gate is symmetric between the qubits,
+  // we can sort the targets.
+  int min_target = (target1 < target2) ? target1 : target2;
+  int max_target = (target1 < target2) ? target2 : target1;
+
+  fsim_scalars_t sc;
+  sc.val_1j_pID = get_scalarPTR_for_scalarVal(scalar0i1)->packedID;
+  scalarType omega_scalar;
+  sca_init(&omega_scalar);
+  sca_set_enum(&omega_scalar, SCALAR_ENUM_SQRT3);
+  sca_add(&omega_scalar, omega_scalar, scalar0i1);
+  sca_mult(&omega_scalar, omega_scalar, scalar0_5);
+  sc.val_omega_pID = get_scalarPTR_for_scalarVal(omega_scalar)->packedID;
+  sca_clear(&omega_scalar);
+
+  memo_call_t call = memo_call_begin(MEMO_OP_SYCAMORE_2GATE);
+  int64_t result_pID = fsim_apply(&sc, m_pID, min_target, max_target);
+  memo_call_end(call);
+  return result_pID;
+}
+
 #endif
 
+
@@ -57,6 +57,68 @@
 
 #ifdef IS_COMPLEX
 
+/* codes for the Sycamore one qubit gates (see sycamore_gate_code) */
+#define SYCAMORE_GATE_I      0
+#define SYCAMORE_GATE_SQRTX  1
+#define SYCAMORE_GATE_SQRTY  2
+#define SYCAMORE_GATE_SQRTW  3
+#define NUM_SYCAMORE_GATES   4
+
+/*!
+ * \brief Look up the code for a Sycamore one qubit gate name.
+ *
+ * \param gate_name One of "I", "sqrtX", "sqrtY", or "sqrtW"
+ * \result The SYCAMORE_GATE_* code for the gate, or -1 if not recognized
+ *
+ */
+int sycamore_gate_code(const char *gate_name);
+
+/*!
+ * \brief Return the matrixID of a Sycamore one qubit (2x2) gate.
+ *
+ * The gates are built once per session and held, so that they survive
+ * clean_matrix_storage. The registry is rebuilt if its matrices are
+ * found to be no longer in the matrix store.
+ *
+ * \param gate_code One of the SYCAMORE_GATE_* codes
+ * \result The matrixID for the gate matrix
+ *
+ */
+int64_t get_sycamore_gate_pID(int gate_code);
+
+/*!
+ * \brief Release the holds on the Sycamore one qubit gates and empty
+ * the registry; the gates are rebuilt when next needed.
+ */
+void release_sycamore_gates(void);
+
+/*!
+ * \brief Create a matrix which applies a sequence of Sycamore
+ * one qubit gates, given by their codes, to a system.
+ *
+ * \param gate_codes The array of SYCAMORE_GATE_* codes specifying the
+ *      gate to apply for each qubit.  This length of the array must be
+ *      system_size.
+ * \param system_size The number of qubits in the system
+ * \result The matrixID for the gate matrix
+ *
+ */
+int64_t build_sycamore_gate_sequence_from_codes(const int *gate_codes,
+        int system_size);
+
+/*!
+ * \brief Report how many of the one qubit gate levels in the most recent
+ * Sycamore gate sequence were reused from earlier sequences.
+ *
+ * Sequences are built low-index qubit first, and every partial Kronecker
+ * product is remembered, so a sequence which begins with the same gates as
+ * an earlier one only computes the levels after the shared run.
+ *
+ * \result The number of levels (out of system_size) that were reused
+ *
+ */
+int sycamore_gate_sequence_levels_reused(void);
+
 /*!
  * \brief Create a matrix which applies a sequence of Sycamore
  * one qubit gates to a system.
@@ -83,6 +145,25 @@ int64_t build_sycamore_gate_sequence(char **gate_list, int system_size);
  */
 int64_t build_sycamore_2gate(int target1, int target2, int system_size);
 
+/*!
+ * \brief Apply the Sycamore two qubit gate on specified qubits directly
+ * to a state vector or matrix.
+ *
+ * This computes matrix_mult(build_sycamore_2gate(target1, target2, n), m)
+ * without building the gate matrix: it recurses down the quadtree of m
+ * to the level of the first target qubit and recombines the sub-blocks of
+ * the two halves there. Subproblems are remembered in the memo table
+ * (memo.h), keyed on the gate, the target positions and the input
+ * matrixID, so repeated blocks and repeated calls are computed once.
+ *
+ * \param m_pID The matrixID of a 2^n by 2^k matrix (k = 0 for a vector)
+ * \param target1 The (zero-based) index of the first specified qubit
+ * \param target2 The (zero-based) index of the second specified qubit
+ * \result The matrixID for the product of the gate matrix and m_pID
+ *
+ */
+int64_t apply_sycamore_2gate(int64_t m_pID, int target1, int target2);
+
 #endif
 
 #endif
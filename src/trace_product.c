@@ -0,0 +1,187 @@
+//trace_product.c
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+// Standard Libraries
+#include <stdio.h>
+#include <stdlib.h>
+#include <inttypes.h>
+#include <stdint.h>
+
+// Our header files structures and functions
+#include "trace_product.h"
+#include "memo.h"
+
+/*!
+ * \file trace_product.c
+ * \brief Traces and masked sums of matrix products, computed by recursion
+ * on quadrants without forming the product.
+ */
+
+// The quadrant of a matrix in row half i and column half j. A level 0
+// dimension is not split, which matches the LARC panel numbering of row
+// vectors (panels 0 and 1) and column vectors (panels 0 and 2).
+static int64_t quadrant(int64_t m_pID, mat_level_t row_level,
+        mat_level_t col_level, int i, int j)
+{
+  return get_pID_of_indexed_submatrix(m_pID,
+      (row_level ? 2*i : 0) + (col_level ? j : 0));
+}
+
+static int64_t trace_rec(int64_t x_pID, int64_t y_pID, int64_t zero_pID)
+{
+  if (matrix_is_zero(x_pID) || matrix_is_zero(y_pID)) return zero_pID;
+  mat_level_t row_level = matrix_row_level(x_pID);
+  mat_level_t col_level = matrix_col_level(x_pID);
+  if ((row_level == 0) && (col_level == 0)) return matrix_mult(x_pID, y_pID);
+
+  int64_t memo_pID = memo_lookup(MEMO_OP_TRACE_PRODUCT, x_pID, y_pID, 0);
+  if (memo_pID != MATRIX_ID_INVALID) return memo_pID;
+
+  int64_t sum_pID = zero_pID;
+  for (int i = 0; i <= (row_level > 0); ++i)
+    for (int j = 0; j <= (col_level > 0); ++j)
+    {
+      int64_t term_pID = trace_rec(
+          quadrant(x_pID, row_level, col_level, i, j),
+          quadrant(y_pID, col_level, row_level, j, i), zero_pID);
+      if (term_pID == MATRIX_ID_INVALID) return MATRIX_ID_INVALID;
+      sum_pID = matrix_add(sum_pID, term_pID);
+    }
+  memo_insert(MEMO_OP_TRACE_PRODUCT, x_pID, y_pID, 0, sum_pID);
+  return sum_pID;
+}
+
+int64_t trace_of_product(int64_t X_pID, int64_t Y_pID)
+{
+  if (matrix_is_invalid(X_pID) || matrix_is_invalid(Y_pID))
+  {
+    printf("ERROR in %s: input matrix %" PRId64 " or %" PRId64
+        " is invalid.\n", __func__, X_pID, Y_pID);
+    return MATRIX_ID_INVALID;
+  }
+  if ((matrix_row_level(X_pID) != matrix_col_level(Y_pID))
+      || (matrix_col_level(X_pID) != matrix_row_level(Y_pID)))
+  {
+    printf("ERROR in %s: X*Y is not square (X is 2^%u by 2^%u, "
+        "Y is 2^%u by 2^%u).\n", __func__, matrix_row_level(X_pID),
+        matrix_col_level(X_pID), matrix_row_level(Y_pID),
+        matrix_col_level(Y_pID));
+    return MATRIX_ID_INVALID;
+  }
+  memo_call_t call = memo_call_begin(MEMO_OP_TRACE_PRODUCT);
+  int64_t trace_pID = trace_rec(X_pID, Y_pID, get_zero_pID(0, 0));
+  memo_call_end(call);
+  return trace_pID;
+}
+
+static int64_t masked_rec(int64_t x_pID, int64_t y_pID, int64_t m_pID,
+        int64_t zero_pID)
+{
+  if (matrix_is_zero(x_pID) || matrix_is_zero(y_pID) || matrix_is_zero(m_pID))
+    return zero_pID;
+  mat_level_t row_level = matrix_row_level(x_pID);
+  mat_level_t inner_level = matrix_col_level(x_pID);
+  mat_level_t col_level = matrix_col_level(y_pID);
+  if ((row_level == 0) && (inner_level == 0) && (col_level == 0))
+    return matrix_mult(matrix_mult(x_pID, y_pID), m_pID);
+
+  int64_t memo_pID = memo_lookup(MEMO_OP_MASKED_PRODUCT_SUM, x_pID, y_pID,
+      m_pID);
+  if (memo_pID != MATRIX_ID_INVALID) return memo_pID;
+
+  int64_t sum_pID = zero_pID;
+  for (int i = 0; i <= (row_level > 0); ++i)
+    for (int j = 0; j <= (col_level > 0); ++j)
+    {
+      int64_t m_ij = quadrant(m_pID, row_level, col_level, i, j);
+      if (matrix_is_zero(m_ij)) continue;
+      for (int k = 0; k <= (inner_level > 0); ++k)
+      {
+        int64_t term_pID = masked_rec(
+            quadrant(x_pID, row_level, inner_level, i, k),
+            quadrant(y_pID, inner_level, col_level, k, j), m_ij, zero_pID);
+        if (term_pID == MATRIX_ID_INVALID) return MATRIX_ID_INVALID;
+        sum_pID = matrix_add(sum_pID, term_pID);
+      }
+    }
+  memo_insert(MEMO_OP_MASKED_PRODUCT_SUM, x_pID, y_pID, m_pID, sum_pID);
+  return sum_pID;
+}
+
+int64_t masked_product_sum(int64_t X_pID, int64_t Y_pID, int64_t M_pID)
+{
+  if (matrix_is_invalid(X_pID) || matrix_is_invalid(Y_pID)
+      || matrix_is_invalid(M_pID))
+  {
+    printf("ERROR in %s: input matrix %" PRId64 ", %" PRId64 " or %" PRId64
+        " is invalid.\n", __func__, X_pID, Y_pID, M_pID);
+    return MATRIX_ID_INVALID;
+  }
+  if ((matrix_col_level(X_pID) != matrix_row_level(Y_pID))
+      || (matrix_row_level(M_pID) != matrix_row_level(X_pID))
+      || (matrix_col_level(M_pID) != matrix_col_level(Y_pID)))
+  {
+    printf("ERROR in %s: sizes do not match (X is 2^%u by 2^%u, Y is 2^%u "
+        "by 2^%u, M is 2^%u by 2^%u).\n", __func__, matrix_row_level(X_pID),
+        matrix_col_level(X_pID), matrix_row_level(Y_pID),
+        matrix_col_level(Y_pID), matrix_row_level(M_pID),
+        matrix_col_level(M_pID));
+    return MATRIX_ID_INVALID;
+  }
+  memo_call_t call = memo_call_begin(MEMO_OP_MASKED_PRODUCT_SUM);
+  int64_t sum_pID = masked_rec(X_pID, Y_pID, M_pID, get_zero_pID(0, 0));
+  memo_call_end(call);
+  return sum_pID;
+}
@@ -0,0 +1,100 @@
+//trace_product.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+#ifndef MPL_TRACE_PRODUCT_H
+#define MPL_TRACE_PRODUCT_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* The functions in trace_product.c compute scalar summaries of a matrix    *
+ * product without storing the product. Each is a recursion over quadrants  *
+ * which skips zero blocks and remembers its subproblems in the memo table  *
+ * (memo.h), so shared subtrees are summed once. Both return the packedID   *
+ * of a 1 by 1 matrix; get_scalar_value_string gives its value as a string. *
+ * For the adjacency matrix A of an undirected graph, both                   *
+ *     trace_of_product(A, matrix_mult(A, A))  and                          *
+ *     masked_product_sum(A, A, A)                                          *
+ * are six times the number of triangles, and neither builds A^3.           */
+
+/*!
+ * \brief Compute trace(X*Y) without computing X*Y
+ *
+ * Splitting both matrices into quadrants, trace(X*Y) is the sum over i,j
+ * of trace(X_ij * Y_ji), which is applied recursively down to the scalars.
+ *
+ * \param X_pID The packedID of an m by n matrix X
+ * \param Y_pID The packedID of an n by m matrix Y
+ * \result The packedID of the scalar trace(X*Y), or MATRIX_ID_INVALID on error
+ */
+int64_t trace_of_product(int64_t X_pID, int64_t Y_pID);
+
+/*!
+ * \brief Compute the sum of the entries of (X*Y) o M without computing X*Y
+ *
+ * Here o is the entrywise product, so the result is the sum of the entries
+ * of X*Y at the nonzero entries of M, weighted by M. Splitting into
+ * quadrants, it is the sum over i,j,k of the same quantity for X_ik, Y_kj
+ * and M_ij, and whenever one of the three blocks is zero the term is skipped.
+ *
+ * \param X_pID The packedID of an m by n matrix X
+ * \param Y_pID The packedID of an n by p matrix Y
+ * \param M_pID The packedID of an m by p matrix M (the mask)
+ * \result The packedID of the scalar sum, or MATRIX_ID_INVALID on error
+ */
+int64_t masked_product_sum(int64_t X_pID, int64_t Y_pID, int64_t M_pID);
+
+#endif
@@ -0,0 +1,263 @@
+//traversal.c
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+// Standard Libraries
+#include <stdio.h>
+#include <stdlib.h>
+#include <inttypes.h>
+#include <stdint.h>
+#include <string.h>
+
+// Our header files structures and functions
+#include "traversal.h"
+
+/*!
+ * \file traversal.c
+ * \brief Visit each distinct node of a LARC quadtree once.
+ */
+
+static uint64_t pID_hash(int64_t pID)
+{
+  uint64_t h = (uint64_t)pID * 0x9E3779B97F4A7C15ULL;
+  return h ^ (h >> 29);
+}
+
+int pID_set_init(pID_set_t *set, int64_t expected_count)
+{
+  int64_t capacity = 64;
+  while (capacity < 2*expected_count) capacity *= 2;
+  set->slot = malloc(capacity*sizeof(int64_t));
+  if (set->slot == NULL)
+  {
+    set->capacity = set->count = 0;
+    return -1;
+  }
+  for (int64_t i = 0; i < capacity; ++i) set->slot[i] = MATRIX_ID_INVALID;
+  set->capacity = capacity;
+  set->count = 0;
+  return 0;
+}
+
+void pID_set_free(pID_set_t *set)
+{
+  free(set->slot);
+  set->slot = NULL;
+  set->capacity = set->count = 0;
+}
+
+// doubles the capacity of the set, keeping its entries
+static int pID_set_grow(pID_set_t *set)
+{
+  pID_set_t bigger;
+  if (pID_set_init(&bigger, set->capacity) != 0) return -1;
+  for (int64_t i = 0; i < set->capacity; ++i)
+    if (set->slot[i] != MATRIX_ID_INVALID)
+      pID_set_insert(&bigger, set->slot[i]);
+  free(set->slot);
+  *set = bigger;
+  return 0;
+}
+
+int pID_set_insert(pID_set_t *set, int64_t pID)
+{
+  if ((2*(set->count+1) > set->capacity) && (pID_set_grow(set) != 0))
+    return -1;
+  uint64_t mask = (uint64_t)set->capacity - 1;
+  uint64_t i = pID_hash(pID) & mask;
+  while (set->slot[i] != MATRIX_ID_INVALID)
+  {
+    if (set->slot[i] == pID) return 0;
+    i = (i + 1) & mask;
+  }
+  set->slot[i] = pID;
+  set->count++;
+  return 1;
+}
+
+int pID_map_init(pID_map_t *map, int64_t expected_count)
+{
+  int64_t capacity = 64;
+  while (capacity < 2*expected_count) capacity *= 2;
+  map->key = malloc(capacity*sizeof(int64_t));
+  map->value = malloc(capacity*sizeof(int64_t));
+  if ((map->key == NULL) || (map->value == NULL))
+  {
+    free(map->key);
+    free(map->value);
+    map->key = map->value = NULL;
+    map->capacity = map->count = 0;
+    return -1;
+  }
+  for (int64_t i = 0; i < capacity; ++i) map->key[i] = MATRIX_ID_INVALID;
+  map->capacity = capacity;
+  map->count = 0;
+  return 0;
+}
+
+void pID_map_free(pID_map_t *map)
+{
+  free(map->key);
+  free(map->value);
+  map->key = map->value = NULL;
+  map->capacity = map->count = 0;
+}
+
+// doubles the capacity of the map, keeping its entries
+static int pID_map_grow(pID_map_t *map)
+{
+  pID_map_t bigger;
+  if (pID_map_init(&bigger, map->capacity) != 0) return -1;
+  for (int64_t i = 0; i < map->capacity; ++i)
+    if (map->key[i] != MATRIX_ID_INVALID)
+      pID_map_put(&bigger, map->key[i], map->value[i]);
+  pID_map_free(map);
+  *map = bigger;
+  return 0;
+}
+
+int pID_map_put(pID_map_t *map, int64_t pID, int64_t value)
+{
+  if ((2*(map->count+1) > map->capacity) && (pID_map_grow(map) != 0))
+    return -1;
+  uint64_t mask = (uint64_t)map->capacity - 1;
+  uint64_t i = pID_hash(pID) & mask;
+  while ((map->key[i] != MATRIX_ID_INVALID) && (map->key[i] != pID))
+    i = (i + 1) & mask;
+  if (map->key[i] == MATRIX_ID_INVALID)
+  {
+    map->key[i] = pID;
+    map->count++;
+  }
+  map->value[i] = value;
+  return 0;
+}
+
+int pID_map_get(const pID_map_t *map, int64_t pID, int64_t *value)
+{
+  uint64_t mask = (uint64_t)map->capacity - 1;
+  uint64_t i = pID_hash(pID) & mask;
+  while (map->key[i] != MATRIX_ID_INVALID)
+  {
+    if (map->key[i] == pID)
+    {
+      *value = map->value[i];
+      return 1;
+    }
+    i = (i + 1) & mask;
+  }
+  return 0;
+}
+
+int64_t count_unique_nodes(int64_t m_pID)
+{
+  if (matrix_is_invalid(m_pID))
+  {
+    printf("ERROR in %s: packedID %" PRId64 " is not a valid matrix.\n",
+        __func__, m_pID);
+    return -1;
+  }
+
+  pID_set_t seen;
+  int64_t stack_size = 1024, top = 0;
+  int64_t *stack = malloc(stack_size*sizeof(int64_t));
+  if ((stack == NULL) || (pID_set_init(&seen, 1024) != 0))
+  {
+    printf("ERROR in %s: out of memory.\n", __func__);
+    free(stack);
+    return -1;
+  }
+
+  // depth first walk; a node's children are pushed only on its first visit
+  int out_of_memory = 0;
+  stack[top++] = m_pID;
+  while ((top > 0) && !out_of_memory)
+  {
+    int64_t pID = stack[--top];
+    int added = pID_set_insert(&seen, pID);
+    if (added <= 0)
+    {
+      out_of_memory = (added < 0);
+      continue;
+    }
+    mat_level_t row_level = matrix_row_level(pID);
+    mat_level_t col_level = matrix_col_level(pID);
+    if ((row_level == 0) && (col_level == 0))
+      continue;
+    if (top + 4 > stack_size)
+    {
+      int64_t *bigger = realloc(stack, 2*stack_size*sizeof(int64_t));
+      if (bigger == NULL)
+      {
+        out_of_memory = 1;
+        continue;
+      }
+      stack = bigger;
+      stack_size *= 2;
+    }
+    // vectors have only two panels: 0 and 2 (column) or 0 and 1 (row)
+    for (int k = 0; k < 4; ++k)
+    {
+      if (((k & 1) && !col_level) || ((k & 2) && !row_level)) continue;
+      stack[top++] = get_pID_of_indexed_submatrix(pID, k);
+    }
+  }
+
+  int64_t count = out_of_memory ? -1 : seen.count;
+  if (out_of_memory)
+    printf("ERROR in %s: out of memory.\n", __func__);
+  free(stack);
+  pID_set_free(&seen);
+  return count;
+}
@@ -0,0 +1,157 @@
+//traversal.h
+/******************************************************************
+ *                                                                *
+ * Copyright (C) 2014-2024, Institute for Defense Analyses        *
+ * 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           *
+ * This material may be reproduced by or for the US Government    *
+ * pursuant to the copyright license under the clauses at DFARS   *
+ * 252.227-7013 and 252.227-7014.                                 *
+ *                                                                *
+ * LARC : Linear Algebra via Recursive Compression                *
+ * Authors:                                                       *
+ *   - Steve Cuccaro (IDA-CCS)                                    *
+ *   - John Daly (LPS)                                            *
+ *   - John Gilbert (UCSB, IDA adjunct)                           *
+ *   - Mark Pleszkoch (IDA-CCS)                                   *
+ *   - Jenny Zito (IDA-CCS)                                       *
+ *                                                                *
+ * Additional contributors are listed in "LARCcontributors".      *
+ *                                                                *
+ * Questions: larc@super.org                                      *
+ *                                                                *
+ * All rights reserved.                                           *
+ *                                                                *
+ * Redistribution and use in source and binary forms, with or     *
+ * without modification, are permitted provided that the          *
+ * following conditions are met:                                  *
+ *   - Redistribution of source code must retain the above        *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer.                                      *
+ *   - Redistribution in binary form must reproduce the above     *
+ *     copyright notice, this list of conditions and the          *
+ *     following disclaimer in the documentation and/or other     *
+ *     materials provided with the distribution.                  *
+ *   - Neither the name of the copyright holder nor the names of  *
+ *     its contributors may be used to endorse or promote         *
+ *     products derived from this software without specific prior *
+ *     written permission.                                        *
+ *                                                                *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         *
+ * CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    *
+ * INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       *
+ * MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       *
+ * DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        *
+ * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   *
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   *
+ * NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   *
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       *
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      *
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   *
+ * OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, *
+ * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             *
+ *                                                                *
+ *****************************************************************/
+
+
+#ifndef MPL_TRAVERSAL_H
+#define MPL_TRAVERSAL_H
+
+#include <inttypes.h>
+#include "larc.h"
+#include "global.h"
+#include "matmath.h"
+
+/* The functions in traversal.c walk the quadtree of a LARC matrix visiting  *
+ * each distinct node (packedID) once, however many times it is shared.      *
+ * The pID_set type, a growable hash set of packedIDs, is available to other *
+ * MyPyLARC C files which need to mark nodes as seen.                        */
+
+typedef struct pID_set {
+  int64_t *slot;          /* MATRIX_ID_INVALID marks an empty slot */
+  int64_t capacity;       /* always a power of two */
+  int64_t count;
+} pID_set_t;
+
+/*!
+ * \brief Initialize an empty set of packedIDs
+ *
+ * \param set The set
+ * \param expected_count The number of entries to allocate space for
+ * \result 0 on success, -1 if out of memory
+ */
+int pID_set_init(pID_set_t *set, int64_t expected_count);
+
+/*!
+ * \brief Free the memory of a set of packedIDs
+ *
+ * \param set The set
+ */
+void pID_set_free(pID_set_t *set);
+
+/*!
+ * \brief Add a packedID to a set
+ *
+ * \param set The set
+ * \param pID The packedID
+ * \result 1 if pID was added, 0 if it was already present, -1 if out of memory
+ */
+int pID_set_insert(pID_set_t *set, int64_t pID);
+
+/* The pID_map type maps packedIDs to int64_t values (such as the position  *
+ * of a node in a list), with the same growable open addressing as pID_set. */
+
+typedef struct pID_map {
+  int64_t *key;           /* MATRIX_ID_INVALID marks an empty slot */
+  int64_t *value;
+  int64_t capacity;       /* always a power of two */
+  int64_t count;
+} pID_map_t;
+
+/*!
+ * \brief Initialize an empty map from packedIDs to values
+ *
+ * \param map The map
+ * \param expected_count The number of entries to allocate space for
+ * \result 0 on success, -1 if out of memory
+ */
+int pID_map_init(pID_map_t *map, int64_t expected_count);
+
+/*!
+ * \brief Free the memory of a map from packedIDs to values
+ *
+ * \param map The map
+ */
+void pID_map_free(pID_map_t *map);
+
+/*!
+ * \brief Set the value of a packedID in a map
+ *
+ * \param map The map
+ * \param pID The packedID
+ * \param value Its new value
+ * \result 0 on success, -1 if out of memory
+ */
+int pID_map_put(pID_map_t *map, int64_t pID, int64_t value);
+
+/*!
+ * \brief Look up the value of a packedID in a map
+ *
+ * \param map The map
+ * \param pID The packedID
+ * \param value Set to the value of pID, if it is present
+ * \result 1 if pID is present, 0 if not
+ */
+int pID_map_get(const pID_map_t *map, int64_t pID, int64_t *value);
+
+/*!
+ * \brief Count the distinct nodes (including scalars) in a matrix
+ *
+ * This is the LARCsize of the matrix, the number of entries that
+ * fprint_larcMatrixFile would write, computed without writing a file.
+ *
+ * \param m_pID The packedID of the matrix
+ * \result The number of distinct packedIDs in its quadtree, or -1 on error
+ */
+int64_t count_unique_nodes(int64_t m_pID);
+
+#endif
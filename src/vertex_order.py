@@ -0,0 +1,238 @@
+#              vertex_order.py
+#*################################################################
+#                                                                #
+# Copyright (C) 2014-2024, Institute for Defense Analyses        #
+# 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+# This material may be reproduced by or for the US Government    #
+# pursuant to the copyright license under the clauses at DFARS   #
+# 252.227-7013 and 252.227-7014.                                 #
+#                                                                #
+# LARC : Linear Algebra via Recursive Compression                #
+# Authors:                                                       #
+#   - Steve Cuccaro (IDA-CCS)                                    #
+#   - John Daly (LPS)                                            #
+#   - John Gilbert (UCSB, IDA adjunct)                           #
+#   - Mark Pleszkoch (IDA-CCS)                                   #
+#   - Jenny Zito (IDA-CCS)                                       #
+#                                                                #
+# Additional contributors are listed in "LARCcontributors".      #
+#                                                                #
+# Questions: larc@super.org                                      #
+#                                                                #
+# All rights reserved.                                           #
+#                                                                #
+# Redistribution and use in source and binary forms, with or     #
+# without modification, are permitted provided that the          #
+# following conditions are met:                                  #
+#   - Redistribution of source code must retain the above        #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer.                                      #
+#   - Redistribution in binary form must reproduce the above     #
+#     copyright notice, this list of conditions and the          #
+#     following disclaimer in the documentation and/or other     #
+#     materials provided with the distribution.                  #
+#   - Neither the name of the copyright holder nor the names of  #
+#     its contributors may be used to endorse or promote         #
+#     products derived from this software without specific prior #
+#     written permission.                                        #
+#                                                                #
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+# DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+#                                                                #
+#*################################################################
+
+
+
+
+## \file vertex_order.py
+#  \brief Vertex relabelings which make the adjacency matrix of a graph
+#  compress better in LARC.
+#
+#  LARC shares identical quadtree blocks, and all-zero blocks cost nothing,
+#  so an adjacency matrix compresses best when the edges are gathered into
+#  few blocks. A graph read from a file keeps the vertex numbers of its
+#  source. The orderings here renumber the vertices from the edge list
+#  alone (as numpy arrays), before the matrix is loaded:
+#    - 'degree': vertices by decreasing degree
+#    - 'bfs': the Cuthill-McKee order, a breadth first search which visits
+#      the neighbours of each vertex by increasing degree
+#    - 'rcm': the reverse Cuthill-McKee order
+#    - 'bisection': recursive bisection aligned with the quadtree, where each
+#      block of 2^k labels is split in half along a breadth first search
+#      order of its vertices, starting from a peripheral vertex
+#  The orderings use numpy only, with one loop iteration per search level.
+
+from __future__ import print_function, division
+
+import numpy as np
+
+__all__ = ['VERTEX_ORDERINGS', 'vertex_ordering', 'relabel_edges']
+
+VERTEX_ORDERINGS = ('none', 'degree', 'bfs', 'rcm', 'bisection')
+
+
+##
+# \brief Builds the symmetric adjacency structure of a graph without loops
+#
+# \return (indptr, indices, degree) in compressed sparse row form
+def _adjacency(rows, cols, num_vertices):
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    src = np.concatenate((rows, cols))
+    dst = np.concatenate((cols, rows))
+    keep = (src != dst)
+    src, dst = src[keep], dst[keep]
+    order = np.lexsort((dst, src))
+    src, dst = src[order], dst[order]
+    if len(src) > 1:
+        new = np.ones(len(src), dtype=bool)
+        new[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst = src[new], dst[new]
+    degree = np.bincount(src, minlength=num_vertices)
+    indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    return indptr, dst, degree
+
+
+##
+# \brief Returns the vertices of one part of the graph in Cuthill-McKee order
+#
+# Only vertices v with part[v] == part_id are visited, and part[v] is set
+# to -1 for each of them. Each connected piece of the part is searched in
+# turn, starting from the given start vertex or from its vertex of least
+# degree, and the vertices with no neighbours in the part come last.
+#
+# \return The pair (order, number of vertices with no neighbours in the part)
+def _search_order(indptr, indices, degree, vertices, part, part_id,
+                  start=None):
+    # vertices with no neighbours in the part go last, all at once
+    first = indptr[vertices]
+    count = indptr[vertices + 1] - first
+    neighbours = indices[np.repeat(first - np.cumsum(count) + count, count)
+                         + np.arange(count.sum())]
+    inside = np.bincount(np.repeat(np.arange(len(vertices)), count),
+                         weights=(part[neighbours] == part_id),
+                         minlength=len(vertices))
+    isolated = vertices[inside == 0]
+    part[isolated] = -1
+
+    starts = vertices[np.argsort(degree[vertices], kind='stable')]
+    if start is not None and part[start] == part_id:
+        starts = np.concatenate(([start], starts))
+    next_start = 0
+    levels = []
+    found = len(isolated)
+    while found < len(vertices):
+        while part[starts[next_start]] != part_id:
+            next_start += 1
+        frontier = starts[next_start:next_start+1]
+        part[frontier] = -1
+        while len(frontier):
+            levels.append(frontier)
+            found += len(frontier)
+            # the neighbours of the frontier, grouped by frontier vertex
+            first = indptr[frontier]
+            count = indptr[frontier + 1] - first
+            offset = np.repeat(first - np.cumsum(count) + count, count)
+            neighbours = indices[offset + np.arange(count.sum())]
+            parent = np.repeat(np.arange(len(frontier)), count)
+            new = (part[neighbours] == part_id)
+            neighbours, parent = neighbours[new], parent[new]
+            # by parent, then by degree; keep each vertex's first appearance
+            order = np.lexsort((degree[neighbours], parent))
+            neighbours = neighbours[order]
+            neighbours, first_seen = np.unique(neighbours, return_index=True)
+            frontier = neighbours[np.argsort(first_seen)]
+            part[frontier] = -1
+    levels.append(isolated)
+    return np.concatenate(levels), len(isolated)
+
+
+##
+# \brief Orders the vertices by recursive bisection along search orders
+def _bisection_order(indptr, indices, degree, num_vertices, leaf_size):
+    part = np.zeros(num_vertices, dtype=np.int64)
+    result = np.empty(num_vertices, dtype=np.int64)
+    block = 1
+    while block < num_vertices:
+        block *= 2
+    next_id = 1
+    todo = [(np.arange(num_vertices), 0, block)]
+    while todo:
+        vertices, start, block = todo.pop()
+        if len(vertices) <= leaf_size or block <= 1:
+            result[start:start+len(vertices)] = vertices
+            continue
+        half = block // 2
+        if len(vertices) <= half:
+            todo.append((vertices, start, half))
+            continue
+        # search once to find a peripheral vertex, then again from it
+        part[vertices] = next_id
+        order, num_isolated = _search_order(indptr, indices, degree,
+                                            vertices, part, next_id)
+        if num_isolated < len(order):
+            part[vertices] = next_id + 1
+            order, num_isolated = _search_order(
+                indptr, indices, degree, vertices, part, next_id + 1,
+                start=order[len(order) - num_isolated - 1])
+        next_id += 2
+        todo.append((order[half:], start + half, half))
+        todo.append((order[:half], start, half))
+    return result
+
+
+##
+# \brief Computes a relabeling of the vertices of a graph
+#
+# \param rows Array-like of edge row indices, starting at 0
+# \param cols Array-like of edge column indices, starting at 0
+# \param num_vertices The number of vertices
+# \param method One of VERTEX_ORDERINGS
+# \param leaf_size For 'bisection', blocks with at most this many vertices
+# are not split further
+# \return An int64 array new_label with new_label[old vertex] = new vertex
+def vertex_ordering(rows, cols, num_vertices, method='rcm', leaf_size=8):
+    if method not in VERTEX_ORDERINGS:
+        raise ValueError("unknown vertex ordering %r (choose from %s)"
+                         % (method, ", ".join(VERTEX_ORDERINGS)))
+    if method == 'none' or num_vertices == 0:
+        return np.arange(num_vertices, dtype=np.int64)
+    indptr, indices, degree = _adjacency(rows, cols, num_vertices)
+    if method == 'degree':
+        order = np.argsort(-degree, kind='stable')
+    elif method == 'bisection':
+        order = _bisection_order(indptr, indices, degree, num_vertices,
+                                 leaf_size)
+    else:
+        part = np.zeros(num_vertices, dtype=np.int64)
+        order, num_isolated = _search_order(indptr, indices, degree,
+                                            np.arange(num_vertices), part, 0)
+        if method == 'rcm':
+            order = order[::-1]
+    new_label = np.empty(num_vertices, dtype=np.int64)
+    new_label[order] = np.arange(num_vertices)
+    return new_label
+
+
+##
+# \brief Applies a relabeling to an edge list
+#
+# \param rows Array-like of edge row indices
+# \param cols Array-like of edge column indices
+# \param new_label The relabeling, as returned by vertex_ordering
+# \return The pair (new_label[rows], new_label[cols])
+def relabel_edges(rows, cols, new_label):
+    return (new_label[np.asarray(rows, dtype=np.int64)],
+            new_label[np.asarray(cols, dtype=np.int64)])
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCContributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../../src"))
+import MyPyLARC as mypy
+import numpy as np
+
+## \file circuitCompileTest.py
+#
+#  \brief Check that Circuit.compile cancels and fuses gates without
+#  changing the circuit matrix.
+#
+# Each circuit is also built the naive way, multiplying the gate matrices
+# from gate.c into an accumulator in circuit order, and the compiled
+# product must have the same packedID.
+#
+
+##
+# \brief Multiplies the gates of a circuit one at a time, without compiling
+#
+# \param circuit A Circuit
+# \return The packedID of the naive product of its gates
+def naive_product(circuit):
+    mID = mypy.get_identity_pID(circuit.num_wires)
+    for g in circuit.gates:
+        gate_mID = mypy.build_controlled_gate(
+            sum(1 << w for w in g.controls),
+            sum(1 << w for w in g.neg_controls),
+            sum(1 << w for w in g.targets), mypy.cvar.packedID_NOT)
+        mID = mypy.matrix_mult(mID, gate_mID)
+    return mID
+
+
+if __name__ == '__main__':
+
+    verbose = 0
+
+    matrix_exponent = 17
+    op_exponent = 15
+    max_level = 6
+    regionbitparam = -1
+    zeroregionbitparam = -1
+
+    # initialize LARC
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+    scalarTypeStr = mypy.cvar.scalarTypeStr
+
+    print("%s scalarType: Test for whether commuting self-inverse pairs cancel:"
+          %scalarTypeStr)
+    circuit = mypy.Circuit()
+    circuit.cnot(0, 1).ccnot(2, 3, 4).not_gate(5).cnot(0, 1).not_gate(5)
+    circuit.compile()
+    same = (circuit.stats == {'gates': 5, 'cancelled': 4, 'blocks': 1})
+    same = same and (circuit.product()[0] == naive_product(circuit))
+    print("  PASSED." if same else "  FAILED.")
+
+    print("%s scalarType: Test for whether gates that do not commute are kept:"
+          %scalarTypeStr)
+    circuit = mypy.Circuit()
+    circuit.cnot(0, 1).cnot(1, 2).cnot(0, 1)
+    circuit.compile(max_block_wires=2)
+    same = (circuit.stats['cancelled'] == 0)
+    same = same and (circuit.product()[0] == naive_product(circuit))
+    print("  PASSED." if same else "  FAILED.")
+
+    print("%s scalarType: Test for whether a fully cancelled circuit is the identity:"
+          %scalarTypeStr)
+    circuit = mypy.Circuit()
+    circuit.ccnot(0, 1, 2).cnot(3, 4, 1).ccnot(0, 1, 2).cnot(3, 4, 1)
+    circuit.compile()
+    same = (circuit.stats['blocks'] == 0)
+    same = same and (circuit.product()[0] ==
+                     mypy.get_identity_pID(circuit.num_wires))
+    print("  PASSED." if same else "  FAILED.")
+
+    print("%s scalarType: Test for whether fused random circuits match the naive product:"
+          %scalarTypeStr)
+    rng = np.random.default_rng(10)
+    same = True
+    for trial in range(20):
+        circuit = mypy.Circuit()
+        for k in range(30):
+            wires = [int(w) for w in rng.permutation(circuit.num_wires)[:3]]
+            kind = rng.integers(4)
+            if kind == 0:
+                circuit.not_gate(wires[0])
+            elif kind == 1:
+                circuit.cnot(wires[0], wires[1])
+            elif kind == 2:
+                circuit.cnot(wires[0], wires[1], 1)
+            else:
+                circuit.ccnot(wires[0], wires[1], wires[2])
+        for max_block_wires in [1, 3, 4]:
+            circuit.compile(max_block_wires)
+            same = same and (circuit.stats['blocks'] <= circuit.stats['gates'])
+            same = same and (circuit.product()[0] == naive_product(circuit))
+    print("  PASSED." if same else "  FAILED.")
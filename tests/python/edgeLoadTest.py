@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCContributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__),"../../src"))
+import MyPyLARC as mypy
+import numpy as np
+
+## \file edgeLoadTest.py
+#
+#  \brief Check that the bottom-up edge loaders build the same adjacency
+#  matrix as the LARC Matrix Market reader.
+#
+# A random undirected graph is written as a Matrix Market file and as a
+# binary edge file, and loaded with read_matrixMarketExchange_file,
+# read_matrixMarket_parallel, read_edge_file and edges_to_pID. All of them
+# must give the same packedID.
+#
+if __name__ == '__main__':
+
+    verbose = 0
+
+    matrix_exponent = 17
+    op_exponent = 15
+    max_level = 8
+    regionbitparam = -1
+    zeroregionbitparam = -1
+
+    # initialize LARC
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+    scalarTypeStr = mypy.cvar.scalarTypeStr
+
+    level = 6
+    num_vertices = 2**level
+    rng = np.random.default_rng(12)
+    rows = rng.integers(0, num_vertices, 300)
+    cols = rng.integers(0, num_vertices, 300)
+    keep = rows != cols
+    pairs = set(zip(rows[keep], cols[keep])) | set(zip(cols[keep], rows[keep]))
+    pairs = sorted(pairs)
+    rows = np.array([r for r, c in pairs], dtype=np.int64)
+    cols = np.array([c for r, c in pairs], dtype=np.int64)
+
+    with tempfile.TemporaryDirectory() as output_path:
+        mm_name = os.path.join(output_path, "graph.mm")
+        with open(mm_name, "w") as fp:
+            print("%%MatrixMarket matrix coordinate integer general", file=fp)
+            print("%d %d %d" %(num_vertices, num_vertices, len(pairs)), file=fp)
+            for r, c in pairs:
+                print("%d %d 1" %(r+1, c+1), file=fp)
+        edge_name = os.path.join(output_path, "graph.edges")
+        mypy.write_edge_file(edge_name, rows, cols, num_vertices)
+
+        mm_mID = mypy.read_matrixMarketExchange_file(mm_name)
+
+        print("%s scalarType: Test for whether read_edge_file matches the Matrix Market reader:"
+              %scalarTypeStr)
+        same = (mypy.read_edge_file(edge_name, level) == mm_mID)
+        same = same and (mypy.read_edge_file(edge_name, -1) == mm_mID)
+        print("  PASSED." if same else "  FAILED.")
+
+        print("%s scalarType: Test for whether edges_to_pID matches the Matrix Market reader:"
+              %scalarTypeStr)
+        # repeated edges are entered once, and the order does not matter
+        order = rng.permutation(len(rows))
+        same = (mypy.edges_to_pID(rows, cols, level) == mm_mID)
+        same = same and (mypy.edges_to_pID(np.concatenate((rows[order], rows)),
+                                           np.concatenate((cols[order], cols)),
+                                           level) == mm_mID)
+        print("  PASSED." if same else "  FAILED.")
+
+        print("%s scalarType: Test for whether read_matrixMarket_parallel matches the Matrix Market reader:"
+              %scalarTypeStr)
+        same = True
+        for num_threads in [1, 2, 3, 4, 8]:
+            same = same and (mypy.read_matrixMarket_parallel(mm_name, -1,
+                                                             num_threads) == mm_mID)
+        print("  PASSED." if same else "  FAILED.")
+
+        print("%s scalarType: Test for whether an empty edge list gives the zero matrix:"
+              %scalarTypeStr)
+        same = (mypy.edges_to_pID([], [], level) == mypy.get_zero_pID(level, level))
+        print("  PASSED." if same else "  FAILED.")
@@ -184,6 +184,28 @@ if __name__ == '__main__':
     else:
         print("  FAILED.")
 
+    # The generic controlled gate builder must give the same matrices
+    # (and so the same matrixIDs) as the CNOT and CCNOT builders.
+    print("%s scalarType: Test for whether build_controlled_gate matches CNOT/CCNOT:"
+          %scalarTypeStr)
+    same = True
+    for i in range(half_level):
+        c1 = (i+CCnotB_offset)%half_level
+        c2 = (i+CCnotA_offset)%half_level
+        t = i+half_level
+        same = same and (mypy.build_ccnot_gate(c1, c2, t) ==
+            mypy.build_controlled_gate((1<<c1)|(1<<c2), 0, 1<<t,
+                                       mypy.cvar.packedID_NOT))
+        c = (i+CntrlNot_offset)%half_level
+        same = same and (mypy.build_cnot_gate(c, t, 0) ==
+            mypy.build_controlled_gate(1<<c, 0, 1<<t, mypy.cvar.packedID_NOT))
+        same = same and (mypy.build_cnot_gate(c, t, 1) ==
+            mypy.build_controlled_gate(0, 1<<c, 1<<t, mypy.cvar.packedID_NOT))
+    if same:
+        print("  PASSED.")
+    else:
+        print("  FAILED.")
+
     # Delete files and directory we created
     files=glob.glob(output_path+'/circuit*')
     for f in files:
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCContributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+import types
+sys.path.append(os.path.join(os.path.dirname(__file__),"../../src"))
+sys.path.append(os.path.join(os.path.dirname(__file__),"../../Count_triangles"))
+import MyPyLARC as mypy
+import numpy as np
+from incremental_triangles import IncrementalTriangleCounter
+
+## \file incrementalTrianglesTest.py
+#
+#  \brief Check the incremental triangle count against full recounts.
+#
+# Edges of a random graph are added to an IncrementalTriangleCounter in
+# batches (with repeats, reversed edges and loops mixed in), and after each
+# batch the count must equal trace(A^3)/6 recomputed from all the edges so
+# far, both in LARC and with numpy.
+#
+if __name__ == '__main__':
+
+    verbose = 0
+
+    matrix_exponent = 17
+    op_exponent = 15
+    max_level = 6
+    regionbitparam = -1
+    zeroregionbitparam = -1
+
+    # initialize LARC
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+    scalarTypeStr = mypy.cvar.scalarTypeStr
+
+    level = max_level
+    n = 2**level
+    rng = np.random.default_rng(16)
+    rows = rng.integers(0, n, 600)
+    cols = rng.integers(0, n, 600)
+
+    print("%s scalarType: Test for whether incremental counts match full recounts:"
+          %scalarTypeStr)
+    counter = IncrementalTriangleCounter(level, rows[:200], cols[:200])
+    same = True
+    for first in range(200, len(rows) + 100, 100):
+        # the batch repeats some edges already added, in either direction
+        batch_rows = np.concatenate((rows[first:first+100], cols[first-50:first]))
+        batch_cols = np.concatenate((cols[first:first+100], rows[first-50:first]))
+        before = counter.triangles
+        new = counter.add_edges(batch_rows, batch_cols)
+        counter.clean()
+
+        A = np.zeros((n, n), dtype=np.int64)
+        A[rows[:first+100], cols[:first+100]] = 1
+        A[cols[:first+100], rows[:first+100]] = 1
+        np.fill_diagonal(A, 0)
+        expected = int(np.trace(A @ A @ A)) // 6
+
+        A_mID = mypy.numpy_to_pID(A)
+        recount_mID = mypy.traceID(mypy.matrix_mult(A_mID, mypy.matrix_mult(A_mID, A_mID)))
+        same = same and (counter.triangles == expected)
+        same = same and (new == expected - before)
+        same = same and (recount_mID == mypy.numpy_to_pID(np.array(6*expected)))
+        same = same and (counter.num_edges == int(A.sum()))
+    print("  PASSED." if same else "  FAILED.")
+
+    print("%s scalarType: Test for whether edges are deduplicated at levels of 32 and above:"
+          %scalarTypeStr)
+    big = 2**39
+    dedup_rows, dedup_cols = IncrementalTriangleCounter._symmetric_edges(
+        types.SimpleNamespace(level=40), [big, 3, 3, 5], [1, 4, 4, 5])
+    same = (list(dedup_rows) == [1, 3, 4, big]) and (list(dedup_cols) == [big, 4, 3, 1])
+    print("  PASSED." if same else "  FAILED.")
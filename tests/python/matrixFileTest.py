@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCContributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__),"../../src"))
+import MyPyLARC as mypy
+import numpy as np
+
+## \file matrixFileTest.py
+#
+#  \brief Check that binary larcMatrix files and archives read back the
+#  matrices that were written.
+#
+# Matrices are written to .lmb files (fprint_larcMatrixBinary) and to one
+# .lma archive (fprint_larcMatrixArchive) and read back into the same
+# store, where a matrix that was read correctly has its original packedID.
+#
+if __name__ == '__main__':
+
+    verbose = 0
+
+    matrix_exponent = 17
+    op_exponent = 15
+    max_level = 6
+    regionbitparam = -1
+    zeroregionbitparam = -1
+
+    # initialize LARC
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+    scalarTypeStr = mypy.cvar.scalarTypeStr
+
+    # a random 0/1 matrix, a sparse one with shared blocks, and products
+    rng = np.random.default_rng(19)
+    A_mID = mypy.numpy_to_pID(rng.integers(0, 2, (16, 16)))
+    B_mID = mypy.kronecker_product(mypy.get_identity_pID(2),
+                                   mypy.numpy_to_pID(rng.integers(0, 2, (4, 4))))
+    C_mID = mypy.matrix_mult(A_mID, B_mID)
+    matrices = [('A', A_mID), ('B', B_mID), ('AB', C_mID),
+                ('I', mypy.get_identity_pID(max_level))]
+
+    with tempfile.TemporaryDirectory() as output_path:
+
+        print("%s scalarType: Test for whether .lmb files read back the same matrices:"
+              %scalarTypeStr)
+        same = True
+        for name, mID in matrices:
+            file_name = os.path.join(output_path, name + mypy.BINARY_SUFFIX)
+            mypy.save_matrix(mID, file_name)
+            same = same and mypy.is_binary_matrix_file(file_name)
+            same = same and (mypy.load_matrix(file_name) == mID)
+            # the binary twin of a JSON name is read once it exists
+            same = same and (mypy.load_matrix(os.path.join(output_path,
+                                                           name + ".json")) == mID)
+        print("  PASSED." if same else "  FAILED.")
+
+        print("%s scalarType: Test for whether .lmb and JSON files give the same matrices:"
+              %scalarTypeStr)
+        same = True
+        for name, mID in matrices:
+            json_name = os.path.join(output_path, name + "_text.json")
+            mypy.save_matrix(mID, json_name, binary=False)
+            lmb_name = mypy.convert_matrix_file(json_name)
+            same = same and (mypy.read_larcMatrixFile(json_name) == mID)
+            same = same and (mypy.read_larcMatrixBinary(lmb_name) == mID)
+        print("  PASSED." if same else "  FAILED.")
+
+        print("%s scalarType: Test for whether a .lma archive reads back its matrices:"
+              %scalarTypeStr)
+        archive_name = os.path.join(output_path, "all" + mypy.ARCHIVE_SUFFIX)
+        size = mypy.save_matrix_archive(archive_name, matrices)
+        names = [name for name, mID in matrices]
+        found = mypy.load_matrix_archive(archive_name)
+        same = (mypy.matrix_archive_names(archive_name) == names)
+        same = same and (found == dict(matrices))
+        same = same and (mypy.load_matrix_archive(archive_name, ['AB', 'A'])
+                         == {'AB': C_mID, 'A': A_mID})
+        # shared subtrees are written once
+        same = same and (size <= sum(mypy.count_unique_nodes(mID)
+                                     for name, mID in matrices))
+        print("  PASSED." if same else "  FAILED.")
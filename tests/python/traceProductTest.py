@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+ #*##############################################################*#
+ #                                                                #
+ # Copyright (C) 2014-2024, Institute for Defense Analyses        #
+ # 4850 Mark Center Drive, Alexandria, VA; 703-845-2500           #
+ # This material may be reproduced by or for the US Government    #
+ # pursuant to the copyright license under the clauses at DFARS   #
+ # 252.227-7013 and 252.227-7014.                                 #
+ #                                                                #
+ # LARC : Linear Algebra via Recursive Compression                #
+ # Authors:                                                       #
+ #   - Steve Cuccaro (IDA-CCS)                                    #
+ #   - John Daly (LPS)                                            #
+ #   - John Gilbert (UCSB, IDA adjunct)                           #
+ #   - Mark Pleszkoch (IDA-CCS)                                   #
+ #   - Jenny Zito (IDA-CCS)                                       #
+ #                                                                #
+ # Additional contributors are listed in "LARCContributors".      #
+ #                                                                #
+ # Questions: larc@super.org                                      #
+ #                                                                #
+ # All rights reserved.                                           #
+ #                                                                #
+ # Redistribution and use in source and binary forms, with or     #
+ # without modification, are permitted provided that the          #
+ # following conditions are met:                                  #
+ #   - Redistribution of source code must retain the above        #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer.                                      #
+ #   - Redistribution in binary form must reproduce the above     #
+ #     copyright notice, this list of conditions and the          #
+ #     following disclaimer in the documentation and/or other     #
+ #     materials provided with the distribution.                  #
+ #   - Neither the name of the copyright holder nor the names of  #
+ #     its contributors may be used to endorse or promote         #
+ #     products derived from this software without specific prior #
+ #     written permission.                                        #
+ #                                                                #
+ # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND         #
+ # CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,    #
+ # INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF       #
+ # MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE       #
+ # DISCLAIMED.  IN NO EVENT SHALL THE COPYRIGHT HOLDER NOR        #
+ # CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,   #
+ # SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT   #
+ # NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;   #
+ # LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)       #
+ # HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN      #
+ # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR   #
+ # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, #
+ # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.             #
+ #                                                                #
+ #*##############################################################*#
+
+
+from __future__ import print_function, division
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__),"../../src"))
+import MyPyLARC as mypy
+import numpy as np
+
+## \file traceProductTest.py
+#
+#  \brief Check trace_of_product and masked_product_sum against the
+#  matrices they avoid building.
+#
+# trace_of_product(X, Y) must be the same scalar as traceID(matrix_mult(X, Y)),
+# and masked_product_sum(X, Y, M) the same as the sum of the entries of
+# (X*Y) o M computed with numpy. Scalars are compared by packedID.
+#
+if __name__ == '__main__':
+
+    verbose = 0
+
+    matrix_exponent = 17
+    op_exponent = 15
+    max_level = 6
+    regionbitparam = -1
+    zeroregionbitparam = -1
+
+    # initialize LARC
+    mypy.initialize_larc(matrix_exponent,op_exponent,max_level,regionbitparam,zeroregionbitparam,verbose)
+    scalarTypeStr = mypy.cvar.scalarTypeStr
+
+    rng = np.random.default_rng(13)
+
+    print("%s scalarType: Test for whether trace_of_product matches traceID of the product:"
+          %scalarTypeStr)
+    same = True
+    for level in range(max_level + 1):
+        n = 2**level
+        for density in [0.1, 0.5]:
+            X = rng.integers(-3, 4, (n, n)) * (rng.random((n, n)) < density)
+            Y = rng.integers(-3, 4, (n, n)) * (rng.random((n, n)) < density)
+            X_mID = mypy.numpy_to_pID(X)
+            Y_mID = mypy.numpy_to_pID(Y)
+            trace_mID = mypy.trace_of_product(X_mID, Y_mID)
+            same = same and (trace_mID ==
+                             mypy.traceID(mypy.matrix_mult(X_mID, Y_mID)))
+            same = same and (trace_mID == mypy.numpy_to_pID(np.trace(X @ Y)))
+    # zero blocks and shared subtrees
+    I_mID = mypy.get_identity_pID(max_level)
+    Z_mID = mypy.get_zero_pID(max_level, max_level)
+    same = same and (mypy.trace_of_product(I_mID, I_mID) == mypy.traceID(I_mID))
+    same = same and (mypy.trace_of_product(I_mID, Z_mID) == mypy.traceID(Z_mID))
+    print("  PASSED." if same else "  FAILED.")
+
+    print("%s scalarType: Test for whether masked_product_sum matches the masked product:"
+          %scalarTypeStr)
+    same = True
+    for level in range(1, max_level + 1):
+        n = 2**level
+        X = rng.integers(-3, 4, (n, n)) * (rng.random((n, n)) < 0.3)
+        Y = rng.integers(-3, 4, (n, n)) * (rng.random((n, n)) < 0.3)
+        M = rng.integers(0, 2, (n, n))
+        total_mID = mypy.masked_product_sum(mypy.numpy_to_pID(X),
+                                            mypy.numpy_to_pID(Y),
+                                            mypy.numpy_to_pID(M))
+        same = same and (total_mID ==
+                         mypy.numpy_to_pID(np.sum((X @ Y) * M)))
+    print("  PASSED." if same else "  FAILED.")
+
+    print("%s scalarType: Test for whether both count triangles as trace(A^3):"
+          %scalarTypeStr)
+    n = 2**max_level
+    A = np.triu(rng.random((n, n)) < 0.2, 1).astype(np.int64)
+    A = A + A.T
+    A_mID = mypy.numpy_to_pID(A)
+    A3_trace_mID = mypy.traceID(mypy.matrix_mult(A_mID, mypy.matrix_mult(A_mID, A_mID)))
+    same = (mypy.trace_of_product(A_mID, mypy.matrix_mult(A_mID, A_mID)) == A3_trace_mID)
+    same = same and (mypy.masked_product_sum(A_mID, A_mID, A_mID) == A3_trace_mID)
+    print("  PASSED." if same else "  FAILED.")